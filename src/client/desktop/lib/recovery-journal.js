@@ -0,0 +1,72 @@
+/**
+ * Crash recovery — reader for the engine's append-only session journal
+ * (src/engine/journal.py). Each record is:
+ *
+ *   u32le payload length | u32le crc32(payload) | payload (UTF-8 JSON)
+ *
+ * Reading stops at the first record that is truncated, too long, fails
+ * its CRC or isn't JSON — the same rule as journal.py's read_journal —
+ * so a torn tail is never shown as recovered text, even if its bytes
+ * happen to parse.
+ *
+ * Used by main.js check-crash-recovery + unit-tested here.
+ */
+
+'use strict';
+
+const zlib = require('zlib');
+
+const MAX_RECORD_BYTES = 1 << 20;  // Anything larger is a corrupt length field
+
+let _table = null;
+
+/** zlib-compatible CRC-32 (zlib.crc32 needs Node >= 20.15; Electron 28 ships 18). */
+function crc32(buf) {
+  if (typeof zlib.crc32 === 'function') return zlib.crc32(buf) >>> 0;
+  if (!_table) {
+    _table = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+      let c = n;
+      for (let k = 0; k < 8; k++) c = (c & 1) ? (0xEDB88320 ^ (c >>> 1)) : (c >>> 1);
+      _table[n] = c >>> 0;
+    }
+  }
+  let crc = 0xFFFFFFFF;
+  for (let i = 0; i < buf.length; i++) crc = _table[(crc ^ buf[i]) & 0xFF] ^ (crc >>> 8);
+  return (crc ^ 0xFFFFFFFF) >>> 0;
+}
+
+/**
+ * Every complete, intact record in order.
+ * @param {Buffer} data — the journal file's bytes
+ * @returns {Array<{t:number, s:number, e:number, c:number, p:boolean, x:string}>}
+ */
+function parseRecoveryJournal(data) {
+  const records = [];
+  let pos = 0;
+  while (pos + 8 <= data.length) {
+    const len = data.readUInt32LE(pos);
+    const crc = data.readUInt32LE(pos + 4);
+    if (len > MAX_RECORD_BYTES || pos + 8 + len > data.length) break;
+    const payload = data.subarray(pos + 8, pos + 8 + len);
+    if (crc32(payload) !== crc) break;
+    let rec;
+    try { rec = JSON.parse(payload.toString('utf-8')); } catch (e) { break; }
+    records.push(rec);
+    pos += 8 + len;
+  }
+  return records;
+}
+
+/** Final segments in order plus a trailing partial, as one text. */
+function recoverText(data) {
+  const finals = [];
+  let partial = null;
+  for (const rec of parseRecoveryJournal(data)) {
+    if (rec.p) { partial = rec.x; } else { finals.push(rec.x); partial = null; }
+  }
+  if (partial) finals.push(partial);
+  return finals.filter(Boolean).join(' ');
+}
+
+module.exports = { crc32, parseRecoveryJournal, recoverText, MAX_RECORD_BYTES };
@@ -151,6 +151,7 @@ const util = require('util');
 // so a hung upstream (Matrix, translate API, HF download) can't
 // leave the renderer waiting forever on an IPC reply.
 const { withTimeout } = require('./lib/timeout');
+const { recoverText: recoverJournalText } = require('./lib/recovery-journal');
 const pasteStrategies = require('./strategies/paste-strategies');
 const installer = require('./install/installer');
 const settingsCatalog = require('./settings/catalog');
@@ -7759,8 +7760,9 @@ async function _transcribeViaWS(wavPath) {
             ws.send(audioData);
           } else {
             // Large recording — stream in sub-frame chunks so we never hit the 50MB
-            // WS frame limit, then signal end. The server reassembles to disk and
-            // transcribes the whole file (bounded RAM). This is what makes the
+            // WS frame limit, then signal end. The server spools to disk (bounded
+            // RAM) and, where it can decode the stream, transcribes while the
+            // frames are still arriving. This is what makes the
             // "unlimited recording" promise actually deliverable.
             ws.send(JSON.stringify({ action: 'transcribe_upload', language: 'auto', format: ext }));
             for (let off = 0; off < audioData.length; off += UPLOAD_CHUNK) {
@@ -10265,51 +10267,129 @@ ipcMain.handle('translate-offline', async (event, text, sourceLang, targetLang)
 });
 
 // On-device translation — NLLB-200 (CTranslate2 + SentencePiece), fully offline.
-// Spawns the venv python on the bundled translate_local.py with the bundled model
-// (same offline-correct pattern as 'batch-transcribe-local'). No cloud, no API key.
+// Runs the bundled translate_local.py as a long-lived warm worker (--serve, JSON
+// Lines): the model loads once and stays resident, and the worker drops it after
+// NLLB_IDLE_EVICT_S idle seconds to free RAM. If the worker can't be used, falls
+// back to the one-shot spawn (same offline-correct pattern as
+// 'batch-transcribe-local'). No cloud, no API key.
 // Shared by the 'translate-local' IPC and the mini-translate-speech text step.
-async function nllbTranslate(text, sourceLang, targetLang) {
-  if (!text || !targetLang) return { ok: false, error: 'Missing text or target language' };
-  const tmpReq = path.join(os.tmpdir(), `windy-tr-${crypto.randomBytes(8).toString('hex')}.json`);
-  try {
-    const appDataDir = path.join(os.homedir(), '.windy-pro');
-    const venvPy = process.platform === 'win32'
-      ? path.join(appDataDir, 'venv', 'Scripts', 'python.exe')
-      : path.join(appDataDir, 'venv', 'bin', 'python');
-    const bundledRoot = process.resourcesPath ? path.join(process.resourcesPath, 'bundled') : null;
-    const bundledPy = bundledRoot
-      ? (process.platform === 'win32' ? path.join(bundledRoot, 'python', 'python.exe') : path.join(bundledRoot, 'python', 'bin', 'python3'))
-      : null;
-    const pythonPath = fs.existsSync(venvPy) ? venvPy : (bundledPy && fs.existsSync(bundledPy) ? bundledPy : 'python3');
+const NLLB_IDLE_EVICT_S = 300;
+let nllbWorker = null; // { proc, pending: Map<id, {resolve, reject, timer}>, nextId, buf }
 
-    const modelDir = app.isPackaged
+function nllbPaths() {
+  const appDataDir = path.join(os.homedir(), '.windy-pro');
+  const venvPy = process.platform === 'win32'
+    ? path.join(appDataDir, 'venv', 'Scripts', 'python.exe')
+    : path.join(appDataDir, 'venv', 'bin', 'python');
+  const bundledRoot = process.resourcesPath ? path.join(process.resourcesPath, 'bundled') : null;
+  const bundledPy = bundledRoot
+    ? (process.platform === 'win32' ? path.join(bundledRoot, 'python', 'python.exe') : path.join(bundledRoot, 'python', 'bin', 'python3'))
+    : null;
+  return {
+    pythonPath: fs.existsSync(venvPy) ? venvPy : (bundledPy && fs.existsSync(bundledPy) ? bundledPy : 'python3'),
+    modelDir: app.isPackaged
       ? path.join(process.resourcesPath, 'bundled', 'model', 'nllb-200-600M')
-      : path.join(__dirname, '..', '..', '..', 'extraResources', 'model', 'nllb-200-600M');
-    const scriptPath = app.isPackaged
+      : path.join(__dirname, '..', '..', '..', 'extraResources', 'model', 'nllb-200-600M'),
+    scriptPath: app.isPackaged
       ? path.join(process.resourcesPath, 'engine', 'translate_local.py')
-      : path.join(__dirname, '..', '..', 'engine', 'translate_local.py');
+      : path.join(__dirname, '..', '..', 'engine', 'translate_local.py'),
+    // Persistent translation cache (repeat phrases skip the model across restarts)
+    cachePath: path.join(appDataDir, 'translation-cache.db'),
+  };
+}
 
-    if (!fs.existsSync(path.join(modelDir, 'model.bin'))) {
-      return { ok: false, error: 'On-device translation model is not installed.' };
+const NLLB_ENV = { HF_HUB_OFFLINE: '1', TRANSFORMERS_OFFLINE: '1', KMP_DUPLICATE_LIB_OK: 'TRUE' };
+
+function getNllbWorker(pythonPath, scriptPath, cachePath) {
+  if (nllbWorker && nllbWorker.proc.exitCode === null && !nllbWorker.proc.killed) return nllbWorker;
+  const args = [scriptPath, '--serve', '--idle-evict-s', String(NLLB_IDLE_EVICT_S)];
+  if (cachePath && fs.existsSync(path.dirname(cachePath))) args.push('--cache-path', cachePath);
+  const proc = spawn(pythonPath, args, {
+    env: { ...process.env, ...NLLB_ENV },
+    stdio: ['pipe', 'pipe', 'pipe'],
+  });
+  const worker = { proc, pending: new Map(), nextId: 1, buf: '' };
+  proc.stdout.on('data', (chunk) => {
+    worker.buf += chunk.toString('utf-8');
+    let nl;
+    while ((nl = worker.buf.indexOf('\n')) >= 0) {
+      const line = worker.buf.slice(0, nl).trim();
+      worker.buf = worker.buf.slice(nl + 1);
+      if (!line) continue;
+      let msg;
+      try { msg = JSON.parse(line); } catch (_) { continue; }
+      const waiter = msg.id != null ? worker.pending.get(msg.id) : null;
+      if (!waiter) continue; // ready banner
+      worker.pending.delete(msg.id);
+      clearTimeout(waiter.timer);
+      waiter.resolve(msg);
     }
-    fs.writeFileSync(tmpReq, JSON.stringify({
-      model_dir: modelDir,
-      items: [{ text, source: sourceLang || 'en', target: targetLang }],
-    }));
+  });
+  proc.stderr.on('data', (d) => console.log(String(d).trimEnd()));
+  const failAll = (err) => {
+    for (const w of worker.pending.values()) { clearTimeout(w.timer); w.reject(err); }
+    worker.pending.clear();
+    if (nllbWorker === worker) nllbWorker = null;
+  };
+  proc.on('error', failAll);
+  proc.on('exit', (code) => failAll(new Error(`translate worker exited (${code})`)));
+  nllbWorker = worker;
+  return worker;
+}
 
+function nllbWorkerRequest(worker, payload, timeoutMs) {
+  return new Promise((resolve, reject) => {
+    const id = worker.nextId++;
+    const timer = setTimeout(() => {
+      worker.pending.delete(id);
+      reject(new Error('translate worker timed out'));
+    }, timeoutMs);
+    worker.pending.set(id, { resolve, reject, timer });
+    worker.proc.stdin.write(JSON.stringify({ id, ...payload }) + '\n');
+  });
+}
+
+async function nllbTranslateOneShot(pythonPath, scriptPath, payload) {
+  const tmpReq = path.join(os.tmpdir(), `windy-tr-${crypto.randomBytes(8).toString('hex')}.json`);
+  try {
+    fs.writeFileSync(tmpReq, JSON.stringify(payload));
     const { stdout } = await execFileAsync(pythonPath, [scriptPath, tmpReq], {
       timeout: 60000,
       maxBuffer: 16 * 1024 * 1024,
-      env: { ...process.env, HF_HUB_OFFLINE: '1', TRANSFORMERS_OFFLINE: '1', KMP_DUPLICATE_LIB_OK: 'TRUE' },
+      env: { ...process.env, ...NLLB_ENV },
     });
-    const parsed = JSON.parse(stdout.trim().split('\n').pop());
+    return JSON.parse(stdout.trim().split('\n').pop());
+  } finally {
+    try { fs.unlinkSync(tmpReq); } catch (_) {}
+  }
+}
+
+async function nllbTranslate(text, sourceLang, targetLang) {
+  if (!text || !targetLang) return { ok: false, error: 'Missing text or target language' };
+  try {
+    const { pythonPath, modelDir, scriptPath, cachePath } = nllbPaths();
+    if (!fs.existsSync(path.join(modelDir, 'model.bin'))) {
+      return { ok: false, error: 'On-device translation model is not installed.' };
+    }
+    const payload = {
+      model_dir: modelDir,
+      items: [{ text, source: sourceLang || 'en', target: targetLang }],
+    };
+    let parsed;
+    try {
+      parsed = await nllbWorkerRequest(getNllbWorker(pythonPath, scriptPath, cachePath), payload, 60000);
+    } catch (workerErr) {
+      console.warn('[translate-local] warm worker unavailable, using one-shot:', workerErr.message);
+      parsed = await nllbTranslateOneShot(pythonPath, scriptPath, payload);
+    }
     if (!parsed.ok) return { ok: false, error: parsed.error || 'translation failed' };
+    if (parsed.load_ms != null) {
+      console.log(`[translate-local] ${parsed.cold ? 'cold' : 'warm'}: load ${parsed.load_ms}ms, translate ${parsed.translate_ms}ms, ${parsed.cache_hits || 0} cached`);
+    }
     return { ok: true, translatedText: parsed.results?.[0]?.translatedText || '', engine: parsed.engine || 'nllb-local' };
   } catch (err) {
     console.error('[translate-local] error:', err.message);
     return { ok: false, error: err.message };
-  } finally {
-    try { fs.unlinkSync(tmpReq); } catch (_) {}
   }
 }
 ipcMain.handle('translate-local', (event, text, sourceLang, targetLang) => nllbTranslate(text, sourceLang, targetLang));
@@ -10843,12 +10923,18 @@ ipcMain.handle('install-update', async () => {
   return { ok: false, error: 'Updater not available' };
 });
 
-// Crash recovery — check for orphaned temp file
+// Crash recovery — the engine's append-only session journal
+// (src/engine/journal.py), read up to the first torn or corrupt record
+// (lib/recovery-journal.js checks each record's crc32).
+function readRecoveryJournal(file) {
+  return recoverJournalText(fs.readFileSync(file));
+}
+
 ipcMain.handle('check-crash-recovery', async () => {
-  const tempFile = path.join(os.tmpdir(), 'windy_session.txt');
+  const tempFile = path.join(os.tmpdir(), 'windy_session.journal');
   if (fs.existsSync(tempFile)) {
     try {
-      const content = fs.readFileSync(tempFile, 'utf-8');
+      const content = readRecoveryJournal(tempFile);
       if (content.trim().length > 0) {
         return { found: true, content, path: tempFile };
       }
@@ -10858,7 +10944,7 @@ ipcMain.handle('check-crash-recovery', async () => {
 });
 
 ipcMain.handle('dismiss-crash-recovery', async () => {
-  const tempFile = path.join(os.tmpdir(), 'windy_session.txt');
+  const tempFile = path.join(os.tmpdir(), 'windy_session.journal');
   try { fs.unlinkSync(tempFile); } catch (e) { /* ignore */ }
   return { success: true };
 });
@@ -11362,6 +11448,12 @@ app.on('will-quit', () => {
     intel.flush();
   } catch (_) { /* never block quit */ }
 
+  // Warm translate worker exits on stdin EOF
+  if (nllbWorker) {
+    try { nllbWorker.proc.stdin.end(); nllbWorker.proc.kill(); } catch (_) { /* already gone */ }
+    nllbWorker = null;
+  }
+
   // Graceful Python server shutdown: SIGTERM → 3s → SIGKILL
   if (pythonProcess) {
     try {
@@ -2330,6 +2330,20 @@ class WindyApp {
     };
     const engineIcon = engineIcons[activeEngine] || '🏠';
 
+    // The engine changed a setting on its own to stay real-time (degradation.py)
+    if (msg.adjustment) {
+      const adj = msg.adjustment;
+      badge.title = `Performance ratio: ${msg.ratio}x — ${adj.setting} ${adj.from} → ${adj.to}`;
+      if (adj.setting === 'model_size' && adj.applied) {
+        badge.textContent = `${engineIcon} ${msg.model} ✅`;
+        badge.classList.remove('loading');
+        this.showReconnectToast(adj.action === 'degrade'
+          ? `⚡ Switched to ${adj.to} to keep up in real time`
+          : `✅ Back to ${adj.to}`);
+      }
+      return;
+    }
+
     if (msg.status === 'slow') {
       badge.textContent = `${engineIcon} ${displayName} ⚠️ slow`;
       badge.classList.add('loading');
@@ -3611,9 +3625,9 @@ class WindyApp {
 
     console.debug(`[Batch] Uploading ${(audioBlob.size / 1024 / 1024).toFixed(1)}MB to cloud`);
 
-    // AbortController for timeout (5 min for long recordings)
+    // AbortController for timeout (30 min: queued jobs can wait behind others)
     const controller = new AbortController();
-    const timeout = setTimeout(() => controller.abort(), 5 * 60 * 1000);
+    const timeout = setTimeout(() => controller.abort(), 30 * 60 * 1000);
 
     try {
       // Build query params for language & diarization
@@ -3622,7 +3636,7 @@ class WindyApp {
       const params = new URLSearchParams({ language: lang });
       if (diarize) params.append('diarize', 'true');
 
-      const response = await fetch(`${cloudUrl}/api/v1/transcribe/batch?${params}`, {
+      const post = (path) => fetch(`${cloudUrl}${path}?${params}`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -3632,6 +3646,17 @@ class WindyApp {
         signal: controller.signal
       });
 
+      // Queue a job and poll it, so long recordings don't hold one request
+      // open past proxy timeouts. Older servers only have /batch.
+      let response = await post('/api/v1/transcribe/jobs');
+      if (response.status === 404) {
+        response = await post('/api/v1/transcribe/batch');
+      } else if (response.ok) {
+        const job = await response.json();
+        console.debug(`[Batch] Queued cloud job ${job.job_id} (position ${job.queue_position || 0})`);
+        response = await this._pollCloudJob(`${cloudUrl}${job.status_url}`, token, controller.signal);
+      }
+
       if (!response.ok) {
         const errRaw = await response.text();
         // Strip HTML error pages — show only meaningful message
@@ -3648,7 +3673,7 @@ class WindyApp {
       return data.text || data.raw_text || '';
     } catch (err) {
       if (err.name === 'AbortError') {
-        throw new Error('Cloud processing timed out (5 min). Try a shorter recording or a different engine.');
+        throw new Error('Cloud processing timed out (30 min). Try a shorter recording or a different engine.');
       }
       throw err;
     } finally {
@@ -3656,6 +3681,29 @@ class WindyApp {
     }
   }
 
+  /**
+   * Poll a queued cloud transcription job until it finishes.
+   * Resolves to a Response-like object whose json() is the transcript.
+   */
+  async _pollCloudJob(statusUrl, token, signal) {
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      if (signal.aborted) throw new DOMException('Aborted', 'AbortError');
+      const response = await fetch(statusUrl, {
+        headers: { 'Authorization': `Bearer ${token}` },
+        signal
+      });
+      if (!response.ok) return response;
+      const job = await response.json();
+      if (job.status === 'done') {
+        return { ok: true, json: async () => job.result };
+      }
+      if (job.status === 'failed' || job.status === 'cancelled') {
+        return { ok: false, status: 500, text: async () => job.error || `Job ${job.status}` };
+      }
+    }
+  }
+
   /**
    * Display the polished batch transcription result.
    */
@@ -19,16 +19,21 @@ import json
 import re
 import uuid
 import os
-import sqlite3
 import hashlib
 import hmac
+import time
 from datetime import datetime, timedelta, timezone
-from contextlib import asynccontextmanager, contextmanager
+from contextlib import asynccontextmanager
 from pathlib import Path
 import numpy as np
 import struct
 import logging
 
+from .batching import scheduler_from_env
+from .db import Database
+from .decoding import AudioDecodeError, AudioTooLarge, decode_stream
+from .jobs import JOBS_SCHEMA, PRIORITIES, QueueFull, queue_from_env, webhook_url_error
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════
@@ -110,26 +115,8 @@ DB_PATH = os.getenv("WINDY_CLOUD_DB", str(Path.home() / ".windy-pro" / "cloud.db
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
-
-
-@contextmanager
-def db_session():
-    """Context manager for database connections — ensures cleanup."""
-    conn = get_db()
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+# One connection per thread, queries on a small DB thread pool (see db.py)
+db = Database(DB_PATH, workers=int(os.getenv("WINDY_CLOUD_DB_WORKERS", "4")))
 
 
 # Email validation regex
@@ -137,8 +124,8 @@ _EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 
 def init_db():
-    conn = get_db()
-    conn.executescript("""
+    with db.session() as conn:
+        conn.executescript("""
         CREATE TABLE IF NOT EXISTS users (
             id TEXT PRIMARY KEY,
             email TEXT UNIQUE NOT NULL,
@@ -168,9 +155,7 @@ def init_db():
         );
         CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id);
         CREATE INDEX IF NOT EXISTS idx_segments_session ON segments(session_id);
-    """)
-    conn.commit()
-    conn.close()
+    """ + JOBS_SCHEMA)
 
 
 # ═══════════════════════════════════
@@ -180,7 +165,9 @@ def init_db():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    await job_queue.start()
     yield
+    await job_queue.stop()
 
 
 app = FastAPI(
@@ -241,6 +228,8 @@ class HealthResponse(BaseModel):
     gpu_available: bool
     models_loaded: List[str]
     active_connections: int
+    batching: Optional[dict] = None
+    jobs: Optional[dict] = None
 
 
 # ═══════════════════════════════════
@@ -283,39 +272,41 @@ async def register(request: Request, body: AuthRegister):
     if not _EMAIL_RE.match(body.email):
         raise HTTPException(status_code=400, detail="Invalid email address")
 
-    with db_session() as conn:
-        existing = conn.execute("SELECT id FROM users WHERE email = ?", (body.email.lower(),)).fetchone()
-        if existing:
-            raise HTTPException(status_code=409, detail="Email already registered")
+    user_id = str(uuid.uuid4())
+    pw_hash = hash_password(body.password)
 
-        user_id = str(uuid.uuid4())
-        pw_hash = hash_password(body.password)
+    def insert_user(conn):
+        if conn.execute("SELECT id FROM users WHERE email = ?", (body.email.lower(),)).fetchone():
+            return False
         conn.execute(
             "INSERT INTO users (id, email, name, password_hash) VALUES (?, ?, ?, ?)",
             (user_id, body.email.lower(), body.name, pw_hash)
         )
+        return True
+
+    if not await db.run(insert_user):
+        raise HTTPException(status_code=409, detail="Email already registered")
 
-        user = {"id": user_id, "email": body.email.lower(), "name": body.name}
-        token = create_access_token(user)
-        return AuthResponse(token=token, user=user)
+    user = {"id": user_id, "email": body.email.lower(), "name": body.name}
+    token = create_access_token(user)
+    return AuthResponse(token=token, user=user)
 
 
 @app.post("/api/v1/auth/login", response_model=AuthResponse)
 @limiter.limit("5/minute")
 async def login(request: Request, body: AuthLogin):
     """Login with email and password."""
-    with db_session() as conn:
-        row = conn.execute(
-            "SELECT id, email, name, password_hash FROM users WHERE email = ?",
-            (body.email.lower(),)
-        ).fetchone()
+    row = await db.fetchone(
+        "SELECT id, email, name, password_hash FROM users WHERE email = ?",
+        (body.email.lower(),)
+    )
 
-        if not row or not verify_password(body.password, row["password_hash"]):
-            raise HTTPException(status_code=401, detail="Invalid email or password")
+    if not row or not verify_password(body.password, row["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
 
-        user = {"id": row["id"], "email": row["email"], "name": row["name"]}
-        token = create_access_token(user)
-        return AuthResponse(token=token, user=user)
+    user = {"id": row["id"], "email": row["email"], "name": row["name"]}
+    token = create_access_token(user)
+    return AuthResponse(token=token, user=user)
 
 
 @app.get("/api/v1/auth/me")
@@ -337,6 +328,21 @@ async def refresh_token(user: dict = Depends(get_current_user)):
 #  Vault Endpoints (T8)
 # ═══════════════════════════════════
 
+def _session_with_segments(conn, session_id: int, user_id: str, columns: str):
+    """(session row or None, its final segments in order) in one transaction."""
+    session = conn.execute(
+        "SELECT * FROM sessions WHERE id = ? AND user_id = ?",
+        (session_id, user_id)
+    ).fetchone()
+    if not session:
+        return None, []
+    segments = conn.execute(
+        f"SELECT {columns} FROM segments WHERE session_id = ? AND is_partial = 0 ORDER BY start_time",
+        (session_id,)
+    ).fetchall()
+    return session, segments
+
+
 @app.get("/api/v1/vault/sessions")
 async def vault_list_sessions(
     limit: int = 50,
@@ -344,66 +350,54 @@ async def vault_list_sessions(
     user: dict = Depends(get_current_user)
 ):
     """List transcription sessions for the current user."""
-    with db_session() as conn:
-        rows = conn.execute("""
-            SELECT s.*,
-                   (SELECT text FROM segments WHERE session_id = s.id AND is_partial = 0
-                    ORDER BY start_time LIMIT 1) as preview
-            FROM sessions s
-            WHERE s.user_id = ?
-            ORDER BY s.started_at DESC
-            LIMIT ? OFFSET ?
-        """, (user["id"], limit, offset)).fetchall()
-        return [dict(r) for r in rows]
+    rows = await db.fetchall("""
+        SELECT s.*,
+               (SELECT text FROM segments WHERE session_id = s.id AND is_partial = 0
+                ORDER BY start_time LIMIT 1) as preview
+        FROM sessions s
+        WHERE s.user_id = ?
+        ORDER BY s.started_at DESC
+        LIMIT ? OFFSET ?
+    """, (user["id"], limit, offset))
+    return [dict(r) for r in rows]
 
 
 @app.get("/api/v1/vault/sessions/{session_id}")
 async def vault_get_session(session_id: int, user: dict = Depends(get_current_user)):
     """Get a session with all its segments."""
-    with db_session() as conn:
-        session = conn.execute(
-            "SELECT * FROM sessions WHERE id = ? AND user_id = ?",
-            (session_id, user["id"])
-        ).fetchone()
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        segments = conn.execute(
-            "SELECT * FROM segments WHERE session_id = ? AND is_partial = 0 ORDER BY start_time",
-            (session_id,)
-        ).fetchall()
-
-        result = dict(session)
-        result["segments"] = [dict(s) for s in segments]
-        return result
+    session, segments = await db.run(_session_with_segments, session_id, user["id"], "*")
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    result = dict(session)
+    result["segments"] = [dict(s) for s in segments]
+    return result
 
 
 @app.delete("/api/v1/vault/sessions/{session_id}")
 async def vault_delete_session(session_id: int, user: dict = Depends(get_current_user)):
     """Delete a transcription session."""
-    with db_session() as conn:
-        cursor = conn.execute(
-            "DELETE FROM sessions WHERE id = ? AND user_id = ?",
-            (session_id, user["id"])
-        )
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="Session not found")
-        return {"deleted": True}
+    cursor = await db.execute(
+        "DELETE FROM sessions WHERE id = ? AND user_id = ?",
+        (session_id, user["id"])
+    )
+    if cursor.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"deleted": True}
 
 
 @app.get("/api/v1/vault/search")
 async def vault_search(q: str = "", limit: int = 50, user: dict = Depends(get_current_user)):
     """Search transcripts for the current user."""
-    with db_session() as conn:
-        rows = conn.execute("""
-            SELECT seg.*, ses.started_at as session_date
-            FROM segments seg
-            JOIN sessions ses ON seg.session_id = ses.id
-            WHERE ses.user_id = ? AND seg.text LIKE ? AND seg.is_partial = 0
-            ORDER BY seg.created_at DESC
-            LIMIT ?
-        """, (user["id"], f"%{q}%", limit)).fetchall()
-        return [dict(r) for r in rows]
+    rows = await db.fetchall("""
+        SELECT seg.*, ses.started_at as session_date
+        FROM segments seg
+        JOIN sessions ses ON seg.session_id = ses.id
+        WHERE ses.user_id = ? AND seg.text LIKE ? AND seg.is_partial = 0
+        ORDER BY seg.created_at DESC
+        LIMIT ?
+    """, (user["id"], f"%{q}%", limit))
+    return [dict(r) for r in rows]
 
 
 @app.get("/api/v1/vault/sessions/{session_id}/export")
@@ -413,28 +407,19 @@ async def vault_export_session(
     user: dict = Depends(get_current_user)
 ):
     """Export a session as plain text or markdown."""
-    with db_session() as conn:
-        session = conn.execute(
-            "SELECT * FROM sessions WHERE id = ? AND user_id = ?",
-            (session_id, user["id"])
-        ).fetchone()
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        segments = conn.execute(
-            "SELECT text FROM segments WHERE session_id = ? AND is_partial = 0 ORDER BY start_time",
-            (session_id,)
-        ).fetchall()
-        
-        full_text = " ".join(s["text"] for s in segments)
-        
-        if fmt == "md":
-            started = session["started_at"] or "Unknown"
-            return {
-                "format": "md",
-                "text": f"# Transcription — {started}\n\n{full_text}\n"
-            }
-        return {"format": "txt", "text": full_text}
+    session, segments = await db.run(_session_with_segments, session_id, user["id"], "text")
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    full_text = " ".join(s["text"] for s in segments)
+
+    if fmt == "md":
+        started = session["started_at"] or "Unknown"
+        return {
+            "format": "md",
+            "text": f"# Transcription — {started}\n\n{full_text}\n"
+        }
+    return {"format": "txt", "text": full_text}
 
 
 # ═══════════════════════════════════
@@ -456,7 +441,9 @@ async def health_check():
         version="0.4.0",
         gpu_available=gpu_available,
         models_loaded=[],
-        active_connections=len(active_connections)
+        active_connections=len(active_connections),
+        batching=batch_scheduler.stats(),
+        jobs=await job_queue.stats()
     )
 
 
@@ -520,91 +507,157 @@ async def _llm_cleanup(raw_text: str) -> str:
     return text.strip()
 
 
+MAX_BATCH_BYTES = 100_000_000  # 100MB upload cap for batch transcription
+
+
+async def _decode_upload(request: Request):
+    """Decode the request body as it streams in: no temp files, no ffmpeg
+    subprocess, and never the whole upload in memory (see decoding.py).
+    None for an empty body."""
+    if int(request.headers.get("content-length") or 0) > MAX_BATCH_BYTES:
+        raise HTTPException(status_code=413, detail="Audio too large (100MB max)")
+    try:
+        audio = await decode_stream(request.stream(), max_bytes=MAX_BATCH_BYTES)
+    except AudioTooLarge:
+        raise HTTPException(status_code=413, detail="Audio too large (100MB max)")
+    except AudioDecodeError as e:
+        logger.error(f"Audio decoding failed: {e}")
+        raise HTTPException(status_code=422, detail="Audio format conversion failed. Ensure audio is valid.")
+    return audio if audio is not None and audio.size else None
+
+
+async def _transcribe_audio(audio: np.ndarray) -> dict:
+    """Full-quality transcription of decoded audio, plus LLM cleanup."""
+    # Transcribe with GPU model
+    model = await get_cloud_model()
+    loop = asyncio.get_event_loop()
+    segments_result, info = await loop.run_in_executor(
+        None, lambda: model.transcribe(
+            audio,
+            language="en",
+            beam_size=5,
+            best_of=5,
+            vad_filter=True,
+            condition_on_previous_text=True,
+            word_timestamps=True,
+            no_speech_threshold=0.6
+        )
+    )
+
+    # Collect all segments
+    full_segments = await loop.run_in_executor(None, lambda: list(segments_result))
+    raw_text = " ".join(seg.text.strip() for seg in full_segments if seg.text.strip())
+
+    # LLM cleanup pass
+    polished_text = await _llm_cleanup(raw_text)
+
+    return {
+        "text": polished_text,
+        "raw_text": raw_text,
+        "duration": info.duration,
+        "language": info.language,
+        "segments": [
+            {
+                "text": seg.text.strip(),
+                "start": seg.start,
+                "end": seg.end,
+                "words": [{"word": w.word, "start": w.start, "end": w.end} for w in (seg.words or [])]
+            }
+            for seg in full_segments if seg.text.strip()
+        ]
+    }
+
+
+EMPTY_RESULT = {"text": "", "raw_text": "", "duration": 0, "language": "en", "segments": []}
+
+
 @app.post("/api/v1/transcribe/batch")
 async def batch_transcribe(
     request: Request,
     user: dict = Depends(get_current_user)
 ):
     """
-    Batch transcription — upload complete audio, get polished text back.
+    Batch transcription: upload complete audio, get polished transcript.
     Supports up to 30 minutes of audio.
     Uses large-v3 on GPU + LLM cleanup for highest quality.
+
+    Holds the request open until the transcript is ready; long recordings
+    should use /api/v1/transcribe/jobs instead.
     """
-    # Get audio from request body
-    body = await request.body()
-    if len(body) > 100_000_000:  # 100MB max
-        raise HTTPException(status_code=413, detail="Audio too large (100MB max)")
-    if len(body) == 0:
-        return {"text": "", "raw_text": "", "duration": 0, "language": "en", "segments": []}
+    audio = await _decode_upload(request)
+    if audio is None:
+        return dict(EMPTY_RESULT)
+    try:
+        return await _transcribe_audio(audio)
+    except Exception as e:
+        logger.error(f"Batch transcription failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
-    # Save to temp file
-    import tempfile
-    import subprocess as _sp
-    with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as tmp:
-        tmp.write(body)
-        tmp_path = tmp.name
 
-    wav_path = tmp_path + '.wav'
+# ═══════════════════════════════════
+#  Transcription Jobs (queued batch — see jobs.py)
+# ═══════════════════════════════════
+
+JOBS_DIR = os.getenv("WINDY_CLOUD_JOBS_DIR", str(Path(DB_PATH).parent / "jobs"))
+
+
+job_queue = queue_from_env(db, _transcribe_audio, JOBS_DIR)
+
+
+@app.post("/api/v1/transcribe/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_transcription_job(
+    request: Request,
+    priority: str = "normal",
+    webhook_url: Optional[str] = None,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Queue a batch transcription and return its job id immediately.
+    Poll GET /api/v1/transcribe/jobs/{job_id}, or pass ?webhook_url= to
+    have the finished job POSTed there.
+    """
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=422, detail=f"priority must be one of: {', '.join(PRIORITIES)}")
+    if webhook_url is not None:
+        # Resolves the host, so off the event loop
+        error = await asyncio.get_running_loop().run_in_executor(None, webhook_url_error, webhook_url)
+        if error:
+            raise HTTPException(status_code=422, detail=error)
+    audio = await _decode_upload(request)
+    if audio is None:
+        raise HTTPException(status_code=400, detail="Empty audio body")
     try:
-        # Convert to WAV via ffmpeg
-        _sp.run([
-            'ffmpeg', '-y', '-i', tmp_path,
-            '-ar', '16000', '-ac', '1', '-c:a', 'pcm_s16le', wav_path
-        ], capture_output=True, check=True)
-
-        # Transcribe with GPU model
-        model = await get_cloud_model()
-        loop = asyncio.get_event_loop()
-        segments_result, info = await loop.run_in_executor(
-            None, lambda: model.transcribe(
-                wav_path,
-                language="en",
-                beam_size=5,
-                best_of=5,
-                vad_filter=True,
-                condition_on_previous_text=True,
-                word_timestamps=True,
-                no_speech_threshold=0.6
-            )
-        )
+        job = await job_queue.submit(user["id"], audio, priority=priority, webhook_url=webhook_url)
+    except QueueFull:
+        raise HTTPException(status_code=429, detail="Transcription queue is full, retry later")
+    job["status_url"] = f"/api/v1/transcribe/jobs/{job['job_id']}"
+    return job
 
-        # Collect all segments
-        full_segments = await loop.run_in_executor(None, lambda: list(segments_result))
-        raw_text = " ".join(seg.text.strip() for seg in full_segments if seg.text.strip())
 
-        # LLM cleanup pass
-        polished_text = await _llm_cleanup(raw_text)
+@app.get("/api/v1/transcribe/jobs")
+async def list_transcription_jobs(limit: int = 50, user: dict = Depends(get_current_user)):
+    """List the user's recent jobs (without results)."""
+    return {"jobs": await job_queue.list(user["id"], limit=min(max(limit, 1), 200))}
 
-        return {
-            "text": polished_text,
-            "raw_text": raw_text,
-            "duration": info.duration,
-            "language": info.language,
-            "segments": [
-                {
-                    "text": seg.text.strip(),
-                    "start": seg.start,
-                    "end": seg.end,
-                    "words": [{"word": w.word, "start": w.start, "end": w.end} for w in (seg.words or [])]
-                }
-                for seg in full_segments if seg.text.strip()
-            ]
-        }
-    except _sp.CalledProcessError as e:
-        logger.error(f"ffmpeg conversion failed: {e.stderr}")
-        raise HTTPException(status_code=422, detail="Audio format conversion failed. Ensure audio is valid.")
-    except Exception as e:
-        logger.error(f"Batch transcription failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        try:
-            os.unlink(wav_path)
-        except OSError:
-            pass
+
+@app.get("/api/v1/transcribe/jobs/{job_id}")
+async def get_transcription_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Job status; includes `result` (same shape as /transcribe/batch) once done."""
+    job = await job_queue.get(job_id, user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.delete("/api/v1/transcribe/jobs/{job_id}")
+async def delete_transcription_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Cancel a queued job, or delete a finished one. Running jobs can't be stopped."""
+    previous = await job_queue.cancel(job_id, user["id"])
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if previous == "running":
+        raise HTTPException(status_code=409, detail="Job is already running")
+    return {"cancelled" if previous == "queued" else "deleted": True, "job_id": job_id}
 
 
 # ═══════════════════════════════════
@@ -630,6 +683,11 @@ async def get_cloud_model():
     return _cloud_model
 
 
+# Buffers from all live connections are transcribed together in batches
+# (WINDY_CLOUD_BATCH_SIZE / WINDY_CLOUD_BATCH_WAIT_MS) — see batching.py
+batch_scheduler = scheduler_from_env(get_cloud_model)
+
+
 # ═══════════════════════════════════
 #  WebSocket Streaming (T9: path → /ws/transcribe)
 # ═══════════════════════════════════
@@ -645,41 +703,73 @@ CLOUD_AUDIO_CHUNK_THRESHOLD = 32000  # 1 second of audio
 MAX_AUDIO_FRAMES_PER_SECOND = 80
 
 
-async def _transcribe_buffer(buffer: bytearray, model, segment_start_time: float):
+async def _transcribe_buffer(buffer: bytearray, segment_start_time: float):
     """Transcribe an audio buffer and return segments.
     
     Deduplicates transcription logic used in both streaming and stop-flush paths.
+    The buffer is queued on the shared batch scheduler, so concurrent
+    connections share one batched model pass instead of one call each.
     
     Returns:
         List of segment dicts and total audio seconds processed.
     """
     int16_array = np.frombuffer(bytes(buffer), dtype=np.int16)
     float32_array = int16_array.astype(np.float32) / 32768.0
-    
-    loop = asyncio.get_event_loop()
-    segments_result, info = await loop.run_in_executor(
-        None, lambda: model.transcribe(
-            float32_array, language="en", beam_size=5, vad_filter=True,
-            condition_on_previous_text=False, initial_prompt="Clear English speech.",
-            no_speech_threshold=0.6, log_prob_threshold=-1.0
-        )
-    )
-    segments_list = await loop.run_in_executor(None, lambda: list(segments_result))
+
+    segments_list = await batch_scheduler.submit(float32_array)
     
     results = []
     for seg in segments_list:
-        if seg.text.strip():
-            results.append({
-                "type": "transcript",
-                "text": seg.text.strip(),
-                "start_time": segment_start_time + seg.start,
-                "end_time": segment_start_time + seg.end,
-                "is_partial": False
-            })
+        results.append({
+            "type": "transcript",
+            "text": seg["text"],
+            "start_time": segment_start_time + seg["start"],
+            "end_time": segment_start_time + seg["end"],
+            "is_partial": False
+        })
     
     audio_seconds = len(buffer) / (16000 * 2)  # 16kHz, 2 bytes per sample
     return results, audio_seconds
 
+
+# Live transcript segments are written in batches rather than per buffer
+SEGMENT_BATCH = int(os.getenv("WINDY_CLOUD_SEGMENT_BATCH", "20"))
+SEGMENT_FLUSH_S = float(os.getenv("WINDY_CLOUD_SEGMENT_FLUSH_S", "5"))
+
+
+class SegmentWriter:
+    """Buffers one live session's transcript segments and writes them in a
+    single executemany once SEGMENT_BATCH have collected or the oldest is
+    SEGMENT_FLUSH_S old; flush() writes whatever is left (stop, disconnect)."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self._pending: list = []
+        self._oldest = 0.0
+
+    async def add(self, results: list):
+        if not self.session_id or not results:
+            return
+        if not self._pending:
+            self._oldest = time.monotonic()
+        self._pending.extend(
+            (self.session_id, r["text"], r["start_time"], r["end_time"], 0.9) for r in results
+        )
+        if len(self._pending) >= SEGMENT_BATCH or time.monotonic() - self._oldest >= SEGMENT_FLUSH_S:
+            await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await db.executemany(
+                "INSERT INTO segments (session_id, text, start_time, end_time, confidence) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        except Exception as e:
+            logger.error(f"Could not save {len(rows)} segment(s) for session {self.session_id}: {e}")
+
 @app.websocket("/ws/transcribe")
 async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
     """
@@ -718,8 +808,7 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
                 user = decode_token(cmd["token"])
             elif cmd.get("email") and cmd.get("password"):
                 email = cmd["email"].lower()
-                with db_session() as conn:
-                    row = conn.execute("SELECT id, email, name, password_hash FROM users WHERE email = ?", (email,)).fetchone()
+                row = await db.fetchone("SELECT id, email, name, password_hash FROM users WHERE email = ?", (email,))
                 if not row or not verify_password(cmd["password"], row[3]):
                     await websocket.send_json({"type": "error", "message": "Invalid email or password"})
                     await websocket.close(code=4001, reason="Invalid credentials")
@@ -759,17 +848,16 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
     session_id = None
     if user:
         try:
-            conn = get_db()
-            cursor = conn.execute(
+            cursor = await db.execute(
                 "INSERT INTO sessions (user_id) VALUES (?)", (user["id"],)
             )
             session_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
         except Exception as e:
             logger.warning(f"Could not create DB session (non-fatal): {e}")
             session_id = None
 
+    segment_writer = SegmentWriter(session_id)
+
     # Audio accumulation buffer
     audio_buffer = bytearray()
     MAX_AUDIO_BUFFER_SIZE = 50 * 1024 * 1024  # 50MB max buffer size (M6)
@@ -817,43 +905,12 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
                 # When we have enough audio, transcribe
                 if len(audio_buffer) >= CLOUD_AUDIO_CHUNK_THRESHOLD:
                     try:
-                        model = await get_cloud_model()
-                        # Convert Int16 PCM bytes to float32 numpy array
-                        int16_array = np.frombuffer(bytes(audio_buffer), dtype=np.int16)
-                        float32_array = int16_array.astype(np.float32) / 32768.0
-
-                        # Run transcription in thread pool to avoid blocking
-                        loop = asyncio.get_event_loop()
-                        segments_result, info = await loop.run_in_executor(
-                            None, lambda: model.transcribe(
-                                float32_array, language="en", beam_size=5, vad_filter=True,
-                                condition_on_previous_text=False, initial_prompt="Clear English speech.",
-                                no_speech_threshold=0.6, log_prob_threshold=-1.0
-                            )
-                        )
-                        segments_list = await loop.run_in_executor(None, lambda: list(segments_result))
-
-                        for seg in segments_list:
-                            segment_data = {
-                                "type": "transcript",
-                                "text": seg.text.strip(),
-                                "start_time": segment_start_time + seg.start,
-                                "end_time": segment_start_time + seg.end,
-                                "is_partial": False
-                            }
+                        results, audio_seconds = await _transcribe_buffer(audio_buffer, segment_start_time)
+                        for segment_data in results:
                             await websocket.send_json(segment_data)
+                        await segment_writer.add(results)
 
-                            # Save to vault if we have a session
-                            if session_id and seg.text.strip():
-                                conn = get_db()
-                                conn.execute(
-                                    "INSERT INTO segments (session_id, text, start_time, end_time, confidence) VALUES (?, ?, ?, ?, ?)",
-                                    (session_id, seg.text.strip(), segment_start_time + seg.start, segment_start_time + seg.end, 0.9)
-                                )
-                                conn.commit()
-                                conn.close()
-
-                        total_audio_seconds += len(audio_buffer) / (16000 * 2)  # 16kHz, 2 bytes per sample
+                        total_audio_seconds += audio_seconds
                         segment_start_time = total_audio_seconds
                     except Exception as e:
                         logger.error(f"Transcription error: {e}")
@@ -884,35 +941,10 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
                         # Transcribe remaining buffer
                         if len(audio_buffer) > 0:
                             try:
-                                model = await get_cloud_model()
-                                int16_array = np.frombuffer(bytes(audio_buffer), dtype=np.int16)
-                                float32_array = int16_array.astype(np.float32) / 32768.0
-                                loop = asyncio.get_event_loop()
-                                segments_result, _ = await loop.run_in_executor(
-                                    None, lambda: model.transcribe(
-                                        float32_array, language="en", beam_size=5, vad_filter=True,
-                                        condition_on_previous_text=False, initial_prompt="Clear English speech.",
-                                        no_speech_threshold=0.6, log_prob_threshold=-1.0
-                                    )
-                                )
-                                segments_list = await loop.run_in_executor(None, lambda: list(segments_result))
-                                for seg in segments_list:
-                                    if seg.text.strip():
-                                        await websocket.send_json({
-                                            "type": "transcript",
-                                            "text": seg.text.strip(),
-                                            "start_time": segment_start_time + seg.start,
-                                            "end_time": segment_start_time + seg.end,
-                                            "is_partial": False
-                                        })
-                                        if session_id:
-                                            conn = get_db()
-                                            conn.execute(
-                                                "INSERT INTO segments (session_id, text, start_time, end_time, confidence) VALUES (?, ?, ?, ?, ?)",
-                                                (session_id, seg.text.strip(), segment_start_time + seg.start, segment_start_time + seg.end, 0.9)
-                                            )
-                                            conn.commit()
-                                            conn.close()
+                                results, _ = await _transcribe_buffer(audio_buffer, segment_start_time)
+                                for segment_data in results:
+                                    await websocket.send_json(segment_data)
+                                await segment_writer.add(results)
                             except Exception as e:
                                 logger.error(f"Final transcription error: {e}")
                             finally:
@@ -920,15 +952,13 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
 
                         # End session if authenticated
                         if session_id and user:
-                            conn = get_db()
-                            conn.execute("""
+                            await segment_writer.flush()
+                            await db.execute("""
                                 UPDATE sessions SET
                                     ended_at = datetime('now'),
                                     duration_s = (julianday(datetime('now')) - julianday(started_at)) * 86400
                                 WHERE id = ?
                             """, (session_id,))
-                            conn.commit()
-                            conn.close()
 
                         await websocket.send_json({
                             "type": "state", "state": "idle"
@@ -951,6 +981,7 @@ async def websocket_transcribe(websocket: WebSocket, token: str = Query(None)):
     except WebSocketDisconnect:
         pass
     finally:
+        await segment_writer.flush()
         active_connections.pop(connection_id, None)
         # Remove user session tracking
         user_id = user.get("id") if user else None
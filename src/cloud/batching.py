@@ -0,0 +1,216 @@
+"""
+Windy Word - Cloud Batch Scheduler
+Cross-connection batched inference for the /ws/transcribe endpoint.
+
+Every streaming connection used to call model.transcribe() on its own
+1-second buffer through run_in_executor, so N users meant N concurrent
+CTranslate2 calls fighting over the same cores. Instead, connections
+submit ready buffers here; one scheduler task gathers whatever is queued
+(up to max_batch_size, waiting at most max_wait_ms after the first
+arrival) and runs them as ONE batched encoder/decoder pass, then fans
+the segments back out to each caller.
+
+Latency bound per buffer: max_wait_ms + one batch's inference time
+(+ the batch ahead of it, if one is running).
+
+Per-batch occupancy (size / max_batch_size), queue wait and inference
+time are kept in a rolling window and exposed via stats() so CPU nodes
+can be sized from /health.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Decode options — same as the former per-connection transcribe call
+STREAM_DECODE_OPTIONS = dict(
+    language="en",
+    beam_size=5,
+    initial_prompt="Clear English speech.",
+    no_speech_threshold=0.6,
+    log_prob_threshold=-1.0,
+    without_timestamps=True,
+)
+
+
+def transcribe_batch(model, buffers: List[np.ndarray]) -> List[List[dict]]:
+    """Run one batched faster-whisper pass over independent audio buffers.
+
+    The buffers are laid end to end and handed to BatchedInferencePipeline
+    with one clip per speech region, so each becomes one row of the encoder
+    batch. Segment timestamps come back on the concatenated timeline and are
+    mapped back to (buffer index, buffer-relative time).
+    """
+    from faster_whisper import BatchedInferencePipeline
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    pipeline = getattr(model, "_windy_batched_pipeline", None)
+    if pipeline is None:
+        pipeline = BatchedInferencePipeline(model)
+        model._windy_batched_pipeline = pipeline
+
+    # vad_filter is ignored once clip_timestamps are given, so run VAD per
+    # buffer here and batch only the speech regions (same effect as the old
+    # per-connection vad_filter=True call)
+    offsets = []
+    clips = []
+    position = 0
+    for buf in buffers:
+        offsets.append(position / SAMPLE_RATE)
+        for speech in get_speech_timestamps(buf, VadOptions()):
+            clips.append({
+                "start": (position + speech["start"]) / SAMPLE_RATE,
+                "end": (position + speech["end"]) / SAMPLE_RATE,
+            })
+        position += buf.size
+
+    results: List[List[dict]] = [[] for _ in buffers]
+    if not clips:
+        return results
+    audio = np.concatenate(buffers) if len(buffers) > 1 else buffers[0]
+
+    segments, _info = pipeline.transcribe(
+        audio,
+        clip_timestamps=clips,
+        batch_size=len(clips),
+        **STREAM_DECODE_OPTIONS,
+    )
+
+    for seg in segments:
+        text = seg.text.strip()
+        if not text:
+            continue
+        idx = max(0, bisect_right(offsets, seg.start + 1e-3) - 1)
+        results[idx].append({
+            "text": text,
+            "start": max(0.0, seg.start - offsets[idx]),
+            "end": max(0.0, seg.end - offsets[idx]),
+        })
+    return results
+
+
+class BatchScheduler:
+    """Gathers buffers from all connections into bounded-latency batches."""
+
+    def __init__(
+        self,
+        get_model: Callable[[], Awaitable],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 50.0,
+        batch_fn: Callable = transcribe_batch,
+        history: int = 256,
+    ):
+        self._get_model = get_model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._batch_fn = batch_fn
+        # One inference thread: batches run back to back, never oversubscribed
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="windy-batch")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._recent = deque(maxlen=history)
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, audio: np.ndarray) -> List[dict]:
+        """Queue one float32 16 kHz buffer; resolves to its segments
+        (text/start/end, times relative to the buffer)."""
+        if audio.size == 0 or float(np.max(np.abs(audio))) < 0.001:
+            return []  # Silent buffer — don't spend a batch slot on it
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, future, time.monotonic()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Connections that went away while queued don't need a slot
+            batch = [item for item in batch if not item[1].done()]
+            if batch:
+                await self._dispatch(batch)
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        buffers = [audio for audio, _, _ in batch]
+        try:
+            model = await self._get_model()
+            results = await loop.run_in_executor(self._executor, self._batch_fn, model, buffers)
+        except Exception as e:
+            logger.error(f"Batched transcription failed ({len(batch)} buffers): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finished = time.monotonic()
+
+        for (_, future, _), segments in zip(batch, results):
+            if not future.done():
+                future.set_result(segments)
+
+        record = {
+            "size": len(batch),
+            "occupancy": round(len(batch) / self.max_batch_size, 3),
+            "max_queue_wait_ms": round(max(started - queued for _, _, queued in batch) * 1000, 1),
+            "inference_ms": round((finished - started) * 1000, 1),
+            "audio_s": round(sum(b.size for b in buffers) / SAMPLE_RATE, 2),
+        }
+        self._recent.append(record)
+        self.batches += 1
+        self.items += len(batch)
+        logger.debug(f"batch {self.batches}: {record}")
+
+    def stats(self) -> dict:
+        """Aggregate occupancy over the recent batch window."""
+        recent = list(self._recent)
+        sizes = [r["size"] for r in recent]
+        histogram = {str(n): sizes.count(n) for n in range(1, self.max_batch_size + 1) if n in sizes}
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "buffers": self.items,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "recent_batches": len(recent),
+            "avg_occupancy": round(sum(r["occupancy"] for r in recent) / len(recent), 3) if recent else 0.0,
+            "avg_inference_ms": round(sum(r["inference_ms"] for r in recent) / len(recent), 1) if recent else 0.0,
+            "max_queue_wait_ms": max((r["max_queue_wait_ms"] for r in recent), default=0.0),
+            "size_histogram": histogram,
+            "last_batch": recent[-1] if recent else None,
+        }
+
+
+def scheduler_from_env(get_model: Callable[[], Awaitable]) -> BatchScheduler:
+    """Build the scheduler from WINDY_CLOUD_BATCH_SIZE / WINDY_CLOUD_BATCH_WAIT_MS."""
+    return BatchScheduler(
+        get_model,
+        max_batch_size=int(os.getenv("WINDY_CLOUD_BATCH_SIZE", "8")),
+        max_wait_ms=float(os.getenv("WINDY_CLOUD_BATCH_WAIT_MS", "50")),
+    )
@@ -0,0 +1,358 @@
+"""
+Windy Word - Cloud Benchmarks
+Benchmarks for the cloud API's per-request work.
+
+Usage:
+    python -m src.cloud.benchmark decode [--minutes 1,10,30] [--formats webm,m4a]
+        [--chunk-kb 64] [--json out.json]
+    python -m src.cloud.benchmark db [--ops 5000] [--concurrency 1,16] [--json out.json]
+
+Benchmarks:
+    decode  Upload decoding for /api/v1/transcribe/batch. For each
+            synthetic upload (a MediaRecorder-style mono recording encoded
+            with PyAV) and each implementation, one fresh process takes
+            the body from "request arrives" to the float32 array the model
+            is handed:
+                ffmpeg-subprocess  request.body() -> temp file -> ffmpeg
+                                   -> temp WAV -> decode (the old endpoint;
+                                   needs ffmpeg on PATH)
+                pyav-stream        body chunks -> decode_stream (the new one)
+            Reported per upload: latency, peak RSS above the process
+            baseline (ffmpeg's own peak separately), and temp bytes
+            written. The model call that follows is not included.
+    db      SQLite access as the API does it, against a seeded copy of the
+            real schema (api.init_db): a connection opened per call with
+            its PRAGMAs, run on the event loop (the old get_db()) vs
+            db.Database, for a login lookup, a vault session read and live
+            segment writes (one insert per transcribed buffer vs
+            SegmentWriter batches). Reported per workload and concurrency:
+            ops/s, p50/p99 latency, and the longest event loop stall.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .decoding import AV_AVAILABLE, decode_file, decode_stream
+
+if AV_AVAILABLE:
+    import av
+
+FORMATS = {  # name -> (container, codec, suffix)
+    "webm": ("webm", "libopus", ".webm"),
+    "ogg": ("ogg", "libopus", ".ogg"),
+    "m4a": ("mp4", "aac", ".m4a"),
+    "mp3": ("mp3", "libmp3lame", ".mp3"),
+    "wav": ("wav", "pcm_s16le", ".wav"),
+}
+
+
+def synth_upload(path: Path, minutes: float, fmt: str, rate: int = 48000, seed: int = 0):
+    """Write a speech-like mono recording (noise bursts and pauses) in fmt."""
+    container_fmt, codec, _suffix = FORMATS[fmt]
+    rng = np.random.default_rng(seed)
+    frame = 960  # 20 ms at 48 kHz, as MediaRecorder emits
+    with av.open(str(path), "w", format=container_fmt) as container:
+        stream = container.add_stream(codec, rate=rate)
+        stream.layout = "mono"
+        for i in range(int(minutes * 60 * rate / frame)):
+            # ~2 s phrases with ~0.4 s pauses
+            loud = (i % 120) < 100
+            pcm = (rng.standard_normal(frame) * (3000 if loud else 30)).astype(np.int16)
+            out = av.AudioFrame.from_ndarray(pcm[None, :], format="s16", layout="mono")
+            out.rate = rate
+            out.pts = i * frame
+            for packet in stream.encode(out):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return _maxrss(resource.RUSAGE_SELF)
+
+
+def _maxrss(who) -> int:
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _legacy(path: Path, chunk: int) -> tuple:
+    """The old endpoint: whole body in memory, two temp files, ffmpeg."""
+    body = Path(path).read_bytes()  # request.body()
+    with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
+        tmp.write(body)
+        tmp_path = tmp.name
+    wav_path = tmp_path + ".wav"
+    try:
+        subprocess.run(["ffmpeg", "-y", "-i", tmp_path, "-ar", "16000", "-ac", "1",
+                        "-c:a", "pcm_s16le", wav_path], capture_output=True, check=True)
+        temp_bytes = len(body) + os.path.getsize(wav_path)
+        return decode_file(wav_path), temp_bytes
+    finally:
+        for p in (tmp_path, wav_path):
+            try:
+                os.unlink(p)
+            except OSError:
+                pass
+
+
+def _streamed(path: Path, chunk: int) -> tuple:
+    """The new endpoint: decode_stream over the body as it arrives."""
+    async def body():
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(chunk)
+                if not data:
+                    return
+                yield data
+                await asyncio.sleep(0)  # Let the decoder thread interleave, as on a socket
+
+    return asyncio.run(decode_stream(body(), max_bytes=1 << 40)), 0
+
+
+IMPLS = {"ffmpeg-subprocess": _legacy, "pyav-stream": _streamed}
+
+
+def _child(impl: str, path: str, chunk: int, out):
+    baseline = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        audio, temp_bytes = IMPLS[impl](Path(path), chunk)
+    except Exception as e:
+        out.put({"error": f"{type(e).__name__}: {e}"[:200]})
+        return
+    elapsed = time.perf_counter() - start
+    out.put({
+        "latency_ms": round(elapsed * 1000, 1),
+        "audio_s": round(audio.size / 16000, 1),
+        "peak_rss_mb": round((_maxrss(resource.RUSAGE_SELF) - baseline) / 1048576, 1),
+        "child_peak_rss_mb": round(_maxrss(resource.RUSAGE_CHILDREN) / 1048576, 1),
+        "temp_mb": round(temp_bytes / 1048576, 1),
+    })
+
+
+def bench_decode(minutes_list, formats, chunk_kb: int = 64) -> list:
+    """One row per (upload, implementation), each measured in a fresh process."""
+    if not AV_AVAILABLE:
+        raise SystemExit("PyAV is required: pip install av")
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            for minutes in minutes_list:
+                path = Path(tmp) / f"upload-{minutes}m{FORMATS[fmt][2]}"
+                synth_upload(path, minutes, fmt)
+                for impl in IMPLS:
+                    row = {"format": fmt, "minutes": minutes,
+                           "upload_mb": round(path.stat().st_size / 1048576, 1), "impl": impl}
+                    if impl == "ffmpeg-subprocess" and shutil.which("ffmpeg") is None:
+                        rows.append({**row, "error": "ffmpeg not on PATH"})
+                        continue
+                    out = ctx.Queue()
+                    proc = ctx.Process(target=_child, args=(impl, str(path), chunk_kb * 1024, out))
+                    proc.start()
+                    result = out.get()
+                    proc.join()
+                    rows.append({**row, **result})
+    return rows
+
+
+def _legacy_connect(path: str) -> sqlite3.Connection:
+    """The old api.get_db(): a new connection and its PRAGMAs per call."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _legacy_call(path: str, fn, *args):
+    conn = _legacy_connect(path)
+    try:
+        result = fn(conn, *args)
+        conn.commit()
+        return result
+    finally:
+        conn.close()
+
+
+async def _loop_stall(stop: asyncio.Event, out: list):
+    """Longest gap between 1 ms ticks while the workload runs."""
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    last = loop.time()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = loop.time()
+        worst = max(worst, now - last - 0.001)
+        last = now
+    out.append(worst)
+
+
+def bench_db(ops: int = 5000, concurrency_list=(1, 16), sessions: int = 50,
+             segments_per_session: int = 200) -> list:
+    """One row per (workload, implementation, concurrency). Needs a process
+    that hasn't imported the API yet (api.db binds its path on import)."""
+    if f"{__package__}.api" in sys.modules:
+        raise RuntimeError("bench_db must run before the cloud API is imported")
+    tmp = tempfile.mkdtemp(prefix="windy-db-bench-")
+    os.environ["WINDY_CLOUD_DB"] = os.path.join(tmp, "cloud.db")
+    os.environ.setdefault("WINDY_JWT_SECRET", "benchmark-only-secret")
+    os.environ.setdefault("WINDY_API_KEY", "benchmark-only-key")
+    from . import api  # Binds api.db to the temp path above
+
+    path = api.DB_PATH
+    api.init_db()
+    with api.db.session() as conn:
+        conn.execute("INSERT INTO users (id, email, name, password_hash) VALUES ('u', 'u@bench', 'U', 'x')")
+        for s in range(sessions):
+            session_id = conn.execute("INSERT INTO sessions (user_id) VALUES ('u')").lastrowid
+            conn.executemany(
+                "INSERT INTO segments (session_id, text, start_time, end_time) VALUES (?, ?, ?, ?)",
+                [(session_id, f"segment {i} of session {s}", float(i), i + 1.0) for i in range(segments_per_session)],
+            )
+        live_session = conn.execute("INSERT INTO sessions (user_id) VALUES ('u')").lastrowid
+
+    def login(conn):
+        return conn.execute("SELECT id, email, name, password_hash FROM users WHERE email = ?",
+                            ("u@bench",)).fetchone()
+
+    def session_read(conn, n):
+        return api._session_with_segments(conn, n % sessions + 1, "u", "*")
+
+    def segment_insert(conn, n):
+        conn.execute("INSERT INTO segments (session_id, text, start_time, end_time, confidence) "
+                     "VALUES (?, ?, ?, ?, ?)", (live_session, f"live {n}", float(n), n + 1.0, 0.9))
+
+    segment = lambda n: [{"text": f"live {n}", "start_time": float(n), "end_time": n + 1.0}]
+
+    async def legacy(workload, n):
+        if workload == "login":
+            _legacy_call(path, login)
+        elif workload == "session_read":
+            _legacy_call(path, session_read, n)
+        else:
+            _legacy_call(path, segment_insert, n)
+
+    async def pooled(workload, n, writer):
+        if workload == "login":
+            await api.db.run(login)
+        elif workload == "session_read":
+            await api.db.run(session_read, n)
+        else:
+            await writer.add(segment(n))
+
+    async def run(workload, impl, concurrency):
+        latencies = []
+        stop, stall = asyncio.Event(), []
+        ticker = asyncio.get_running_loop().create_task(_loop_stall(stop, stall))
+
+        async def client(c):
+            writer = api.SegmentWriter(live_session)
+            for n in range(c, ops, concurrency):
+                t0 = time.perf_counter()
+                if impl == "per-call-connection":
+                    await legacy(workload, n)
+                    await asyncio.sleep(0)  # The endpoint's other awaits
+                else:
+                    await pooled(workload, n, writer)
+                latencies.append(time.perf_counter() - t0)
+            await writer.flush()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(c) for c in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await ticker
+        latencies.sort()
+        return {
+            "ops_per_s": round(ops / elapsed),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+            "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+            "max_loop_stall_ms": round(stall[0] * 1000, 1),
+        }
+
+    rows = []
+    try:
+        for workload in ("login", "session_read", "segment_write"):
+            for concurrency in concurrency_list:
+                for impl in ("per-call-connection", "pooled"):
+                    result = asyncio.run(run(workload, impl, concurrency))
+                    rows.append({"workload": workload, "concurrency": concurrency, "impl": impl, **result})
+        rows.append({"workload": "all", "impl": "pooled", "connections_opened": api.db.open_connections})
+    finally:
+        api.db.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return rows
+
+
+def _print_table(rows: list):
+    if not rows:
+        return
+    cols = list(rows[0].keys())
+    for r in rows:
+        cols += [c for c in r if c not in cols]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    print("  ".join("-" * widths[c] for c in cols))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols))
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", dest="json_path", default=None, help="Also write results to this JSON file")
+
+    parser = argparse.ArgumentParser(description="Windy Word cloud API benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_decode = sub.add_parser("decode", parents=[common],
+                              help="Batch upload decoding: ffmpeg subprocess vs streaming PyAV")
+    p_decode.add_argument("--minutes", default="1,10,30", help="Comma-separated recording lengths")
+    p_decode.add_argument("--formats", default="webm,m4a", help=f"Comma-separated: {', '.join(FORMATS)}")
+    p_decode.add_argument("--chunk-kb", type=int, default=64, help="Body chunk size for the streamed path")
+
+    p_db = sub.add_parser("db", parents=[common],
+                          help="SQLite access: connection per call vs pooled Database")
+    p_db.add_argument("--ops", type=int, default=5000, help="Operations per workload and concurrency")
+    p_db.add_argument("--concurrency", default="1,16", help="Comma-separated concurrent clients")
+
+    args = parser.parse_args(argv)
+
+    if args.bench == "decode":
+        rows = bench_decode([float(m) for m in args.minutes.split(",")],
+                            [f.strip() for f in args.formats.split(",")], args.chunk_kb)
+    elif args.bench == "db":
+        rows = bench_db(args.ops, [int(c) for c in args.concurrency.split(",")])
+
+    print("=" * 70)
+    print(f"WINDY WORD CLOUD BENCHMARK — {args.bench}")
+    print("=" * 70)
+    _print_table(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"bench": args.bench, "results": rows}, f, indent=2)
+        print(f"\nResults saved to: {args.json_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
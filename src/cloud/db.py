@@ -0,0 +1,107 @@
+"""
+Windy Word - Cloud Database
+Pooled, thread-affine SQLite access for the cloud API.
+
+get_db() used to open a new sqlite3 connection for every request (and
+for every transcribed second on /ws/transcribe), re-running the WAL and
+foreign_keys PRAGMAs each time, and every query ran on the event loop.
+Database pays those costs once per thread instead of once per call:
+
+- Each thread lazily opens one connection and keeps it, so the PRAGMAs
+  run once and sqlite3's per-connection statement cache
+  (cached_statements) keeps the API's fixed set of queries prepared.
+  A connection is only ever used by the thread that opened it.
+- run(fn, *args) calls fn(conn, *args) in a transaction on a small
+  dedicated thread pool (one connection per pool thread), so async
+  endpoints await the DB instead of blocking the loop. fetchall(),
+  fetchone() and execute() cover the one-statement cases.
+- session() is the same transaction on the calling thread, for sync
+  callers (startup, scripts).
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+class Database:
+    """Per-thread SQLite connections plus a thread pool to run queries on."""
+
+    def __init__(self, path: str, workers: int = 4, cached_statements: int = 256):
+        self.path = path
+        self.workers = max(1, workers)
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="windy-db")
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from any
+            # thread; thread affinity comes from self._local
+            conn = sqlite3.connect(self.path, check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+            conn.row_factory = sqlite3.Row
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def session(self):
+        """The calling thread's connection, committed on success and
+        rolled back on error."""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _call(self, fn: Callable, args: tuple):
+        with self.session() as conn:
+            return fn(conn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """fn(conn, *args) in one transaction on a DB pool thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+
+    async def fetchall(self, sql: str, params=()) -> List[sqlite3.Row]:
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params=()) -> Optional[sqlite3.Row]:
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Run one write; the cursor's rowcount and lastrowid stay readable."""
+        return await self.run(lambda conn: conn.execute(sql, params))
+
+    async def executemany(self, sql: str, rows) -> int:
+        return await self.run(lambda conn: conn.executemany(sql, rows).rowcount)
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._connections)
+
+    def close(self):
+        """Stop the pool and close every connection (the Database is unusable after)."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,191 @@
+"""
+Windy Word - Cloud Audio Decoding
+In-process decoding of uploaded audio for /api/v1/transcribe/batch.
+
+The endpoint used to read the whole body (up to 100 MB) into memory,
+write it to a temp .webm, run an ffmpeg subprocess to write a second
+temp WAV, and hand that path to the model. Now the request stream goes
+straight into PyAV (the decoder faster-whisper itself uses) on a worker
+thread, and comes out as one 16 kHz float32 array:
+
+- Body chunks go through a bounded queue, so at most QUEUE_CHUNKS
+  chunks of compressed audio are held at a time. A slow decoder applies
+  backpressure to the upload instead of buffering it.
+- Decoded audio is kept as int16 and converted once at the end into a
+  preallocated float32 array. There are no temp files and no subprocess.
+- Streamable containers (WebM/Opus from MediaRecorder, Ogg, WAV, MP3,
+  FLAC) are decoded as they arrive. MP4/M4A needs its index, which is
+  often at the end of the file, so those bodies are spooled first: in
+  memory up to SPOOL_MEMORY_BYTES, on disk past that.
+"""
+
+import asyncio
+import queue
+import tempfile
+from typing import AsyncIterator, List, Optional
+
+import numpy as np
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+    av = None
+
+SAMPLE_RATE = 16000
+QUEUE_CHUNKS = 64                       # Compressed chunks in flight (~4 MB at 64 KB each)
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024    # MP4 bodies beyond this spool to disk
+
+
+class AudioTooLarge(Exception):
+    """The body went past max_bytes."""
+
+
+class AudioDecodeError(Exception):
+    """The body isn't audio PyAV can decode."""
+
+
+class _ChunkReader:
+    """File-like reader over body chunks put() from the event loop, for
+    PyAV's custom IO. Not seekable."""
+
+    def __init__(self, maxsize: int = QUEUE_CHUNKS):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._buffer = b""
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer and not self._eof:
+            item = self.queue.get()
+            if item is None:
+                self._eof = True
+            else:
+                self._buffer = item
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def drain(self):
+        """Drop queued chunks and end the stream (upload abandoned)."""
+        self._eof = True
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def _is_mp4(head: bytes) -> bool:
+    """ISO-BMFF (MP4, M4A, MOV, 3GP): a box size, then 'ftyp'."""
+    return len(head) >= 8 and head[4:8] == b"ftyp"
+
+
+def decode_file(source, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode a path or readable file object to float32 mono at sample_rate."""
+    if not AV_AVAILABLE:
+        raise AudioDecodeError("PyAV is not installed")
+    chunks: List[np.ndarray] = []
+    try:
+        with av.open(source, mode="r", metadata_errors="ignore") as container:
+            if not container.streams.audio:
+                raise AudioDecodeError("no audio stream")
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+            for frame in container.decode(audio=0):
+                frame.pts = None  # Let the resampler keep its own timeline
+                for out in resampler.resample(frame):
+                    chunks.append(out.to_ndarray().reshape(-1))
+            for out in resampler.resample(None):
+                chunks.append(out.to_ndarray().reshape(-1))
+    except AudioDecodeError:
+        raise
+    except Exception as e:  # av.error.* — bad or truncated input
+        raise AudioDecodeError(str(e)) from e
+    return _to_float32(chunks)
+
+
+def _to_float32(chunks: List[np.ndarray]) -> np.ndarray:
+    """int16 chunks -> one float32 array, allocated once."""
+    audio = np.empty(sum(c.size for c in chunks), dtype=np.float32)
+    pos = 0
+    chunks.reverse()
+    while chunks:  # Free each int16 chunk as soon as it's copied
+        chunk = chunks.pop()
+        audio[pos:pos + chunk.size] = chunk
+        pos += chunk.size
+    audio *= np.float32(1.0 / 32768.0)
+    return audio
+
+
+async def decode_stream(stream: AsyncIterator[bytes], max_bytes: int,
+                        sample_rate: int = SAMPLE_RATE) -> Optional[np.ndarray]:
+    """Decode an async byte stream (e.g. Request.stream()) while it arrives.
+
+    Returns None for an empty body. Raises AudioTooLarge once more than
+    max_bytes have arrived, and AudioDecodeError for undecodable input.
+    """
+    loop = asyncio.get_running_loop()
+    reader: Optional[_ChunkReader] = None
+    spool = None
+    decoding = None
+    head = b""
+    received = 0
+    try:
+        async for chunk in stream:
+            if not chunk:
+                continue
+            received += len(chunk)
+            if received > max_bytes:
+                raise AudioTooLarge(f"body over {max_bytes} bytes")
+            if reader is None and spool is None:
+                head += chunk
+                if len(head) < 8:
+                    continue
+                chunk, head = head, b""
+                if _is_mp4(chunk):
+                    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+                else:
+                    reader = _ChunkReader()
+                    decoding = loop.run_in_executor(None, decode_file, reader, sample_rate)
+            if spool is not None:
+                spool.write(chunk)
+                continue
+            if not await _put(reader, decoding, chunk):
+                break  # Decoder failed; its error is raised below
+
+        if spool is not None:
+            spool.seek(0)
+            return await loop.run_in_executor(None, decode_file, spool, sample_rate)
+        if reader is None:
+            if not head:
+                return None
+            reader = _ChunkReader()
+            reader.queue.put(head)
+            decoding = loop.run_in_executor(None, decode_file, reader, sample_rate)
+        await _put(reader, decoding, None)
+        return await decoding
+    finally:
+        if spool is not None:
+            spool.close()
+        if decoding is not None and not decoding.done():
+            # Stopped early (too large, client gone): let the decoder finish
+            reader.drain()
+            reader.queue.put_nowait(None)
+            try:
+                await decoding
+            except Exception:
+                pass
+
+
+async def _put(reader: _ChunkReader, decoding, item) -> bool:
+    """Queue item for the decoder, waiting while the queue is full.
+    False if the decoder stopped (so nothing will ever make room)."""
+    while True:
+        try:
+            reader.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            if decoding.done():
+                return False
+            await asyncio.sleep(0.005)
@@ -0,0 +1,426 @@
+"""
+Windy Word - Cloud Transcription Jobs
+Queued batch transcription for /api/v1/transcribe/jobs.
+
+/api/v1/transcribe/batch holds the request open for the whole job (up
+to 30 minutes of audio plus a 30 s LLM cleanup), tying up a server
+worker and running into proxy timeouts. Jobs decouple the two: the
+upload is decoded and stored, the POST returns a job id at once, and
+a bounded pool works through the queue:
+
+- State lives in the cloud SQLite DB (the `jobs` table, JOBS_SCHEMA,
+  through db.Database) and the decoded audio sits next to it as int16
+  PCM, so queued jobs survive a restart. Jobs that were running when the process died are
+  queued again on start().
+- At most `workers` jobs run at once, at most `per_user` of them for
+  one user, so one account's backlog can't starve everyone else.
+  Queued jobs run by priority (high, normal, low), then arrival order.
+- At most `max_queued` jobs wait at a time; submit() raises QueueFull
+  past that (HTTP 429).
+- Clients poll get(), or pass a webhook URL that gets the finished job
+  POSTed to it (retried with backoff, signed with WINDY_WEBHOOK_SECRET
+  when set). Undelivered webhooks are retried after a restart too.
+  Webhook hosts must resolve to public addresses — loopback, private,
+  link-local and reserved ranges are refused at submit and again on
+  each delivery, and redirects aren't followed — unless the host is
+  listed in WINDY_WEBHOOK_ALLOW_HOSTS (comma-separated; for local
+  receivers in development).
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .db import Database
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+FINISHED = ("done", "failed", "cancelled")
+
+JOBS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        priority INTEGER NOT NULL DEFAULT 1,
+        audio_path TEXT,
+        audio_s REAL DEFAULT 0,
+        webhook_url TEXT,
+        webhook_status TEXT,
+        result TEXT,
+        error TEXT,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        started_at TEXT,
+        finished_at TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority);
+    CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id);
+"""
+
+
+class QueueFull(Exception):
+    """max_queued jobs are already waiting."""
+
+
+class UnsafeWebhook(ValueError):
+    """The webhook URL points somewhere the server must not POST to."""
+
+
+def _blocked_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])  # Drop an IPv6 scope id
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return (ip.is_loopback or ip.is_private or ip.is_link_local or ip.is_reserved
+            or ip.is_multicast or ip.is_unspecified)
+
+
+def webhook_url_error(url: str) -> Optional[str]:
+    """Why url can't be a webhook target, or None if it can.
+
+    Resolves the host (blocking): every address it resolves to must be
+    public, unless the host is in WINDY_WEBHOOK_ALLOW_HOSTS.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return "webhook_url must be an http(s) URL"
+    host = parsed.hostname.lower()
+    allowed = {h.strip().lower() for h in os.getenv("WINDY_WEBHOOK_ALLOW_HOSTS", "").split(",") if h.strip()}
+    if host in allowed:
+        return None
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except (ValueError, UnicodeError, OSError):
+        return f"webhook_url host {host} can't be resolved"
+    if any(_blocked_address(info[4][0]) for info in infos):
+        return f"webhook_url host {host} is not a public address"
+    return None
+
+
+def _sign(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """A 3xx is the receiver's answer, not somewhere else to POST to."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _post_json(url: str, body: bytes, headers: dict, timeout: float) -> int:
+    # Checked on every attempt: the host may resolve differently by now
+    error = webhook_url_error(url)
+    if error:
+        raise UnsafeWebhook(error)
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with _opener.open(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+class JobQueue:
+    """Persistent, prioritised batch transcription queue with a bounded
+    worker pool. `run` turns one job's float32 16 kHz audio into its
+    result dict."""
+
+    webhook_attempts = 3
+    webhook_backoff_s = 2.0   # Doubles per attempt
+    webhook_timeout_s = 10.0
+
+    def __init__(
+        self,
+        db: Database,
+        run: Callable[[np.ndarray], Awaitable[dict]],
+        audio_dir: str,
+        workers: int = 2,
+        per_user: int = 1,
+        max_queued: int = 100,
+        webhook_secret: Optional[str] = None,
+    ):
+        self._db = db
+        self._run = run
+        self.audio_dir = audio_dir
+        self.workers = max(1, workers)
+        self.per_user = max(1, per_user)
+        self.max_queued = max_queued
+        self.webhook_secret = webhook_secret
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._claim_lock: Optional[asyncio.Lock] = None
+        self._running: Dict[str, str] = {}  # job id -> user id
+        self._tasks: set = set()
+        self.completed = 0
+        self.failed = 0
+
+    # ── DB helpers ───────────────────────────────
+
+    async def _query(self, sql: str, params=()) -> list:
+        return await self._db.fetchall(sql, params)
+
+    async def _update(self, sql: str, params=()) -> int:
+        return (await self._db.execute(sql, params)).rowcount
+
+    # ── Lifecycle ────────────────────────────────
+
+    async def start(self):
+        """Bind to the running loop, requeue jobs orphaned by a previous
+        process (or loop), and start working. Idempotent."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._claim_lock = asyncio.Lock()
+        self._running.clear()
+        self._tasks.clear()
+        async with self._claim_lock:  # No claims until orphans are requeued
+            requeued = await self._update(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'")
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted transcription job(s)")
+        await self._fill()
+        for row in await self._query(
+            "SELECT * FROM jobs WHERE webhook_url IS NOT NULL AND webhook_status IS NULL "
+            "AND status IN ('done', 'failed')"
+        ):
+            self._spawn(self._deliver(row["id"]))
+
+    async def stop(self):
+        """Cancel in-flight work; running jobs are requeued on the next start()."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ── Client API ───────────────────────────────
+
+    async def submit(self, user_id: str, audio: np.ndarray, priority: str = "normal",
+                     webhook_url: Optional[str] = None) -> dict:
+        """Store the audio and queue a job. Raises QueueFull."""
+        await self.start()
+        if (await self._query("SELECT COUNT(*) FROM jobs WHERE status = 'queued'"))[0][0] >= self.max_queued:
+            raise QueueFull(f"{self.max_queued} jobs already queued")
+        job_id = uuid.uuid4().hex
+        audio_path = os.path.join(self.audio_dir, f"{job_id}.pcm")
+        await asyncio.get_running_loop().run_in_executor(None, self._write_audio, audio, audio_path)
+        await self._update(
+            "INSERT INTO jobs (id, user_id, priority, audio_path, audio_s, webhook_url) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, user_id, PRIORITIES[priority], audio_path, round(audio.size / 16000, 2), webhook_url),
+        )
+        await self._fill()
+        return await self.get(job_id, user_id)
+
+    def _write_audio(self, audio: np.ndarray, path: str):
+        os.makedirs(self.audio_dir, exist_ok=True)
+        np.clip(audio * 32768.0, -32768, 32767).astype("<i2").tofile(path)
+
+    async def get(self, job_id: str, user_id: Optional[str] = None) -> Optional[dict]:
+        """The job as clients see it (None if missing or not user_id's)."""
+        rows = await self._query("SELECT rowid, * FROM jobs WHERE id = ?", (job_id,))
+        if not rows or (user_id is not None and rows[0]["user_id"] != user_id):
+            return None
+        job = self._public(rows[0])
+        if job["status"] == "queued":
+            ahead = await self._query(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                "(priority < ? OR (priority = ? AND rowid < ?))",
+                (rows[0]["priority"], rows[0]["priority"], rows[0]["rowid"]),
+            )
+            job["queue_position"] = ahead[0][0] + 1
+        return job
+
+    async def list(self, user_id: str, limit: int = 50) -> List[dict]:
+        """A user's most recent jobs, without results."""
+        rows = await self._query(
+            "SELECT * FROM jobs WHERE user_id = ? ORDER BY rowid DESC LIMIT ?", (user_id, limit)
+        )
+        return [self._public(row, with_result=False) for row in rows]
+
+    async def cancel(self, job_id: str, user_id: str) -> Optional[str]:
+        """Cancel a queued job, or forget a finished one. Returns the
+        status it had, or None if there's no such job. Running jobs are
+        left alone (the caller gets 'running' back)."""
+        rows = await self._query("SELECT * FROM jobs WHERE id = ? AND user_id = ?", (job_id, user_id))
+        if not rows:
+            return None
+        status = rows[0]["status"]
+        if status == "queued":
+            if not await self._update("UPDATE jobs SET status = 'cancelled', finished_at = datetime('now') "
+                                      "WHERE id = ? AND status = 'queued'", (job_id,)):
+                return "running"  # Claimed between the two statements
+            self._remove_audio(rows[0]["audio_path"])
+        elif status in FINISHED:
+            await self._update("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return status
+
+    async def stats(self) -> dict:
+        counts = {row[0]: row[1] for row in await self._query(
+            "SELECT status, COUNT(*) FROM jobs WHERE status IN ('queued', 'running') GROUP BY status")}
+        return {
+            "workers": self.workers,
+            "per_user": self.per_user,
+            "max_queued": self.max_queued,
+            "queued": counts.get("queued", 0),
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    @staticmethod
+    def _public(row, with_result: bool = True) -> dict:
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "priority": next(k for k, v in PRIORITIES.items() if v == row["priority"]),
+            "audio_s": row["audio_s"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+        if row["webhook_url"]:
+            job["webhook_status"] = row["webhook_status"]
+        if row["error"]:
+            job["error"] = row["error"]
+        if with_result and row["result"]:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    # ── Workers ──────────────────────────────────
+
+    async def _fill(self):
+        """Start queued jobs while there are free workers, by priority,
+        skipping users already at their per_user limit."""
+        async with self._claim_lock:  # One claimer at a time, or limits overshoot
+            while len(self._running) < self.workers:
+                busy = [u for u, n in Counter(self._running.values()).items() if n >= self.per_user]
+                exclude = f"AND user_id NOT IN ({','.join('?' * len(busy))})" if busy else ""
+                rows = await self._query(
+                    f"SELECT id, user_id FROM jobs WHERE status = 'queued' {exclude} "
+                    "ORDER BY priority, rowid LIMIT 1", busy)
+                if not rows:
+                    return
+                job_id, user_id = rows[0]["id"], rows[0]["user_id"]
+                if not await self._update("UPDATE jobs SET status = 'running', started_at = datetime('now') "
+                                          "WHERE id = ? AND status = 'queued'", (job_id,)):
+                    continue  # Cancelled in the meantime
+                self._running[job_id] = user_id
+                self._spawn(self._execute(job_id))
+
+    async def _execute(self, job_id: str):
+        row = (await self._query("SELECT * FROM jobs WHERE id = ?", (job_id,)))[0]
+        loop = asyncio.get_running_loop()
+        try:
+            pcm = await loop.run_in_executor(None, np.fromfile, row["audio_path"], "<i2")
+            audio = pcm.astype(np.float32) / 32768.0
+            result = await self._run(audio)
+        except asyncio.CancelledError:
+            self._running.pop(job_id, None)
+            raise  # Shutting down: left 'running', requeued on the next start()
+        except Exception as e:
+            logger.error(f"Transcription job {job_id} failed: {e}")
+            self.failed += 1
+            status, fields = "failed", {"error": str(e) or type(e).__name__}
+        else:
+            self.completed += 1
+            status, fields = "done", {"result": json.dumps(result)}
+        recorded = False
+        try:
+            await self._finish(job_id, status, **fields)
+            recorded = True
+        except Exception as e:
+            # The row stays 'running' until the next start() requeues (and,
+            # its audio gone, fails) it; the worker slot and audio must not leak
+            logger.error(f"Could not record job {job_id} as {status}: {e}")
+        finally:
+            self._running.pop(job_id, None)
+            self._remove_audio(row["audio_path"])
+        if recorded and row["webhook_url"]:
+            self._spawn(self._deliver(job_id))
+        await self._fill()
+
+    async def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        await self._update(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = datetime('now') WHERE id = ?",
+            (status, result, error, job_id),
+        )
+
+    @staticmethod
+    def _remove_audio(path: Optional[str]):
+        if path:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    async def _deliver(self, job_id: str):
+        """POST the finished job to its webhook, retrying with backoff."""
+        row = await self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not row:
+            return
+        url = row[0]["webhook_url"]
+        body = json.dumps(self._public(row[0])).encode()
+        headers = {"Content-Type": "application/json", "X-Windy-Job": job_id}
+        if self.webhook_secret:
+            headers["X-Windy-Signature"] = _sign(body, self.webhook_secret)
+        loop = asyncio.get_running_loop()
+        outcome = "failed"
+        for attempt in range(self.webhook_attempts):
+            if attempt:
+                await asyncio.sleep(self.webhook_backoff_s * 2 ** (attempt - 1))
+            try:
+                status = await loop.run_in_executor(
+                    None, _post_json, url, body, headers, self.webhook_timeout_s)
+            except UnsafeWebhook as e:
+                outcome = f"failed: {e}"[:200]
+                break
+            except Exception as e:
+                outcome = f"failed: {e}"[:200]
+                continue
+            if 200 <= status < 300:
+                outcome = "delivered"
+                break
+            outcome = f"failed: HTTP {status}"
+            if status < 500 and status != 429:
+                break  # The receiver rejected (or redirected) it; retrying won't help
+        await self._update("UPDATE jobs SET webhook_status = ? WHERE id = ?", (outcome, job_id))
+        if outcome != "delivered":
+            logger.warning(f"Webhook for job {job_id} to {url}: {outcome}")
+
+
+def queue_from_env(db: Database, run: Callable[[np.ndarray], Awaitable[dict]], audio_dir: str) -> JobQueue:
+    """Build the queue from WINDY_CLOUD_JOB_WORKERS / WINDY_CLOUD_JOB_PER_USER /
+    WINDY_CLOUD_JOB_MAX_QUEUED / WINDY_WEBHOOK_SECRET."""
+    return JobQueue(
+        db,
+        run,
+        audio_dir,
+        workers=int(os.getenv("WINDY_CLOUD_JOB_WORKERS", "2")),
+        per_user=int(os.getenv("WINDY_CLOUD_JOB_PER_USER", "1")),
+        max_queued=int(os.getenv("WINDY_CLOUD_JOB_MAX_QUEUED", "100")),
+        webhook_secret=os.getenv("WINDY_WEBHOOK_SECRET") or None,
+    )
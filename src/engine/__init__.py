@@ -1,14 +1,17 @@
 """Windy Word Transcription Engine"""
-from .transcriber import (
-    StreamingTranscriber,
-    TranscriberConfig,
-    TranscriptionState,
-    TranscriptionSegment,
-)
 
 __all__ = [
     "StreamingTranscriber",
-    "TranscriberConfig", 
+    "TranscriberConfig",
     "TranscriptionState",
     "TranscriptionSegment",
 ]
+
+
+def __getattr__(name):
+    # Lazy: importing a light submodule (translation_cache, journal, ...)
+    # mustn't pull in the transcriber stack and faster-whisper
+    if name in __all__:
+        from . import transcriber
+        return getattr(transcriber, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
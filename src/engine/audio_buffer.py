@@ -0,0 +1,191 @@
+"""
+Windy Word - PCM Ring Buffer
+Fixed-capacity audio buffer shared by feed_audio, the worker thread and
+stop_session.
+
+Replaces the old `audio_buffer += b"".join(drained)` pattern, which
+re-copied the whole buffer on every drain (quadratic in buffer length and
+worst exactly when the worker falls behind).
+
+Layout: a "mirrored" float32 array of 2 x capacity. Every sample is written
+twice (at i and i + capacity), so any run of up to `capacity` samples is
+contiguous in memory and `view()` can hand the model a float32 slice with
+no copy. Incoming int16 PCM is scaled to float32 once, at write time,
+straight into the buffer.
+
+Positions are monotonic sample counters since the last `clear()`, so
+`read_position / sample_rate` is the session time of the oldest buffered
+sample — the streaming decoder relies on that for absolute timestamps.
+"""
+
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+
+class PcmRingBuffer:
+    """Thread-safe single-producer / single-consumer ring of mono PCM."""
+
+    def __init__(self, capacity_s: float = 30.0, sample_rate: int = 16000):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("PcmRingBuffer requires numpy")
+        self.sample_rate = sample_rate
+        self.capacity = int(capacity_s * sample_rate)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._lock = threading.Lock()
+        self._write = 0       # Samples ever written
+        self._read = 0        # Samples ever consumed / discarded
+        self._leased = 0      # Samples from _read the consumer is still reading
+        self._carry = b""     # Odd trailing byte from a split int16 frame
+        self.dropped_samples = 0
+        self.compacted_samples = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._write - self._read
+
+    @property
+    def read_position(self) -> int:
+        """Absolute sample index of the oldest buffered sample."""
+        return self._read
+
+    @property
+    def duration_s(self) -> float:
+        """Seconds of audio currently buffered."""
+        return len(self) / self.sample_rate
+
+    def write(self, pcm: bytes) -> int:
+        """Append int16 little-endian PCM. Returns samples dropped on overflow.
+
+        On overflow the oldest audio is discarded, except audio the consumer
+        has leased via view() — in that case the oldest part of the INCOMING
+        frame is dropped instead, so the model never reads a half-overwritten
+        window.
+        """
+        if self._carry:
+            pcm = self._carry + pcm
+            self._carry = b""
+        if len(pcm) % 2:
+            self._carry = pcm[-1:]
+            pcm = pcm[:-1]
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if samples.size == 0:
+            return 0
+
+        with self._lock:
+            dropped = 0
+            if samples.size > self.capacity:
+                dropped += samples.size - self.capacity
+                samples = samples[-self.capacity:]
+            overflow = (self._write - self._read) + samples.size - self.capacity
+            if overflow > 0:
+                unleased = (self._write - self._read) - self._leased
+                from_buffer = min(overflow, unleased)
+                self._read += from_buffer
+                dropped += from_buffer
+                if overflow > from_buffer:
+                    samples = samples[overflow - from_buffer:]
+                    dropped += overflow - from_buffer
+            self._store(samples)
+            self.dropped_samples += dropped
+            return dropped
+
+    def _store(self, samples, scale=None):
+        if scale is None:
+            scale = np.float32(1.0 / 32768.0)  # int16 PCM
+        cap = self.capacity
+        n = samples.size
+        pos = self._write % cap
+        first = min(n, cap - pos)
+        head = self._data[pos:pos + first]
+        np.multiply(samples[:first], scale, out=head, casting="unsafe")
+        self._data[pos + cap:pos + cap + first] = head
+        rest = n - first
+        if rest:
+            wrapped = self._data[:rest]
+            np.multiply(samples[first:], scale, out=wrapped, casting="unsafe")
+            self._data[cap:cap + rest] = wrapped
+        self._write += n
+
+    def view(self, n: int = None):
+        """Zero-copy float32 view of the oldest `n` samples (default: all).
+
+        The region stays leased — protected from overwrite — until the next
+        consume() / clear().
+        """
+        with self._lock:
+            available = self._write - self._read
+            n = available if n is None else max(0, min(n, available))
+            self._leased = n
+            start = self._read % self.capacity
+            return self._data[start:start + n]
+
+    def consume(self, n: int):
+        """Drop the oldest `n` samples and end any lease."""
+        with self._lock:
+            self._read += max(0, min(n, self._write - self._read))
+            self._leased = 0
+
+    def discard_oldest(self, keep: int) -> int:
+        """Drop the oldest audio so at most `keep` samples remain. Returns samples dropped.
+
+        A no-op while the consumer holds a lease (the leased region IS the oldest audio).
+        """
+        with self._lock:
+            excess = (self._write - self._read) - keep
+            if excess <= 0 or self._leased:
+                return 0
+            self._read += excess
+            self.dropped_samples += excess
+            return excess
+
+    def skip(self, n: int) -> bool:
+        """Advance both positions past `n` samples that were never written
+        (silence cut by the VAD gate), keeping read_position on session time.
+
+        Only possible while the buffer is empty and unleased; returns False
+        otherwise and the gap is lost.
+        """
+        with self._lock:
+            if self._write != self._read or self._leased:
+                return False
+            self._write += n
+            self._read += n
+            return True
+
+    def compact(self, keep) -> int:
+        """Remove samples from the oldest len(keep) where `keep` is False.
+
+        For cutting silence out of a backlog. Audio written after `keep` was
+        computed is kept as is, and any lease ends. Positions after the cut
+        shift back, so read_position stops being session time for the
+        removed stretch. Returns samples removed.
+        """
+        with self._lock:
+            available = self._write - self._read
+            n = min(len(keep), available)
+            start = self._read % self.capacity
+            buffered = self._data[start:start + available]
+            kept = np.concatenate((buffered[:n][keep[:n]], buffered[n:]))
+            removed = available - kept.size
+            self._leased = 0
+            if removed:
+                self._write = self._read
+                self._store(kept, np.float32(1.0))
+                self.compacted_samples += removed
+            return removed
+
+    def clear(self):
+        """Empty the buffer and restart positions at zero (new session)."""
+        with self._lock:
+            self._write = 0
+            self._read = 0
+            self._leased = 0
+            self._carry = b""
+            self.dropped_samples = 0
+            self.compacted_samples = 0
@@ -0,0 +1,629 @@
+"""
+Windy Word - Engine Benchmarks
+Benchmarks for the live transcription hot path. The ring and vibe
+microbenchmarks load no model and isolate one piece of per-chunk work;
+stt runs the whole StreamingTranscriber end to end.
+
+Usage:
+    python -m src.engine.benchmark ring [--seconds 600] [--drain-ms 50,1000] [--json out.json]
+    python -m src.engine.benchmark vibe [--hours 1] [--repeat 3] [--json out.json]
+    python -m src.engine.benchmark wire [--minutes 10] [--repeat 3] [--json out.json]
+    python -m src.engine.benchmark stt [--models tiny,base] [--compute-types int8,float32]
+        [--beams 1,5] [--chunk-s 1,3] [--modes chunked,fixed,streaming] [--speed 1.0] [--json out.json]
+
+Benchmarks:
+    ring  Audio buffering in the worker loop: the old bytes-concatenation
+          buffer vs PcmRingBuffer. Reports wall time and transient
+          allocations (tracemalloc) per second of audio fed.
+    vibe  VibeProcessor.process over a synthetic long session: the old
+          per-rule re.sub loop vs the precompiled single-pass rules.
+          Checks the outputs are identical before timing.
+    wire  WindyServer broadcast encodings over a synthetic session's
+          messages (partials, finals with word timings, state changes,
+          heartbeats): bytes, encode and decode time per message for JSON
+          and each binary subprotocol. Checks every message round-trips.
+    stt   StreamingTranscriber.feed_audio with WAV fixtures (default:
+          tests/audio, from tests/create_test_audio.py) in 20 ms frames at
+          --speed x real time, for every model / compute type / beam /
+          chunk_length_s combination. Per run: real-time factor (decode
+          time / audio time), first-partial latency (speech onset fed ->
+          first text), end-of-utterance latency (last speech fed -> last
+          final text; the session is stopped when the file ends), peak RSS,
+          model calls and decode time per transcribed word, and WER against
+          <name>_groundtruth.txt when it exists. Modes: chunked (utterance
+          segmentation), fixed (chunk_length_s windows), streaming.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from . import protocol_codec
+from .audio_buffer import PcmRingBuffer
+from .vibe import VibeProcessor
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20  # Electron client sends ~20ms PCM frames
+
+
+# ═════════════════════════════════
+#  Audio buffering (ring)
+# ═════════════════════════════════
+
+class _LegacyBuffer:
+    """The pre-ring-buffer worker loop: join, concatenate, trim, convert."""
+
+    def __init__(self, chunk_s: float, cap_s: float = 10.0):
+        self.chunk_bytes = int(SAMPLE_RATE * 2 * chunk_s)
+        self.cap_bytes = int(SAMPLE_RATE * 2 * cap_s)
+        self.buffer = b""
+
+    def step(self, drained):
+        self.buffer += b"".join(drained)
+        if len(self.buffer) > self.cap_bytes:
+            self.buffer = self.buffer[len(self.buffer) - self.cap_bytes:]
+        if len(self.buffer) >= self.chunk_bytes:
+            audio = np.frombuffer(self.buffer, dtype=np.int16).astype(np.float32) / 32768.0
+            self.buffer = b""
+            return audio.size
+        return 0
+
+
+class _RingBuffer:
+    """The current path: feed_audio writes, worker views and consumes."""
+
+    def __init__(self, chunk_s: float, cap_s: float = 10.0):
+        self.chunk = int(SAMPLE_RATE * chunk_s)
+        self.cap = int(SAMPLE_RATE * cap_s)
+        self.ring = PcmRingBuffer(capacity_s=30.0, sample_rate=SAMPLE_RATE)
+
+    def step(self, drained):
+        for frame in drained:
+            self.ring.write(frame)
+        available = len(self.ring)
+        if available > self.cap:
+            self.ring.discard_oldest(self.cap)
+            available = self.cap
+        if available >= self.chunk:
+            audio = self.ring.view(available)
+            self.ring.consume(available)
+            return audio.size
+        return 0
+
+
+def _run_buffer(impl, batches, track_alloc: bool) -> dict:
+    allocated = 0
+    events = 0
+    if track_alloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    for batch in batches:
+        if track_alloc:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        impl.step(batch)
+        if track_alloc:
+            grew = tracemalloc.get_traced_memory()[1] - before
+            if grew > 0:
+                allocated += grew
+                # Anything bigger than a couple of frames is a buffer copy
+                if grew > 4 * FRAME_MS * SAMPLE_RATE * 2 // 1000:
+                    events += 1
+    elapsed = time.perf_counter() - start
+    if track_alloc:
+        tracemalloc.stop()
+    return {"elapsed_s": elapsed, "allocated_bytes": allocated, "buffer_copies": events}
+
+
+def bench_ring(seconds: float, drain_ms_list, chunk_s: float) -> list:
+    """Compare legacy bytes buffering with PcmRingBuffer."""
+    frame = (np.random.default_rng(0).integers(-3000, 3000, SAMPLE_RATE * FRAME_MS // 1000)
+             .astype(np.int16).tobytes())
+    results = []
+    for drain_ms in drain_ms_list:
+        per_drain = max(1, drain_ms // FRAME_MS)
+        n_batches = int(seconds * 1000 / (per_drain * FRAME_MS))
+        batches = [[frame] * per_drain] * n_batches
+        audio_s = n_batches * per_drain * FRAME_MS / 1000
+        for name, cls in (("legacy-bytes", _LegacyBuffer), ("ring-buffer", _RingBuffer)):
+            timing = _run_buffer(cls(chunk_s), batches, track_alloc=False)
+            alloc = _run_buffer(cls(chunk_s), batches, track_alloc=True)
+            results.append({
+                "impl": name,
+                "drain_ms": drain_ms,
+                "audio_s": audio_s,
+                "us_per_audio_s": round(timing["elapsed_s"] / audio_s * 1e6, 1),
+                "alloc_kb_per_audio_s": round(alloc["allocated_bytes"] / audio_s / 1024, 1),
+                "buffer_copies_per_audio_s": round(alloc["buffer_copies"] / audio_s, 2),
+            })
+    return results
+
+
+# ═════════════════════════════════
+#  Vibe post-processing
+# ═════════════════════════════════
+
+class _LegacyVibe(VibeProcessor):
+    """The pre-compilation rules: one re.sub per filler and per correction."""
+
+    def _remove_fillers(self, text: str) -> str:
+        for filler in sorted(self.FILLERS, key=len, reverse=True):
+            text = re.sub(r'\b' + re.escape(filler) + r'\b', '', text, flags=re.IGNORECASE)
+        return text
+
+    def _fix_grammar(self, text: str) -> str:
+        for pattern, replacement in self.CORRECTIONS.items():
+            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        return text
+
+    def _fix_punctuation(self, text: str) -> str:
+        if text and text[0].islower():
+            text = text[0].upper() + text[1:]
+        text = re.sub(r'([.!?])\s+([a-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
+        if text and text[-1] not in '.!?':
+            text += '.'
+        return text
+
+    def _clean_whitespace(self, text: str) -> str:
+        text = re.sub(r' {2,}', ' ', text)
+        text = re.sub(r' ([.!?,;:])', r'\1', text)
+        return text.strip()
+
+
+_VIBE_WORDS = (
+    "so I think we should ship the release on Friday and then review the "
+    "metrics with the team before the customer call next week because the "
+    "numbers looked good yesterday but nobody has checked the dashboards"
+).split()
+_VIBE_SPOKEN = ["um", "uh", "Umm", "like", "you know", "I mean", "basically", "Literally",
+                "sort of", "kind of", "actually", "wanna", "Gonna", "gotta", "kinda",
+                "sorta", "cuz", "lemme", "dunno", "hmm", "likely", "unlike", "umbrella"]
+
+
+def vibe_segments(hours: float, words_per_minute: int = 150, words_per_segment: int = 8,
+                  seed: int = 0) -> list:
+    """Synthetic dictation: ~150 wpm in ~3 s segments, ~1 in 5 tokens a
+    filler, slang correction or near-miss ("likely", "umbrella")."""
+    rng = np.random.default_rng(seed)
+    n_segments = int(hours * 60 * words_per_minute / words_per_segment)
+    segments = []
+    for _ in range(n_segments):
+        tokens = []
+        for _ in range(words_per_segment):
+            if rng.random() < 0.2:
+                tokens.append(_VIBE_SPOKEN[rng.integers(len(_VIBE_SPOKEN))])
+            else:
+                tokens.append(_VIBE_WORDS[rng.integers(len(_VIBE_WORDS))])
+        text = " ".join(tokens)
+        if rng.random() < 0.3:
+            text += rng.choice([".", "?", "!", ". and then", ", right"])
+        segments.append(text)
+    return segments
+
+
+def bench_vibe(hours: float, repeat: int) -> list:
+    """Compare per-rule re.sub with the precompiled VibeProcessor."""
+    segments = vibe_segments(hours)
+    settings = {'vibe_enabled': True}
+    impls = (("legacy-per-rule", _LegacyVibe(settings)), ("precompiled", VibeProcessor(settings)))
+
+    reference = [impls[0][1].process(t) for t in segments]
+    results = []
+    for name, proc in impls:
+        if [proc.process(t) for t in segments] != reference:
+            raise AssertionError(f"{name}: output differs from legacy VibeProcessor")
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            for text in segments:
+                proc.process(text)
+            best = min(best, time.perf_counter() - start)
+        results.append({
+            "impl": name,
+            "session_hours": hours,
+            "segments": len(segments),
+            "ms_per_session": round(best * 1000, 1),
+            "us_per_segment": round(best / len(segments) * 1e6, 2),
+            "segments_per_s": int(len(segments) / best),
+            "identical_output": True,
+        })
+    return results
+
+
+# ═════════════════════════════════
+#  Broadcast encodings (wire)
+# ═════════════════════════════════
+
+def wire_messages(minutes: float, seed: int = 0) -> list:
+    """The broadcasts of a dictation session: a partial every ~0.5 s,
+    a final with word timings every ~3 s, state changes and heartbeats."""
+    rng = np.random.default_rng(seed)
+    messages = []
+    t = 0.0
+    text = []
+    while t < minutes * 60:
+        word = _VIBE_WORDS[rng.integers(len(_VIBE_WORDS))]
+        start = t
+        t += float(rng.uniform(0.25, 0.5))
+        text.append({"word": " " + word, "start": round(start, 2), "end": round(t, 2),
+                     "prob": float(rng.uniform(0.6, 1.0))})
+        final = len(text) >= 8
+        if final or len(text) % 2 == 0:
+            messages.append({
+                "type": "transcript",
+                "text": "".join(w["word"] for w in text).strip(),
+                "start": text[0]["start"],
+                "end": text[-1]["end"],
+                "confidence": float(rng.uniform(-0.6, -0.1)),
+                "partial": not final,
+                "words": list(text) if final else [],
+                "detected_language": "en",
+                "language_probability": 0.98,
+            })
+        if final:
+            text = []
+            messages.append({"type": "state", "state": "buffering", "previous": "listening"})
+            messages.append({"type": "state", "state": "listening", "previous": "buffering"})
+        if int(t) % 15 == 0 and int(start) % 15 != 0:
+            messages.append({"type": "pong", "heartbeat": True})
+    return messages
+
+
+def bench_wire(minutes: float, repeat: int) -> list:
+    """Encode and decode the session's broadcasts in each encoding."""
+    messages = wire_messages(minutes)
+    encodings = [None] + protocol_codec.SUBPROTOCOLS
+    results = []
+    for encoding in encodings:
+        frames = [protocol_codec.encode(m, encoding) for m in messages]
+        round_trip = all(_close(protocol_codec.decode(f, encoding), m) for f, m in zip(frames, messages))
+        size = sum(len(f.encode("utf-8") if isinstance(f, str) else f) for f in frames)
+        best_enc = best_dec = float("inf")
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            for m in messages:
+                protocol_codec.encode(m, encoding)
+            best_enc = min(best_enc, time.perf_counter() - start)
+            start = time.perf_counter()
+            for f in frames:
+                protocol_codec.decode(f, encoding)
+            best_dec = min(best_dec, time.perf_counter() - start)
+        results.append({
+            "encoding": encoding or "json",
+            "messages": len(messages),
+            "bytes_per_msg": round(size / len(messages), 1),
+            "session_kb": round(size / 1024, 1),
+            "encode_us_per_msg": round(best_enc / len(messages) * 1e6, 2),
+            "decode_us_per_msg": round(best_dec / len(messages) * 1e6, 2),
+            "round_trip": round_trip,
+        })
+    return results
+
+
+def _close(a, b) -> bool:
+    """Equal up to f32 rounding of floats."""
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= 1e-6 * max(1.0, abs(b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_close(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+# ═════════════════════════════════
+#  Live transcription (stt)
+# ═════════════════════════════════
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "tests" / "audio"
+DEFAULT_FIXTURES = ("test_short.wav", "test_long.wav")
+
+
+def load_wav(path) -> np.ndarray:
+    """16-bit PCM WAV -> float32 mono at 16 kHz (downmixed / resampled if needed)."""
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        channels, rate = w.getnchannels(), w.getframerate()
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    audio = pcm.astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        n = int(round(audio.size * SAMPLE_RATE / rate))
+        audio = np.interp(np.linspace(0, audio.size - 1, n), np.arange(audio.size), audio).astype(np.float32)
+    return audio
+
+
+def reference_for(path) -> str:
+    """Ground-truth text next to a fixture (<stem>_groundtruth.txt), or None."""
+    ref = Path(path).with_name(Path(path).stem + "_groundtruth.txt")
+    return ref.read_text(encoding="utf-8").strip() if ref.exists() else None
+
+
+_WER_STRIP = re.compile(r"[^\w\s']")
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance / reference length (case and punctuation ignored)."""
+    ref = _WER_STRIP.sub(" ", reference.lower()).split()
+    hyp = _WER_STRIP.sub(" ", hypothesis.lower()).split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def speech_bounds(audio: np.ndarray, threshold: float = 0.02) -> tuple:
+    """(onset_s, offset_s) of the first and last 20 ms frame peaking above threshold."""
+    frame = SAMPLE_RATE * FRAME_MS // 1000
+    n = audio.size // frame
+    if n == 0:
+        return 0.0, audio.size / SAMPLE_RATE
+    peaks = np.abs(audio[:n * frame]).reshape(n, frame).max(axis=1)
+    voiced = np.flatnonzero(peaks > threshold)
+    if voiced.size == 0:
+        return 0.0, audio.size / SAMPLE_RATE
+    return voiced[0] * frame / SAMPLE_RATE, (voiced[-1] + 1) * frame / SAMPLE_RATE
+
+
+def _rss_bytes() -> int:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _RssSampler:
+    """Samples process RSS every 10 ms while active; .peak_mb afterwards."""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak / 1024 / 1024, 1)
+
+
+def run_stt_session(transcriber, audio: np.ndarray, speed: float, sink: list,
+                    reference: str = None) -> dict:
+    """Feed one clip through a live session at `speed` x real time and measure it.
+
+    `sink` is the list the transcriber's on_transcript callback appends
+    (monotonic time, segment) to; it is cleared first.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be > 0 (latencies are measured against the feed clock)")
+    sink.clear()
+    frame = SAMPLE_RATE * FRAME_MS // 1000
+    frame_s = frame / SAMPLE_RATE
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    onset_s, offset_s = speech_bounds(audio)
+    onset_wall = offset_wall = None
+    busy_before = sum(r["busy_s"] for r in transcriber.pool_stats())
+    calls_before = sum(r["completed"] for r in transcriber.pool_stats())
+
+    with _RssSampler() as rss:
+        transcriber.start_session()
+        t0 = time.monotonic()
+        for i, off in enumerate(range(0, len(pcm), frame * 2)):
+            delay = t0 + i * frame_s / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            transcriber.feed_audio(pcm[off:off + frame * 2])
+            fed_s = (i + 1) * frame_s
+            if onset_wall is None and fed_s > onset_s:
+                onset_wall = time.monotonic()
+            if offset_wall is None and fed_s >= offset_s:
+                offset_wall = time.monotonic()
+        text = transcriber.stop_session()
+
+    decode_s = sum(r["busy_s"] for r in transcriber.pool_stats()) - busy_before
+    calls = sum(r["completed"] for r in transcriber.pool_stats()) - calls_before
+    words = len(text.split())
+    audio_s = audio.size / SAMPLE_RATE
+    finals = [wall for wall, seg in sink if not seg.is_partial]
+    return {
+        "audio_s": round(audio_s, 2),
+        "rtf": round(decode_s / audio_s, 3) if audio_s else 0.0,
+        "first_partial_ms": int((sink[0][0] - onset_wall) * 1000) if sink else None,
+        "eou_ms": int((finals[-1] - offset_wall) * 1000) if finals else None,
+        "peak_rss_mb": rss.peak_mb,
+        "calls": calls,
+        "decode_ms_per_word": round(decode_s * 1000 / words, 1) if words else None,
+        "wer": round(word_error_rate(reference, text), 3) if reference is not None else None,
+        "text": text,
+    }
+
+
+def _load_transcriber(config):
+    from .transcriber import StreamingTranscriber
+
+    transcriber = StreamingTranscriber(config)
+    if not transcriber.load_model():
+        raise RuntimeError(f"could not load {config.model_size} ({config.compute_type})")
+    return transcriber
+
+
+def bench_stt(audio_paths, models, compute_types, beams, chunk_sizes, modes=("chunked",),
+              speed: float = 1.0, device: str = "cpu", transcriber_factory=None) -> list:
+    """One row per model x compute type x mode x beam x chunk_length_s x clip.
+
+    transcriber_factory(config) -> loaded StreamingTranscriber (default: load
+    the faster-whisper model); one transcriber serves all runs of a
+    model/compute type, its config is updated between runs.
+    """
+    from .transcriber import TranscriberConfig
+
+    factory = transcriber_factory or _load_transcriber
+    clips = [(Path(p).name, load_wav(p), reference_for(p)) for p in audio_paths]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for model in models:
+            for compute_type in compute_types:
+                config = TranscriberConfig(
+                    model_size=model,
+                    device=device,
+                    compute_type=compute_type,
+                    # Never touch the real crash-recovery journal
+                    temp_file_path=os.path.join(tmp, "bench.journal"),
+                )
+                load_start = time.monotonic()
+                try:
+                    transcriber = factory(config)
+                except Exception as e:
+                    rows.append({"model": model, "compute": compute_type, "error": str(e)})
+                    continue
+                load_s = round(time.monotonic() - load_start, 2)
+                sink = []
+                transcriber.on_transcript(lambda seg: sink.append((time.monotonic(), seg)))
+
+                for mode in modes:
+                    for beam in beams:
+                        # Streaming re-decodes on stream_step_s; chunk_length_s doesn't apply
+                        for chunk_s in (chunk_sizes if mode != "streaming" else [None]):
+                            config.streaming = mode == "streaming"
+                            config.segmentation = "fixed" if mode == "fixed" else "utterance"
+                            config.beam_size = beam
+                            config.stream_beam_size = beam
+                            if chunk_s is not None:
+                                config.chunk_length_s = chunk_s
+                            for name, audio, reference in clips:
+                                result = run_stt_session(transcriber, audio, speed, sink, reference)
+                                rows.append({
+                                    "model": model,
+                                    "compute": compute_type,
+                                    "mode": mode,
+                                    "beam": beam,
+                                    "chunk_s": chunk_s if chunk_s is not None else "-",
+                                    "audio": name,
+                                    "load_s": load_s,
+                                    **{k: v for k, v in result.items() if k != "text"},
+                                })
+                del transcriber
+    return rows
+
+
+def _print_table(rows: list):
+    if not rows:
+        return
+    cols = list(rows[0].keys())
+    for r in rows:
+        cols += [c for c in r if c not in cols]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    print("  ".join("-" * widths[c] for c in cols))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols))
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", dest="json_path", default=None, help="Also write results to this JSON file")
+
+    parser = argparse.ArgumentParser(description="Windy Word engine microbenchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_ring = sub.add_parser("ring", parents=[common],
+                            help="Audio buffering: bytes concatenation vs ring buffer")
+    p_ring.add_argument("--seconds", type=float, default=600.0, help="Seconds of audio to feed")
+    p_ring.add_argument("--drain-ms", default="50,1000",
+                        help="Comma-separated worker drain intervals (50 = keeping up, 1000 = backlog)")
+    p_ring.add_argument("--chunk-s", type=float, default=3.0, help="chunk_length_s")
+
+    p_vibe = sub.add_parser("vibe", parents=[common],
+                            help="VibeProcessor: per-rule re.sub vs precompiled rules")
+    p_vibe.add_argument("--hours", type=float, default=1.0, help="Length of the synthetic session")
+    p_vibe.add_argument("--repeat", type=int, default=3, help="Timed passes (best is reported)")
+
+    p_wire = sub.add_parser("wire", parents=[common],
+                            help="Broadcast encodings: JSON vs binary subprotocols")
+    p_wire.add_argument("--minutes", type=float, default=10.0, help="Length of the synthetic session")
+    p_wire.add_argument("--repeat", type=int, default=3, help="Timed passes (best is reported)")
+
+    p_stt = sub.add_parser("stt", parents=[common],
+                           help="Live transcription: RTF, latency, peak RSS and WER per configuration")
+    p_stt.add_argument("--audio", default=",".join(str(FIXTURE_DIR / f) for f in DEFAULT_FIXTURES),
+                       help="Comma-separated 16-bit WAV files (references: <name>_groundtruth.txt)")
+    p_stt.add_argument("--models", default="tiny", help="Comma-separated model sizes")
+    p_stt.add_argument("--compute-types", default="int8", help="Comma-separated compute types")
+    p_stt.add_argument("--beams", default="1,5", help="Comma-separated beam sizes")
+    p_stt.add_argument("--chunk-s", default="3.0", help="Comma-separated chunk_length_s values (chunked / fixed modes)")
+    p_stt.add_argument("--modes", default="chunked", help="Comma-separated: chunked, fixed, streaming")
+    p_stt.add_argument("--speed", type=float, default=1.0, help="Feed pace, x real time (4 = 4x faster)")
+    p_stt.add_argument("--device", default="cpu")
+
+    args = parser.parse_args(argv)
+
+    if args.bench == "ring":
+        rows = bench_ring(args.seconds, [int(x) for x in args.drain_ms.split(",")], args.chunk_s)
+    elif args.bench == "vibe":
+        rows = bench_vibe(args.hours, args.repeat)
+    elif args.bench == "wire":
+        rows = bench_wire(args.minutes, args.repeat)
+    elif args.bench == "stt":
+        rows = bench_stt(
+            [p for p in args.audio.split(",") if p and Path(p).exists()],
+            args.models.split(","),
+            args.compute_types.split(","),
+            [int(b) for b in args.beams.split(",")],
+            [float(c) for c in args.chunk_s.split(",")],
+            [m.strip() for m in args.modes.split(",")],
+            speed=args.speed,
+            device=args.device,
+        )
+
+    print("=" * 70)
+    print(f"WINDY WORD ENGINE BENCHMARK — {args.bench}")
+    print("=" * 70)
+    _print_table(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"bench": args.bench, "results": rows}, f, indent=2)
+        print(f"\nResults saved to: {args.json_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
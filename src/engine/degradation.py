@@ -0,0 +1,187 @@
+"""
+Windy Word - Adaptive Degradation Controller
+Keeps live dictation real-time on machines too slow for the configured settings.
+
+The transcriber feeds every measured real-time factor (decode time /
+audio time) into the controller. When the rolling average stays above
+`high_rtf` it takes ONE step down the ladder, cheapest quality loss first:
+
+1. beam_size       halve it (5 -> 2 -> 1); stream_beam_size in streaming mode
+2. chunk_length_s  double it, up to MAX_CHUNK_S. Whisper pads every call to
+                   30s, so the encoder cost is per call: longer chunks mean
+                   fewer calls per second of audio (chunked mode only)
+3. model_size      the next smaller model of the same family that exists
+                   locally — never one that would need a download
+
+Each step clears the window, so the next decision is made on samples taken
+with the new settings. When the average stays below `low_rtf` for
+`restore_after` samples the most recent step is undone; steps are undone in
+reverse, so the controller never goes above what the user configured. The
+gap between the two thresholds plus the longer restore delay is the
+hysteresis that stops it flapping between two settings.
+
+The controller only decides; StreamingTranscriber applies the change.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+# Longest chunk the controller will select; the chunked loop caps its
+# buffer at 10s
+MAX_CHUNK_S = 8.0
+
+# Model families, smallest first. A -ct2 / -cpu suffix is kept when
+# stepping ("windy-core-cpu" -> "windy-lite-cpu").
+MODEL_LADDERS = (
+    ("tiny", "base", "small", "medium", "large-v3"),
+    ("windy-nano", "windy-lite", "windy-core", "windy-edge", "windy-plus", "windy-turbo", "windy-pro-engine"),
+)
+_MODEL_SUFFIXES = ("-ct2", "-cpu")
+
+# Order in which settings are degraded
+LADDER = ("beam_size", "stream_beam_size", "chunk_length_s", "model_size")
+
+
+def smaller_models(model_size: str) -> List[str]:
+    """Models below model_size in its family, largest first ([] if unknown)."""
+    name = str(model_size)
+    suffix = ""
+    for s in _MODEL_SUFFIXES:
+        if name.endswith(s):
+            name, suffix = name[:-len(s)], s
+            break
+    for ladder in MODEL_LADDERS:
+        if name in ladder:
+            return [m + suffix for m in reversed(ladder[:ladder.index(name)])]
+    return []
+
+
+@dataclass
+class Adjustment:
+    """One change to a transcriber setting."""
+    action: str   # "degrade" or "restore"
+    setting: str  # Key from LADDER
+    old: object
+    new: object
+    rtf: float    # Rolling average that triggered the change
+
+    def to_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "setting": self.setting,
+            "from": self.old,
+            "to": self.new,
+            "rtf": round(self.rtf, 2),
+        }
+
+
+class DegradationController:
+    """RTF-driven step-down / step-up over the transcriber's settings."""
+
+    def __init__(self, high_rtf: float = 0.9, low_rtf: float = 0.5, window: int = 5,
+                 restore_after: int = 20,
+                 model_available: Optional[Callable[[str], bool]] = None):
+        if low_rtf >= high_rtf:
+            raise ValueError("low_rtf must be below high_rtf")
+        self.high_rtf = high_rtf
+        self.low_rtf = low_rtf
+        self.window = max(1, window)
+        self.restore_after = max(self.window, restore_after)
+        self.model_available = model_available or (lambda _name: True)
+        self._samples: Deque[float] = deque(maxlen=self.restore_after)
+        self._steps: List[Adjustment] = []  # Applied degradations, oldest first
+        self._pending: Optional[Adjustment] = None  # Model swap still loading
+        self._failed_models = set()
+        self._lock = threading.Lock()
+        self.history: List[Adjustment] = []
+
+    @property
+    def level(self) -> int:
+        """Number of degradation steps currently applied."""
+        return len(self._steps)
+
+    def observe(self, rtf: float, settings: Dict[str, object]) -> Optional[Adjustment]:
+        """Record one RTF sample; returns the change to apply, if any.
+
+        settings holds the current value of every setting the controller
+        may touch (keys from LADDER; absent keys are left alone).
+        """
+        with self._lock:
+            self._samples.append(rtf)
+            if self._pending is not None or len(self._samples) < self.window:
+                return None
+            recent = list(self._samples)[-self.window:]
+            avg = sum(recent) / len(recent)
+            if avg > self.high_rtf:
+                adj = self._next_degradation(settings, avg)
+            elif (self._steps and len(self._samples) >= self.restore_after
+                  and sum(self._samples) / len(self._samples) < self.low_rtf):
+                last = self._steps[-1]
+                adj = Adjustment("restore", last.setting, settings.get(last.setting, last.new),
+                                 last.old, sum(self._samples) / len(self._samples))
+            else:
+                return None
+            if adj is None:
+                return None  # Nothing left to give up
+            self._samples.clear()
+            if adj.setting == "model_size":
+                self._pending = adj  # Confirmed by applied() once the swap lands
+            else:
+                self._record(adj)
+            return adj
+
+    def applied(self, adj: Adjustment, success: bool = True):
+        """Report the outcome of a model swap returned by observe()."""
+        with self._lock:
+            if self._pending is adj:
+                self._pending = None
+            if success:
+                self._record(adj)
+            elif adj.action == "degrade":
+                self._failed_models.add(adj.new)
+
+    def baseline(self) -> Dict[str, object]:
+        """Configured values of every setting currently degraded."""
+        with self._lock:
+            base = {}
+            for step in reversed(self._steps):
+                base[step.setting] = step.old
+            return base
+
+    def stats(self) -> dict:
+        with self._lock:
+            recent = list(self._samples)[-self.window:]
+            return {
+                "level": len(self._steps),
+                "rtf": round(sum(recent) / len(recent), 2) if recent else None,
+                "steps": [s.to_dict() for s in self._steps],
+                "pending": self._pending.to_dict() if self._pending else None,
+            }
+
+    def _record(self, adj: Adjustment):
+        if adj.action == "degrade":
+            self._steps.append(adj)
+        elif self._steps and self._steps[-1].setting == adj.setting:
+            self._steps.pop()
+        self.history.append(adj)
+
+    def _next_degradation(self, settings: Dict[str, object], avg: float) -> Optional[Adjustment]:
+        for setting in LADDER:
+            if setting not in settings:
+                continue
+            current = settings[setting]
+            new = None
+            if setting in ("beam_size", "stream_beam_size"):
+                if current > 1:
+                    new = max(1, current // 2)
+            elif setting == "chunk_length_s":
+                if current < MAX_CHUNK_S:
+                    new = min(MAX_CHUNK_S, current * 2)
+            elif setting == "model_size":
+                new = next((m for m in smaller_models(current)
+                            if m not in self._failed_models and self.model_available(m)), None)
+            if new is not None:
+                return Adjustment("degrade", setting, current, new, avg)
+        return None
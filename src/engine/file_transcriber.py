@@ -0,0 +1,391 @@
+"""
+Windy Word - Long-File Transcription
+Parallel chunked decoding for transcribe_upload / transcribe_blob.
+
+One model.transcribe call over a multi-hour upload runs on a single
+decoder and the client hears nothing until it ends. Instead:
+
+- The file is split at pauses into chunks of about `chunk_s` (shorter
+  when that leaves workers idle, never under MIN_CHUNK_S). Each cut goes
+  in the middle of the longest quiet stretch within `search_s` of the
+  target, or at the quietest frame when there is none, so no word is cut.
+- Chunks are decoded `workers` at a time, each on a model leased from
+  the pool: across replicas, and across a replica's CTranslate2 workers
+  (`num_workers`), which is where the speedup with cores comes from.
+- Segment timestamps are shifted by the chunk offset and stitched in
+  order. on_progress reports percent done after every chunk, with the
+  text of the chunks that are now complete in order.
+
+Files shorter than two chunks take the single-call path, with no
+progress reports.
+
+UploadPipeline does the same while an upload is still arriving: PyAV
+decodes the bytes as transcribe_upload receives them, and each chunk
+starts as soon as it is decoded, so a large upload finishes close to
+max(upload, inference) rather than their sum.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+    av = None
+
+try:
+    from faster_whisper import decode_audio
+    DECODE_AVAILABLE = True
+except ImportError:
+    DECODE_AVAILABLE = False
+    decode_audio = None
+
+from .vad import frame_rms
+
+SAMPLE_RATE = 16000
+MIN_CHUNK_S = 30.0  # One Whisper window; shorter chunks lose context for no speedup
+
+# (start_s, end_s, text) relative to the audio passed in
+Segment = Tuple[float, float, str]
+
+
+@dataclass
+class FileTranscript:
+    """Stitched result of a (possibly chunked) file transcription."""
+    text: str
+    segments: List[dict] = field(default_factory=list)
+    duration_s: float = 0.0
+    chunks: int = 1
+    workers: int = 1
+
+
+def chunk_length(duration_s: float, workers: int, chunk_s: float) -> float:
+    """Target chunk length: chunk_s, shortened so every worker gets a chunk."""
+    return max(MIN_CHUNK_S, min(chunk_s, duration_s / max(1, workers)))
+
+
+def plan_chunks(audio, sample_rate: int, target_s: float, search_s: Optional[float] = None,
+                min_rms: float = 0.003, frame_s: float = 0.02) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges covering audio, cut at pauses near every target_s."""
+    frame = int(sample_rate * frame_s)
+    rms = frame_rms(audio, frame)
+    if rms.size == 0:
+        return [(0, audio.size)] if audio.size else []
+    search = int((target_s / 4 if search_s is None else search_s) / frame_s)
+    target = int(target_s / frame_s)
+    quiet = rms < max(min_rms, 0.1 * float(np.percentile(rms, 90)))
+
+    cuts = [0]
+    while rms.size - cuts[-1] > target + search:
+        lo, hi = cuts[-1] + target - search, cuts[-1] + target + search
+        cuts.append(_longest_pause_mid(quiet[lo:hi]) + lo if quiet[lo:hi].any()
+                    else lo + int(np.argmin(rms[lo:hi])))
+    bounds = [c * frame for c in cuts] + [audio.size]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _longest_pause_mid(quiet) -> int:
+    """Index of the middle of the longest run of True."""
+    padded = np.concatenate(([False], quiet, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    i = int(np.argmax(ends - starts))
+    return int(starts[i] + ends[i]) // 2
+
+
+class _ChunkRunner:
+    """Decodes chunks on a thread pool as they are submitted, stitching
+    timestamps and reporting progress with the text complete in order."""
+
+    def __init__(self, transcribe_chunk: Callable, workers: int, sample_rate: int,
+                 on_progress: Optional[Callable[[dict], None]]):
+        self._transcribe = transcribe_chunk
+        self._sample_rate = sample_rate
+        self._on_progress = on_progress
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="windy-file")
+        self._lock = threading.Lock()
+        self._futures = []
+        self._results: List[Optional[List[Segment]]] = []
+        self._done = 0
+        self._emitted = 0
+        self._processed = 0
+        self._submitted = 0
+        self._t0 = time.monotonic()
+        self.workers = max(1, workers)
+        self.total_samples: Optional[int] = None  # None while the length is unknown
+        self.receiving = False
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def submit(self, audio, start: int):
+        """Queue audio (starting at sample `start` of the file) as the next chunk."""
+        with self._lock:
+            index = len(self._results)
+            self._results.append(None)
+            self._submitted += audio.size
+        self._futures.append(self._pool.submit(self._run, index, audio, start))
+
+    def _run(self, index: int, audio, start: int):
+        segments = self._transcribe(audio)
+        offset = start / self._sample_rate
+        stitched = [(s + offset, e + offset, t) for s, e, t in segments]
+        with self._lock:
+            self._results[index] = stitched
+            self._done += 1
+            self._processed += audio.size
+            # Text goes out in file order: flush the completed prefix
+            new = []
+            while self._emitted < len(self._results) and self._results[self._emitted] is not None:
+                new.extend(t for _s, _e, t in self._results[self._emitted])
+                self._emitted += 1
+            if self._on_progress:
+                total = self.total_samples or self._submitted
+                self._on_progress({
+                    "percent": round(100.0 * self._processed / max(total, 1), 1),
+                    "chunks_done": self._done,
+                    "chunks_total": len(self._results),
+                    "processed_s": round(self._processed / self._sample_rate, 1),
+                    "audio_duration_s": round(total / self._sample_rate, 1),
+                    "elapsed_s": round(time.monotonic() - self._t0, 2),
+                    "receiving": self.receiving,
+                    "text": _join(new),
+                })
+
+    def finish(self) -> List[Segment]:
+        """Wait for every chunk; re-raises the first chunk failure."""
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        return [s for chunk in self._results for s in chunk]
+
+    def cancel(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def transcribe_file(source, transcribe_chunk: Callable, workers: int = 1, chunk_s: float = 120.0,
+                    on_progress: Optional[Callable[[dict], None]] = None,
+                    sample_rate: int = SAMPLE_RATE) -> FileTranscript:
+    """Transcribe a file path or float32 16 kHz array in parallel chunks.
+
+    transcribe_chunk(source) -> list of (start_s, end_s, text) is called
+    from worker threads, with the path for single-call files and an audio
+    array per chunk otherwise; it should lease its own model.
+    """
+    if isinstance(source, str):
+        if not DECODE_AVAILABLE:
+            return _single(source, transcribe_chunk, None)
+        source = decode_audio(source, sampling_rate=sample_rate)
+    duration = source.size / sample_rate
+    workers = max(1, workers)
+    target = chunk_length(duration, workers, chunk_s)
+    if duration < 2 * target:
+        return _single(source, transcribe_chunk, duration)
+
+    chunks = plan_chunks(source, sample_rate, target)
+    runner = _ChunkRunner(transcribe_chunk, min(workers, len(chunks)), sample_rate, on_progress)
+    runner.total_samples = source.size
+    for start, end in chunks:
+        runner.submit(source[start:end], start)
+    return _stitched(runner.finish(), duration, len(chunks), runner.workers)
+
+
+class _BytePipe:
+    """Blocking file-like reader over bytes written from another thread,
+    for PyAV's custom-IO demuxer. Not seekable, so containers that need
+    their end first (MP4 with a trailing moov) fail and fall back.
+
+    Holds at most max_bytes not yet read (always at least one write):
+    write() returns False instead of queueing past that."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.queued_bytes = 0
+        self._buffer = b""
+        self._eof = False
+
+    def write(self, data: bytes) -> bool:
+        with self._lock:
+            if self.queued_bytes and self.queued_bytes + len(data) > self.max_bytes:
+                return False
+            self.queued_bytes += len(data)
+        self._queue.put(bytes(data))
+        return True
+
+    def close(self):
+        self._queue.put(None)
+
+    def drop(self):
+        """Discard everything not yet read, then signal end of stream."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            self.queued_bytes = 0
+        self._queue.put(None)
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer and not self._eof:
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+            else:
+                with self._lock:
+                    self.queued_bytes = max(0, self.queued_bytes - len(item))
+                self._buffer = item
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class UploadPipeline:
+    """Decode an upload while it is still arriving and transcribe it in
+    chunks as the decoded audio comes in, so inference overlaps the
+    network transfer. feed() never blocks; finish() does.
+
+    At most max_buffered_bytes of the upload wait for the decoder. If it
+    falls further behind, or stops (failed or done), feed() stops
+    queueing, and if streaming can't complete, finish() raises so the
+    caller transcribes the file it saved instead.
+
+    Chunks are cut as in transcribe_file, at chunk_s (the final length is
+    unknown, so they aren't shortened to fill workers). An upload that
+    ends before the first cut goes through transcribe_file whole.
+    """
+
+    def __init__(self, transcribe_chunk: Callable, workers: int = 1, chunk_s: float = 120.0,
+                 on_progress: Optional[Callable[[dict], None]] = None,
+                 sample_rate: int = SAMPLE_RATE, max_buffered_bytes: int = 64 * 1024 * 1024):
+        if not AV_AVAILABLE:
+            raise RuntimeError("UploadPipeline requires PyAV")
+        self._transcribe = transcribe_chunk
+        self._workers = max(1, workers)
+        self._chunk_s = max(MIN_CHUNK_S, chunk_s)
+        self._on_progress = on_progress
+        self._sample_rate = sample_rate
+        self._runner = _ChunkRunner(transcribe_chunk, self._workers, sample_rate, on_progress)
+        self._runner.receiving = True
+        self._pipe = _BytePipe(max_buffered_bytes)
+        self._pending: List = []
+        self._pending_samples = 0
+        self._offset = 0  # File sample where _pending starts
+        self.received_bytes = 0
+        self.started = time.monotonic()
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._decode, name="windy-upload-decode", daemon=True)
+        self._thread.start()
+
+    def feed(self, data: bytes):
+        """Hand over the next bytes of the upload."""
+        self.received_bytes += len(data)
+        if self.error is not None or not self._thread.is_alive():
+            return  # Decoding has stopped; nothing would read these bytes
+        if not self._pipe.write(data):
+            self.error = RuntimeError(
+                f"Upload decoding fell more than {self._pipe.max_bytes // 1048576}MB behind")
+            self._pipe.drop()
+
+    def finish(self) -> FileTranscript:
+        """Upload complete: transcribe what is left and return the result."""
+        self._pipe.close()
+        self._thread.join()
+        if self.error is not None:
+            self._runner.cancel()
+            raise self.error
+        audio = self._take_pending()
+        if not len(self._runner):
+            self._runner.cancel()
+            return transcribe_file(audio, self._transcribe, self._workers, self._chunk_s,
+                                   self._on_progress, self._sample_rate)
+        if audio.size:
+            self._runner.submit(audio, self._offset)
+        duration = (self._offset + audio.size) / self._sample_rate
+        self._runner.total_samples = self._offset + audio.size
+        self._runner.receiving = False
+        return _stitched(self._runner.finish(), duration, len(self._runner),
+                         min(self._workers, len(self._runner)))
+
+    def abort(self):
+        """Upload abandoned: stop decoding and drop queued chunks."""
+        self._pipe.drop()
+        self._runner.cancel()
+
+    def _decode(self):
+        container = None
+        try:
+            container = av.open(self._pipe, mode="r")
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=self._sample_rate)
+            for frame in container.decode(audio=0):
+                frame.pts = None  # Let the resampler keep its own timeline
+                for out in resampler.resample(frame):
+                    self._add(out)
+            for out in resampler.resample(None):
+                self._add(out)
+        except Exception as e:
+            if self.error is None:  # Keep feed()'s reason for cutting the stream
+                self.error = e
+        finally:
+            if container is not None:
+                container.close()
+
+    def _add(self, frame):
+        pcm = frame.to_ndarray().reshape(-1)
+        self._pending.append(pcm.astype(np.float32) * np.float32(1.0 / 32768.0))
+        self._pending_samples += pcm.size
+        # Cut once a chunk plus its search window is buffered, as plan_chunks would
+        if self._pending_samples > self._chunk_s * 1.25 * self._sample_rate:
+            audio = self._take_pending()
+            chunks = plan_chunks(audio, self._sample_rate, self._chunk_s)
+            for start, end in chunks[:-1]:
+                self._runner.submit(audio[start:end], self._offset + start)
+            tail = chunks[-1][0]
+            self._pending = [audio[tail:].copy()]
+            self._pending_samples = audio.size - tail
+            self._offset += tail
+
+    def _take_pending(self):
+        audio = np.concatenate(self._pending) if self._pending else np.zeros(0, dtype=np.float32)
+        self._pending = []
+        self._pending_samples = 0
+        return audio
+
+
+def _stitched(segments: List[Segment], duration: float, chunks: int, workers: int) -> FileTranscript:
+    return FileTranscript(
+        text=_join(t for _s, _e, t in segments),
+        segments=[{"start": round(s, 2), "end": round(e, 2), "text": t} for s, e, t in segments],
+        duration_s=duration,
+        chunks=chunks,
+        workers=workers,
+    )
+
+
+def _single(source, transcribe_chunk, duration) -> FileTranscript:
+    segments = transcribe_chunk(source)
+    if duration is None:
+        duration = segments[-1][1] if segments else 0.0
+    return _stitched(segments, duration, 1, 1)
+
+
+def _join(texts) -> str:
+    return " ".join(t.strip() for t in texts if t.strip())
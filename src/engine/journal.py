@@ -0,0 +1,193 @@
+"""
+Windy Word - Crash-Recovery Journal
+Append-only session journal with group commit.
+
+The old recovery file was opened, appended, fsync'd and closed for every
+segment on the transcription thread — one disk flush per segment on the
+hot path. The journal keeps one handle open; append() only copies the
+record into the file buffer, and a background flusher writes + fsyncs
+everything appended in the last `durability_ms` in one go. A crash loses
+at most that window. durability_ms=0 restores fsync-per-record.
+
+Record layout (little-endian):
+    u32 payload length | u32 crc32(payload) | payload (UTF-8 JSON)
+Payload: {"t": wall time, "s": start, "e": end, "c": confidence,
+          "p": is_partial, "x": text}
+
+A torn or corrupt tail (crash mid-write) stops the reader at the last
+complete record; everything before it is recovered.
+"""
+
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+_HEADER = struct.Struct("<II")
+MAX_RECORD_BYTES = 1 << 20  # Anything larger is a corrupt length field
+
+
+class SessionJournal:
+    """Append-only, group-committed journal for one live session."""
+
+    def __init__(self, path, durability_ms: float = 200.0):
+        self.path = Path(path)
+        self.durability_s = max(0.0, durability_ms) / 1000.0
+        self._file = None
+        self._lock = threading.Lock()        # File buffer; append() takes it
+        self._sync_lock = threading.Lock()   # One fsync at a time; close() waits for it
+        self._dirty = threading.Event()
+        self._closing = False
+        self._flusher: Optional[threading.Thread] = None
+        self.syncs = 0
+        self.records = 0
+
+    def open(self):
+        """Start a fresh journal (truncates any previous session's file)."""
+        self.close()
+        try:
+            self._file = open(self.path, "wb")
+        except OSError as e:
+            print(f"Journal open error: {e}", file=sys.stderr)
+            self._file = None
+            return
+        self._closing = False
+        if self.durability_s > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="journal-flush", daemon=True)
+            self._flusher.start()
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def append(self, text: str, start: float, end: float,
+               confidence: float = 0.0, partial: bool = False):
+        """Buffer one record. Only touches disk when durability_ms is 0."""
+        if self._file is None:
+            return
+        payload = json.dumps({
+            "t": round(time.time(), 3),
+            "s": start,
+            "e": end,
+            "c": confidence,
+            "p": bool(partial),
+            "x": text,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        record = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        try:
+            with self._lock:
+                self._file.write(record)
+                self.records += 1
+            if self.durability_s == 0:
+                self.sync()
+        except (OSError, ValueError) as e:
+            print(f"Journal write error: {e}", file=sys.stderr)
+            return
+        self._dirty.set()
+
+    def sync(self):
+        """Write and fsync everything appended so far."""
+        with self._sync_lock:
+            with self._lock:
+                if self._file is None:
+                    return
+                self._file.flush()
+                fd = self._file.fileno()
+            # The fsync runs outside _lock so append() on the transcriber
+            # thread never waits on the disk; _sync_lock keeps close()
+            # from closing the fd underneath it
+            os.fsync(fd)
+            self.syncs += 1
+
+    def _flush_loop(self):
+        while not self._closing:
+            self._dirty.wait()
+            if self._closing:
+                break
+            # Group commit: let the window fill, then one write + fsync for all of it
+            time.sleep(self.durability_s)
+            self._dirty.clear()
+            try:
+                self.sync()
+            except (OSError, ValueError) as e:
+                print(f"Journal sync error: {e}", file=sys.stderr)
+
+    def close(self, delete: bool = False):
+        """Sync and close. delete=True removes the file (clean session end)."""
+        flusher, self._flusher = self._flusher, None
+        self._closing = True
+        self._dirty.set()
+        if flusher is not None:
+            flusher.join(timeout=2.0)
+        with self._sync_lock, self._lock:
+            if self._file is not None:
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self.syncs += 1
+                except (OSError, ValueError):
+                    pass
+                self._file.close()
+                self._file = None
+        if delete:
+            try:
+                self.path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def read_journal(path) -> List[dict]:
+    """Read every complete record; stops quietly at a torn/corrupt tail."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return []
+    records = []
+    pos = 0
+    while pos + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, pos)
+        start = pos + _HEADER.size
+        if length > MAX_RECORD_BYTES or start + length > len(data):
+            break
+        payload = data[start:start + length]
+        if zlib.crc32(payload) != crc:
+            break
+        try:
+            records.append(json.loads(payload))
+        except ValueError:
+            break
+        pos = start + length
+    return records
+
+
+def reconstruct_session(records: List[dict]) -> List[dict]:
+    """Final segments in order, plus the last partial if it came after them
+    (words that were on screen but never committed when the crash hit)."""
+    segments = []
+    trailing_partial = None
+    for r in records:
+        seg = {
+            "text": r.get("x", ""),
+            "start": r.get("s", 0.0),
+            "end": r.get("e", 0.0),
+            "confidence": r.get("c", 0.0),
+            "timestamp": r.get("t"),
+        }
+        if r.get("p"):
+            trailing_partial = seg
+        else:
+            segments.append(seg)
+            trailing_partial = None
+    if trailing_partial and trailing_partial["text"]:
+        segments.append({**trailing_partial, "partial": True})
+    return segments
+
+
+def recover_text(path) -> str:
+    """Plain transcript text recoverable from a journal file."""
+    return " ".join(s["text"] for s in reconstruct_session(read_journal(path)) if s["text"]).strip()
@@ -0,0 +1,114 @@
+"""
+Windy Word - Whisper Model Pool
+N CTranslate2 replicas of the same model behind one lease API.
+
+A single WhisperModel is shared by the live session, transcribe_blob,
+transcribe_upload and translate_blob; a long file upload holds it for
+minutes and live dictation stalls behind it. With `model_replicas > 1`
+the pool keeps replica 0 for the live session while one is running and
+routes one-shot jobs to the least-loaded of the others.
+
+CTranslate2 models are thread-safe — concurrent calls on one replica
+queue inside it (up to `num_workers` run in parallel) — so the pool
+never blocks; it only picks the replica and counts what is in flight,
+which is what /health reports as queue depth.
+
+Thread budget: `cpu_threads` is the TOTAL intra-op thread budget and is
+split evenly across replicas and their workers, so parallel decodes
+don't oversubscribe the cores. Each replica costs a full copy of the model in memory.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List
+
+
+class ModelReplica:
+    """One loaded model plus its load counters."""
+
+    def __init__(self, index: int, model):
+        self.index = index
+        self.model = model
+        self.in_flight = 0
+        self.completed = 0
+        self.busy_s = 0.0
+
+
+def split_threads(cpu_threads: int, replicas: int, workers: int = 1) -> int:
+    """Per-worker intra-op threads for a total budget (0 = all cores).
+
+    Each of a replica's `workers` runs its own decode with this many
+    threads, so the budget is split over replicas x workers. Returns 0
+    (CTranslate2's own default) for a single replica and worker with no
+    explicit budget.
+    """
+    lanes = max(1, replicas) * max(1, workers)
+    if cpu_threads <= 0:
+        if lanes == 1:
+            return 0
+        cpu_threads = os.cpu_count() or lanes
+    return max(1, cpu_threads // lanes)
+
+
+class ModelPool:
+    """Least-loaded routing over N model replicas, with a live-session lane."""
+
+    def __init__(self, models: List):
+        if not models:
+            raise ValueError("ModelPool needs at least one model")
+        self._replicas = [ModelReplica(i, m) for i, m in enumerate(models)]
+        self._lock = threading.Lock()
+        self.live_active = False  # Set by the transcriber while a session runs
+
+    @classmethod
+    def load(cls, factory: Callable[[int], object], replicas: int) -> "ModelPool":
+        """Build a pool by calling factory(index) once per replica."""
+        return cls([factory(i) for i in range(max(1, replicas))])
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def primary(self):
+        """Replica 0's model — the live-session model."""
+        return self._replicas[0].model
+
+    def _pick(self, live: bool) -> ModelReplica:
+        if live or len(self._replicas) == 1:
+            return self._replicas[0]
+        # Keep the live lane clear while dictation is running
+        candidates = self._replicas[1:] if self.live_active else self._replicas
+        return min(candidates, key=lambda r: (r.in_flight, r.index))
+
+    @contextmanager
+    def acquire(self, live: bool = False):
+        """Lease a model for one decode. Consume the segment generator
+        INSIDE the block — faster-whisper decodes lazily."""
+        with self._lock:
+            replica = self._pick(live)
+            replica.in_flight += 1
+        start = time.monotonic()
+        try:
+            yield replica.model
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                replica.in_flight -= 1
+                replica.completed += 1
+                replica.busy_s += elapsed
+
+    def stats(self) -> List[dict]:
+        """Per-replica queue depth and load, for /health."""
+        with self._lock:
+            return [
+                {
+                    "replica": r.index,
+                    "queue_depth": r.in_flight,
+                    "completed": r.completed,
+                    "busy_s": round(r.busy_s, 3),
+                    "live": r.index == 0 and (self.live_active or len(self._replicas) == 1),
+                }
+                for r in self._replicas
+            ]
@@ -0,0 +1,194 @@
+"""
+Windy Word - Broadcast Encodings
+Per-client wire formats for WindyServer._broadcast.
+
+JSON text frames stay the default. A client can ask for a binary encoding
+by offering a WebSocket subprotocol at connect time:
+
+    new WebSocket("ws://127.0.0.1:9876", ["windy.bin.v1"])
+
+- windy.bin.v1      compact little-endian layouts for the hot broadcasts
+                    (transcript, state, pong), defined in
+                    shared/schemas/engine-protocol-binary.json; anything
+                    else goes out as a JSON fallback frame
+- windy.msgpack.v1  every broadcast as a MessagePack map (only offered
+                    when msgpack is installed)
+
+Only broadcasts are affected; direct replies to commands stay JSON text
+frames, so a client tells them apart by frame type. Floats in bin.v1 are
+32-bit: timestamps and scores come back within ~1e-7 relative.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+BIN_V1 = "windy.bin.v1"
+MSGPACK_V1 = "windy.msgpack.v1"
+
+# The repo keeps shared/ next to src/; the desktop bundle ships engine/
+# and shared/ side by side under resources/
+_LAYOUT_CANDIDATES = [
+    Path(__file__).resolve().parent.parent.parent / 'shared' / 'schemas' / 'engine-protocol-binary.json',
+    Path(__file__).resolve().parent.parent / 'shared' / 'schemas' / 'engine-protocol-binary.json',
+]
+
+_SCALARS = {"bool": "B", "u8": "B", "u16": "H", "u32": "I", "f32": "f", "f64": "d"}
+_STRINGS = {"str8": "B", "str16": "H", "str32": "I"}
+_SWAP = sys.byteorder != "little"
+
+# Anything a malformed message can raise while packing
+_PACK_ERRORS = (struct.error, KeyError, TypeError, ValueError, AttributeError, OverflowError)
+
+
+class _Layout:
+    """A compiled layout: one struct for the header, column plans for lists."""
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.code = spec["code"]
+        self.fields = [(f[0], f[1], f[2] if len(f) > 2 else None) for f in spec["fields"]]
+        self.names = {f[0] for f in self.fields}
+        fmt = "<B"
+        for _name, kind, _sub in self.fields:
+            fmt += _SCALARS.get(kind) or _STRINGS.get(kind) or "H"
+        self.header = struct.Struct(fmt)
+
+    def encode(self, message: dict) -> bytes:
+        values = [self.code]
+        tail = []
+        for name, kind, sub in self.fields:
+            value = message[name]
+            if kind in _SCALARS:
+                values.append(value)
+            elif kind in _STRINGS:
+                data = value.encode("utf-8")
+                values.append(len(data))
+                tail.append(data)
+            else:
+                values.append(len(value))
+                for sub_name, sub_kind in sub:
+                    column = [item[sub_name] for item in value]
+                    if sub_kind in _SCALARS:
+                        tail.append(_pack_array(_SCALARS[sub_kind], column))
+                    else:
+                        data = [s.encode("utf-8") for s in column]
+                        tail.append(_pack_array(_STRINGS[sub_kind], [len(d) for d in data]))
+                        tail.extend(data)
+        return self.header.pack(*values) + b"".join(tail)
+
+    def decode(self, frame: bytes) -> dict:
+        values = self.header.unpack_from(frame)[1:]
+        pos = self.header.size
+        message = {"type": self.name}
+        lists = []
+        for (name, kind, sub), value in zip(self.fields, values):
+            if kind == "bool":
+                message[name] = bool(value)
+            elif kind in _SCALARS:
+                message[name] = value
+            elif kind in _STRINGS:
+                message[name] = frame[pos:pos + value].decode("utf-8")
+                pos += value
+            else:
+                lists.append((name, sub, value))
+        for name, sub, count in lists:
+            items = [{} for _ in range(count)]
+            for sub_name, sub_kind in sub:
+                code = _SCALARS.get(sub_kind) or _STRINGS[sub_kind]
+                column, pos = _unpack_array(code, frame, pos, count)
+                if sub_kind in _STRINGS:
+                    lengths, column = column, []
+                    for n in lengths:
+                        column.append(frame[pos:pos + n].decode("utf-8"))
+                        pos += n
+                for item, v in zip(items, column):
+                    item[sub_name] = bool(v) if sub_kind == "bool" else v
+            message[name] = items
+        return message
+
+
+def _pack_array(code: str, values) -> bytes:
+    packed = array(code, values)
+    if _SWAP:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_array(code: str, frame: bytes, pos: int, count: int):
+    column = array(code)
+    end = pos + count * column.itemsize
+    column.frombytes(frame[pos:end])
+    if _SWAP:
+        column.byteswap()
+    return column.tolist(), end
+
+
+def _load_layouts():
+    for path in _LAYOUT_CANDIDATES:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, ValueError):
+            continue
+        layouts = {name: _Layout(name, s) for name, s in spec.get("layouts", {}).items()}
+        return layouts, spec.get("frame", {}).get("fallbackCode", 0)
+    return None, 0
+
+
+_LAYOUTS, _FALLBACK_CODE = _load_layouts()
+_BY_CODE = {layout.code: layout for layout in (_LAYOUTS or {}).values()}
+
+# Offered encodings, preferred first when a client offers several
+SUBPROTOCOLS = ([BIN_V1] if _LAYOUTS is not None else []) + ([MSGPACK_V1] if MSGPACK_AVAILABLE else [])
+
+
+def select_subprotocol(offered) -> Optional[str]:
+    """The client's first offered encoding that this server supports, or None (JSON)."""
+    for name in offered or ():
+        if name in SUBPROTOCOLS:
+            return name
+    return None
+
+
+def encode(message: dict, subprotocol: Optional[str] = None) -> Union[str, bytes]:
+    """Serialize one broadcast for a client on `subprotocol` (None = JSON text)."""
+    if subprotocol == BIN_V1 and _LAYOUTS is not None:
+        layout = _LAYOUTS.get(message.get("type"))
+        if layout is not None and len(message) == len(layout.names) + 1 and layout.names.issubset(message):
+            try:
+                return layout.encode(message)
+            except _PACK_ERRORS:
+                pass  # e.g. a >255-byte str8; the fallback carries it
+        return bytes([_FALLBACK_CODE]) + json.dumps(message).encode("utf-8")
+    if subprotocol == MSGPACK_V1 and MSGPACK_AVAILABLE:
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message)
+
+
+def decode(frame: Union[str, bytes], subprotocol: Optional[str] = None) -> dict:
+    """Inverse of encode(); text frames are always JSON."""
+    if isinstance(frame, str):
+        return json.loads(frame)
+    if subprotocol == MSGPACK_V1:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack frame but msgpack is not installed")
+        return msgpack.unpackb(frame, raw=False)
+    if not frame:
+        raise ValueError("empty frame")
+    if frame[0] == _FALLBACK_CODE:
+        return json.loads(frame[1:].decode("utf-8"))
+    layout = _BY_CODE.get(frame[0])
+    if layout is None:
+        raise ValueError(f"unknown layout code {frame[0]}")
+    return layout.decode(frame)
@@ -29,6 +29,8 @@ import os
 from pathlib import Path
 from typing import Any, Iterable
 
+from . import protocol_codec
+
 # Module-level schema load — the file ships in the bundle, never
 # changes at runtime.
 _SCHEMA_PATH = Path(__file__).resolve().parent.parent.parent \
@@ -63,6 +65,7 @@ def _type_ok(value, expected) -> bool:
     if expected == 'number':  return isinstance(value, (int, float)) and not isinstance(value, bool)
     if expected == 'boolean': return isinstance(value, bool)
     if expected == 'null':    return value is None
+    if expected == 'array':   return isinstance(value, list)
     return True  # unknown → don't fail
 
 
@@ -140,3 +143,16 @@ def validate_server_message(msg: Any) -> list[str]:
         if field in msg:
             errs.extend(_validate_field(f"type={mtype}.{field}", msg[field], field_spec))
     return errs
+
+
+def validate_server_frame(frame: Any, subprotocol: str | None = None) -> list[str]:
+    """Validate one outbound frame as it goes over the wire: a JSON
+    text frame, or a binary frame in the client's negotiated encoding
+    (see protocol_codec). Decodes, then validate_server_message."""
+    if not _ENABLED:
+        return []
+    try:
+        msg = protocol_codec.decode(frame, subprotocol)
+    except Exception as e:
+        return [f"undecodable frame ({subprotocol or 'json'}): {e}"]
+    return validate_server_message(msg)
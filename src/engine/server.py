@@ -12,6 +12,7 @@ import json
 import sys
 import os
 import time
+import tempfile
 import http
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
@@ -28,9 +29,12 @@ except ImportError:
 WebSocketServerProtocol = Any
 
 from dataclasses import replace as _replace_config
-from .transcriber import StreamingTranscriber, TranscriberConfig, TranscriptionState
+from .transcriber import BACKLOG_POLICIES, StreamingTranscriber, TranscriberConfig, TranscriptionState
 from .vault import PromptVault
+from .journal import read_journal, reconstruct_session
 from .vibe import VibeProcessor
+from .file_transcriber import AV_AVAILABLE as UPLOAD_PIPELINE_AVAILABLE, UploadPipeline, transcribe_file
+from . import protocol_codec
 
 SERVER_VERSION = "0.3.0"
 
@@ -76,16 +80,20 @@ class WindyServer:
             # print(f"[DEBUG] _broadcast: NO clients to send to!")
             return
         
-        data = json.dumps(message)
-        # print(f"[DEBUG] _broadcast: sending {message.get('type','')} to {len(self.clients)} clients, data_len={len(data)}")
+        # Encode once per negotiated encoding, not once per client
+        frames = {}
+        sends = []
+        for client in list(self.clients):
+            encoding = getattr(client, 'subprotocol', None)
+            if encoding not in frames:
+                frames[encoding] = protocol_codec.encode(message, encoding)
+            sends.append(self._safe_send(client, frames[encoding]))
+        # print(f"[DEBUG] _broadcast: sending {message.get('type','')} to {len(self.clients)} clients")
         # Use _safe_send to gracefully handle dead connections
-        results = await asyncio.gather(
-            *[self._safe_send(client, data) for client in list(self.clients)],
-            return_exceptions=True
-        )
+        results = await asyncio.gather(*sends, return_exceptions=True)
         # print(f"[DEBUG] _broadcast: send complete, results={results}")
     
-    async def _safe_send(self, ws: WebSocketServerProtocol, data: str):
+    async def _safe_send(self, ws: WebSocketServerProtocol, data: str | bytes):
         """Send data to a single client, removing it on failure."""
         try:
             await ws.send(data)
@@ -115,6 +123,35 @@ class WindyServer:
         if self._loop and self._loop.is_running():
             asyncio.run_coroutine_threadsafe(coro, self._loop)
 
+    def _on_adjustment(self, adj, applied: bool):
+        """Called from the transcriber when the degradation controller changes
+        a setting. Never rate-limited: every change reaches the UI."""
+        msg = {
+            "type": "performance",
+            "ratio": round(adj.rtf, 2),
+            "model": self.transcriber.config.model_size if self.transcriber else None,
+            "recommend": None,
+            "status": adj.action if applied else "adjust_failed",
+            "adjustment": {**adj.to_dict(), "applied": applied}
+        }
+        coro = self._broadcast(msg)
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _on_backlog(self, report: dict):
+        """Called from the transcriber when live audio piles up (or drains)."""
+        coro = self._broadcast({"type": "backlog", **report})
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _wire_transcriber(self, transcriber: StreamingTranscriber):
+        """Register the server's callbacks on a (new) transcriber."""
+        transcriber.on_state_change(self._on_state_change)
+        transcriber.on_transcript(self._on_transcript)
+        transcriber.on_performance_warning(self._on_performance_warning)
+        transcriber.on_adjustment(self._on_adjustment)
+        transcriber.on_backlog(self._on_backlog)
+
     def _on_state_change(self, old_state: TranscriptionState, new_state: TranscriptionState):
         """Handle transcriber state changes (thread-safe)."""
         coro = self._broadcast({
@@ -142,9 +179,10 @@ class WindyServer:
             else:
                 segment.text = original_text
         
-        # Save to vault
+        # Save to vault — queued for the write-behind writer, so the
+        # broadcast below never waits on an fsync
         if self._current_session_id and not segment.is_partial:
-            self.vault.save_segment(
+            self.vault.queue_segment(
                 session_id=self._current_session_id,
                 text=segment.text,
                 start_time=segment.start_time,
@@ -174,7 +212,8 @@ class WindyServer:
         """Handle a client connection."""
         self.clients.add(websocket)
         client_addr = websocket.remote_address
-        print(f"Client connected: {client_addr}")
+        encoding = getattr(websocket, 'subprotocol', None)
+        print(f"Client connected: {client_addr} ({encoding or 'json'})")
         
         # Send current state
         await websocket.send(json.dumps({
@@ -209,6 +248,10 @@ class WindyServer:
             self.clients.discard(websocket)
             print(f"Client disconnected: {client_addr}")
     
+    async def _vault_call(self, fn, *args):
+        """Run a blocking vault method in the thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
     async def _handle_command(self, cmd: dict, websocket: WebSocketServerProtocol):
         """Handle a command from client."""
         # Protocol schema validation — gated on WINDY_VALIDATE_WS=1.
@@ -246,12 +289,11 @@ class WindyServer:
                     # transcriber's config is untouched until the load succeeds —
                     # otherwise a failed load leaves us reporting a model we never loaded.
                     if self._pending_device is not None:
-                        new_config = _replace_config(self.transcriber.config, model_size=self._pending_model, device=self._pending_device)
+                        new_config = _replace_config(self.transcriber.configured_config(), model_size=self._pending_model, device=self._pending_device)
                     else:
-                        new_config = _replace_config(self.transcriber.config, model_size=self._pending_model)
+                        new_config = _replace_config(self.transcriber.configured_config(), model_size=self._pending_model)
                     new_transcriber = StreamingTranscriber(new_config)
-                    new_transcriber.on_state_change(self._on_state_change)
-                    new_transcriber.on_transcript(self._on_transcript)
+                    self._wire_transcriber(new_transcriber)
 
                     # Load model in thread pool to avoid blocking event loop
                     loop = asyncio.get_event_loop()
@@ -274,7 +316,7 @@ class WindyServer:
                     self._pending_device = None
                 
                 self.transcriber.start_session()
-                self._current_session_id = self.vault.create_session()
+                self._current_session_id = await self._vault_call(self.vault.create_session)
                 self._session_start_time = time.monotonic()
                 await websocket.send(json.dumps({
                     "type": "ack",
@@ -303,7 +345,8 @@ class WindyServer:
                     print(f"Session ended: {word_count} words in {duration_s}s")
                     self._session_start_time = None
                 if self._current_session_id:
-                    self.vault.end_session(self._current_session_id)
+                    # end_session waits for queued segments — keep that off the loop
+                    await self._vault_call(self.vault.end_session, self._current_session_id)
                     self._current_session_id = None
                 await websocket.send(json.dumps({
                     "type": "ack",
@@ -331,6 +374,14 @@ class WindyServer:
                     applied["task"] = new_task
                     print(f"Task switched to: {new_task}")
 
+            # Streaming mode (sliding-window decoding) — read when a session
+            # starts, so a change mid-session applies to the next one
+            if "streaming" in config_data and self.transcriber:
+                self.transcriber.config.streaming = bool(config_data["streaming"])
+                applied["streaming"] = self.transcriber.config.streaming
+                if self.transcriber._running:
+                    applied["streaming_note"] = "Streaming change takes effect on next session start"
+
             # Vibe toggle (hot-swappable)
             if "vibe_enabled" in config_data:
                 self.vibe.enabled = config_data["vibe_enabled"]
@@ -367,11 +418,9 @@ class WindyServer:
                     
                     # Separate config so a failed load can't corrupt the live
                     # transcriber's reported model_size (it keeps the old, working model).
-                    new_config = _replace_config(self.transcriber.config, model_size=new_model)
+                    new_config = _replace_config(self.transcriber.configured_config(), model_size=new_model)
                     new_transcriber = StreamingTranscriber(new_config)
-                    new_transcriber.on_state_change(self._on_state_change)
-                    new_transcriber.on_transcript(self._on_transcript)
-                    new_transcriber.on_performance_warning(self._on_performance_warning)
+                    self._wire_transcriber(new_transcriber)
                     
                     loop = asyncio.get_event_loop()
                     success = await loop.run_in_executor(
@@ -407,18 +456,22 @@ class WindyServer:
             }))
         
         elif action == "recovery_check":
-            # T19: Check for crash recovery file
-            recovery_path = Path.home() / "windy_session.txt"
-            text = ""
-            if recovery_path.exists():
-                try:
-                    text = recovery_path.read_text().strip()
-                except Exception:
-                    pass
+            # T19: Check for a crash-recovery journal left by a session that
+            # never reached stop_session (never the live session's own journal)
+            if self.transcriber:
+                recovery_path = self.transcriber.get_session_file()
+            else:
+                recovery_path = Path(tempfile.gettempdir()) / "windy_session.journal"
+            segments = []
+            live = bool(self.transcriber and self.transcriber._running)
+            if not live and recovery_path.exists():
+                segments = reconstruct_session(read_journal(recovery_path))
+            text = " ".join(s["text"] for s in segments if s["text"]).strip()
             if text:
                 await websocket.send(json.dumps({
                     "type": "recovery_available",
-                    "text": text
+                    "text": text,
+                    "segments": segments
                 }))
                 # Remove recovery file after sending
                 try:
@@ -443,10 +496,12 @@ class WindyServer:
             }))
 
         # ═══ Vault Commands ═══
+        # SQLite reads (and waits on the vault's segment writer) run in the
+        # thread pool, never on the event loop
         elif action == "vault_list":
             limit = cmd.get("limit", 50)
             offset = cmd.get("offset", 0)
-            sessions = self.vault.get_sessions(limit, offset)
+            sessions = await self._vault_call(self.vault.get_sessions, limit, offset)
             await websocket.send(json.dumps({
                 "type": "vault_list",
                 "sessions": sessions
@@ -454,7 +509,7 @@ class WindyServer:
         
         elif action == "vault_get":
             session_id = cmd.get("session_id")
-            session = self.vault.get_session(session_id) if session_id else None
+            session = await self._vault_call(self.vault.get_session, session_id) if session_id else None
             await websocket.send(json.dumps({
                 "type": "vault_get",
                 "session": session
@@ -462,7 +517,7 @@ class WindyServer:
         
         elif action == "vault_search":
             query = cmd.get("query", "")
-            results = self.vault.search(query)
+            results = await self._vault_call(self.vault.search, query)
             await websocket.send(json.dumps({
                 "type": "vault_search",
                 "results": results
@@ -471,7 +526,7 @@ class WindyServer:
         elif action == "vault_export":
             session_id = cmd.get("session_id")
             fmt = cmd.get("format", "txt")
-            text = self.vault.export_session(session_id, fmt) if session_id else ""
+            text = await self._vault_call(self.vault.export_session, session_id, fmt) if session_id else ""
             await websocket.send(json.dumps({
                 "type": "vault_export",
                 "text": text,
@@ -480,7 +535,7 @@ class WindyServer:
         
         elif action == "vault_delete":
             session_id = cmd.get("session_id")
-            success = self.vault.delete_session(session_id) if session_id else False
+            success = await self._vault_call(self.vault.delete_session, session_id) if session_id else False
             await websocket.send(json.dumps({
                 "type": "vault_delete",
                 "success": success
@@ -497,7 +552,6 @@ class WindyServer:
                     # Wait for the next binary message (the raw audio blob — webm/opus)
                     audio_data = await websocket.recv()
                     if isinstance(audio_data, bytes) and len(audio_data) > 100:
-                        import tempfile
                         # Save raw audio to temp file (faster-whisper uses ffmpeg to decode)
                         tmp = tempfile.NamedTemporaryFile(suffix='.webm', delete=False)
                         tmp.write(audio_data)
@@ -507,17 +561,19 @@ class WindyServer:
                             lang = source_lang if source_lang not in ('auto', '') else None
                             # Run blocking inference off the event loop (see _transcribe_file_and_reply).
                             def _do_translate():
-                                segments, info = self.transcriber.model.transcribe(
-                                    tmp.name,  # File path — faster-whisper handles decoding via ffmpeg
-                                    language=lang,
-                                    task="translate",
-                                    beam_size=self.transcriber.config.beam_size,
-                                    vad_filter=True,
-                                    condition_on_previous_text=False,
-                                    no_speech_threshold=0.6,
-                                    log_prob_threshold=-1.0
-                                )
-                                txt = " ".join(seg.text.strip() for seg in segments if seg.text.strip())
+                                # One-shot jobs lease a non-live replica when the pool has one
+                                with self.transcriber.lease_model() as model:
+                                    segments, info = model.transcribe(
+                                        tmp.name,  # File path — faster-whisper handles decoding via ffmpeg
+                                        language=lang,
+                                        task="translate",
+                                        beam_size=self.transcriber.config.beam_size,
+                                        vad_filter=True,
+                                        condition_on_previous_text=False,
+                                        no_speech_threshold=0.6,
+                                        log_prob_threshold=-1.0
+                                    )
+                                    txt = " ".join(seg.text.strip() for seg in segments if seg.text.strip())
                                 return txt, (getattr(info, 'language', '') or '')
 
                             loop = asyncio.get_event_loop()
@@ -565,7 +621,6 @@ class WindyServer:
                 try:
                     audio_data = await websocket.recv()
                     if isinstance(audio_data, bytes) and len(audio_data) > 100:
-                        import tempfile
                         # Determine suffix from hint or default to .wav
                         fmt = cmd.get("format", "wav")
                         suffix = f".{fmt}" if fmt else ".wav"
@@ -597,18 +652,27 @@ class WindyServer:
             # Chunked upload for long recordings that exceed the single-frame WS
             # limit (max_size=50MB). Client sends this command, then N binary frames
             # (each < 50MB), then {"action": "transcribe_upload_end"}. Frames are
-            # streamed straight to disk so RAM stays bounded for multi-hour audio,
-            # then faster-whisper transcribes the reassembled file (it decodes
-            # incrementally, so a long file does not load fully into RAM).
+            # streamed straight to disk so RAM stays bounded while receiving.
+            # Pipelined (the default when PyAV is available; "pipeline": false
+            # to opt out), the frames are also decoded as they arrive and
+            # transcribed chunk by chunk during the upload; otherwise the
+            # reassembled file is decoded and transcribed in parallel chunks.
+            # Either way transcribe_progress messages report along the way.
             language = cmd.get("language", "en")
             if self.transcriber and self.transcriber.model:
-                import tempfile
                 fmt = cmd.get("format", "wav")
                 suffix = f".{fmt}" if fmt else ".wav"
                 tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
                 total = 0
                 MAX_UPLOAD = 2 * 1024 * 1024 * 1024  # 2GB hard safety cap (~17h opus)
                 aborted = False
+                job = self._file_job(websocket, language)
+                pipeline = None
+                if (self.transcriber.config.upload_pipeline and cmd.get("pipeline", True)
+                        and UPLOAD_PIPELINE_AVAILABLE):
+                    pipeline = UploadPipeline(job[0], workers=self.transcriber.file_workers(),
+                                              chunk_s=self.transcriber.config.file_chunk_s,
+                                              on_progress=job[1])
                 try:
                     while True:
                         part = await websocket.recv()
@@ -618,6 +682,8 @@ class WindyServer:
                                 aborted = True
                                 break
                             tmp.write(part)
+                            if pipeline is not None:
+                                pipeline.feed(part)
                         else:
                             try:
                                 ctrl = json.loads(part)
@@ -628,6 +694,8 @@ class WindyServer:
                             # ignore any other interleaved text frame
                     tmp.close()
                     if aborted:
+                        if pipeline is not None:
+                            pipeline.abort()
                         try: os.unlink(tmp.name)
                         except Exception: pass
                         await websocket.send(json.dumps({
@@ -636,8 +704,11 @@ class WindyServer:
                         }))
                     elif total > 100:
                         print(f"[upload] received {round(total/1048576,1)}MB, transcribing...", flush=True)
-                        await self._transcribe_file_and_reply(websocket, tmp.name, language)
+                        await self._transcribe_file_and_reply(websocket, tmp.name, language,
+                                                              pipeline=pipeline, job=job)
                     else:
+                        if pipeline is not None:
+                            pipeline.abort()
                         try: os.unlink(tmp.name)
                         except Exception: pass
                         await websocket.send(json.dumps({
@@ -646,6 +717,8 @@ class WindyServer:
                         }))
                 except Exception as e:
                     print(f"Transcribe upload error: {e}", file=sys.stderr)
+                    if pipeline is not None:
+                        pipeline.abort()
                     try:
                         tmp.close(); os.unlink(tmp.name)
                     except Exception:
@@ -664,20 +737,19 @@ class WindyServer:
                 "message": f"Unknown action: {action}"
             }))
     
-    async def _transcribe_file_and_reply(self, websocket, tmp_name, language):
-        """Transcribe an on-disk audio file with the loaded model and send the
-        transcribe_result. Shared by transcribe_blob (single frame) and
-        transcribe_upload (chunked, for recordings over the WS frame limit).
-        Always deletes the temp file when done."""
-        try:
-            lang = language if language not in ('auto', '') else None
-            # Run blocking CTranslate2 inference (AND generator consumption) OFF the
-            # event loop so the engine stays responsive — health, heartbeat, and a
-            # second request aren't frozen for the full duration of a long recording.
-            def _do_transcribe():
-                t0 = time.monotonic()
-                segments, info = self.transcriber.model.transcribe(
-                    tmp_name,
+    def _file_job(self, websocket, language):
+        """Model call and progress reporter for one file transcription:
+        (transcribe_chunk, on_progress, progress sends still in flight)."""
+        lang = language if language not in ('auto', '') else None
+        loop = asyncio.get_event_loop()
+        progress_sends = []
+
+        def _chunk(source):
+            # Off the live replica when the pool has more than one, so a
+            # long upload doesn't stall dictation
+            with self.transcriber.lease_model() as model:
+                segments, _info = model.transcribe(
+                    source,
                     language=lang,
                     task="transcribe",
                     beam_size=self.transcriber.config.beam_size,
@@ -686,25 +758,72 @@ class WindyServer:
                     no_speech_threshold=0.3,
                     log_prob_threshold=-1.0
                 )
-                txt = " ".join(seg.text.strip() for seg in segments if seg.text.strip())
-                el = round(time.monotonic() - t0, 2)
-                dur = getattr(info, 'duration', 0) or 0
-                return txt, el, dur
+                return [(seg.start, seg.end, seg.text) for seg in segments]
+
+        def _progress(report):
+            # Worker thread -> event loop; scheduled in order, awaited before the result
+            progress_sends.append(asyncio.run_coroutine_threadsafe(
+                websocket.send(json.dumps({"type": "transcribe_progress", **report})), loop))
+
+        return _chunk, _progress, progress_sends
 
+    async def _transcribe_file_and_reply(self, websocket, tmp_name, language, pipeline=None, job=None):
+        """Transcribe an on-disk audio file with the loaded model and send the
+        transcribe_result. Shared by transcribe_blob (single frame) and
+        transcribe_upload (chunked, for recordings over the WS frame limit).
+        Long files are split at pauses and decoded in parallel
+        (file_transcriber.py), with a transcribe_progress message per chunk.
+        With a `pipeline` (transcribe_upload's UploadPipeline, built from
+        `job`) most of the file is already transcribed; if it failed to
+        decode the stream, the file on disk is transcribed instead.
+        Always deletes the temp file when done."""
+        try:
+            chunk_fn, progress_fn, progress_sends = job or self._file_job(websocket, language)
             loop = asyncio.get_event_loop()
-            text, elapsed, audio_duration = await loop.run_in_executor(None, _do_transcribe)
+            t0 = time.monotonic()
+
+            # Run blocking CTranslate2 inference (AND generator consumption) OFF the
+            # event loop so the engine stays responsive — health, heartbeat, and a
+            # second request aren't frozen for the full duration of a long recording.
+            def _do_transcribe():
+                if pipeline is not None:
+                    try:
+                        return pipeline.finish(), True
+                    except Exception as e:
+                        print(f"[upload] streamed decode failed ({e}); transcribing the file", file=sys.stderr)
+                return transcribe_file(
+                    tmp_name, chunk_fn,
+                    workers=self.transcriber.file_workers(),
+                    chunk_s=self.transcriber.config.file_chunk_s,
+                    on_progress=progress_fn,
+                ), False
+
+            result, pipelined = await loop.run_in_executor(None, _do_transcribe)
+            if progress_sends:
+                await asyncio.gather(*(asyncio.wrap_future(f) for f in progress_sends),
+                                     return_exceptions=True)
+            # Pipelined, elapsed_s runs from the start of the upload; wait_s
+            # is only the time after its last frame
+            elapsed = round(time.monotonic() - (pipeline.started if pipelined else t0), 2)
+            text, audio_duration = result.text, result.duration_s
             ratio = round(elapsed / max(audio_duration, 0.01), 2)
 
             await websocket.send(json.dumps({
                 "type": "transcribe_result",
                 "text": text,
+                "segments": result.segments,
                 "elapsed_s": elapsed,
+                "wait_s": round(time.monotonic() - t0, 2),
                 "audio_duration_s": round(audio_duration, 1),
                 "ratio": ratio,
+                "chunks": result.chunks,
+                "workers": result.workers,
+                "pipelined": pipelined,
                 "model": self.transcriber.config.model_size,
                 "engine": "local-whisper-ws"
             }))
-            print(f"🎤 Batch transcribe: {len(text)} chars in {elapsed}s (ratio {ratio}, model {self.transcriber.config.model_size})")
+            print(f"🎤 Batch transcribe: {len(text)} chars in {elapsed}s (ratio {ratio}, model {self.transcriber.config.model_size}, "
+                  f"{result.chunks} chunk(s) x{result.workers}{', pipelined' if pipelined else ''})")
         finally:
             try:
                 os.unlink(tmp_name)
@@ -733,9 +852,7 @@ class WindyServer:
         # Initialize transcriber
         config = self._model_config
         self.transcriber = StreamingTranscriber(config)
-        self.transcriber.on_state_change(self._on_state_change)
-        self.transcriber.on_transcript(self._on_transcript)
-        self.transcriber.on_performance_warning(self._on_performance_warning)
+        self._wire_transcriber(self.transcriber)
 
         # Optional test/CI bypass for model loading
         skip_model_load = os.environ.get("WINDY_SKIP_MODEL_LOAD", "0") in ("1", "true", "yes")
@@ -783,6 +900,9 @@ class WindyServer:
                     # Anything else falls through to the default
                     # handshake path for real WS clients.
                     process_request=self._process_request,
+                    # Broadcast encoding, negotiated per client; clients
+                    # that offer nothing we know stay on JSON
+                    select_subprotocol=self._select_subprotocol,
                 )
                 break  # Success
             except OSError as e:
@@ -913,6 +1033,10 @@ class WindyServer:
         else:
             status = 'ok'
         cfg = getattr(self, '_model_config', None)
+        pool_stats = getattr(self.transcriber, 'pool_stats', None)
+        adaptive_stats = getattr(self.transcriber, 'adaptive_stats', None)
+        backlog_stats = getattr(self.transcriber, 'backlog_stats', None)
+        vad_gate_stats = getattr(self.transcriber, 'vad_gate_stats', None)
         uptime = time.monotonic() - getattr(self, '_started_monotonic', time.monotonic())
         return {
             'status': status,
@@ -921,6 +1045,11 @@ class WindyServer:
             'model': getattr(cfg, 'model_size', None) if cfg else None,
             'device': getattr(cfg, 'device', None) if cfg else None,
             'clients': len(self.clients),
+            'replicas': pool_stats() if callable(pool_stats) else [],
+            'adaptive': adaptive_stats() if callable(adaptive_stats) else {'enabled': False},
+            'backlog': backlog_stats() if callable(backlog_stats) else None,
+            'vad_gate': vad_gate_stats() if callable(vad_gate_stats) else {'enabled': False},
+            'encodings': ['json'] + protocol_codec.SUBPROTOCOLS,
             'version': SERVER_VERSION,
             'error': self._load_error,
         }
@@ -959,6 +1088,10 @@ class WindyServer:
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 pass  # No port cleanup tools available
     
+    def _select_subprotocol(self, connection, subprotocols):
+        """websockets hook: pick the client's broadcast encoding (None = JSON)."""
+        return protocol_codec.select_subprotocol(subprotocols)
+
     async def _heartbeat_loop(self):
         """Send heartbeat ping every 15s to detect zombie connections."""
         while True:
@@ -985,6 +1118,8 @@ class WindyServer:
             self._health_http_server = None
         if self.transcriber:
             self.transcriber.stop_session()
+        # Drain the write-behind queue (stop_session may have emitted finals)
+        self.vault.flush(timeout=5.0)
 
 
 async def main():
@@ -997,12 +1132,51 @@ async def main():
     parser.add_argument("--model", default="base", help="Whisper model size")
     parser.add_argument("--device", default="auto", help="Device (auto/cpu/cuda)")
     parser.add_argument("--language", default="en", help="Language code")
+    parser.add_argument("--streaming", action="store_true",
+                        default=os.environ.get("WINDY_STREAMING", "0") in ("1", "true", "yes"),
+                        help="Sliding-window streaming decode (low-latency partials)")
+    parser.add_argument("--replicas", type=int, default=int(os.environ.get("WINDY_MODEL_REPLICAS", "1")),
+                        help="Model replicas (>1 keeps file jobs off the live-dictation model)")
+    parser.add_argument("--cpu-threads", type=int, default=int(os.environ.get("WINDY_CPU_THREADS", "0")),
+                        help="Total CPU threads, split across replicas (0 = default)")
+    parser.add_argument("--num-workers", type=int, default=int(os.environ.get("WINDY_NUM_WORKERS", "1")),
+                        help="Concurrent decodes per replica")
+    parser.add_argument("--file-workers", type=int, default=int(os.environ.get("WINDY_FILE_WORKERS", "0")),
+                        help="Parallel chunk decodes for long uploads (0 = replicas x num-workers)")
+    parser.add_argument("--no-upload-pipeline", dest="upload_pipeline", action="store_false",
+                        default=os.environ.get("WINDY_UPLOAD_PIPELINE", "1") not in ("0", "false", "no"),
+                        help="Transcribe uploads only after they finish instead of while they arrive")
+    parser.add_argument("--no-adaptive", dest="adaptive", action="store_false",
+                        default=os.environ.get("WINDY_ADAPTIVE", "1") not in ("0", "false", "no"),
+                        help="Don't lower beam / chunk / model automatically when falling behind real time")
+    parser.add_argument("--backlog-policy", choices=BACKLOG_POLICIES,
+                        default=os.environ.get("WINDY_BACKLOG_POLICY", "drop_oldest"),
+                        help="What to give up when transcription falls more than --max-backlog-s behind")
+    parser.add_argument("--max-backlog-s", type=float, default=float(os.environ.get("WINDY_MAX_BACKLOG_S", "10")),
+                        help="Seconds of untranscribed audio before the backlog policy kicks in")
+    parser.add_argument("--no-vad-gate", dest="vad_gate", action="store_false",
+                        default=os.environ.get("WINDY_VAD_GATE", "1") not in ("0", "false", "no"),
+                        help="Send all live audio to the model instead of speech only")
+    parser.add_argument("--segmentation", choices=("utterance", "fixed"),
+                        default=os.environ.get("WINDY_SEGMENTATION", "utterance"),
+                        help="Chunked mode: end model calls at pauses (utterance) or every chunk (fixed)")
     args = parser.parse_args()
     
     config = TranscriberConfig(
         model_size=args.model,
         device=args.device,
-        language=args.language
+        language=args.language,
+        streaming=args.streaming,
+        model_replicas=args.replicas,
+        cpu_threads=args.cpu_threads,
+        num_workers=args.num_workers,
+        file_workers=args.file_workers,
+        upload_pipeline=args.upload_pipeline,
+        adaptive=args.adaptive,
+        backlog_policy=args.backlog_policy,
+        max_backlog_s=args.max_backlog_s,
+        vad_gate=args.vad_gate,
+        segmentation=args.segmentation
     )
     
     server = WindyServer(host=args.host, port=args.port)
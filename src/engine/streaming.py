@@ -0,0 +1,117 @@
+"""
+Windy Word - Streaming Hypothesis Stabiliser
+LocalAgreement-2 commit policy for sliding-window re-decoding.
+
+The live path re-decodes a rolling audio window every few hundred
+milliseconds. Each decode produces a word-level hypothesis for the
+whole window; words that two consecutive decodes agree on (as a common
+prefix) are committed and never revised, the rest is shown to the user
+as a partial. This is the "LocalAgreement-2" policy from the
+whisper_streaming paper (Macháček et al., 2023).
+
+All timestamps handled here are ABSOLUTE session times — the transcriber
+adds the window offset before inserting, so trimming audio off the front
+of the window never invalidates what has already been committed.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class StreamWord:
+    """One word of a decoder hypothesis (absolute session time)."""
+    start: float
+    end: float
+    word: str
+    prob: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Comparison key. Punctuation is kept on purpose: Whisper puts a
+        false period on the last word of a window, and the next decode
+        (which sees the sentence continue) disagrees, so that period is
+        never committed."""
+        return self.word.strip()
+
+
+class LocalAgreement:
+    """
+    Commit the longest common prefix of consecutive hypotheses.
+
+    Usage per decode:
+        committed = agreement.insert(words)   # newly stable words
+        partial = agreement.tentative         # still-revisable tail
+    """
+
+    # Words starting this far before the last commit are treated as
+    # re-decodes of already committed audio and dropped.
+    OVERLAP_TOLERANCE_S = 0.1
+    # Longest n-gram checked when de-duplicating the window head against
+    # the committed tail.
+    MAX_NGRAM = 5
+
+    def __init__(self, prompt_words: int = 50):
+        self._previous: List[StreamWord] = []
+        self._committed_tail = deque(maxlen=max(prompt_words, self.MAX_NGRAM))
+        self.last_committed_end = 0.0
+
+    @property
+    def tentative(self) -> List[StreamWord]:
+        """Uncommitted tail of the most recent hypothesis."""
+        return list(self._previous)
+
+    def prompt(self, max_chars: int = 200) -> str:
+        """Recently committed text, for use as the decoder's initial prompt."""
+        text = "".join(w.word for w in self._committed_tail).strip()
+        return text[-max_chars:]
+
+    def _new_words(self, words: List[StreamWord]) -> List[StreamWord]:
+        """Drop words that belong to audio already committed."""
+        new = [w for w in words
+               if w.start > self.last_committed_end - self.OVERLAP_TOLERANCE_S]
+        if new and self._committed_tail and abs(new[0].start - self.last_committed_end) < 1.0:
+            # The window may still contain the tail of the last commit
+            # (e.g. a word that straddled the trim point) — drop the
+            # longest n-gram that repeats it.
+            tail = list(self._committed_tail)
+            for n in range(min(len(tail), len(new), self.MAX_NGRAM), 0, -1):
+                if [w.key for w in tail[-n:]] == [w.key for w in new[:n]]:
+                    new = new[n:]
+                    break
+        return new
+
+    def _commit(self, words: List[StreamWord]) -> List[StreamWord]:
+        for w in words:
+            self._committed_tail.append(w)
+        if words:
+            self.last_committed_end = words[-1].end
+        return words
+
+    def insert(self, words: List[StreamWord]) -> List[StreamWord]:
+        """Feed one hypothesis; returns the words that became stable."""
+        new = self._new_words(words)
+        agreed = 0
+        for prev, cur in zip(self._previous, new):
+            if prev.key != cur.key:
+                break
+            agreed += 1
+        self._previous = new[agreed:]
+        return self._commit(new[:agreed])
+
+    def finalize(self, words: Optional[List[StreamWord]] = None) -> List[StreamWord]:
+        """Commit everything that is left (end of session / forced flush).
+
+        With `words`, that final hypothesis replaces the pending one —
+        it saw the most audio, so it wins.
+        """
+        pending = self._new_words(words) if words is not None else self._previous
+        self._previous = []
+        return self._commit(list(pending))
+
+    def reset(self):
+        """Forget all state (new session)."""
+        self._previous = []
+        self._committed_tail.clear()
+        self.last_committed_end = 0.0
@@ -14,12 +14,19 @@ import sys
 import time
 import tempfile
 import threading
-import queue
+from contextlib import nullcontext
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Generator, Callable, Optional, List
 from enum import Enum
 
+from .audio_buffer import PcmRingBuffer
+from .degradation import Adjustment, DegradationController
+from .journal import SessionJournal
+from .model_pool import ModelPool, split_threads
+from .streaming import LocalAgreement, StreamWord
+from .vad import StreamingVad, find_pause, quietest_point
+
 # Optional imports with graceful fallback
 try:
     from faster_whisper import WhisperModel
@@ -46,6 +53,11 @@ def _resolve_model_ref(model_size):
                 return cand
     return model_size
 
+
+def _model_is_local(model_size) -> bool:
+    """Whether model_size loads without a download (bundled or user copy)."""
+    return os.path.isdir(str(_resolve_model_ref(model_size)))
+
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
@@ -54,6 +66,26 @@ except ImportError:
     np = None
 
 
+def _peak(audio_np) -> float:
+    """Peak absolute amplitude without allocating an abs() copy of the chunk."""
+    return max(float(audio_np.max()), -float(audio_np.min()))
+
+
+def _speech_mask(audio_np, threshold: float, sample_rate: int = 16000,
+                 frame_s: float = 0.02, pad_s: float = 0.2):
+    """Per-sample mask, True within pad_s of any 20ms frame whose RMS reaches
+    threshold — cheap energy VAD for cutting silence out of a backlog."""
+    frame = int(sample_rate * frame_s)
+    n_frames = audio_np.size // frame
+    frames = audio_np[:n_frames * frame].reshape(n_frames, frame)
+    speech = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame) >= threshold
+    pad = int(pad_s / frame_s)
+    if pad and n_frames:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode="same") > 0
+    # The partial frame at the end stays: more audio may follow it
+    return np.concatenate((np.repeat(speech, frame), np.ones(audio_np.size - n_frames * frame, dtype=bool)))
+
+
 class TranscriptionState(Enum):
     """State machine states for trustable UI feedback."""
     IDLE = "idle"           # Gray - not recording
@@ -76,6 +108,15 @@ class TranscriptionSegment:
     language_probability: float = 0.0
 
 
+# drop_oldest  — discard the oldest audio down to max_backlog_s
+# skip_silence — cut silent stretches out of the backlog first, then drop oldest
+# degrade      — keep every sample and catch up with greedy (beam 1) decoding
+BACKLOG_POLICIES = ("drop_oldest", "skip_silence", "degrade")
+
+# Minimum seconds between "behind" / "overflow" backlog reports
+BACKLOG_REPORT_INTERVAL_S = 2.0
+
+
 @dataclass
 class TranscriberConfig:
     """Configuration for the transcription engine."""
@@ -86,9 +127,54 @@ class TranscriberConfig:
     task: str = "transcribe"  # 'transcribe' or 'translate' (translate = any language → English)
     vad_enabled: bool = True
     vad_threshold: float = 0.5
-    temp_file_path: Optional[str] = None  # For crash recovery
-    chunk_length_s: float = 3.0  # Audio chunk length — 3s balances quality with latency
+    # Live-path energy gate (vad.py): only speech reaches the ring buffer and
+    # the model; a pause of vad_gate_hangover_s ends the utterance. With the
+    # gate on, faster-whisper's own Silero pass is skipped on live decodes.
+    vad_gate: bool = True
+    vad_gate_hangover_s: float = 0.5
+    vad_gate_min_rms: float = 0.003  # ~-50 dBFS; the adaptive noise floor usually sits above it
+    temp_file_path: Optional[str] = None  # Crash-recovery journal path
+    journal_durability_ms: float = 200.0  # Group-commit window: max transcript lost on a crash (0 = fsync every segment)
+    chunk_length_s: float = 3.0  # Fixed chunk length; the shortest utterance cut inside continuous speech
+    # Chunked-mode segmentation. "utterance": a model call ends at a pause —
+    # the VAD gate's utterance end, or, once chunk_length_s is buffered, the
+    # first pause of utterance_pause_s — and at the quietest point by
+    # utterance_max_s. "fixed": every chunk_length_s.
+    segmentation: str = "utterance"
+    utterance_pause_s: float = 0.2
+    utterance_max_s: float = 8.0
     beam_size: int = 5  # beam=5 (Whisper default) for good accuracy
+    # Streaming mode: re-decode a rolling window every stream_step_s and commit
+    # words once two consecutive decodes agree (LocalAgreement-2). Partials
+    # appear within ~0.5s instead of after a full chunk_length_s buffer.
+    streaming: bool = False
+    stream_step_s: float = 0.5        # Minimum new audio between re-decodes
+    stream_max_window_s: float = 15.0  # Force-commit if nothing stabilises this long
+    stream_beam_size: int = 1         # Greedy re-decodes keep total decoder work at or below chunked beam=5
+    ring_buffer_s: float = 30.0  # Capacity of the live audio ring buffer (seconds)
+    # Model pool: with >1 replica, file/blob jobs run on their own replica
+    # so they can't stall live dictation (each replica is a full model copy).
+    model_replicas: int = 1
+    cpu_threads: int = 0   # TOTAL intra-op threads, split across replicas x workers (0 = CTranslate2 default)
+    num_workers: int = 1   # Concurrent decodes per replica
+    # Long uploads (file_transcriber.py): split at pauses into chunks of at
+    # most file_chunk_s, decoded file_workers at a time (0 = one per
+    # replica worker available to file jobs)
+    file_workers: int = 0
+    file_chunk_s: float = 120.0
+    upload_pipeline: bool = True  # Decode and transcribe transcribe_upload frames as they arrive
+    # Adaptive degradation: when the rolling real-time factor stays above
+    # adaptive_high_rtf, step beam -> chunk length -> smaller model; undo
+    # the steps once it stays below adaptive_low_rtf (see degradation.py)
+    adaptive: bool = True
+    adaptive_high_rtf: float = 0.9
+    adaptive_low_rtf: float = 0.5
+    # Backpressure: what the chunked loop does once more than max_backlog_s of
+    # audio is waiting (see BACKLOG_POLICIES). ring_buffer_s is the hard cap
+    # for every policy; audio past it is dropped oldest-first on write.
+    backlog_policy: str = "drop_oldest"
+    max_backlog_s: float = 10.0
+    silence_rms_threshold: float = 0.01  # ~-40 dBFS; quieter 20ms frames count as silence
 
 
 class StreamingTranscriber:
@@ -105,26 +191,44 @@ class StreamingTranscriber:
     def __init__(self, config: TranscriberConfig = None):
         self.config = config or TranscriberConfig()
         self.model = None
+        self._pool: Optional[ModelPool] = None
         self.state = TranscriptionState.IDLE
         self._state_callbacks: List[Callable] = []
         self._transcript_callbacks: List[Callable] = []
-        self._audio_queue = queue.Queue()
+        # Preallocated ring shared by feed_audio, the worker and stop_session
+        # (replaces a Queue of bytes re-joined into an ever-copied buffer)
+        self._audio_ring = PcmRingBuffer(capacity_s=self.config.ring_buffer_s) if NUMPY_AVAILABLE else None
+        self._gate = StreamingVad(
+            min_rms=self.config.vad_gate_min_rms,
+            hangover_s=self.config.vad_gate_hangover_s
+        ) if self.config.vad_gate and NUMPY_AVAILABLE else None
+        self._utterance_end = threading.Event()  # Set by the gate at each pause
         self._running = False
         self._worker_thread = None
-        self._buffer_lock = threading.Lock()  # Thread-safe audio buffer access
         self._consecutive_errors = 0
         self._max_consecutive_errors = 5
         
-        # Crash recovery: temp file for continuous writes
+        # Crash recovery: append-only journal, group-committed off the hot path
         if self.config.temp_file_path:
             self._temp_file = Path(self.config.temp_file_path)
         else:
-            self._temp_file = Path(tempfile.gettempdir()) / "windy_session.txt"
+            self._temp_file = Path(tempfile.gettempdir()) / "windy_session.journal"
+        self._journal = SessionJournal(self._temp_file, self.config.journal_durability_ms)
         
         # Accumulated transcript for the session
         self._full_transcript = []
         self._on_performance_warning_cb = None
         self._perf_ratios = []
+        self._adjustment_callbacks: List[Callable] = []
+        self._backlog_callbacks: List[Callable] = []
+        self._peak_lag_s = 0.0
+        self._behind = False
+        self._last_backlog_report = 0.0
+        self._degrader = DegradationController(
+            high_rtf=self.config.adaptive_high_rtf,
+            low_rtf=self.config.adaptive_low_rtf,
+            model_available=_model_is_local
+        ) if self.config.adaptive else None
         self._detected_language = ''  # Last detected language code
         self._language_probability = 0.0
     
@@ -161,6 +265,77 @@ class StreamingTranscriber:
         """Register a callback for performance warnings (ratio, model, recommendation)."""
         self._on_performance_warning_cb = callback
     
+    def on_adjustment(self, callback: Callable):
+        """Register a callback for adaptive setting changes (Adjustment, applied)."""
+        self._adjustment_callbacks.append(callback)
+    
+    def on_backlog(self, callback: Callable):
+        """Register a callback for backlog reports (backlog_stats() + "action")."""
+        self._backlog_callbacks.append(callback)
+    
+    def backlog_stats(self) -> dict:
+        """Audio waiting to be transcribed, in seconds, and what the policy discarded."""
+        ring = self._audio_ring
+        stats = {
+            "policy": self.config.backlog_policy,
+            "max_backlog_s": self.config.max_backlog_s,
+            "lag_s": 0.0,
+            "peak_lag_s": round(self._peak_lag_s, 2),
+            "dropped_s": 0.0,
+            "skipped_silence_s": 0.0,
+        }
+        if ring is not None:
+            stats["lag_s"] = round(ring.duration_s, 2)
+            stats["dropped_s"] = round(ring.dropped_samples / ring.sample_rate, 2)
+            stats["skipped_silence_s"] = round(ring.compacted_samples / ring.sample_rate, 2)
+        return stats
+    
+    def _report_backlog(self, action: str, throttle: bool = False):
+        now = time.monotonic()
+        if throttle and now - self._last_backlog_report < BACKLOG_REPORT_INTERVAL_S:
+            return
+        self._last_backlog_report = now
+        report = {**self.backlog_stats(), "action": action}
+        for callback in self._backlog_callbacks:
+            try:
+                callback(report)
+            except Exception as e:
+                print(f"Backlog callback error: {e}", file=sys.stderr)
+    
+    def _note_lag(self, lag_samples: int, sample_rate: int):
+        """Track lag (undecoded audio) and report falling behind / catching up."""
+        lag_s = lag_samples / sample_rate
+        self._peak_lag_s = max(self._peak_lag_s, lag_s)
+        step_s = self.config.stream_step_s if self.config.streaming else self.config.chunk_length_s
+        behind_s = 2 * step_s
+        if not self.config.streaming and self.config.segmentation == "utterance":
+            behind_s = max(behind_s, self.config.utterance_max_s)  # An utterance may buffer this long
+        if lag_s > behind_s:
+            self._behind = True
+            self._report_backlog("behind", throttle=True)
+        elif self._behind and lag_s <= step_s:
+            self._behind = False
+            self._report_backlog("caught_up")
+    
+    def _relieve_backlog(self, ring, limit: int):
+        """Apply config.backlog_policy to a backlog longer than `limit` samples.
+        
+        Returns (samples to process now, beam size override or None).
+        """
+        policy = self.config.backlog_policy
+        if policy == "degrade":
+            # Nothing is dropped here; the ring's capacity is the only cap
+            self._report_backlog("degrade", throttle=True)
+            return len(ring), 1
+        action = "drop_oldest"
+        if policy == "skip_silence":
+            ring.compact(_speech_mask(ring.view(), self.config.silence_rms_threshold))
+            action = "skip_silence"
+        if len(ring) > limit:
+            ring.discard_oldest(limit)
+        self._report_backlog(action)
+        return min(len(ring), limit), None
+    
     def _emit_segment(self, segment: TranscriptionSegment):
         """Emit a transcript segment to callbacks and temp file."""
         # Always write to temp file first (crash recovery)
@@ -178,16 +353,17 @@ class StreamingTranscriber:
                 print(f"Transcript callback error: {e}", file=sys.stderr)
     
     def _write_to_temp(self, segment: TranscriptionSegment):
-        """Write segment to temp file for crash recovery."""
-        try:
-            mode = "a" if self._temp_file.exists() else "w"
-            with open(self._temp_file, mode, encoding="utf-8") as f:
-                prefix = "[partial] " if segment.is_partial else ""
-                f.write(f"{prefix}{segment.text}\n")
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk
-        except Exception as e:
-            print(f"Temp file write error: {e}", file=sys.stderr)
+        """Journal segment for crash recovery (buffered; fsync is group-committed).
+        
+        A no-op outside a session — the journal is opened by start_session.
+        """
+        self._journal.append(
+            segment.text,
+            segment.start_time,
+            segment.end_time,
+            segment.confidence,
+            segment.is_partial
+        )
     
     def load_model(self) -> bool:
         """Load the Whisper model based on config."""
@@ -198,29 +374,8 @@ class StreamingTranscriber:
         
         try:
             self._set_state(TranscriptionState.BUFFERING)
-            
-            # Auto-detect device
-            device = self.config.device
-            if device == "auto":
-                try:
-                    import torch
-                    device = "cuda" if torch.cuda.is_available() else "cpu"
-                except ImportError:
-                    device = "cpu"
-            
-            # Auto-detect compute type
-            compute_type = self.config.compute_type
-            if compute_type == "auto":
-                compute_type = "float16" if device == "cuda" else "int8"
-            
-            model_ref = _resolve_model_ref(self.config.model_size)
-            print(f"Loading model: {self.config.model_size} -> {model_ref} on {device} ({compute_type})")
-
-            self.model = WhisperModel(
-                model_ref,
-                device=device,
-                compute_type=compute_type
-            )
+            self._pool = self._load_pool(self.config)
+            self.model = self._pool.primary
             
             self._set_state(TranscriptionState.IDLE)
             print(f"Model loaded successfully")
@@ -231,19 +386,122 @@ class StreamingTranscriber:
             print(f"Failed to load model: {e}", file=sys.stderr)
             return False
     
+    def _load_pool(self, config: TranscriberConfig) -> ModelPool:
+        """Build the replica pool for config (raises on failure)."""
+        # Auto-detect device
+        device = config.device
+        if device == "auto":
+            try:
+                import torch
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+            except ImportError:
+                device = "cpu"
+        
+        # Auto-detect compute type
+        compute_type = config.compute_type
+        if compute_type == "auto":
+            compute_type = "float16" if device == "cuda" else "int8"
+        
+        model_ref = _resolve_model_ref(config.model_size)
+        replicas = max(1, config.model_replicas)
+        threads = split_threads(config.cpu_threads, replicas, config.num_workers)
+        print(f"Loading model: {config.model_size} -> {model_ref} on {device} ({compute_type})"
+              f" x{replicas} replica(s), cpu_threads={threads or 'default'}, num_workers={config.num_workers}")
+
+        return ModelPool.load(
+            lambda _i: WhisperModel(
+                model_ref,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=threads,
+                num_workers=max(1, config.num_workers)
+            ),
+            replicas
+        )
+    
+    def swap_model(self, model_size: str) -> bool:
+        """Load model_size alongside the current model and switch to it.
+        
+        Safe while a session is running: decodes keep using the old pool
+        until the new one is loaded, and leases already taken finish on
+        the replica they hold. Memory peaks at both models for the load.
+        """
+        if not FASTER_WHISPER_AVAILABLE:
+            return False
+        try:
+            pool = self._load_pool(replace(self.config, model_size=model_size))
+        except Exception as e:
+            print(f"Failed to load model {model_size}: {e}", file=sys.stderr)
+            return False
+        if self._pool is not None:
+            pool.live_active = self._pool.live_active
+        self._pool = pool
+        self.model = pool.primary
+        self.config.model_size = model_size
+        return True
+    
+    def configured_config(self) -> TranscriberConfig:
+        """Copy of the config with adaptive degradations undone — the base
+        for a rebuilt transcriber, so it doesn't inherit a degraded beam."""
+        base = self._degrader.baseline() if self._degrader else {}
+        return replace(self.config, **base)
+    
+    def vad_gate_stats(self) -> dict:
+        """Speech vs. gated-out silence for /health."""
+        if self._gate is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._gate.stats()}
+    
+    def adaptive_stats(self) -> dict:
+        """Degradation state for /health."""
+        if self._degrader is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._degrader.stats()}
+    
+    def lease_model(self, live: bool = False):
+        """Context manager yielding a model replica for one decode.
+        
+        live=True is the dictation lane (replica 0); one-shot jobs get the
+        least-loaded other replica. Without a pool (single model set
+        directly) this just yields self.model.
+        """
+        if self._pool is None:
+            return nullcontext(self.model)
+        return self._pool.acquire(live=live)
+    
+    def file_workers(self) -> int:
+        """Parallel decodes for a file job: config.file_workers, or every
+        replica worker not reserved for a running live session."""
+        if self.config.file_workers > 0:
+            return self.config.file_workers
+        replicas = len(self._pool) if self._pool is not None else 1
+        if replicas > 1 and self._pool.live_active:
+            replicas -= 1
+        return replicas * max(1, self.config.num_workers)
+    
+    def pool_stats(self) -> List[dict]:
+        """Per-replica queue depth for /health ([] before the model loads)."""
+        return self._pool.stats() if self._pool is not None else []
+    
     def start_session(self):
         """Start a new transcription session."""
         if self._running:
             return
         
-        # Clear temp file for new session
-        try:
-            self._temp_file.unlink(missing_ok=True)
-        except:
-            pass
+        # Fresh journal for the new session (truncates the previous one)
+        self._journal.open()
         
         self._full_transcript = []
+        if self._audio_ring is not None:
+            self._audio_ring.clear()
+        self._peak_lag_s = 0.0
+        self._behind = False
+        if self._gate is not None:
+            self._gate.reset()
+        self._utterance_end.clear()
         self._running = True
+        if self._pool is not None:
+            self._pool.live_active = True
         self._worker_thread = threading.Thread(target=self._process_audio_loop)
         self._worker_thread.daemon = True
         self._worker_thread.start()
@@ -259,123 +517,172 @@ class StreamingTranscriber:
         """
         self._running = False
         
-        # Do NOT flush the queue — let the worker thread drain it.
+        # Do NOT clear the ring buffer — let the worker thread drain it.
         # Signal stop by setting _running=False; the worker loop
         # will finish its current chunk and exit.
         
         self._set_state(TranscriptionState.BUFFERING)  # Show processing state
         
+        worker_alive = False
         if self._worker_thread:
             # Give the worker up to 10s to finish processing remaining audio
             self._worker_thread.join(timeout=10.0)
+            worker_alive = self._worker_thread.is_alive()
             self._worker_thread = None
         
-        # Now process any remaining audio that was queued after the worker exited
-        remaining = b""
-        try:
-            while not self._audio_queue.empty():
-                remaining += self._audio_queue.get_nowait()
-        except Exception:
-            pass
-        
-        if remaining and len(remaining) > 1600:  # At least 0.05s of audio
-            self._process_chunk(remaining)
+        # Now process any audio still buffered if the worker exited early.
+        # A worker that is still decoding owns the ring — leave it alone.
+        ring = self._audio_ring
+        if ring is not None and not worker_alive:
+            if len(ring) > 800:  # At least 0.05s of audio
+                self._process_chunk(ring.view())
+            ring.clear()
         
+        if self._pool is not None:
+            self._pool.live_active = False
         self._set_state(TranscriptionState.IDLE)
         
-        # Clean up recovery file on successful stop
-        try:
-            self._temp_file.unlink(missing_ok=True)
-        except Exception:
-            pass
+        # Clean up recovery journal on successful stop
+        self._journal.close(delete=True)
         
         # Return accumulated transcript
         return " ".join(seg.text for seg in self._full_transcript)
     
     def feed_audio(self, audio_chunk: bytes):
         """Feed audio data to the transcriber (thread-safe)."""
-        if self._running and audio_chunk:
-            with self._buffer_lock:
-                self._audio_queue.put(audio_chunk)
+        if not (self._running and audio_chunk and self._audio_ring is not None):
+            return
+        if self._gate is None:
+            self._write_audio(audio_chunk)
+            return
+        for kind, value in self._gate.process(audio_chunk):
+            if kind == "audio":
+                self._write_audio(value)
+            elif kind == "gap":
+                # Keeps read_position on session time if the worker has drained
+                # the last utterance; otherwise the pause is simply left out
+                self._audio_ring.skip(value)
+            else:
+                self._utterance_end.set()
+    
+    def _write_audio(self, pcm: bytes):
+        if self._audio_ring.write(pcm):
+            # Ring full: even the degrade policy is losing audio now
+            self._report_backlog("overflow", throttle=True)
+    
+    def _track_performance(self, process_duration: float, audio_duration_s: float):
+        """Record one real-time-factor sample and notify the performance callback."""
+        ratio = process_duration / max(audio_duration_s, 0.01)
+        if not hasattr(self, '_perf_ratios'):
+            self._perf_ratios = []
+        self._perf_ratios.append(ratio)
+        # Keep last 5 ratios for rolling average
+        self._perf_ratios = self._perf_ratios[-5:]
+        avg_ratio = sum(self._perf_ratios) / len(self._perf_ratios)
+        
+        # Warn if model can't keep up (after at least 2 chunks to skip warmup)
+        if len(self._perf_ratios) >= 2 and avg_ratio > 1.0:
+            recommend = "tiny" if self.config.model_size != "tiny" else None
+            if self._on_performance_warning_cb:
+                self._on_performance_warning_cb(
+                    avg_ratio, self.config.model_size, recommend
+                )
+        elif len(self._perf_ratios) >= 2 and avg_ratio < 0.5:
+            # Model is keeping up well — broadcast good performance  
+            if self._on_performance_warning_cb:
+                self._on_performance_warning_cb(
+                    avg_ratio, self.config.model_size, None
+                )
+        
+        if self._degrader is not None:
+            self._adapt(ratio)
+    
+    def _adapt(self, ratio: float):
+        """Feed one RTF sample to the degradation controller and apply its decision."""
+        settings = {"model_size": self.config.model_size}
+        if self.config.streaming:
+            settings["stream_beam_size"] = self.config.stream_beam_size
+        else:
+            settings["beam_size"] = self.config.beam_size
+            settings["chunk_length_s"] = self.config.chunk_length_s
+        adj = self._degrader.observe(ratio, settings)
+        if adj is None:
+            return
+        if adj.setting != "model_size":
+            # Read per decode — takes effect on the next chunk
+            setattr(self.config, adj.setting, adj.new)
+            self._notify_adjustment(adj, True)
+            return
+        
+        def swap():
+            ok = self.swap_model(adj.new)
+            self._degrader.applied(adj, ok)
+            self._notify_adjustment(adj, ok)
+        
+        # Load in the background; the session keeps decoding on the old model
+        threading.Thread(target=swap, name="model-swap", daemon=True).start()
+    
+    def _notify_adjustment(self, adj: Adjustment, applied: bool):
+        print(f"Adaptive {adj.action}: {adj.setting} {adj.old} -> {adj.new} "
+              f"(rtf {adj.rtf:.2f}){'' if applied else ' FAILED'}", file=sys.stderr)
+        for callback in self._adjustment_callbacks:
+            try:
+                callback(adj, applied)
+            except Exception as e:
+                print(f"Adjustment callback error: {e}", file=sys.stderr)
     
     def _process_audio_loop(self):
         """Background thread for processing audio chunks."""
-        audio_buffer = b""
+        if self.config.streaming:
+            return self._process_stream_loop()
+        
+        ring = self._audio_ring
+        if ring is None:
+            return
         sample_rate = 16000
-        bytes_per_sample = 2
-        max_buffer_bytes = int(sample_rate * bytes_per_sample * 10.0)  # Cap at 10s for quality
         
         while True:
             try:
+                available = len(ring)
                 # Exit only when stopped AND no more audio to process
-                if not self._running and self._audio_queue.empty() and len(audio_buffer) == 0:
+                if not self._running and available <= 800:
                     break
                 
-                # Drain ALL pending items from queue at once (not one-at-a-time)
-                drained = []
-                try:
-                    while True:
-                        chunk = self._audio_queue.get_nowait()
-                        drained.append(chunk)
-                except queue.Empty:
-                    pass
+                # Backpressure: past max_backlog_s the policy decides what gives
+                beam_size = None
+                max_buffer_samples = int(sample_rate * self.config.max_backlog_s)
+                if available > max_buffer_samples:
+                    available, beam_size = self._relieve_backlog(ring, max_buffer_samples)
                 
-                if not drained and not audio_buffer:
-                    if not self._running:
-                        break  # Stopped and nothing left
+                # Process at the end of an utterance, when enough audio is
+                # buffered (see _chunk_boundary), OR when stopping
+                utterance_end = self._utterance_end.is_set()
+                if utterance_end:
+                    self._utterance_end.clear()
+                if beam_size is not None:
+                    cut, boundary = available, "forced"  # Backlog catch-up takes it all
+                else:
+                    cut, boundary = self._chunk_boundary(ring, available, utterance_end)
+                
+                if cut is None:
                     time.sleep(0.05)
                     continue
                 
-                audio_buffer += b"".join(drained)
+                self._set_state(TranscriptionState.BUFFERING)
                 
-                # Cap buffer to prevent runaway latency — keep only recent audio
-                if len(audio_buffer) > max_buffer_bytes:
-                    excess = len(audio_buffer) - max_buffer_bytes
-                    audio_buffer = audio_buffer[excess:]
+                self._note_lag(available, sample_rate)
+                audio_duration_s = cut / sample_rate
+                process_start = time.monotonic()
+                self._process_chunk(ring.view(cut), beam_size, mid_speech=boundary == "forced")
+                process_duration = time.monotonic() - process_start
+                ring.consume(cut)
                 
-                # Process when we have enough audio, OR when stopping with remaining audio
-                min_buffer_size = int(sample_rate * bytes_per_sample * self.config.chunk_length_s)
-                should_process = len(audio_buffer) >= min_buffer_size or (not self._running and len(audio_buffer) > 1600)
+                self._track_performance(process_duration, audio_duration_s)
                 
-                if should_process:
-                    self._set_state(TranscriptionState.BUFFERING)
-                    
-                    # Process with timeout safeguard
-                    audio_duration_s = len(audio_buffer) / 32000.0
-                    # print(f"[DEBUG] Processing chunk: {len(audio_buffer)} bytes ({audio_duration_s:.1f}s audio)")
-                    process_start = time.monotonic()
-                    self._process_chunk(audio_buffer)
-                    process_duration = time.monotonic() - process_start
-                    # print(f"[DEBUG] Chunk processed in {process_duration:.2f}s")
-                    
-                    # Performance ratio tracking
-                    ratio = process_duration / max(audio_duration_s, 0.01)
-                    if not hasattr(self, '_perf_ratios'):
-                        self._perf_ratios = []
-                    self._perf_ratios.append(ratio)
-                    # Keep last 5 ratios for rolling average
-                    self._perf_ratios = self._perf_ratios[-5:]
-                    avg_ratio = sum(self._perf_ratios) / len(self._perf_ratios)
-                    
-                    # Warn if model can't keep up (after at least 2 chunks to skip warmup)
-                    if len(self._perf_ratios) >= 2 and avg_ratio > 1.0:
-                        recommend = "tiny" if self.config.model_size != "tiny" else None
-                        if self._on_performance_warning_cb:
-                            self._on_performance_warning_cb(
-                                avg_ratio, self.config.model_size, recommend
-                            )
-                    elif len(self._perf_ratios) >= 2 and avg_ratio < 0.5:
-                        # Model is keeping up well — broadcast good performance  
-                        if self._on_performance_warning_cb:
-                            self._on_performance_warning_cb(
-                                avg_ratio, self.config.model_size, None
-                            )
-                    
-                    audio_buffer = b""
-                    self._consecutive_errors = 0
-                    if not self._running:
-                        break
-                    self._set_state(TranscriptionState.LISTENING)
+                self._consecutive_errors = 0
+                if not self._running:
+                    break
+                self._set_state(TranscriptionState.LISTENING)
                     
             except Exception as e:
                 self._consecutive_errors += 1
@@ -394,11 +701,211 @@ class StreamingTranscriber:
                 time.sleep(min(0.5 * (2 ** (self._consecutive_errors - 1)), 10.0))
                 if self._running:
                     self._set_state(TranscriptionState.LISTENING)
-                audio_buffer = b""  # Discard corrupted buffer
+                ring.consume(len(ring))  # Discard corrupted buffer
+    
+    def _chunk_boundary(self, ring, available: int, utterance_end: bool):
+        """Where the next chunked-mode model call ends: (samples, boundary)
+        or (None, None) to wait for more audio.
+        
+        boundary is "end" (session stopping), "pause" (a natural break) or
+        "forced" (cut inside continuous speech).
+        """
+        sample_rate = 16000
+        if not self._running:
+            return available, "end"
+        if utterance_end and available > 800:
+            return available, "pause"
+        min_samples = int(sample_rate * self.config.chunk_length_s)
+        if available < min_samples:
+            return None, None
+        if self.config.segmentation != "utterance":
+            return available, "forced"
+        
+        audio = ring.view(available)
+        cut = find_pause(audio, sample_rate, self.config.chunk_length_s,
+                         self.config.utterance_pause_s, self.config.vad_gate_min_rms)
+        if cut is not None:
+            return cut, "pause"
+        max_s = max(self.config.utterance_max_s, self.config.chunk_length_s)
+        if available >= int(sample_rate * max_s):
+            # No pause in max_s of speech: cut at the quietest point of its second half
+            return quietest_point(audio[:int(sample_rate * max_s)], sample_rate, max_s / 2), "forced"
+        return None, None
+    
+    def _process_stream_loop(self):
+        """Background thread for streaming mode (sliding-window re-decoding).
+        
+        The window holds all audio since the last committed word. Whenever at
+        least stream_step_s of new audio has arrived, the whole window is
+        re-decoded; LocalAgreement commits the prefix that two consecutive
+        decodes agree on and the window is trimmed to the end of that prefix,
+        so in steady state it stays only a couple of seconds long.
+        """
+        ring = self._audio_ring
+        if ring is None:
+            return
+        sample_rate = 16000
+        decoded_samples = 0    # Window length at the last decode
+        last_decode_s = 0.0    # Duration of the last decode (adaptive step)
+        agreement = LocalAgreement()
+        
+        while True:
+            try:
+                # The ring's unconsumed audio IS the window; its read position
+                # is the session time of the window's first sample.
+                available = len(ring)
+                window_start_s = ring.read_position / sample_rate
+                
+                utterance_end = self._utterance_end.is_set()
+                if not self._running or utterance_end:
+                    # Final decode sees the most audio — commit all of it. At an
+                    # utterance end the window is empty afterwards, so the gate
+                    # can skip the pause without losing session time.
+                    self._utterance_end.clear()
+                    words = None
+                    if available > 800:
+                        words = self._decode_window(ring.view(available), window_start_s, agreement.prompt())
+                    ring.consume(available)
+                    decoded_samples = 0
+                    self._emit_words(agreement.finalize(words), partial=False)
+                    if not self._running:
+                        break
+                    continue
+                
+                # Never re-decode faster than the decoder runs: on a slow machine
+                # the step stretches instead of the backlog growing.
+                step_s = max(self.config.stream_step_s, last_decode_s)
+                new_samples = available - decoded_samples
+                if new_samples < step_s * sample_rate:
+                    time.sleep(0.05)
+                    continue
+                
+                self._note_lag(new_samples, sample_rate)
+                process_start = time.monotonic()
+                words = self._decode_window(ring.view(available), window_start_s, agreement.prompt())
+                last_decode_s = time.monotonic() - process_start
+                decoded_samples = available
+                self._track_performance(last_decode_s, new_samples / sample_rate)
+                
+                window_s = available / sample_rate
+                if words is not None:
+                    committed = agreement.insert(words)
+                    if window_s > self.config.stream_max_window_s:
+                        # Hypothesis never stabilised — don't let the window grow forever
+                        committed = committed + agreement.finalize()
+                    self._emit_words(committed, partial=False)
+                    self._emit_words(agreement.tentative, partial=True)
+                
+                # Trim everything before the last committed word. With nothing
+                # pending (silence), keep just the last second in case a word is
+                # starting at the window edge.
+                cut_s = agreement.last_committed_end - window_start_s
+                if not agreement.tentative:
+                    cut_s = max(cut_s, window_s - 1.0)
+                elif window_s > self.config.stream_max_window_s:
+                    cut_s = max(cut_s, window_s - self.config.stream_max_window_s)
+                cut = max(0, min(int(cut_s * sample_rate), available))
+                ring.consume(cut)  # Also ends the lease taken by view()
+                decoded_samples = max(decoded_samples - cut, 0)
+                
+                self._consecutive_errors = 0
+                
+            except Exception as e:
+                self._consecutive_errors += 1
+                print(f"Streaming error ({self._consecutive_errors}/{self._max_consecutive_errors}): {e}", file=sys.stderr)
+                
+                if self._consecutive_errors >= self._max_consecutive_errors:
+                    self._set_state(TranscriptionState.ERROR)
+                    print("Too many consecutive errors — stopping session", file=sys.stderr)
+                    self._running = False
+                    break
+                
+                self._set_state(TranscriptionState.ERROR)
+                time.sleep(min(0.5 * (2 ** (self._consecutive_errors - 1)), 10.0))
+                if self._running:
+                    self._set_state(TranscriptionState.LISTENING)
+                # Discard the corrupted window; session time keeps advancing
+                ring.consume(len(ring))
+                decoded_samples = 0
+                agreement.finalize()
     
-    def _process_chunk(self, audio_data: bytes):
+    def _decode_window(self, audio_np, window_start_s: float, prompt: str = "") -> Optional[List[StreamWord]]:
+        """Decode a streaming window (float32 samples) into words with absolute
+        session timestamps.
+        
+        Returns [] for a silent window and None when decoding was not possible.
+        """
+        if not self.model or not NUMPY_AVAILABLE:
+            return None
+        
+        try:
+            if audio_np.size == 0 or _peak(audio_np) < 0.001:
+                return []
+            
+            lang = self.config.language if self.config.language not in ('auto', '') else None
+            with self.lease_model(live=True) as model:
+                segments, info = model.transcribe(
+                    audio_np,
+                    language=lang,
+                    task=self.config.task,
+                    beam_size=self.config.stream_beam_size,
+                    word_timestamps=True,  # LocalAgreement compares words and trims on their end times
+                    vad_filter=self.config.vad_enabled and self._gate is None,
+                    vad_parameters=dict(threshold=self.config.vad_threshold),
+                    condition_on_previous_text=False,
+                    initial_prompt=prompt or None,
+                    no_speech_threshold=0.6,
+                    log_prob_threshold=-1.0
+                )
+                segments = list(segments)  # Decoding is lazy — finish it inside the lease
+            
+            detected_lang = getattr(info, 'language', '') or ''
+            if detected_lang:
+                self._detected_language = detected_lang
+                self._language_probability = getattr(info, 'language_probability', 0.0) or 0.0
+            
+            return [
+                StreamWord(
+                    start=window_start_s + w.start,
+                    end=window_start_s + w.end,
+                    word=w.word,
+                    prob=getattr(w, 'probability', 0.0) or 0.0
+                )
+                for segment in segments
+                for w in (getattr(segment, 'words', None) or [])
+            ]
+        except (RuntimeError, ValueError) as e:
+            print(f"Transcription model error (recoverable): {e}", file=sys.stderr)
+            return None
+    
+    def _emit_words(self, words: List[StreamWord], partial: bool):
+        """Emit a run of streaming words as one segment."""
+        text = "".join(w.word for w in words).strip()
+        if not text:
+            return
+        self._emit_segment(TranscriptionSegment(
+            text=text,
+            start_time=words[0].start,
+            end_time=words[-1].end,
+            confidence=sum(w.prob for w in words) / len(words),
+            is_partial=partial,
+            words=[
+                {"word": w.word, "start": w.start, "end": w.end, "prob": w.prob}
+                for w in words
+            ],
+            detected_language=self._detected_language,
+            language_probability=self._language_probability
+        ))
+    
+    def _process_chunk(self, audio_data, beam_size: Optional[int] = None, mid_speech: bool = False):
         """Process a chunk of audio and emit segments.
         
+        `audio_data` is normally a float32 view straight out of the ring
+        buffer; raw 16-bit PCM bytes are still accepted and converted.
+        `beam_size` overrides config.beam_size (backlog catch-up).
+        `mid_speech` marks a chunk cut inside continuous speech rather than
+        at a pause.
+        
         Error handling: catches RuntimeError and ValueError from model.transcribe(),
         logs the error, and returns gracefully so the processing loop can continue.
         """
@@ -406,28 +913,33 @@ class StreamingTranscriber:
             return
         
         try:
-            # Convert bytes to numpy array (assuming 16-bit PCM, 16kHz mono)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            if isinstance(audio_data, (bytes, bytearray)):
+                # Convert bytes to numpy array (assuming 16-bit PCM, 16kHz mono)
+                audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            else:
+                audio_np = audio_data
             
             # Skip near-silent chunks (avoid hallucinations on silence)
-            if audio_np.size > 0 and np.max(np.abs(audio_np)) < 0.001:
+            if audio_np.size > 0 and _peak(audio_np) < 0.001:
                 return
             
             # Transcribe or translate — condition_on_previous_text=False prevents hallucination buildup
             # When task='translate', Whisper translates any spoken language → English text
             lang = self.config.language if self.config.language not in ('auto', '') else None
-            segments, info = self.model.transcribe(
-                audio_np,
-                language=lang,
-                task=self.config.task,
-                beam_size=self.config.beam_size,
-                word_timestamps=False,
-                vad_filter=self.config.vad_enabled,
-                vad_parameters=dict(threshold=self.config.vad_threshold),
-                condition_on_previous_text=False,
-                no_speech_threshold=0.6,
-                log_prob_threshold=-1.0
-            )
+            with self.lease_model(live=True) as model:
+                segments, info = model.transcribe(
+                    audio_np,
+                    language=lang,
+                    task=self.config.task,
+                    beam_size=beam_size or self.config.beam_size,
+                    word_timestamps=False,
+                    vad_filter=self.config.vad_enabled and self._gate is None,
+                    vad_parameters=dict(threshold=self.config.vad_threshold),
+                    condition_on_previous_text=False,
+                    no_speech_threshold=0.6,
+                    log_prob_threshold=-1.0
+                )
+                segments = list(segments)  # Decoding is lazy — finish it inside the lease
             
             # Capture detected language from transcription info
             detected_lang = getattr(info, 'language', '') or ''
@@ -437,16 +949,15 @@ class StreamingTranscriber:
                 self._language_probability = lang_prob
             
             # Emit each segment
-            for segment in segments:
+            for i, segment in enumerate(segments):
                 text = segment.text.strip()
                 
-                # Whisper adds a trailing period to nearly every chunk
-                # because it treats each chunk as a complete utterance.
-                # During continuous recording, this creates false periods
-                # at chunk boundaries ("Hello, my." "name is Grant.").
-                # Strip trailing period unless it's an ellipsis or the
-                # text contains clear sentence structure (? or !).
-                if text.endswith('.') and not text.endswith('...'):
+                # Whisper ends every chunk with a period because it treats
+                # the chunk as a complete utterance. Chunks closed at a pause
+                # are one; a chunk cut mid-sentence ("Hello, my." "name is
+                # Grant.") gets its false final period stripped.
+                if (mid_speech and i == len(segments) - 1
+                        and text.endswith('.') and not text.endswith('...')):
                     text = text[:-1].rstrip()
                 
                 ts = TranscriptionSegment(
@@ -2,19 +2,40 @@
 """On-device translation for Windy Word — NLLB-200 via CTranslate2 + SentencePiece.
 
 Fully offline: loads a bundled CTranslate2 model + its SentencePiece tokenizer from a
-local directory; never touches the network. Spawned per request by the desktop main
-process (mirrors the offline batch-transcribe-local pattern).
+local directory; never touches the network.
 
-Request: a JSON file path as argv[1] (or JSON on stdin):
+One-shot mode (a JSON file path as argv[1], or JSON on stdin):
     {"model_dir": "/abs/path/nllb-200-600M", "items": [{"text": "...", "source": "en", "target": "es"}]}
 source/target are ISO-639-1 codes; mapped to NLLB FLORES-200 codes below.
 Response (stdout, one line):
-    {"ok": true, "results": [{"translatedText": "..."}], "engine": "nllb-200-600M-int8"}
+    {"ok": true, "results": [{"translatedText": "..."}], "engine": "nllb-200-600M-int8",
+     "cold": true, "load_ms": 2412, "translate_ms": 180}
     {"ok": false, "error": "..."}
+
+Warm worker mode (--serve [--idle-evict-s 300]): a long-lived process speaking
+JSON Lines like services/translate-api/translate-worker.py. The model loads on
+the first request and stays resident; after --idle-evict-s seconds without a
+request it is dropped to free RAM and reloaded (cold) on the next one.
+    INPUT  (stdin):  {"id": 1, "model_dir": "...", "items": [...]}
+    OUTPUT (stdout): {"id": 1, "ok": true, "results": [...], "cold": false, "load_ms": 0, "translate_ms": 95, ...}
+    READY  (stdout): {"type": "ready", "pid": 1234}
+All items of a request go through ONE translate_batch call.
+
+Warm workers keep a translation cache (translation_cache.py; --cache-path
+makes it persistent): cached items skip the model, and a request made only
+of cached items doesn't even load it. Responses report "cache_hits".
 """
 import sys
 import os
+import gc
 import json
+import time
+import threading
+
+try:
+    from .translation_cache import TranslationCache
+except ImportError:  # Run as a script from the bundled engine directory
+    from translation_cache import TranslationCache
 
 os.environ.setdefault("HF_HUB_OFFLINE", "1")
 os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
@@ -50,43 +71,161 @@ def _nllb(code):
     return LANG_TO_NLLB.get(code, LANG_TO_NLLB.get(code.split("-")[0], "eng_Latn"))
 
 
-def main():
-    try:
-        raw = open(sys.argv[1], "r", encoding="utf-8").read() if len(sys.argv) > 1 else sys.stdin.read()
-        req = json.loads(raw)
-        model_dir = req["model_dir"]
-        items = req.get("items", [])
+ENGINE = "nllb-200-600M-int8"
+
+
+class _Model:
+    """The loaded CTranslate2 translator + SentencePiece processor (one model_dir)."""
 
+    def __init__(self, model_dir):
         import ctranslate2
         import sentencepiece as spm
 
-        translator = ctranslate2.Translator(model_dir, device="cpu", compute_type="int8")
-        sp = spm.SentencePieceProcessor()
-        sp.Load(os.path.join(model_dir, "sentencepiece.bpe.model"))
+        self.model_dir = model_dir
+        self.translator = ctranslate2.Translator(model_dir, device="cpu", compute_type="int8")
+        self.sp = spm.SentencePieceProcessor()
+        self.sp.Load(os.path.join(model_dir, "sentencepiece.bpe.model"))
 
-        results = []
-        for it in items:
+    def translate_items(self, items):
+        """Translate every item in one translate_batch call (empty texts pass through)."""
+        results = [{"translatedText": it.get("text") or ""} for it in items]
+        batch, prefixes, slots = [], [], []
+        for i, it in enumerate(items):
             text = (it.get("text") or "").strip()
             if not text:
-                results.append({"translatedText": it.get("text") or ""})
                 continue
             src = _nllb(it.get("source", "en"))
             tgt = _nllb(it.get("target", "en"))
             # NLLB recipe (verified): source tokens + </s> + source-lang; decoder starts target-lang.
-            source_tokens = sp.Encode(text, out_type=str) + ["</s>", src]
-            out = translator.translate_batch(
-                [source_tokens],
-                target_prefix=[[tgt]],
-                max_batch_size=1,
-                beam_size=4,
-                max_decoding_length=512,
-            )
-            toks = out[0].hypotheses[0]
-            if toks and toks[0] == tgt:
+            batch.append(self.sp.Encode(text, out_type=str) + ["</s>", src])
+            prefixes.append([tgt])
+            slots.append(i)
+        if not batch:
+            return results
+        out = self.translator.translate_batch(
+            batch,
+            target_prefix=prefixes,
+            max_batch_size=len(batch),
+            beam_size=4,
+            max_decoding_length=512,
+        )
+        for i, prefix, res in zip(slots, prefixes, out):
+            toks = res.hypotheses[0]
+            if toks and toks[0] == prefix[0]:
                 toks = toks[1:]
-            results.append({"translatedText": sp.Decode(toks)})
+            results[i] = {"translatedText": self.sp.Decode(toks)}
+        return results
+
+
+def _translate(state, req):
+    """Run one request against the cached model (loading it if needed).
+    Returns the response dict with cold/warm timing."""
+    model_dir = req["model_dir"]
+    items = req.get("items", [])
+    cache = state.get("cache")
+    identity = f"{ENGINE}:{os.path.basename(os.path.normpath(model_dir))}"
+
+    results = [None] * len(items)
+    hits = 0
+    for i, it in enumerate(items):
+        text = (it.get("text") or "").strip()
+        if not text:
+            # Passed through as translate_items would: never needs the model
+            results[i] = {"translatedText": it.get("text") or ""}
+        elif cache is not None:
+            hit = cache.get(text, it.get("source", "en"), it.get("target", "en"), identity)
+            if hit is not None:
+                results[i] = {"translatedText": hit}
+                hits += 1
+    misses = [i for i, r in enumerate(results) if r is None]
 
-        print(json.dumps({"ok": True, "results": results, "engine": "nllb-200-600M-int8"}, ensure_ascii=False))
+    cold = False
+    t0 = time.monotonic()
+    if misses and (state.get("model") is None or state["model"].model_dir != model_dir):
+        cold = True
+        state["model"] = None
+        gc.collect()
+        state["model"] = _Model(model_dir)
+    t1 = time.monotonic()
+    if misses:
+        fresh = state["model"].translate_items([items[i] for i in misses])
+        for i, res in zip(misses, fresh):
+            results[i] = res
+            text = (items[i].get("text") or "").strip()
+            if cache is not None and text:
+                cache.put(text, items[i].get("source", "en"), items[i].get("target", "en"),
+                          identity, res["translatedText"])
+    t2 = time.monotonic()
+    return {
+        "ok": True,
+        "results": results,
+        "engine": ENGINE,
+        "cold": cold,
+        "load_ms": int((t1 - t0) * 1000),
+        "translate_ms": int((t2 - t1) * 1000),
+        "cache_hits": hits,
+    }
+
+
+def _emit(obj):
+    """Write a JSON object to stdout (one line)."""
+    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def serve(idle_evict_s=300.0, cache_path=None):
+    """Warm worker: JSON Lines requests on stdin until EOF."""
+    state = {"model": None, "cache": TranslationCache(db_path=cache_path)}
+    lock = threading.Lock()
+    timer = [None]
+
+    def evict():
+        with lock:
+            if state["model"] is not None:
+                state["model"] = None
+                gc.collect()
+                sys.stderr.write(f"[translate_local] idle {idle_evict_s:.0f}s — model evicted\n")
+
+    _emit({"type": "ready", "pid": os.getpid()})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        if timer[0] is not None:
+            timer[0].cancel()
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get("id")
+            with lock:
+                resp = _translate(state, req)
+            resp["id"] = req_id
+            sys.stderr.write(f"[translate_local] {len(req.get('items', []))} item(s) "
+                             f"{'cold' if resp['cold'] else 'warm'}: load {resp['load_ms']}ms, "
+                             f"translate {resp['translate_ms']}ms, {resp['cache_hits']} cached\n")
+            _emit(resp)
+        except Exception as e:  # noqa: BLE001
+            _emit({"id": req_id, "ok": False, "error": str(e)})
+        if idle_evict_s > 0:
+            timer[0] = threading.Timer(idle_evict_s, evict)
+            timer[0].daemon = True
+            timer[0].start()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        idle = 300.0
+        if "--idle-evict-s" in sys.argv:
+            idle = float(sys.argv[sys.argv.index("--idle-evict-s") + 1])
+        cache_path = None
+        if "--cache-path" in sys.argv:
+            cache_path = sys.argv[sys.argv.index("--cache-path") + 1]
+        serve(idle, cache_path)
+        return
+    try:
+        raw = open(sys.argv[1], "r", encoding="utf-8").read() if len(sys.argv) > 1 else sys.stdin.read()
+        req = json.loads(raw)
+        print(json.dumps(_translate({"model": None}, req), ensure_ascii=False))
     except Exception as e:  # noqa: BLE001
         print(json.dumps({"ok": False, "error": str(e)}, ensure_ascii=False))
         sys.exit(1)
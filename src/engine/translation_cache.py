@@ -0,0 +1,171 @@
+"""
+Windy Word - Translation Cache
+Shared result cache for the text translators (the M2M-100 Translator in
+src/translation and the on-device NLLB worker, translate_local.py).
+
+Dictation repeats itself ("okay", "thank you", "next slide"), and every
+repeat used to re-run beam search. Results are cached under
+sha256(model identity, source, target, normalized text):
+
+- Memory tier: LRU bounded by max_entries, entries expire after ttl_s.
+- Disk tier (optional, db_path): SQLite table that survives restarts;
+  a memory miss falls through to it and promotes the hit. Rows older
+  than ttl_s are never served and are deleted when read; every
+  `prune_every` puts (and on open) expired rows are dropped and the
+  table is trimmed to the newest max_disk_entries.
+
+Normalization is NFC + collapsed whitespace only — case and punctuation
+change the translation, so they stay part of the key.
+
+Stdlib only: translate_local.py imports this as a sibling module from the
+bundled engine directory.
+"""
+
+import hashlib
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Cache-key form of a text: NFC, trimmed, single spaces."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(text: str, source_lang: str, target_lang: str, model: str) -> str:
+    raw = "\x00".join((model, source_lang, target_lang, normalize_text(text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Thread-safe LRU + TTL translation cache with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 10000, ttl_s: float = 7 * 86400,
+                 db_path: Optional[str] = None, max_disk_entries: int = 100000):
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+        self.db_path = db_path
+        self.max_disk_entries = max(1, max_disk_entries)
+        # Prune often enough that the table overshoots its cap by at most ~10%
+        self.prune_every = max(1, min(1000, self.max_disk_entries // 10))
+        self._puts_since_prune = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (text, expires_at)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        cache_key TEXT PRIMARY KEY,
+                        translated_text TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                """)
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_translations_created ON translations(created_at)")
+                self._prune(time.time())
+            except sqlite3.Error as e:
+                print(f"Translation cache disk tier disabled: {e}", file=sys.stderr)
+                self._db = None
+
+    def get(self, text: str, source_lang: str, target_lang: str, model: str) -> Optional[str]:
+        """Cached translation, or None (counted as a miss)."""
+        key = cache_key(text, source_lang, target_lang, model)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT translated_text, created_at FROM translations WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row and row[1] + self.ttl_s > now:
+                    self._remember(key, row[0], row[1] + self.ttl_s)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+                if row:
+                    try:
+                        self._db.execute("DELETE FROM translations WHERE cache_key = ?", (key,))
+                        self._db.commit()
+                    except sqlite3.Error:
+                        pass
+            self.misses += 1
+            return None
+
+    def put(self, text: str, source_lang: str, target_lang: str, model: str, translated: str):
+        key = cache_key(text, source_lang, target_lang, model)
+        now = time.time()
+        with self._lock:
+            self._remember(key, translated, now + self.ttl_s)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO translations (cache_key, translated_text, created_at) VALUES (?, ?, ?)",
+                        (key, translated, now)
+                    )
+                    self._puts_since_prune += 1
+                    if self._puts_since_prune >= self.prune_every:
+                        self._prune(now)
+                    else:
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Translation cache write error: {e}", file=sys.stderr)
+
+    def _prune(self, now: float):
+        """Drop expired rows, then the oldest rows past max_disk_entries."""
+        self._db.execute("DELETE FROM translations WHERE created_at <= ?", (now - self.ttl_s,))
+        excess = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM translations WHERE cache_key IN "
+                "(SELECT cache_key FROM translations ORDER BY created_at LIMIT ?)", (excess,))
+        self._db.commit()
+        self._puts_since_prune = 0
+
+    def _remember(self, key: str, translated: str, expires_at: float):
+        self._entries[key] = (translated, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for health responses."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,177 @@
+"""
+Windy Word - Streaming Voice Activity Gate
+Energy VAD in front of the live audio ring, so silence never reaches Whisper.
+
+Without it every chunk with any room noise went through the full Whisper
+encoder, and faster-whisper's vad_filter re-ran Silero on each call. The
+gate runs on the raw PCM as feed_audio receives it:
+
+- 20ms frames; a frame is loud when its RMS is `snr` times the noise floor
+  (and at least `min_rms`). The floor tracks quiet frames quickly and loud
+  ones very slowly (~40s time constant), so steady noise that starts
+  mid-session, like a fan, is learned within about ten seconds.
+- Speech starts after `min_speech_s` of consecutive loud frames; the
+  `preroll_s` before it is forwarded too, so onsets aren't clipped.
+- Speech ends after `hangover_s` without a loud frame. The hangover audio
+  is forwarded (it holds word tails) and an "end" event marks the
+  utterance boundary.
+- Everything else is dropped and reported as a "gap" before the next
+  speech, so the consumer can keep session time.
+
+State (noise floor, partial frames, the open utterance) carries across
+calls: feeding 10ms or 1s at a time gives the same result.
+
+find_pause() / quietest_point() pick where the chunked loop closes a model
+call inside continuous speech: at the first short pause once the utterance
+is long enough, or at the quietest frame when it hits its maximum length.
+"""
+
+import math
+from collections import deque
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# ("audio", int16 PCM bytes) | ("gap", dropped samples) | ("end", None)
+GateEvent = Tuple[str, object]
+
+
+class StreamingVad:
+    """Stateful energy gate over int16 mono PCM."""
+
+    def __init__(self, sample_rate: int = 16000, frame_s: float = 0.02, min_rms: float = 0.003,
+                 snr: float = 3.0, min_speech_s: float = 0.06, hangover_s: float = 0.5,
+                 preroll_s: float = 0.3):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("StreamingVad requires numpy")
+        self.sample_rate = sample_rate
+        self.frame = int(sample_rate * frame_s)
+        self.min_rms = min_rms
+        self.snr = snr
+        self.min_speech_frames = max(1, round(min_speech_s / frame_s))
+        self.hangover_frames = max(1, round(hangover_s / frame_s))
+        self.preroll_frames = max(self.min_speech_frames, round(preroll_s / frame_s))
+        self.reset()
+
+    def reset(self):
+        """Forget everything (new session)."""
+        self._carry = b""
+        self._noise = self.min_rms
+        self._preroll = deque()
+        self._loud_run = 0
+        self._quiet_run = 0
+        self._gap = 0
+        self.in_speech = False
+        self.speech_samples = 0
+        self.gated_samples = 0
+
+    def stats(self) -> dict:
+        return {
+            "in_speech": self.in_speech,
+            "speech_s": round(self.speech_samples / self.sample_rate, 2),
+            "gated_s": round(self.gated_samples / self.sample_rate, 2),
+            "noise_floor_dbfs": round(20 * math.log10(max(self._noise, 1e-6)), 1),
+        }
+
+    def process(self, pcm: bytes) -> List[GateEvent]:
+        """Run one block of int16 PCM through the gate."""
+        pcm = self._carry + pcm
+        usable = len(pcm) - len(pcm) % (2 * self.frame)
+        self._carry = pcm[usable:]
+        if not usable:
+            return []
+        samples = np.frombuffer(pcm[:usable], dtype=np.int16).reshape(-1, self.frame)
+        scaled = samples.astype(np.float32) * np.float32(1.0 / 32768.0)
+        rms = np.sqrt(np.einsum("ij,ij->i", scaled, scaled) / self.frame)
+
+        events: List[GateEvent] = []
+        forward: List[bytes] = []
+        for i, level in enumerate(rms.tolist()):
+            frame = pcm[i * 2 * self.frame:(i + 1) * 2 * self.frame]
+            loud = level >= max(self.min_rms, self._noise * self.snr)
+            # Quiet frames pull the floor in fast; loud ones nudge it up slowly
+            self._noise += (level - self._noise) * (0.0005 if loud else 0.05)
+
+            if self.in_speech:
+                forward.append(frame)
+                self._quiet_run = 0 if loud else self._quiet_run + 1
+                if self._quiet_run >= self.hangover_frames:
+                    self.in_speech = False
+                    self._flush(forward, events)
+                    events.append(("end", None))
+                continue
+
+            self._preroll.append(frame)
+            self._loud_run = self._loud_run + 1 if loud else 0
+            if self._loud_run >= self.min_speech_frames:
+                self.in_speech = True
+                self._quiet_run = 0
+                self._loud_run = 0
+                if self._gap:
+                    events.append(("gap", self._gap))
+                    self._gap = 0
+                forward.extend(self._preroll)
+                self._preroll.clear()
+            elif len(self._preroll) > self.preroll_frames:
+                self._preroll.popleft()
+                self._gap += self.frame
+                self.gated_samples += self.frame
+        self._flush(forward, events)
+        return events
+
+    def _flush(self, forward: List[bytes], events: List[GateEvent]):
+        if forward:
+            audio = b"".join(forward)
+            self.speech_samples += len(audio) // 2
+            events.append(("audio", audio))
+            forward.clear()
+
+
+def frame_rms(audio, frame: int):
+    """RMS of each whole `frame`-sample frame of float32 audio."""
+    n = audio.size // frame
+    frames = audio[:n * frame].reshape(n, frame)
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+
+
+def find_pause(audio, sample_rate: int, min_s: float, pause_s: float,
+               min_rms: float = 0.003, frame_s: float = 0.02) -> Optional[int]:
+    """Sample index in the middle of the first pause of at least pause_s
+    that leaves at least min_s of audio before it, or None.
+
+    A frame is quiet below a tenth (-20 dB) of the buffer's loud end (90th
+    percentile RMS), or below min_rms.
+    """
+    frame = int(sample_rate * frame_s)
+    rms = frame_rms(audio, frame)
+    if rms.size == 0:
+        return None
+    quiet = (rms < max(min_rms, 0.1 * float(np.percentile(rms, 90)))).tolist()
+    need = max(1, round(pause_s / frame_s))
+    first = int(min_s / frame_s)
+    start = None
+    for i, q in enumerate(quiet + [False]):  # Sentinel closes a trailing pause
+        if q:
+            if start is None:
+                start = i
+            continue
+        if start is not None and i - start >= need and (start + i) // 2 >= first:
+            return (start + i) // 2 * frame
+        start = None
+    return None
+
+
+def quietest_point(audio, sample_rate: int, start_s: float, frame_s: float = 0.02) -> int:
+    """Sample index of the centre of the quietest frame after start_s."""
+    frame = int(sample_rate * frame_s)
+    rms = frame_rms(audio, frame)
+    if rms.size == 0:
+        return audio.size
+    first = min(int(start_s / frame_s), rms.size - 1)
+    i = first + int(np.argmin(rms[first:]))
+    return i * frame + frame // 2
@@ -7,16 +7,142 @@ DNA Strand: A4.4 (local mode) / FEAT-017
 
 import sqlite3
 import os
+import sys
 import json
+import time
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+_INSERT_SEGMENT = """
+    INSERT INTO segments (session_id, text, start_time, end_time, confidence, is_partial)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+class _SegmentWriter:
+    """
+    Write-behind queue for segment inserts.
+    
+    One daemon thread with its own connection drains a FIFO and commits
+    whatever has arrived in ONE transaction every `interval_ms` or
+    `max_rows` rows, whichever comes first — one fsync per batch instead
+    of one per segment. Rows are committed strictly in enqueue order, and
+    flush() waits until everything enqueued before the call is on disk —
+    or until its timeout, or until the writer thread has died.
+    """
+    
+    def __init__(self, db_path: str, interval_ms: float = 50.0, max_rows: int = 64):
+        self.db_path = db_path
+        self.interval_s = interval_ms / 1000.0
+        self.max_rows = max(1, max_rows)
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._enqueued = 0   # Rows ever enqueued
+        self._done = 0       # Rows ever committed (or given up on)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False  # The writer thread has exited (closed or crashed)
+        self.batches = 0
+        self.failed_rows = 0
+    
+    def put(self, row: Tuple):
+        with self._cond:
+            self._enqueued += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vault-writer", daemon=True)
+                self._thread.start()
+        self._queue.put(row)
+    
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return self._enqueued - self._done
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row enqueued so far is committed.
+
+        False if that didn't happen within `timeout` seconds, or can't
+        happen because the writer thread is gone.
+        """
+        with self._cond:
+            target = self._enqueued
+            self._cond.wait_for(lambda: self._done >= target or self._stopped, timeout)
+            return self._done >= target
+    
+    def close(self, timeout: float = 5.0):
+        """Flush, then stop the writer thread."""
+        with self._cond:
+            thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+    
+    def _run(self):
+        try:
+            self._drain()
+        finally:
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()  # Wake flush() callers; nothing more will commit
+
+    def _drain(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            while True:
+                row = self._queue.get()
+                if row is None:
+                    return
+                batch = [row]
+                stop = False
+                deadline = time.monotonic() + self.interval_s
+                while len(batch) < self.max_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        row = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if row is None:
+                        stop = True
+                        break
+                    batch.append(row)
+                self._commit(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+    
+    def _commit(self, conn, batch: List[Tuple]):
+        try:
+            with conn:
+                conn.executemany(_INSERT_SEGMENT, batch)
+        except sqlite3.Error:
+            # One bad row (e.g. its session was deleted meanwhile) must not
+            # take the rest of the batch with it — retry row by row, in order.
+            for row in batch:
+                try:
+                    with conn:
+                        conn.execute(_INSERT_SEGMENT, row)
+                except sqlite3.Error as e:
+                    self.failed_rows += 1
+                    print(f"Vault write error (segment dropped): {e}", file=sys.stderr)
+        self.batches += 1
+        with self._cond:
+            self._done += len(batch)
+            self._cond.notify_all()
 
 
 class PromptVault:
     """Local SQLite vault for persisting transcription sessions."""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None,
+                 flush_interval_ms: float = 50.0, flush_max_rows: int = 64,
+                 flush_timeout_s: float = 10.0):
         if db_path is None:
             db_path = os.path.join(str(Path.home()), '.windy-pro', 'vault.db')
         
@@ -24,11 +150,17 @@ class PromptVault:
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
         self.db_path = db_path
+        # One connection shared by every caller thread (the engine server
+        # runs vault calls in its thread pool): each use holds _conn_lock
+        self._conn_lock = threading.Lock()
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute("PRAGMA foreign_keys=ON")
         self._init_schema()
+        # Live-session segments go through the write-behind queue
+        self._writer = _SegmentWriter(db_path, flush_interval_ms, flush_max_rows)
+        self.flush_timeout_s = flush_timeout_s
     
     def _init_schema(self):
         """Create tables if not exists."""
@@ -81,45 +213,63 @@ class PromptVault:
     #  Session Management
     # ═════════════════════════════════
     
+    def _flush_writer(self):
+        """Wait (bounded) for queued segments before reading or changing a session.
+
+        A stalled or dead writer mustn't hang the caller: after
+        flush_timeout_s it goes ahead without the rows still queued.
+        """
+        if not self._writer.flush(self.flush_timeout_s):
+            print(f"Vault writer stalled: going ahead without {self._writer.pending} queued segment(s)",
+                  file=sys.stderr)
+
     def create_session(self) -> int:
         """Create a new session. Returns session ID."""
-        cursor = self._conn.execute(
-            "INSERT INTO sessions (started_at) VALUES (datetime('now'))"
-        )
-        self._conn.commit()
-        return cursor.lastrowid
+        with self._conn_lock:
+            cursor = self._conn.execute(
+                "INSERT INTO sessions (started_at) VALUES (datetime('now'))"
+            )
+            self._conn.commit()
+            return cursor.lastrowid
     
     def end_session(self, session_id: int):
-        """Mark a session as ended and calculate duration."""
-        self._conn.execute("""
-            UPDATE sessions SET 
-                ended_at = datetime('now'),
-                duration_s = (julianday(datetime('now')) - julianday(started_at)) * 86400,
-                word_count = (
-                    SELECT COALESCE(SUM(LENGTH(text) - LENGTH(REPLACE(text, ' ', '')) + 1), 0)
-                    FROM segments WHERE session_id = ? AND is_partial = 0
-                )
-            WHERE id = ?
-        """, (session_id, session_id))
-        self._conn.commit()
+        """Mark a session as ended and calculate duration.
+        
+        Flushes queued segments first so the word count covers them.
+        """
+        self._flush_writer()
+        with self._conn_lock:
+            self._conn.execute("""
+                UPDATE sessions SET 
+                    ended_at = datetime('now'),
+                    duration_s = (julianday(datetime('now')) - julianday(started_at)) * 86400,
+                    word_count = (
+                        SELECT COALESCE(SUM(LENGTH(text) - LENGTH(REPLACE(text, ' ', '')) + 1), 0)
+                        FROM segments WHERE session_id = ? AND is_partial = 0
+                    )
+                WHERE id = ?
+            """, (session_id, session_id))
+            self._conn.commit()
     
     def get_sessions(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
         """Get recent sessions, newest first."""
-        rows = self._conn.execute("""
-            SELECT s.*, 
-                   (SELECT text FROM segments WHERE session_id = s.id AND is_partial = 0 
-                    ORDER BY start_time LIMIT 1) as preview
-            FROM sessions s
-            ORDER BY s.started_at DESC
-            LIMIT ? OFFSET ?
-        """, (limit, offset)).fetchall()
+        with self._conn_lock:
+            rows = self._conn.execute("""
+                SELECT s.*, 
+                       (SELECT text FROM segments WHERE session_id = s.id AND is_partial = 0 
+                        ORDER BY start_time LIMIT 1) as preview
+                FROM sessions s
+                ORDER BY s.started_at DESC
+                LIMIT ? OFFSET ?
+            """, (limit, offset)).fetchall()
         return [dict(r) for r in rows]
     
     def get_session(self, session_id: int) -> Optional[Dict[str, Any]]:
         """Get a single session with its segments."""
-        row = self._conn.execute(
-            "SELECT * FROM sessions WHERE id = ?", (session_id,)
-        ).fetchone()
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT * FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
         if not row:
             return None
         
@@ -129,11 +279,13 @@ class PromptVault:
     
     def delete_session(self, session_id: int) -> bool:
         """Delete a session and all its segments."""
-        cursor = self._conn.execute(
-            "DELETE FROM sessions WHERE id = ?", (session_id,)
-        )
-        self._conn.commit()
-        return cursor.rowcount > 0
+        self._flush_writer()
+        with self._conn_lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE id = ?", (session_id,)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
     
     # ═════════════════════════════════
     #  Segment Management
@@ -143,20 +295,36 @@ class PromptVault:
                      end_time: float, confidence: float = 0, 
                      is_partial: bool = False) -> int:
         """Save a transcription segment. Returns segment ID."""
-        cursor = self._conn.execute("""
-            INSERT INTO segments (session_id, text, start_time, end_time, confidence, is_partial)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (session_id, text, start_time, end_time, confidence, int(is_partial)))
-        self._conn.commit()
-        return cursor.lastrowid
+        self._flush_writer()  # Keep ordering with anything already queued
+        with self._conn_lock:
+            cursor = self._conn.execute(_INSERT_SEGMENT,
+                                        (session_id, text, start_time, end_time, confidence, int(is_partial)))
+            self._conn.commit()
+            return cursor.lastrowid
+    
+    def queue_segment(self, session_id: int, text: str, start_time: float,
+                      end_time: float, confidence: float = 0,
+                      is_partial: bool = False):
+        """Queue a segment for the write-behind writer. Never blocks on disk.
+        
+        Queued segments are committed in order, in batches; end_session(),
+        flush() and close() wait for them.
+        """
+        self._writer.put((session_id, text, start_time, end_time, confidence, int(is_partial)))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued segment is committed."""
+        return self._writer.flush(timeout)
     
     def get_session_segments(self, session_id: int) -> List[Dict[str, Any]]:
         """Get all non-partial segments for a session, ordered by time."""
-        rows = self._conn.execute("""
-            SELECT * FROM segments 
-            WHERE session_id = ? AND is_partial = 0
-            ORDER BY start_time
-        """, (session_id,)).fetchall()
+        self._flush_writer()
+        with self._conn_lock:
+            rows = self._conn.execute("""
+                SELECT * FROM segments 
+                WHERE session_id = ? AND is_partial = 0
+                ORDER BY start_time
+            """, (session_id,)).fetchall()
         return [dict(r) for r in rows]
     
     # ═════════════════════════════════
@@ -165,27 +333,29 @@ class PromptVault:
     
     def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Full-text search across all segments using FTS5 index."""
-        try:
-            # Use FTS5 for fast indexed search
-            rows = self._conn.execute("""
-                SELECT seg.*, ses.started_at as session_date
-                FROM segments seg
-                JOIN segments_fts fts ON seg.id = fts.rowid
-                JOIN sessions ses ON seg.session_id = ses.id
-                WHERE segments_fts MATCH ? AND seg.is_partial = 0
-                ORDER BY seg.created_at DESC
-                LIMIT ?
-            """, (query, limit)).fetchall()
-        except Exception:
-            # Fallback to LIKE for backwards compatibility with old DBs
-            rows = self._conn.execute("""
-                SELECT seg.*, ses.started_at as session_date
-                FROM segments seg
-                JOIN sessions ses ON seg.session_id = ses.id
-                WHERE seg.text LIKE ? AND seg.is_partial = 0
-                ORDER BY seg.created_at DESC
-                LIMIT ?
-            """, (f'%{query}%', limit)).fetchall()
+        self._flush_writer()
+        with self._conn_lock:
+            try:
+                # Use FTS5 for fast indexed search
+                rows = self._conn.execute("""
+                    SELECT seg.*, ses.started_at as session_date
+                    FROM segments seg
+                    JOIN segments_fts fts ON seg.id = fts.rowid
+                    JOIN sessions ses ON seg.session_id = ses.id
+                    WHERE segments_fts MATCH ? AND seg.is_partial = 0
+                    ORDER BY seg.created_at DESC
+                    LIMIT ?
+                """, (query, limit)).fetchall()
+            except Exception:
+                # Fallback to LIKE for backwards compatibility with old DBs
+                rows = self._conn.execute("""
+                    SELECT seg.*, ses.started_at as session_date
+                    FROM segments seg
+                    JOIN sessions ses ON seg.session_id = ses.id
+                    WHERE seg.text LIKE ? AND seg.is_partial = 0
+                    ORDER BY seg.created_at DESC
+                    LIMIT ?
+                """, (f'%{query}%', limit)).fetchall()
         return [dict(r) for r in rows]
     
     def export_session(self, session_id: int, format: str = 'txt') -> str:
@@ -213,7 +383,9 @@ class PromptVault:
             return ' '.join(seg['text'] for seg in segments)
     
     def close(self):
-        """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close the database connection (after draining queued segments)."""
+        self._writer.close()
+        with self._conn_lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
@@ -7,12 +7,20 @@ Optional post-processing that cleans up transcription output:
 - Removes filler words (um, uh, like)
 - Fixes common speech-to-text errors
 
+All rules are compiled once into single-pass patterns (one alternation
+for every filler, one for every correction) when the processor is built,
+instead of ~20 compile-and-scan passes per segment.
+
 DNA Strand: FEAT-067
 """
 
 import re
 from typing import Optional
 
+_SENTENCE_START = re.compile(r'([.!?])\s+([a-z])')
+_MULTI_SPACE = re.compile(r' {2,}')
+_SPACE_BEFORE_PUNCT = re.compile(r' ([.!?,;:])')
+
 
 class VibeProcessor:
     """
@@ -50,6 +58,34 @@ class VibeProcessor:
             self.remove_fillers = settings.get('vibe_remove_fillers', True)
             self.fix_grammar = settings.get('vibe_fix_grammar', True)
             self.fix_punctuation = settings.get('vibe_fix_punctuation', True)
+        
+        self.rebuild()
+    
+    def rebuild(self):
+        """Compile FILLERS and CORRECTIONS into single-pass patterns.
+        
+        Called on construction; call again after changing either table.
+        """
+        # Longest first, so e.g. "kind of" wins over a shorter alternative
+        # at the same position (same precedence as removing longest first).
+        fillers = sorted(self.FILLERS, key=len, reverse=True)
+        self._filler_re = re.compile(
+            r'\b(?:' + '|'.join(re.escape(f) for f in fillers) + r')\b',
+            re.IGNORECASE
+        ) if fillers else None
+        
+        # One capture group per correction; the group that matched picks
+        # the replacement. Replacements are inserted literally.
+        self._correction_groups = {}
+        alternatives = []
+        group = 1
+        for pattern, replacement in self.CORRECTIONS.items():
+            self._correction_groups[group] = replacement
+            alternatives.append(f'({pattern})')
+            group += 1 + re.compile(pattern).groups
+        self._correction_re = re.compile(
+            '|'.join(alternatives), re.IGNORECASE
+        ) if alternatives else None
     
     def process(self, text: str) -> str:
         """Apply all enabled post-processing to transcript text."""
@@ -73,23 +109,17 @@ class VibeProcessor:
         return result
     
     def _remove_fillers(self, text: str) -> str:
-        """Remove filler words from text."""
-        # Sort by length (longest first) to avoid partial matches
-        sorted_fillers = sorted(self.FILLERS, key=len, reverse=True)
-        
-        for filler in sorted_fillers:
-            # Match filler as whole word, case-insensitive
-            pattern = r'\b' + re.escape(filler) + r'\b'
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        return text
+        """Remove filler words from text (whole words, case-insensitive)."""
+        if self._filler_re is None:
+            return text
+        return self._filler_re.sub('', text)
     
     def _fix_grammar(self, text: str) -> str:
         """Apply common grammar corrections."""
-        for pattern, replacement in self.CORRECTIONS.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        return text
+        if self._correction_re is None:
+            return text
+        groups = self._correction_groups
+        return self._correction_re.sub(lambda m: groups[m.lastindex], text)
     
     def _fix_punctuation(self, text: str) -> str:
         """Add basic punctuation where missing."""
@@ -98,8 +128,7 @@ class VibeProcessor:
             text = text[0].upper() + text[1:]
         
         # Capitalize after sentence-ending punctuation
-        text = re.sub(
-            r'([.!?])\s+([a-z])',
+        text = _SENTENCE_START.sub(
             lambda m: m.group(1) + ' ' + m.group(2).upper(),
             text
         )
@@ -113,9 +142,9 @@ class VibeProcessor:
     def _clean_whitespace(self, text: str) -> str:
         """Remove extra whitespace artifacts from processing."""
         # Collapse multiple spaces
-        text = re.sub(r' {2,}', ' ', text)
+        text = _MULTI_SPACE.sub(' ', text)
         # Remove space before punctuation
-        text = re.sub(r' ([.!?,;:])', r'\1', text)
+        text = _SPACE_BEFORE_PUNCT.sub(r'\1', text)
         # Remove leading/trailing whitespace
         text = text.strip()
         return text
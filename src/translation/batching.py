@@ -0,0 +1,171 @@
+"""
+Windy Word - Translation Micro-Batcher
+Dynamic request batching for the translation WebSocket server.
+
+Each request used to run Translator.translate() on its own (batch size 1).
+Requests are now queued per (source_lang, target_lang) — only texts with
+the same language pair can share a generate() call — and a group is
+flushed when it reaches max_batch_size or its oldest request has waited
+max_wait_ms. The whole group runs as one padded batch on the inference
+thread, and each request's future gets its own result back.
+
+Latency bound per request: max_wait_ms + the batch running ahead of it +
+its own batch. Groups are served oldest-first, so a busy pair can't
+starve a quiet one.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+BatchFn = Callable[[List[str], str, str], List[dict]]
+
+
+class _Group:
+    __slots__ = ("items", "first_at")
+
+    def __init__(self):
+        self.items: List[Tuple[str, asyncio.Future, float]] = []
+        self.first_at = 0.0
+
+
+class TranslationBatcher:
+    """Collects translate requests into per-language-pair batches."""
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        detect_fn: Optional[Callable[[str], str]] = None,
+        history: int = 256,
+    ):
+        self._batch_fn = batch_fn
+        self._detect_fn = detect_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        # One inference thread: the model runs one batch at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translate-batch")
+        self._groups: Dict[Tuple[str, str], _Group] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._recent = deque(maxlen=history)
+        self.batches = 0
+        self.requests = 0
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, text: str, source_lang: str, target_lang: str) -> dict:
+        """Queue one text; resolves to its translate()-shaped result dict."""
+        loop = asyncio.get_running_loop()
+        if source_lang == "auto" and self._detect_fn is not None:
+            # Resolve before grouping — the batch key needs the real pair
+            source_lang = await loop.run_in_executor(None, self._detect_fn, text)
+        self._ensure_running()
+        future = loop.create_future()
+        key = (source_lang, target_lang)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+            group.first_at = loop.time()
+        group.items.append((text, future, time.monotonic()))
+        self._wakeup.set()
+        return await future
+
+    def run(self, fn: Callable, *args) -> asyncio.Future:
+        """Run fn(*args) on the inference thread, between batches.
+
+        For model work that isn't a batch (streamed translations): the
+        model still only ever runs one call at a time.
+        """
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _next_group(self, now: float):
+        """(key, seconds until due) of the group to serve next.
+
+        A full group goes first; otherwise the group whose oldest request
+        arrived first, once its max_wait_ms has passed.
+        """
+        if not self._groups:
+            return None, None
+        for key, group in self._groups.items():
+            if len(group.items) >= self.max_batch_size:
+                return key, 0.0
+        key, group = min(self._groups.items(), key=lambda kv: kv[1].first_at)
+        return key, max(0.0, group.first_at + self.max_wait_ms / 1000.0 - now)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, delay = self._next_group(loop.time())
+            if key is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if delay > 0:
+                # Sleep until the oldest group is due, or until a new request
+                # arrives (it may fill a group up to max_batch_size)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            group = self._groups[key]
+            batch = group.items[:self.max_batch_size]
+            rest = group.items[self.max_batch_size:]
+            if rest:
+                group.items = rest
+                group.first_at = loop.time()
+            else:
+                del self._groups[key]
+            batch = [item for item in batch if not item[1].done()]
+            if batch:
+                await self._dispatch(key, batch)
+
+    async def _dispatch(self, key: Tuple[str, str], batch):
+        loop = asyncio.get_running_loop()
+        source_lang, target_lang = key
+        texts = [text for text, _, _ in batch]
+        started = time.monotonic()
+        try:
+            results = await loop.run_in_executor(self._executor, self._batch_fn, texts, source_lang, target_lang)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finished = time.monotonic()
+
+        for (_, future, queued), result in zip(batch, results):
+            result["queue_ms"] = round((started - queued) * 1000, 1)
+            if not future.done():
+                future.set_result(result)
+
+        self._recent.append({
+            "pair": f"{source_lang}-{target_lang}",
+            "size": len(batch),
+            "inference_ms": round((finished - started) * 1000, 1),
+            "max_queue_ms": round(max(started - queued for _, _, queued in batch) * 1000, 1),
+        })
+        self.batches += 1
+        self.requests += len(batch)
+
+    def stats(self) -> dict:
+        """Batching counters for the health response."""
+        recent = list(self._recent)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "requests": self.requests,
+            "queued": sum(len(g.items) for g in self._groups.values()),
+            "avg_batch_size": round(sum(r["size"] for r in recent) / len(recent), 2) if recent else 0.0,
+            "avg_inference_ms": round(sum(r["inference_ms"] for r in recent) / len(recent), 1) if recent else 0.0,
+            "max_queue_ms": max((r["max_queue_ms"] for r in recent), default=0.0),
+        }
@@ -7,14 +7,34 @@ Measures:
 - Latency per request
 - VRAM usage (GPU mode)
 - Translation quality (informal assessment)
+
+Engine comparison (in-process, no server needed):
+    python benchmark.py --engines torch,ct2-int8,ct2-int8_float32
+reports tokens/sec, latency and exact-match parity against the first engine.
+
+Streaming (--stream) sends "stream": true requests and reports time to the
+first translation_partial (TTFT) next to the full round trip.
+
+Load mode (--load) drives the server with N concurrent connections and an
+open-loop Poisson arrival rate, so slow responses don't slow the offered
+load down. Language pairs and text lengths are drawn from weighted mixes:
+    python benchmark.py --load --clients 8 --rate 20 --duration 60 \
+        --pairs en-es:3,en-fr:1,ru-en:1 --lengths short:6,medium:3,long:1 \
+        --output load.json [--baseline previous.json]
+Latency is measured from each request's scheduled arrival (client-side
+waiting for a free connection included) and split into client wait,
+server queue (batcher queue_ms) and inference_ms. Server CPU comes from
+the cpu_time_s difference between health checks before and after the run.
 """
 
 import asyncio
 import json
+import math
+import random
 import time
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 try:
     import websockets
@@ -23,6 +43,71 @@ except ImportError:
     sys.exit(1)
 
 
+# Test pairs with sample sentences
+TEST_CASES = [
+    {
+        "text": "Hello, my name is Sarah and I work as a software engineer.",
+        "source": "en",
+        "target": "ru",
+        "description": "English → Russian"
+    },
+    {
+        "text": "Привет, как дела? Я изучаю программирование.",
+        "source": "ru",
+        "target": "en",
+        "description": "Russian → English"
+    },
+    {
+        "text": "Bom dia! Eu gosto muito de música e arte.",
+        "source": "pt",
+        "target": "fi",
+        "description": "Portuguese → Finnish"
+    },
+    {
+        "text": "Hyvää huomenta! Minä rakastan matkustamista.",
+        "source": "fi",
+        "target": "pt",
+        "description": "Finnish → Portuguese"
+    },
+    {
+        "text": "The weather is beautiful today, perfect for a walk in the park.",
+        "source": "en",
+        "target": "es",
+        "description": "English → Spanish"
+    },
+    {
+        "text": "Me gusta mucho la comida italiana, especialmente la pasta.",
+        "source": "es",
+        "target": "en",
+        "description": "Spanish → English"
+    },
+    {
+        "text": "你好，很高兴见到你。我来自北京。",
+        "source": "zh",
+        "target": "en",
+        "description": "Chinese → English"
+    },
+    {
+        "text": "Welcome to our company. We are happy to have you here.",
+        "source": "en",
+        "target": "ar",
+        "description": "English → Arabic"
+    },
+    {
+        "text": "こんにちは、元気ですか？今日はいい天気ですね。",
+        "source": "ja",
+        "target": "de",
+        "description": "Japanese → German"
+    },
+    {
+        "text": "안녕하세요, 만나서 반갑습니다. 저는 한국에서 왔어요.",
+        "source": "ko",
+        "target": "fr",
+        "description": "Korean → French"
+    }
+]
+
+
 class BenchmarkClient:
     """Client for benchmarking translation server."""
 
@@ -62,14 +147,276 @@ class BenchmarkClient:
 
         return data
 
+    async def translate_stream(self, text: str, source_lang: str, target_lang: str) -> dict:
+        """Streaming translate; records time to the first partial (client-side TTFT)."""
+        start_time = time.time()
+
+        await self.ws.send(json.dumps({
+            "text": text,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            "stream": True
+        }))
+        first_partial_ms = None
+        partials = 0
+        while True:
+            data = json.loads(await self.ws.recv())
+            if data.get("type") == "translation_partial":
+                partials += 1
+                if first_partial_ms is None:
+                    first_partial_ms = int((time.time() - start_time) * 1000)
+                continue
+            break
+
+        data["round_trip_ms"] = int((time.time() - start_time) * 1000)
+        data["client_ttft_ms"] = first_partial_ms if first_partial_ms is not None else data["round_trip_ms"]
+        data["partials"] = partials
+        data["input_text"] = text
+        self.results.append(data)
+
+        return data
+
     async def close(self):
         """Close connection."""
         if self.ws:
             await self.ws.close()
 
 
-async def run_benchmark():
-    """Run comprehensive benchmark."""
+# Words per request for each --lengths bucket (characters for unspaced scripts)
+LENGTH_BUCKETS = {
+    "short": (3, 8),
+    "medium": (12, 30),
+    "long": (40, 90),
+}
+
+UNSPACED_SOURCES = {"zh", "ja"}
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """Parse "en-es:3,en-fr:1" into [("en-es", 3.0), ("en-fr", 1.0)]; weight defaults to 1."""
+    mix = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, weight = part.partition(":")
+        mix.append((name.strip(), float(weight) if weight else 1.0))
+    if not mix:
+        raise ValueError(f"Empty mix: {spec!r}")
+    return mix
+
+
+def percentiles(values: List[float]) -> dict:
+    """p50/p95/p99 (nearest rank), mean and max."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(p):
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 1)
+
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered), 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def make_text(rng: random.Random, source: str, bucket: str) -> str:
+    """Synthetic request text in the source language, length drawn from the bucket.
+
+    Words are sampled from TEST_CASES sentences in that language (English if
+    there are none), so repeated requests don't just hit the result cache.
+    """
+    pool = [c["text"] for c in TEST_CASES if c["source"] == source] or \
+           [c["text"] for c in TEST_CASES if c["source"] == "en"]
+    low, high = LENGTH_BUCKETS[bucket]
+    n = rng.randint(low, high)
+    if source in UNSPACED_SOURCES:
+        chars = [ch for text in pool for ch in text if not ch.isspace()]
+        return "".join(rng.choices(chars, k=n))
+    words = [w.strip(".,!?") for text in pool for w in text.split()]
+    return " ".join(rng.choices(words, k=n)).capitalize() + "."
+
+
+def schedule_arrivals(rate: float, duration: float, pairs: List[Tuple[str, float]],
+                      lengths: List[Tuple[str, float]], seed: int = 0) -> List[dict]:
+    """Open-loop Poisson arrivals: exponential gaps at `rate` requests/sec."""
+    unknown = [name for name, _ in lengths if name not in LENGTH_BUCKETS]
+    if unknown:
+        raise ValueError(f"Unknown length bucket(s) {unknown}; choose from {', '.join(LENGTH_BUCKETS)}")
+    rng = random.Random(seed)
+    pair_names, pair_weights = zip(*pairs)
+    length_names, length_weights = zip(*lengths)
+    arrivals = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        pair = rng.choices(pair_names, pair_weights)[0]
+        source, target = pair.split("-", 1)
+        bucket = rng.choices(length_names, length_weights)[0]
+        arrivals.append({
+            "at": t,
+            "pair": pair,
+            "source": source,
+            "target": target,
+            "bucket": bucket,
+            "text": make_text(rng, source, bucket),
+        })
+        t += rng.expovariate(rate)
+    return arrivals
+
+
+def summarize_load(samples: List[dict], wall_s: float, config: dict,
+                   health_before: dict, health_after: dict) -> dict:
+    """Aggregate per-request samples into the JSON load report."""
+    ok = [s for s in samples if not s.get("error")]
+
+    def group(key):
+        out = {}
+        for name in sorted({s[key] for s in samples}):
+            members = [s for s in ok if s[key] == name]
+            out[name] = {
+                "requests": sum(1 for s in samples if s[key] == name),
+                "errors": sum(1 for s in samples if s[key] == name and s.get("error")),
+                "latency_ms": percentiles([s["latency_ms"] for s in members]),
+            }
+        return out
+
+    cpu = None
+    before = (health_before or {}).get("process") or {}
+    after = (health_after or {}).get("process") or {}
+    if "cpu_time_s" in before and "cpu_time_s" in after and wall_s > 0:
+        cpu_s = after["cpu_time_s"] - before["cpu_time_s"]
+        cores = after.get("cpu_count") or 1
+        cpu = {
+            "cpu_s": round(cpu_s, 3),
+            "cores_busy": round(cpu_s / wall_s, 2),
+            "utilization": round(cpu_s / wall_s / cores, 3),
+        }
+
+    return {
+        "config": config,
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "duration_s": round(wall_s, 3),
+        "offered_rps": config.get("rate"),
+        "throughput_rps": round(len(ok) / wall_s, 2) if wall_s > 0 else 0.0,
+        "latency_ms": percentiles([s["latency_ms"] for s in ok]),
+        "client_wait_ms": percentiles([s["client_wait_ms"] for s in ok]),
+        "server_queue_ms": percentiles([s["queue_ms"] for s in ok if s.get("queue_ms") is not None]),
+        "inference_ms": percentiles([s["inference_ms"] for s in ok if s.get("inference_ms") is not None]),
+        "by_pair": group("pair"),
+        "by_length": group("bucket"),
+        "server_cpu": cpu,
+        "server": {
+            "engine": (health_after or {}).get("engine"),
+            "device": (health_after or {}).get("device"),
+            "batching": (health_after or {}).get("batching"),
+        },
+    }
+
+
+async def run_load(host: str, port: int, clients: int, rate: float, duration: float,
+                   pairs: List[Tuple[str, float]], lengths: List[Tuple[str, float]],
+                   seed: int = 0) -> dict:
+    """Drive the server with `clients` connections at an open-loop `rate`."""
+    arrivals = schedule_arrivals(rate, duration, pairs, lengths, seed)
+    url = f"ws://{host}:{port}"
+    connections = []
+    for _ in range(max(1, clients)):
+        ws = await websockets.connect(url, max_size=None)
+        await ws.recv()  # welcome
+        connections.append(ws)
+
+    async def health(ws):
+        await ws.send(json.dumps({"type": "health"}))
+        return json.loads(await ws.recv())
+
+    health_before = await health(connections[0])
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Queue = asyncio.Queue()
+    samples = []
+    start = loop.time()
+
+    async def feed():
+        # Arrivals are released on schedule regardless of how busy the clients are
+        for arrival in arrivals:
+            await asyncio.sleep(max(0.0, start + arrival["at"] - loop.time()))
+            pending.put_nowait(arrival)
+        for _ in connections:
+            pending.put_nowait(None)
+
+    async def client(ws):
+        while True:
+            arrival = await pending.get()
+            if arrival is None:
+                return
+            scheduled = start + arrival["at"]
+            sent = loop.time()
+            await ws.send(json.dumps({
+                "text": arrival["text"],
+                "source_lang": arrival["source"],
+                "target_lang": arrival["target"],
+            }))
+            data = json.loads(await ws.recv())
+            done = loop.time()
+            samples.append({
+                "pair": arrival["pair"],
+                "bucket": arrival["bucket"],
+                "latency_ms": (done - scheduled) * 1000,
+                "client_wait_ms": (sent - scheduled) * 1000,
+                "queue_ms": data.get("queue_ms"),
+                "inference_ms": data.get("inference_ms"),
+                "error": data.get("error"),
+            })
+
+    await asyncio.gather(feed(), *(client(ws) for ws in connections))
+    wall_s = loop.time() - start
+    health_after = await health(connections[0])
+    for ws in connections:
+        await ws.close()
+
+    config = {
+        "clients": len(connections),
+        "rate": rate,
+        "duration": duration,
+        "pairs": dict(pairs),
+        "lengths": dict(lengths),
+        "seed": seed,
+    }
+    return summarize_load(samples, wall_s, config, health_before, health_after)
+
+
+def print_load_report(report: dict, baseline: Optional[dict] = None):
+    print(f"Requests: {report['requests']} ({report['errors']} errors) in {report['duration_s']}s | "
+          f"offered {report['offered_rps']} req/s, served {report['throughput_rps']} req/s")
+    print(f"{'':<16} {'p50':>8} {'p95':>8} {'p99':>8} {'mean':>8}")
+    for key, label in (("latency_ms", "latency"), ("client_wait_ms", "client wait"),
+                       ("server_queue_ms", "server queue"), ("inference_ms", "inference")):
+        p = report[key]
+        print(f"{label:<16} {p['p50']:>8} {p['p95']:>8} {p['p99']:>8} {p['mean']:>8}")
+    for section in ("by_pair", "by_length"):
+        for name, group in report[section].items():
+            p = group["latency_ms"]
+            print(f"  {name:<14} n={group['requests']:<5} p50 {p['p50']}ms  p95 {p['p95']}ms  p99 {p['p99']}ms")
+    if report["server_cpu"]:
+        cpu = report["server_cpu"]
+        print(f"Server CPU: {cpu['cpu_s']}s ({cpu['cores_busy']} cores busy, {cpu['utilization']:.0%} of machine)")
+
+    if baseline:
+        print("\nvs baseline:")
+        for key in ("p50", "p95", "p99"):
+            old, new = baseline["latency_ms"][key], report["latency_ms"][key]
+            change = f"{(new - old) / old:+.1%}" if old else "n/a"
+            print(f"  latency {key}: {old} -> {new} ms ({change})")
+        old, new = baseline["throughput_rps"], report["throughput_rps"]
+        print(f"  throughput: {old} -> {new} req/s")
+
+
+async def run_benchmark(stream: bool = False):
+    """Run comprehensive benchmark (stream=True: streaming requests, measures TTFT)."""
 
     client = BenchmarkClient()
     await client.connect()
@@ -94,69 +441,7 @@ async def run_benchmark():
     print("TESTING 10 REQUIRED LANGUAGE PAIRS")
     print("="*70 + "\n")
 
-    # Test pairs with sample sentences
-    test_cases = [
-        {
-            "text": "Hello, my name is Sarah and I work as a software engineer.",
-            "source": "en",
-            "target": "ru",
-            "description": "English → Russian"
-        },
-        {
-            "text": "Привет, как дела? Я изучаю программирование.",
-            "source": "ru",
-            "target": "en",
-            "description": "Russian → English"
-        },
-        {
-            "text": "Bom dia! Eu gosto muito de música e arte.",
-            "source": "pt",
-            "target": "fi",
-            "description": "Portuguese → Finnish"
-        },
-        {
-            "text": "Hyvää huomenta! Minä rakastan matkustamista.",
-            "source": "fi",
-            "target": "pt",
-            "description": "Finnish → Portuguese"
-        },
-        {
-            "text": "The weather is beautiful today, perfect for a walk in the park.",
-            "source": "en",
-            "target": "es",
-            "description": "English → Spanish"
-        },
-        {
-            "text": "Me gusta mucho la comida italiana, especialmente la pasta.",
-            "source": "es",
-            "target": "en",
-            "description": "Spanish → English"
-        },
-        {
-            "text": "你好，很高兴见到你。我来自北京。",
-            "source": "zh",
-            "target": "en",
-            "description": "Chinese → English"
-        },
-        {
-            "text": "Welcome to our company. We are happy to have you here.",
-            "source": "en",
-            "target": "ar",
-            "description": "English → Arabic"
-        },
-        {
-            "text": "こんにちは、元気ですか？今日はいい天気ですね。",
-            "source": "ja",
-            "target": "de",
-            "description": "Japanese → German"
-        },
-        {
-            "text": "안녕하세요, 만나서 반갑습니다. 저는 한국에서 왔어요.",
-            "source": "ko",
-            "target": "fr",
-            "description": "Korean → French"
-        }
-    ]
+    test_cases = TEST_CASES
 
     print(f"Running {len(test_cases)} translation tests...\n")
 
@@ -164,7 +449,10 @@ async def run_benchmark():
         print(f"{i}. {test['description']}")
         print(f"   Input:  {test['text']}")
 
-        result = await client.translate(test['text'], test['source'], test['target'])
+        if stream:
+            result = await client.translate_stream(test['text'], test['source'], test['target'])
+        else:
+            result = await client.translate(test['text'], test['source'], test['target'])
 
         if "error" in result:
             print(f"   ❌ Error: {result['error']}\n")
@@ -176,6 +464,9 @@ async def run_benchmark():
             if "tokens_per_sec" in result:
                 print(f"   Speed:  {result['tokens_per_sec']} tokens/sec")
 
+            if "client_ttft_ms" in result:
+                print(f"   TTFT:   {result['client_ttft_ms']}ms (first partial of {result['partials']})")
+
             print()
 
         await asyncio.sleep(0.1)
@@ -211,6 +502,11 @@ async def run_benchmark():
         if avg_tokens_per_sec > 0:
             print(f"  Average throughput: {avg_tokens_per_sec:.1f} tokens/sec")
 
+        ttfts = sorted(r["client_ttft_ms"] for r in successful if "client_ttft_ms" in r)
+        if ttfts:
+            print(f"  Time to first token: avg {sum(ttfts) / len(ttfts):.1f}ms | "
+                  f"p50 {ttfts[len(ttfts) // 2]}ms | max {ttfts[-1]}ms")
+
         print()
 
     # VRAM usage
@@ -274,6 +570,10 @@ def generate_markdown_report(results: List[dict], initial_health: dict, final_he
         if avg_tokens_per_sec > 0:
             report.append(f"- **Average Throughput:** {avg_tokens_per_sec:.1f} tokens/sec")
 
+        ttfts = [r["client_ttft_ms"] for r in successful if "client_ttft_ms" in r]
+        if ttfts:
+            report.append(f"- **Average Time to First Token (streaming):** {sum(ttfts) / len(ttfts):.1f}ms")
+
         report.append("")
 
     report.append("## Test Results")
@@ -316,9 +616,120 @@ def generate_markdown_report(results: List[dict], initial_health: dict, final_he
     output_path.write_text("\n".join(report))
 
 
+def compare_engines(engines: List[str], model_path: str = None, repeats: int = 3) -> List[dict]:
+    """
+    In-process engine comparison (no server): load a Translator per engine,
+    translate TEST_CASES `repeats` times and report output tokens/sec,
+    latency, and parity with the first engine's translations.
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from src.translation.translator import Translator, TranslationConfig
+
+    reports = []
+    reference = None
+    for engine in engines:
+        translator = Translator(TranslationConfig(model_path=model_path, engine=engine, device="cpu", cache_size=0))
+        load_start = time.time()
+        if not translator.load_model():
+            reports.append({"engine": engine, "error": "model failed to load"})
+            continue
+        load_s = time.time() - load_start
+
+        # Warm-up, not timed
+        translator.translate(TEST_CASES[0]["text"], TEST_CASES[0]["source"], TEST_CASES[0]["target"])
+
+        outputs, latencies, tokens = [], [], 0
+        for _ in range(repeats):
+            outputs = []
+            for case in TEST_CASES:
+                start = time.time()
+                result = translator.translate(case["text"], case["source"], case["target"], return_timing=True)
+                latencies.append((time.time() - start) * 1000)
+                tokens += result.get("output_tokens", 0)
+                outputs.append(result.get("translated_text", ""))
+        total_s = sum(latencies) / 1000
+
+        report = {
+            "engine": engine,
+            "load_s": round(load_s, 2),
+            "tokens_per_sec": round(tokens / total_s, 1) if total_s else 0.0,
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 1),
+            "outputs": outputs,
+        }
+        if reference is None:
+            reference = outputs
+        else:
+            same = sum(a == b for a, b in zip(outputs, reference))
+            report["parity"] = round(same / len(reference), 3)
+        reports.append(report)
+        del translator
+
+    return reports
+
+
+def print_engine_comparison(reports: List[dict]):
+    baseline = next((r for r in reports if "tokens_per_sec" in r), None)
+    print(f"{'engine':<18} {'load s':>7} {'tokens/s':>9} {'avg ms':>8} {'speedup':>8} {'parity':>7}")
+    for r in reports:
+        if "error" in r:
+            print(f"{r['engine']:<18} {r['error']}")
+            continue
+        speedup = r["tokens_per_sec"] / baseline["tokens_per_sec"] if baseline["tokens_per_sec"] else 0.0
+        parity = f"{r['parity']:.0%}" if "parity" in r else "ref"
+        print(f"{r['engine']:<18} {r['load_s']:>7} {r['tokens_per_sec']:>9} {r['avg_latency_ms']:>8} "
+              f"{speedup:>7.2f}x {parity:>7}")
+
+
 async def main():
     """Main entry point."""
-    await run_benchmark()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Windy Word translation benchmark")
+    parser.add_argument("--engines", default=None,
+                        help="Compare engines in-process instead of benchmarking the server, "
+                             "e.g. torch,ct2-int8,ct2-int8_float32 (first one is the parity reference)")
+    parser.add_argument("--model-path", default=None, help="M2M-100 model (default: models/m2m100_418M)")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the test set per engine")
+    parser.add_argument("--json", action="store_true", help="Print the engine comparison as JSON")
+    parser.add_argument("--stream", action="store_true",
+                        help="Send streaming requests and report time to first token")
+    parser.add_argument("--load", action="store_true", help="Concurrent open-loop load test against the server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9877)
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent connections")
+    parser.add_argument("--rate", type=float, default=10.0, help="Offered load, requests/sec (Poisson)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals")
+    parser.add_argument("--pairs", default="en-es:3,en-fr:1,es-en:1,ru-en:1",
+                        help="Weighted language-pair mix")
+    parser.add_argument("--lengths", default="short:6,medium:3,long:1",
+                        help=f"Weighted text-length mix over {', '.join(LENGTH_BUCKETS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the load report as JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier --output JSON to compare against")
+    args = parser.parse_args()
+
+    if args.load:
+        report = await run_load(args.host, args.port, args.clients, args.rate, args.duration,
+                                parse_mix(args.pairs), parse_mix(args.lengths), args.seed)
+        baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_load_report(report, baseline)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, indent=2))
+            print(f"Load report saved to: {args.output}", file=sys.stderr)
+        return
+
+    if args.engines:
+        reports = compare_engines(args.engines.split(","), args.model_path, args.repeats)
+        if args.json:
+            print(json.dumps(reports, ensure_ascii=False, indent=2))
+        else:
+            print_engine_comparison(reports)
+        return
+
+    await run_benchmark(stream=args.stream)
 
 
 if __name__ == "__main__":
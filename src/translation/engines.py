@@ -0,0 +1,250 @@
+"""
+Windy Word - Translation Engines
+Inference backends behind the Translator.
+
+The Translator owns the M2M-100 tokenizer, language handling, sentence
+splitting and caching; an engine only turns a batch of source sentences
+into target sentences, either as a batch (translate) or one sentence at a
+time as text pieces while it decodes (stream; greedy — beam search can't
+commit to a prefix early). Engines (TranslationConfig.engine):
+
+- "torch"            PyTorch, float32 on CPU / float16 on CUDA (supports LoRA)
+- "ct2-int8"         CTranslate2, int8 weights + int8 compute
+- "ct2-int8_float32" CTranslate2, int8 weights, float32 activations
+
+CTranslate2 runs a converted copy of the model (ct2_model_path, default
+"<model_path>-ct2-int8"). If it doesn't exist it is converted once on
+first load, which needs torch + transformers; afterwards the CT2 engines
+need neither torch nor a GPU — this is the path for CPU-only nodes, the
+same one services/translate-api uses for NLLB.
+"""
+
+import os
+import sys
+import threading
+from typing import Iterator, List, Tuple
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    torch = None
+    TORCH_AVAILABLE = False
+
+try:
+    import ctranslate2
+    CT2_AVAILABLE = True
+except ImportError:
+    ctranslate2 = None
+    CT2_AVAILABLE = False
+
+ENGINES = ("torch", "ct2-int8", "ct2-int8_float32")
+
+# (translated text, input tokens, output tokens) per sentence; padding excluded
+EngineOutput = List[Tuple[str, int, int]]
+
+
+def encode(tokenizer, sentences: List[str], source_lang: str, max_length: int) -> List[List[int]]:
+    """M2M-100 input ids (__src__ ... </s>) for each sentence.
+
+    The source language is passed per call rather than set on the shared
+    tokenizer (tokenizer.src_lang), so concurrent requests in different
+    languages can't tokenize with each other's language token.
+    """
+    body = tokenizer(sentences, add_special_tokens=False, truncation=True,
+                     max_length=max_length - 2)["input_ids"]
+    lang_id = tokenizer.get_lang_id(source_lang)
+    return [[lang_id] + ids + [tokenizer.eos_token_id] for ids in body]
+
+
+class TorchEngine:
+    """M2M100ForConditionalGeneration.generate() on padded tensors."""
+
+    name = "torch"
+
+    def __init__(self, model, tokenizer, device: str, num_beams: int = 5, max_length: int = 512):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.num_beams = num_beams
+        self.max_length = max_length
+
+    @classmethod
+    def load(cls, config, tokenizer, device: str) -> "TorchEngine":
+        if not TORCH_AVAILABLE:
+            raise RuntimeError("The torch engine needs PyTorch: pip install torch")
+        from transformers import M2M100ForConditionalGeneration
+
+        dtype = torch.float16 if device == "cuda" else torch.float32
+        if config.model_type == "lora" and config.lora_adapter_path:
+            # Load base model + LoRA adapter
+            from peft import PeftModel
+            base_model = M2M100ForConditionalGeneration.from_pretrained(config.model_path, torch_dtype=dtype)
+            model = PeftModel.from_pretrained(base_model, config.lora_adapter_path)
+            print(f"LoRA adapter loaded from {config.lora_adapter_path}")
+        else:
+            # Load standard model (base or fine-tuned merged)
+            model = M2M100ForConditionalGeneration.from_pretrained(config.model_path, torch_dtype=dtype)
+
+        model.to(device)
+        model.eval()
+        return cls(model, tokenizer, device, config.num_beams, config.max_length)
+
+    def translate(self, sentences: List[str], source_lang: str, target_lang: str) -> EngineOutput:
+        # Tokenize input (padded to the longest sentence in the batch)
+        inputs = self.tokenizer.pad(
+            {"input_ids": encode(self.tokenizer, sentences, source_lang, self.max_length)},
+            return_tensors="pt"
+        ).to(self.device)
+
+        with torch.no_grad():
+            generated_tokens = self.model.generate(
+                **inputs,
+                forced_bos_token_id=self.tokenizer.get_lang_id(target_lang),
+                num_beams=self.num_beams,
+                max_length=self.max_length
+            )
+
+        decoded = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+        pad_id = self.tokenizer.pad_token_id
+        return [
+            (text,
+             int(inputs["attention_mask"][i].sum()),
+             int((generated_tokens[i] != pad_id).sum()))
+            for i, text in enumerate(decoded)
+        ]
+
+    def stream(self, sentence: str, source_lang: str, target_lang: str) -> Iterator[str]:
+        """Greedy-decode one sentence, yielding text pieces as they appear."""
+        from transformers import TextIteratorStreamer
+
+        inputs = self.tokenizer.pad(
+            {"input_ids": encode(self.tokenizer, [sentence], source_lang, self.max_length)},
+            return_tensors="pt"
+        ).to(self.device)
+        streamer = TextIteratorStreamer(self.tokenizer, skip_special_tokens=True)
+        failure = []
+
+        def run():
+            try:
+                with torch.no_grad():
+                    self.model.generate(
+                        **inputs,
+                        forced_bos_token_id=self.tokenizer.get_lang_id(target_lang),
+                        num_beams=1,
+                        do_sample=False,
+                        max_length=self.max_length,
+                        streamer=streamer
+                    )
+            except Exception as e:
+                failure.append(e)
+                streamer.end()  # Unblock the consumer
+
+        worker = threading.Thread(target=run, name="translate-stream", daemon=True)
+        worker.start()
+        for piece in streamer:
+            if piece:
+                yield piece
+        worker.join()
+        if failure:
+            raise failure[0]
+
+
+class CT2Engine:
+    """CTranslate2 Translator over the converted M2M-100 model."""
+
+    def __init__(self, translator, tokenizer, compute_type: str,
+                 num_beams: int = 5, max_length: int = 512):
+        self.translator = translator
+        self.tokenizer = tokenizer
+        self.compute_type = compute_type
+        self.name = f"ct2-{compute_type}"
+        self.num_beams = num_beams
+        self.max_length = max_length
+
+    @classmethod
+    def load(cls, config, tokenizer, device: str) -> "CT2Engine":
+        if not CT2_AVAILABLE:
+            raise RuntimeError("CTranslate2 engines need ctranslate2: pip install ctranslate2")
+        if config.model_type == "lora":
+            raise RuntimeError("CTranslate2 can't apply a LoRA adapter; merge it (model_type='finetuned') first")
+        compute_type = config.engine[len("ct2-"):]
+        model_dir = config.ct2_model_path or f"{config.model_path}-ct2-int8"
+        if not os.path.exists(os.path.join(model_dir, "model.bin")):
+            convert_to_ct2(config.model_path, model_dir)
+        translator = ctranslate2.Translator(
+            model_dir,
+            device=device,
+            compute_type=compute_type,
+            intra_threads=config.cpu_threads
+        )
+        return cls(translator, tokenizer, compute_type, config.num_beams, config.max_length)
+
+    def translate(self, sentences: List[str], source_lang: str, target_lang: str) -> EngineOutput:
+        # Same token stream the torch path sees: __src__ ... </s>, truncated alike
+        sources = [
+            self.tokenizer.convert_ids_to_tokens(ids)
+            for ids in encode(self.tokenizer, sentences, source_lang, self.max_length)
+        ]
+        target_token = self.tokenizer.get_lang_token(target_lang)
+        results = self.translator.translate_batch(
+            sources,
+            target_prefix=[[target_token]] * len(sources),
+            beam_size=self.num_beams,
+            max_batch_size=len(sources),
+            max_decoding_length=self.max_length
+        )
+        out = []
+        for source, result in zip(sources, results):
+            tokens = result.hypotheses[0]
+            ids = self.tokenizer.convert_tokens_to_ids(tokens)
+            text = self.tokenizer.decode(ids, skip_special_tokens=True)
+            # torch counts decoder start + forced BOS + </s>; CT2 hypotheses hold the prefix only
+            out.append((text, len(source), len(tokens) + 2))
+        return out
+
+    def stream(self, sentence: str, source_lang: str, target_lang: str) -> Iterator[str]:
+        """Greedy-decode one sentence, yielding text pieces as they appear."""
+        source = self.tokenizer.convert_ids_to_tokens(
+            encode(self.tokenizer, [sentence], source_lang, self.max_length)[0])
+        ids = []
+        emitted = ""
+        for step in self.translator.generate_tokens(
+            source,
+            target_prefix=[self.tokenizer.get_lang_token(target_lang)],
+            max_decoding_length=self.max_length
+        ):
+            ids.append(step.token_id)
+            # Re-decode the whole prefix: SentencePiece pieces only get their
+            # spacing right in context
+            text = self.tokenizer.decode(ids, skip_special_tokens=True)
+            if len(text) > len(emitted) and text.startswith(emitted):
+                yield text[len(emitted):]
+                emitted = text
+
+
+def convert_to_ct2(model_path: str, output_dir: str, quantization: str = "int8"):
+    """One-time Transformers -> CTranslate2 conversion (needs torch + transformers)."""
+    if not CT2_AVAILABLE:
+        raise RuntimeError("CTranslate2 engines need ctranslate2: pip install ctranslate2")
+    print(f"Converting {model_path} to CTranslate2 ({quantization}) at {output_dir}...", file=sys.stderr)
+    converter = ctranslate2.converters.TransformersConverter(model_path)
+    converter.convert(output_dir, quantization=quantization, force=True)
+
+
+def resolve_device(config) -> str:
+    """Resolve device "auto" to cuda when the engine can see a GPU, else cpu."""
+    if config.device != "auto":
+        return config.device
+    if config.engine == "torch":
+        return "cuda" if TORCH_AVAILABLE and torch.cuda.is_available() else "cpu"
+    return "cuda" if CT2_AVAILABLE and ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def load_engine(config, tokenizer, device: str):
+    """Build the engine named by config.engine."""
+    if config.engine not in ENGINES:
+        raise ValueError(f"Unknown translation engine {config.engine!r} (choose from {', '.join(ENGINES)})")
+    if config.engine == "torch":
+        return TorchEngine.load(config, tokenizer, device)
+    return CT2Engine.load(config, tokenizer, device)
@@ -15,6 +15,9 @@ Usage:
     # Custom model path
     python run_server.py --model-path models/custom_model
 
+    # CTranslate2 int8 on a CPU-only node (converts the model on first run)
+    python run_server.py --engine ct2-int8
+
 Examples:
     # Run with fine-tuned Windy Translate Spark model
     python run_server.py --model-type finetuned
@@ -0,0 +1,170 @@
+"""
+Windy Word - Sentence Segmentation
+Language-aware sentence splitter for the Translator's input pipeline.
+
+M2M-100 was trained on sentence pairs; a whole paragraph tokenized as one
+sequence is truncated at max_length and decoded with attention cost that
+grows quadratically with its length. Splitting into sentences first lets
+the Translator translate every sentence of every text as a (length-sorted)
+batch and stitch the results back together.
+
+The splitter is rule based, no models:
+- Sentence-final punctuation per script (。！？ for Chinese/Japanese, । for
+  Hindi, ؟ for Arabic script, ; as the Greek question mark, ...).
+- Spaced languages only break when whitespace follows the punctuation, and
+  not after known abbreviations ("Dr.", "z.B.", "etc."), single-letter
+  initials, or before a lowercase word.
+- Line breaks always end a sentence and are preserved on reassembly.
+- Scripts written without sentence punctuation (Thai, Lao, Khmer, Burmese)
+  are only split at line breaks.
+- Anything longer than max_chars is cut at the last clause boundary or
+  space before the limit, so no piece is silently truncated by the model.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+# Upper bound for one piece; ~512 M2M-100 tokens is far more than this
+MAX_SENTENCE_CHARS = 600
+
+_CLOSERS = "\"'”’)]}»」』"
+
+_TERMINATORS = {
+    "zh": "。！？!?…",
+    "ja": "。！？!?…",
+    "hi": "।॥.!?",
+    "ar": ".!?؟",
+    "fa": ".!?؟",
+    "ur": ".!?؟۔",
+    "he": ".!?",
+    "el": ".!;…",
+}
+_DEFAULT_TERMINATORS = ".!?…"
+
+# Sentences are not separated by spaces in these languages
+UNSPACED_LANGS = {"zh", "ja"}
+
+# No sentence-final punctuation in common use: split on line breaks only
+UNSEGMENTED_LANGS = {"th", "lo", "km", "my"}
+
+_ABBREVIATIONS = {
+    "en": {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+           "a.m", "p.m", "inc", "ltd", "co", "no", "fig", "approx", "dept", "est", "u.s"},
+    "es": {"sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "p.ej", "núm", "pág"},
+    "fr": {"m", "mm", "mme", "mlle", "dr", "etc", "p.ex", "cf", "env", "n°"},
+    "de": {"z.b", "bzw", "usw", "dr", "nr", "ca", "vgl", "d.h", "u.a", "str", "hr", "fr"},
+    "pt": {"sr", "sra", "dr", "dra", "etc", "p.ex", "pág"},
+    "it": {"sig", "sig.ra", "dott", "ecc", "pag", "ing"},
+    "nl": {"dhr", "mevr", "bijv", "enz", "d.w.z", "nr"},
+}
+
+_CLAUSE_BREAK = re.compile(r"[,;:，、；：]\s*")
+_LINE_BREAK = re.compile(r"(\s*\n\s*)")
+_WORD_BEFORE_DOT = re.compile(r"(\S+)\.$")
+
+_boundary_cache = {}
+
+
+def _boundary_pattern(lang: str):
+    if lang not in _boundary_cache:
+        terms = re.escape(_TERMINATORS.get(lang, _DEFAULT_TERMINATORS))
+        closers = re.escape(_CLOSERS)
+        if lang in UNSPACED_LANGS:
+            pattern = rf"[{terms}]+[{closers}]*(\s*)"
+        else:
+            pattern = rf"[{terms}]+[{closers}]*(\s+)"
+        _boundary_cache[lang] = re.compile(pattern)
+    return _boundary_cache[lang]
+
+
+def _is_abbreviation(before: str, lang: str) -> bool:
+    """True if the '.' ending `before` belongs to an abbreviation or initial."""
+    m = _WORD_BEFORE_DOT.search(before)
+    if not m:
+        return False
+    word = m.group(1).lstrip(_CLOSERS + "(").lower()
+    if len(word) == 1 and word.isalpha():
+        return True  # Initial: "J. R. R. Tolkien"
+    return word in _ABBREVIATIONS.get(lang, ()) or word in _ABBREVIATIONS["en"]
+
+
+def _split_paragraph(text: str, lang: str) -> List[str]:
+    if lang in UNSEGMENTED_LANGS:
+        return [text]
+    pieces = []
+    start = 0
+    for m in _boundary_pattern(lang).finditer(text):
+        end = m.end()
+        if end >= len(text):
+            break
+        if lang not in UNSPACED_LANGS:
+            punct_end = m.start(1)
+            if text[punct_end - 1] == "." and _is_abbreviation(text[start:punct_end], lang):
+                continue
+            if text[end].islower():
+                continue
+        sentence = text[start:m.start(1)].strip()
+        if sentence:
+            pieces.append(sentence)
+        start = end
+    tail = text[start:].strip()
+    if tail:
+        pieces.append(tail)
+    return pieces
+
+
+def _cap_length(sentence: str, max_chars: int) -> List[str]:
+    """Cut an over-long sentence at clause boundaries or spaces."""
+    pieces = []
+    while len(sentence) > max_chars:
+        window = sentence[:max_chars]
+        cut = 0
+        for m in _CLAUSE_BREAK.finditer(window):
+            cut = m.end()
+        if cut < max_chars // 2:
+            space = window.rfind(" ")
+            cut = space + 1 if space > max_chars // 2 else max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def split_sentences(text: str, lang: str = "en",
+                    max_chars: int = MAX_SENTENCE_CHARS) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split text into (sentence, separator) pairs.
+
+    separator is the whitespace that followed the sentence in the input
+    ("" between unspaced CJK sentences) or None after the last sentence;
+    pass the pairs' separators to join_sentences() to reassemble.
+    """
+    lang = (lang or "en").split("-")[0].lower()
+    sentences: List[Tuple[str, Optional[str]]] = []
+    parts = _LINE_BREAK.split(text.strip())
+    for i in range(0, len(parts), 2):
+        paragraph = parts[i]
+        pieces = []
+        for sentence in _split_paragraph(paragraph, lang):
+            pieces.extend(_cap_length(sentence, max_chars))
+        if not pieces:
+            continue
+        sentences.extend((p, " ") for p in pieces)
+        line_break = parts[i + 1] if i + 1 < len(parts) else None
+        sentences[-1] = (sentences[-1][0], line_break)
+    if sentences:
+        sentences[-1] = (sentences[-1][0], None)
+    return sentences
+
+
+def join_sentences(sentences: List[str], separators: List[Optional[str]], lang: str = "en") -> str:
+    """Reassemble translated sentences; line breaks are kept, other
+    separators become the target language's sentence spacing."""
+    joiner = "" if (lang or "en").split("-")[0].lower() in UNSPACED_LANGS else " "
+    out = []
+    for sentence, sep in zip(sentences, separators):
+        out.append(sentence)
+        if sep is not None:
+            out.append(sep if "\n" in sep else joiner)
+    return "".join(out).strip()
@@ -6,12 +6,18 @@ Protocol:
 - Client sends JSON: {"text": "...", "source_lang": "en", "target_lang": "es"}
 - Server responds with: {"translated_text": "...", "source_lang": "en", "target_lang": "es", "model": "m2m100_418M", "inference_ms": 123}
 - Supports {"type": "health"} for health checks
+- Concurrent requests for the same language pair are micro-batched
+- Add "stream": true for live captions: the server sends
+  {"type": "translation_partial", "translated_text": "<so far>", "delta": "..."}
+  messages while decoding (greedy), then the final {"type": "translation", ...}
+  with "ttft_ms". An "id" in the request is echoed on every message.
 """
 
 import asyncio
 import json
 import sys
 import os
+import time
 from typing import Set, Any
 from pathlib import Path
 
@@ -25,6 +31,8 @@ except ImportError:
 WebSocketServerProtocol = Any
 
 from .translator import Translator, TranslationConfig
+from .batching import TranslationBatcher
+from .engines import ENGINES
 
 SERVER_VERSION = "0.1.0"
 
@@ -43,9 +51,11 @@ class TranslationServer:
         self.host = host
         self.port = port
         self.translator: Translator = None
+        self._batcher: TranslationBatcher = None
         self.clients: Set[WebSocketServerProtocol] = set()
         self._server = None
         self._loop = None
+        self._started_at = time.monotonic()
 
     async def _safe_send(self, ws: WebSocketServerProtocol, data: str):
         """Send data to a single client, removing it on failure."""
@@ -82,6 +92,9 @@ class TranslationServer:
                     # JSON command
                     try:
                         request = json.loads(message)
+                        if request.get("stream") and request.get("type", "translate") == "translate":
+                            await self._stream_translation(websocket, request)
+                            continue
                         response = await self._handle_request(request)
                         await websocket.send(json.dumps(response))
                     except json.JSONDecodeError:
@@ -127,7 +140,16 @@ class TranslationServer:
                 "model": model_name,
                 "model_loaded": self.translator is not None and self.translator._loaded,
                 "device": self.translator.device if self.translator else None,
-                "vram_usage": vram_usage
+                "engine": self.translator.config.engine if self.translator else None,
+                "vram_usage": vram_usage,
+                "batching": self._batcher.stats() if self._batcher else None,
+                "cache": self.translator.cache.stats() if self.translator and self.translator.cache else None,
+                # Load generators diff cpu_time_s across a run for server CPU usage
+                "process": {
+                    "cpu_time_s": round(time.process_time(), 3),
+                    "uptime_s": round(time.monotonic() - self._started_at, 3),
+                    "cpu_count": os.cpu_count()
+                }
             }
 
         # Get supported languages
@@ -140,39 +162,27 @@ class TranslationServer:
 
         # Translation request
         if request_type == "translate" or "text" in request:
+            error = self._validate_translate_request(request)
+            if error:
+                return error
             text = request.get("text", "").strip()
             source_lang = request.get("source_lang", "auto")
             target_lang = request.get("target_lang", "en")
 
-            # Validation
-            if not text:
-                return {
-                    "type": "error",
-                    "error": "Missing or empty 'text' field"
-                }
-
-            if not target_lang:
-                return {
-                    "type": "error",
-                    "error": "Missing 'target_lang' field"
-                }
-
-            if not self.translator or not self.translator._loaded:
-                return {
-                    "type": "error",
-                    "error": "Translation model not loaded"
-                }
-
-            # Perform translation (run in thread pool to avoid blocking event loop)
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self.translator.translate,
-                text,
-                source_lang,
-                target_lang,
-                True  # return_timing
-            )
+            # Perform translation: queued with concurrent requests for the same
+            # language pair and run as one padded batch off the event loop
+            if self._batcher:
+                result = await self._batcher.submit(text, source_lang, target_lang)
+            else:
+                loop = asyncio.get_event_loop()
+                result = await loop.run_in_executor(
+                    None,
+                    self.translator.translate,
+                    text,
+                    source_lang,
+                    target_lang,
+                    True  # return_timing
+                )
 
             # Add type field
             result["type"] = "translation"
@@ -189,6 +199,70 @@ class TranslationServer:
             "error": f"Unknown request type: {request_type}"
         }
 
+    def _validate_translate_request(self, request: dict):
+        """Error response for a malformed translate request, else None."""
+        if not request.get("text", "").strip():
+            return {
+                "type": "error",
+                "error": "Missing or empty 'text' field"
+            }
+
+        if not request.get("target_lang", "en"):
+            return {
+                "type": "error",
+                "error": "Missing 'target_lang' field"
+            }
+
+        if not self.translator or not self.translator._loaded:
+            return {
+                "type": "error",
+                "error": "Translation model not loaded"
+            }
+        return None
+
+    async def _stream_translation(self, websocket, request: dict):
+        """Send translation_partial messages while decoding, then the final translation."""
+        error = self._validate_translate_request(request)
+        if error:
+            await websocket.send(json.dumps(error))
+            return
+        text = request.get("text", "").strip()
+        source_lang = request.get("source_lang", "auto")
+        target_lang = request.get("target_lang", "en")
+        request_id = request.get("id")
+
+        # Decoding runs on the batcher's inference thread (one model call at a
+        # time); events hop back to the loop through a queue
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            try:
+                for event in self.translator.translate_stream(text, source_lang, target_lang):
+                    loop.call_soon_threadsafe(events.put_nowait, event)
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+
+        if self._batcher:
+            producer = self._batcher.run(produce)
+        else:
+            producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                message = dict(event)
+                message["type"] = "translation_partial" if message.pop("partial", False) else "translation"
+                if request_id is not None:
+                    message["id"] = request_id
+                await websocket.send(json.dumps(message))
+                if message["type"] == "translation" and "error" not in message:
+                    print(f"[{message['source_lang']} → {message['target_lang']}] streamed, "
+                          f"first text {message.get('ttft_ms', 0)}ms, total {message['inference_ms']}ms")
+        finally:
+            await producer
+
     async def start(self, config: TranslationConfig = None):
         """Start the WebSocket server."""
         self._loop = asyncio.get_running_loop()
@@ -208,6 +282,14 @@ class TranslationServer:
             print("Failed to load model", file=sys.stderr)
             return False
 
+        translator = self.translator
+        self._batcher = TranslationBatcher(
+            lambda texts, src, tgt: translator.translate_batch(texts, src, tgt, True),
+            max_batch_size=config.max_batch_size,
+            max_wait_ms=config.max_batch_wait_ms,
+            detect_fn=translator.detect_language
+        )
+
         # Get model name for display
         model_display = "m2m100_418M"
         if hasattr(self.translator, 'config'):
@@ -220,7 +302,8 @@ class TranslationServer:
         print(f"\n{'='*50}")
         print(f"  Windy Word Translation Server v{SERVER_VERSION}")
         print(f"  ws://{self.host}:{self.port}")
-        print(f"  Model: {model_display} | Device: {self.translator.device}")
+        print(f"  Model: {model_display} | Device: {self.translator.device} | Engine: {config.engine}")
+        print(f"  Batching: up to {config.max_batch_size} requests / {config.max_batch_wait_ms}ms per language pair")
         print(f"{'='*50}\n")
 
         self._server = await websockets.serve(
@@ -251,13 +334,34 @@ async def main():
     parser.add_argument("--model-path", default=None, help="Path to M2M-100 model")
     parser.add_argument("--model-type", default="base", choices=["base", "finetuned", "lora"], help="Model type (base/finetuned/lora)")
     parser.add_argument("--lora-adapter", default=None, help="Path to LoRA adapter (if model-type=lora)")
+    parser.add_argument("--engine", default=os.environ.get("WINDY_TRANSLATION_ENGINE", "torch"),
+                        choices=list(ENGINES), help="Inference backend (ct2-* = CTranslate2 int8 for CPU nodes)")
+    parser.add_argument("--ct2-model-path", default=None,
+                        help="Converted CTranslate2 model (default: <model-path>-ct2-int8, converted on first load)")
+    parser.add_argument("--cpu-threads", type=int, default=int(os.environ.get("WINDY_TRANSLATION_CPU_THREADS", "0")),
+                        help="CTranslate2 intra-op threads (0 = library default)")
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get("WINDY_TRANSLATION_BATCH_SIZE", "16")),
+                        help="Max requests per batched generate() call (1 disables batching)")
+    parser.add_argument("--batch-wait-ms", type=float, default=float(os.environ.get("WINDY_TRANSLATION_BATCH_WAIT_MS", "10")),
+                        help="Max time a request waits for its batch to fill")
+    parser.add_argument("--cache-size", type=int, default=int(os.environ.get("WINDY_TRANSLATION_CACHE_SIZE", "10000")),
+                        help="Translation cache entries held in memory (0 disables the cache)")
+    parser.add_argument("--cache-path", default=os.environ.get("WINDY_TRANSLATION_CACHE"),
+                        help="SQLite file for a translation cache that survives restarts")
     args = parser.parse_args()
 
     config = TranslationConfig(
         device=args.device,
         model_path=args.model_path,
         model_type=args.model_type,
-        lora_adapter_path=args.lora_adapter
+        lora_adapter_path=args.lora_adapter,
+        engine=args.engine,
+        ct2_model_path=args.ct2_model_path,
+        cpu_threads=args.cpu_threads,
+        max_batch_size=args.batch_size,
+        max_batch_wait_ms=args.batch_wait_ms,
+        cache_size=args.cache_size,
+        cache_path=args.cache_path
     )
 
     server = TranslationServer(host=args.host, port=args.port)
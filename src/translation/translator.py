@@ -4,11 +4,13 @@ Core translation logic using Meta's M2M-100 model.
 """
 
 import time
-import torch
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+from typing import Iterator, List, Optional
+
+from ..engine.translation_cache import TranslationCache
+from .engines import TORCH_AVAILABLE, load_engine, resolve_device, torch
+from .segmentation import join_sentences, split_sentences
 
 
 @dataclass
@@ -18,8 +20,25 @@ class TranslationConfig:
     model_type: str = "base"  # "base", "finetuned", or "lora"
     lora_adapter_path: str = None  # Path to LoRA adapter if model_type="lora"
     device: str = "auto"
+    # Inference backend (see engines.py): "torch", "ct2-int8" or "ct2-int8_float32"
+    engine: str = "torch"
+    ct2_model_path: Optional[str] = None  # Converted model; default "<model_path>-ct2-int8"
+    cpu_threads: int = 0  # CTranslate2 intra-op threads (0 = library default)
     max_length: int = 512
     num_beams: int = 5
+    # Server-side micro-batching (see batching.py): requests for the same
+    # language pair are grouped for up to max_batch_wait_ms / max_batch_size
+    max_batch_size: int = 16
+    max_batch_wait_ms: float = 10.0
+    # Long inputs are split into sentences (see segmentation.py) and all
+    # sentences are translated in length-sorted batches of this size
+    split_sentences: bool = True
+    sentence_batch_size: int = 32
+    # Result cache (see src/engine/translation_cache.py); cache_size=0 disables
+    cache_size: int = 10000
+    cache_ttl_s: float = 7 * 86400
+    cache_path: Optional[str] = None  # SQLite file for a cache that survives restarts
+    cache_disk_size: int = 100000  # Row cap for the SQLite file
 
     def __post_init__(self):
         if self.model_path is None:
@@ -53,10 +72,16 @@ class Translator:
 
     def __init__(self, config: TranslationConfig = None):
         self.config = config or TranslationConfig()
-        self.model = None
+        self.engine = None
         self.tokenizer = None
         self.device = None
         self._loaded = False
+        self.cache = TranslationCache(
+            max_entries=self.config.cache_size,
+            ttl_s=self.config.cache_ttl_s,
+            db_path=self.config.cache_path,
+            max_disk_entries=self.config.cache_disk_size
+        ) if self.config.cache_size > 0 else None
 
     def load_model(self) -> bool:
         """Load the M2M-100 model and tokenizer."""
@@ -65,43 +90,20 @@ class Translator:
             print(f"Model type: {self.config.model_type}")
 
             # Determine device
-            if self.config.device == "auto":
-                self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            else:
-                self.device = self.config.device
+            self.device = resolve_device(self.config)
 
-            print(f"Using device: {self.device}")
+            print(f"Using device: {self.device} | Engine: {self.config.engine}")
 
-            # Load tokenizer
+            # Load tokenizer (transformers is only needed once a model loads)
+            from transformers import M2M100Tokenizer
             self.tokenizer = M2M100Tokenizer.from_pretrained(self.config.model_path)
             print("Tokenizer loaded")
 
-            # Load model based on type
-            if self.config.model_type == "lora" and self.config.lora_adapter_path:
-                # Load base model + LoRA adapter
-                from peft import PeftModel
-                base_model = M2M100ForConditionalGeneration.from_pretrained(
-                    self.config.model_path,
-                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32
-                )
-                self.model = PeftModel.from_pretrained(
-                    base_model,
-                    self.config.lora_adapter_path
-                )
-                print(f"LoRA adapter loaded from {self.config.lora_adapter_path}")
-            else:
-                # Load standard model (base or fine-tuned merged)
-                self.model = M2M100ForConditionalGeneration.from_pretrained(
-                    self.config.model_path,
-                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32
-                )
-
-            self.model.to(self.device)
-            self.model.eval()
+            self.engine = load_engine(self.config, self.tokenizer, self.device)
             print(f"Model loaded on {self.device}")
 
             # Print VRAM usage if on GPU
-            if self.device == "cuda":
+            if self.device == "cuda" and TORCH_AVAILABLE:
                 vram_mb = torch.cuda.memory_allocated() / 1024 / 1024
                 print(f"VRAM usage: {vram_mb:.1f} MB")
 
@@ -126,6 +128,20 @@ class Translator:
             print(f"Language detection failed: {e}, defaulting to 'en'")
             return "en"
 
+    @property
+    def cache_identity(self) -> str:
+        """Everything besides the input that changes the output."""
+        return f"{self.model_name}:{self.config.engine}:{self.config.model_path}:{self.config.lora_adapter_path}:beams={self.config.num_beams}:max={self.config.max_length}"
+
+    @property
+    def model_name(self) -> str:
+        """Model name reported in responses."""
+        if self.config.model_type == "finetuned":
+            return "windy-translate-spark"
+        if self.config.model_type == "lora":
+            return "m2m100_418M_lora"
+        return "m2m100_418M"
+
     def translate(
         self,
         text: str,
@@ -145,104 +161,267 @@ class Translator:
         Returns:
             dict with translation result and metadata
         """
-        if not self._loaded:
-            return {
-                "error": "Model not loaded",
+        return self.translate_batch([text], source_lang, target_lang, return_timing)[0]
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        return_timing: bool = False
+    ) -> List[dict]:
+        """
+        Translate several texts, batching their sentences together.
+
+        All texts share source_lang/target_lang ("auto" detects per text and
+        runs one batch per detected language). Returns one result dict per
+        input, in order, shaped like translate()'s.
+        """
+        def error_results(message, src=source_lang, extra=None):
+            return [{
+                "error": message,
                 "translated_text": "",
-                "source_lang": source_lang,
-                "target_lang": target_lang
-            }
+                "source_lang": src,
+                "target_lang": target_lang,
+                **(extra or {})
+            } for _ in texts]
+
+        if not self._loaded:
+            return error_results("Model not loaded")
+        if not texts:
+            return []
 
         start_time = time.time()
 
         try:
             # Auto-detect language if requested
             if source_lang == "auto":
-                source_lang = self.detect_language(text)
+                detected = [self.detect_language(t) for t in texts]
+                results: List[Optional[dict]] = [None] * len(texts)
+                for lang in dict.fromkeys(detected):
+                    idx = [i for i, d in enumerate(detected) if d == lang]
+                    group = self.translate_batch([texts[i] for i in idx], lang, target_lang, return_timing)
+                    for i, r in zip(idx, group):
+                        results[i] = r
+                return results
 
             # Validate language codes
             if source_lang not in self.LANG_CODES:
-                return {
-                    "error": f"Unsupported source language: {source_lang}",
-                    "translated_text": "",
-                    "source_lang": source_lang,
-                    "target_lang": target_lang
-                }
+                return error_results(f"Unsupported source language: {source_lang}")
 
             if target_lang not in self.LANG_CODES:
-                return {
-                    "error": f"Unsupported target language: {target_lang}",
-                    "translated_text": "",
-                    "source_lang": source_lang,
-                    "target_lang": target_lang
-                }
+                return error_results(f"Unsupported target language: {target_lang}")
+
+            # Serve repeats from the cache; only misses reach the model
+            if self.cache is not None:
+                identity = self.cache_identity
+                hits = [self.cache.get(t, source_lang, target_lang, identity) for t in texts]
+                misses = [i for i, h in enumerate(hits) if h is None]
+                if len(misses) < len(texts):
+                    fresh = self._translate_uncached(
+                        [texts[i] for i in misses], source_lang, target_lang, return_timing
+                    ) if misses else []
+                    results = [None] * len(texts)
+                    for i, r in zip(misses, fresh):
+                        results[i] = r
+                    for i, hit in enumerate(hits):
+                        if hit is not None:
+                            results[i] = {
+                                "translated_text": hit,
+                                "source_lang": source_lang,
+                                "target_lang": target_lang,
+                                "model": self.model_name,
+                                "inference_ms": 0,
+                                "input_length": len(texts[i]),
+                                "output_length": len(hit),
+                                "cached": True
+                            }
+                    return results
+
+            return self._translate_uncached(texts, source_lang, target_lang, return_timing)
+
+        except Exception as e:
+            return error_results(str(e), extra={"inference_ms": int((time.time() - start_time) * 1000)})
+
+    def _translate_uncached(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        return_timing: bool
+    ) -> List[dict]:
+        """
+        Translate validated texts sentence by sentence; fills the cache.
+
+        Every sentence of every text goes into one pool, sorted by length
+        and run through generate() in chunks of sentence_batch_size, so
+        each padded batch holds sentences of similar length. Translations
+        are stitched back per text in the original order.
+        """
+        start_time = time.time()
 
-            # Set source language
-            self.tokenizer.src_lang = source_lang
-
-            # Tokenize input
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                max_length=self.config.max_length,
-                truncation=True
-            ).to(self.device)
-
-            # Generate translation
-            with torch.no_grad():
-                generated_tokens = self.model.generate(
-                    **inputs,
-                    forced_bos_token_id=self.tokenizer.get_lang_id(target_lang),
-                    num_beams=self.config.num_beams,
-                    max_length=self.config.max_length
-                )
-
-            # Decode output
-            translated_text = self.tokenizer.batch_decode(
-                generated_tokens,
-                skip_special_tokens=True
-            )[0]
+        try:
+            # Sentence pool: (text index, sentence); layouts keep each text's separators
+            pool = []
+            layouts = []
+            for i, text in enumerate(texts):
+                if self.config.split_sentences:
+                    sentences = split_sentences(text, source_lang)
+                else:
+                    sentences = [(text, None)]
+                layouts.append([sep for _, sep in sentences])
+                pool.extend((i, sentence) for sentence, _ in sentences)
+
+            translated = [""] * len(pool)
+            input_tokens = [0] * len(texts)
+            output_tokens = [0] * len(texts)
+
+            # Shortest first: neighbours in a chunk need little padding
+            order = sorted(range(len(pool)), key=lambda k: len(pool[k][1]))
+            step = max(1, self.config.sentence_batch_size)
+            for b in range(0, len(order), step):
+                chunk = order[b:b + step]
+                outputs = self.engine.translate([pool[k][1] for k in chunk], source_lang, target_lang)
+                for k, (text, n_in, n_out) in zip(chunk, outputs):
+                    translated[k] = text
+                    owner = pool[k][0]
+                    input_tokens[owner] += n_in
+                    output_tokens[owner] += n_out
 
             inference_ms = int((time.time() - start_time) * 1000)
 
-            # Determine model name
-            model_name = "m2m100_418M"
-            if self.config.model_type == "finetuned":
-                model_name = "windy-translate-spark"
-            elif self.config.model_type == "lora":
-                model_name = "m2m100_418M_lora"
+            results = []
+            cursor = 0
+            for i, text in enumerate(texts):
+                n = len(layouts[i])
+                translated_text = join_sentences(translated[cursor:cursor + n], layouts[i], target_lang)
+                cursor += n
+                result = {
+                    "translated_text": translated_text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "model": self.model_name,
+                    "inference_ms": inference_ms,
+                    "input_length": len(text),
+                    "output_length": len(translated_text)
+                }
+                if len(texts) > 1:
+                    result["batch_size"] = len(texts)
+                if n > 1:
+                    result["sentences"] = n
+
+                # Add token stats if requested (padding excluded)
+                if return_timing:
+                    result["input_tokens"] = input_tokens[i]
+                    result["output_tokens"] = output_tokens[i]
+                    if inference_ms > 0:
+                        result["tokens_per_sec"] = round(output_tokens[i] / (inference_ms / 1000), 2)
+                results.append(result)
+                if self.cache is not None:
+                    self.cache.put(text, source_lang, target_lang, self.cache_identity, translated_text)
+            return results
 
-            result = {
-                "translated_text": translated_text,
+        except Exception as e:
+            return [{
+                "error": str(e),
+                "translated_text": "",
                 "source_lang": source_lang,
                 "target_lang": target_lang,
-                "model": model_name,
-                "inference_ms": inference_ms,
-                "input_length": len(text),
-                "output_length": len(translated_text)
-            }
+                "inference_ms": int((time.time() - start_time) * 1000)
+            } for _ in texts]
 
-            # Add token stats if requested
-            if return_timing:
-                result["input_tokens"] = inputs["input_ids"].shape[1]
-                result["output_tokens"] = generated_tokens.shape[1]
-                if inference_ms > 0:
-                    result["tokens_per_sec"] = round(generated_tokens.shape[1] / (inference_ms / 1000), 2)
+    def translate_stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Iterator[dict]:
+        """
+        Translate one text incrementally for live captions.
+
+        Sentences are decoded one after another with greedy decoding and
+        each new piece of text is yielded as a partial event:
+            {"partial": True, "translated_text": <everything so far>, "delta": <new text>}
+        The last item yielded is the final translate()-shaped result, with
+        "ttft_ms" (time to the first partial) and "streamed": True. A cache
+        hit (or an error) is yielded as the final result straight away.
+        """
+        start_time = time.time()
+
+        def final(extra):
+            return {"source_lang": source_lang, "target_lang": target_lang, **extra}
+
+        if not self._loaded:
+            yield final({"error": "Model not loaded", "translated_text": ""})
+            return
 
-            return result
+        try:
+            if source_lang == "auto":
+                source_lang = self.detect_language(text)
+            if source_lang not in self.LANG_CODES:
+                yield final({"error": f"Unsupported source language: {source_lang}", "translated_text": ""})
+                return
+            if target_lang not in self.LANG_CODES:
+                yield final({"error": f"Unsupported target language: {target_lang}", "translated_text": ""})
+                return
+
+            if self.cache is not None:
+                hit = self.cache.get(text, source_lang, target_lang, self.cache_identity)
+                if hit is not None:
+                    yield final({
+                        "translated_text": hit,
+                        "model": self.model_name,
+                        "inference_ms": 0,
+                        "input_length": len(text),
+                        "output_length": len(hit),
+                        "cached": True
+                    })
+                    return
+
+            if self.config.split_sentences:
+                sentences = split_sentences(text, source_lang)
+            else:
+                sentences = [(text, None)]
+            separators = [sep for _, sep in sentences]
+
+            done: List[str] = []
+            shown = ""
+            ttft_ms = None
+            for i, (sentence, _) in enumerate(sentences):
+                current = ""
+                for piece in self.engine.stream(sentence, source_lang, target_lang):
+                    current += piece
+                    so_far = join_sentences(done + [current], separators[:i] + [None], target_lang)
+                    if so_far == shown:
+                        continue
+                    if ttft_ms is None:
+                        ttft_ms = int((time.time() - start_time) * 1000)
+                    delta = so_far[len(shown):] if so_far.startswith(shown) else so_far
+                    shown = so_far
+                    yield {"partial": True, "translated_text": so_far, "delta": delta}
+                done.append(current.strip())
+
+            translated_text = join_sentences(done, separators, target_lang)
+            yield final({
+                "translated_text": translated_text,
+                "model": self.model_name,
+                "inference_ms": int((time.time() - start_time) * 1000),
+                "ttft_ms": ttft_ms if ttft_ms is not None else int((time.time() - start_time) * 1000),
+                "input_length": len(text),
+                "output_length": len(translated_text),
+                "streamed": True
+            })
 
         except Exception as e:
-            return {
+            yield final({
                 "error": str(e),
                 "translated_text": "",
-                "source_lang": source_lang,
-                "target_lang": target_lang,
                 "inference_ms": int((time.time() - start_time) * 1000)
-            }
+            })
 
     def get_vram_usage(self) -> dict:
         """Get current VRAM usage (GPU only)."""
-        if self.device == "cuda" and torch.cuda.is_available():
+        if self.device == "cuda" and TORCH_AVAILABLE and torch.cuda.is_available():
             return {
                 "allocated_mb": round(torch.cuda.memory_allocated() / 1024 / 1024, 1),
                 "reserved_mb": round(torch.cuda.memory_reserved() / 1024 / 1024, 1),
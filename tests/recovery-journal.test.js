@@ -0,0 +1,75 @@
+/**
+ * @jest-environment node
+ *
+ * Tests for src/client/desktop/lib/recovery-journal.js — the desktop
+ * reader for src/engine/journal.py's crash-recovery journal.
+ *
+ * Pins the CRC check: a torn tail whose bytes still parse as JSON must
+ * not come back as recovered text.
+ */
+
+'use strict';
+
+const zlib = require('zlib');
+const {
+  crc32, parseRecoveryJournal, recoverText,
+} = require('../src/client/desktop/lib/recovery-journal');
+
+function record(rec, { crc } = {}) {
+  const payload = Buffer.from(JSON.stringify(rec), 'utf-8');
+  const header = Buffer.alloc(8);
+  header.writeUInt32LE(payload.length, 0);
+  header.writeUInt32LE(crc === undefined ? crc32(payload) : crc, 4);
+  return Buffer.concat([header, payload]);
+}
+
+const seg = (x, p = false) => ({ t: 1, s: 0, e: 1, c: 0.9, p, x });
+
+describe('crc32', () => {
+  test('matches zlib / Python zlib.crc32', () => {
+    // python -c "import zlib; print(zlib.crc32(b'123456789'))"
+    expect(crc32(Buffer.from('123456789'))).toBe(0xCBF43926);
+    expect(crc32(Buffer.alloc(0))).toBe(0);
+  });
+
+  test('table fallback agrees with zlib.crc32 when both exist', () => {
+    if (typeof zlib.crc32 !== 'function') return;
+    const real = zlib.crc32;
+    const buf = Buffer.from('{"x":"héllo wörld"}', 'utf-8');
+    try {
+      zlib.crc32 = undefined;
+      expect(crc32(buf)).toBe(real(buf) >>> 0);
+    } finally {
+      zlib.crc32 = real;
+    }
+  });
+});
+
+describe('recoverText', () => {
+  test('finals in order plus the trailing partial', () => {
+    const data = Buffer.concat([
+      record(seg('hello')), record(seg('hel', true)), record(seg('world')), record(seg('and th', true)),
+    ]);
+    expect(recoverText(data)).toBe('hello world and th');
+  });
+
+  test('stops at a record whose CRC does not match, even if it parses', () => {
+    const data = Buffer.concat([
+      record(seg('kept')),
+      record(seg('garbage that parses'), { crc: 12345 }),
+      record(seg('after the tear')),
+    ]);
+    expect(parseRecoveryJournal(data).map((r) => r.x)).toEqual(['kept']);
+    expect(recoverText(data)).toBe('kept');
+  });
+
+  test('ignores a truncated tail and an oversized length field', () => {
+    const good = record(seg('kept'));
+    const torn = record(seg('cut off')).subarray(0, 12);
+    expect(recoverText(Buffer.concat([good, torn]))).toBe('kept');
+
+    const huge = Buffer.alloc(8);
+    huge.writeUInt32LE((1 << 20) + 1, 0);
+    expect(recoverText(Buffer.concat([good, huge]))).toBe('kept');
+  });
+});
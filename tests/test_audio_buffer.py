@@ -0,0 +1,89 @@
+"""
+Tests for the PCM ring buffer behind StreamingTranscriber.feed_audio.
+"""
+
+import numpy as np
+import pytest
+
+from src.engine.audio_buffer import PcmRingBuffer
+
+
+def pcm(values):
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+@pytest.fixture
+def ring():
+    # 1 second at 10 Hz = 10 samples: small enough to reason about wraps
+    return PcmRingBuffer(capacity_s=1.0, sample_rate=10)
+
+
+class TestRingBuffer:
+    def test_write_and_view_scales_to_float32(self, ring):
+        ring.write(pcm([0, 16384, -32768]))
+        view = ring.view()
+        assert view.dtype == np.float32
+        assert view.tolist() == [0.0, 0.5, -1.0]
+
+    def test_view_is_zero_copy(self, ring):
+        ring.write(pcm(range(5)))
+        view = ring.view()
+        assert not view.flags.owndata
+        assert np.shares_memory(view, ring._data)
+
+    def test_view_is_contiguous_across_wrap(self, ring):
+        ring.write(pcm(range(8)))
+        ring.consume(6)
+        ring.write(pcm(range(100, 106)))  # wraps past the end
+        view = ring.view()
+        assert view.flags.c_contiguous
+        assert (view * 32768).round().astype(int).tolist() == [6, 7, 100, 101, 102, 103, 104, 105]
+
+    def test_overflow_drops_oldest(self, ring):
+        ring.write(pcm(range(8)))
+        dropped = ring.write(pcm(range(8, 12)))
+        assert dropped == 2
+        assert len(ring) == 10
+        assert ring.read_position == 2
+        assert round(ring.view()[0] * 32768) == 2
+
+    def test_overflow_never_overwrites_leased_audio(self, ring):
+        ring.write(pcm(range(8)))
+        view = ring.view()
+        ring.write(pcm(range(100, 104)))  # 2 samples too many
+        assert (view * 32768).round().astype(int).tolist() == list(range(8))
+        assert ring.dropped_samples == 2
+        ring.consume(8)
+        assert (ring.view() * 32768).round().astype(int).tolist() == [102, 103]
+
+    def test_odd_byte_frames_are_reassembled(self, ring):
+        data = pcm([1000, 2000])
+        ring.write(data[:3])
+        ring.write(data[3:])
+        assert (ring.view() * 32768).round().astype(int).tolist() == [1000, 2000]
+
+    def test_discard_oldest_and_positions(self, ring):
+        ring.write(pcm(range(9)))
+        assert ring.discard_oldest(4) == 5
+        assert ring.read_position == 5
+        assert ring.duration_s == pytest.approx(0.4)
+        ring.clear()
+        assert len(ring) == 0 and ring.read_position == 0
+
+    def test_compact_removes_masked_samples(self, ring):
+        ring.write(pcm(range(6)))
+        keep = np.array([True, False, False, True])
+        ring.write(pcm([100]))  # arrives after the mask was computed
+        assert ring.compact(keep) == 2
+        assert (ring.view() * 32768).round().astype(int).tolist() == [0, 3, 4, 5, 100]
+        assert ring.compacted_samples == 2
+        assert ring.dropped_samples == 0
+
+    def test_skip_only_when_drained(self, ring):
+        ring.write(pcm(range(3)))
+        assert not ring.skip(5)
+        ring.consume(3)
+        assert ring.skip(5)
+        assert ring.read_position == 8
+        ring.write(pcm([7]))
+        assert round(ring.view()[0] * 32768) == 7
@@ -199,6 +199,58 @@ class TestBatchTranscription:
         )
         assert res.status_code not in (404, 405, 501)
 
+    def test_batch_invalid_audio(self, client, auth_headers):
+        """Undecodable bodies are a 422, not a 500."""
+        from src.cloud import decoding
+        if not decoding.AV_AVAILABLE:
+            pytest.skip("PyAV not installed")
+        res = client.post(
+            "/api/v1/transcribe/batch",
+            content=b"definitely not audio" * 100,
+            headers={**auth_headers, "Content-Type": "application/octet-stream"}
+        )
+        assert res.status_code == 422
+
+    def test_batch_decodes_in_process(self, client, auth_headers, monkeypatch):
+        """The model gets a 16 kHz float32 array decoded from the body."""
+        import io
+        import wave
+        from types import SimpleNamespace
+        import numpy as np
+        from src.cloud import api, decoding
+        if not decoding.AV_AVAILABLE:
+            pytest.skip("PyAV not installed")
+
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(np.zeros(32000, dtype=np.int16).tobytes())
+        received = []
+
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                received.append(audio)
+                segment = SimpleNamespace(start=0.0, end=2.0, text=" hello", words=None)
+                return iter([segment]), SimpleNamespace(duration=2.0, language="en")
+
+        async def get_model():
+            return Model()
+
+        async def no_cleanup(text):
+            return text
+        monkeypatch.setattr(api, "get_cloud_model", get_model)
+        monkeypatch.setattr(api, "_llm_cleanup", no_cleanup)
+        res = client.post(
+            "/api/v1/transcribe/batch",
+            content=buf.getvalue(),
+            headers={**auth_headers, "Content-Type": "audio/wav"}
+        )
+        assert res.status_code == 200
+        assert res.json()["text"] == "hello"
+        assert received[0].dtype == np.float32 and received[0].size == 32000
+
 
 # ═══════════════════════════════════
 #  WebSocket Auth
@@ -0,0 +1,105 @@
+"""
+Tests for the cross-connection batch scheduler behind /ws/transcribe.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from src.cloud.batching import BatchScheduler
+
+
+async def _model():
+    return "model"
+
+
+def _tagged(value, n=1600):
+    """0.1 s buffer whose samples identify it."""
+    return np.full(n, value, dtype=np.float32)
+
+
+class RecordingBatchFn:
+    """Echoes each buffer's tag back as its transcript and records batch sizes."""
+
+    def __init__(self, delay_s=0.0):
+        self.sizes = []
+        self.delay_s = delay_s
+
+    def __call__(self, model, buffers):
+        assert model == "model"
+        self.sizes.append(len(buffers))
+        time.sleep(self.delay_s)
+        return [[{"text": f"{b[0]:.2f}", "start": 0.0, "end": b.size / 16000}] for b in buffers]
+
+
+class TestBatchScheduler:
+    def test_concurrent_submits_share_one_batch(self):
+        fn = RecordingBatchFn()
+        sched = BatchScheduler(_model, max_batch_size=8, max_wait_ms=100, batch_fn=fn)
+
+        async def run():
+            return await asyncio.gather(*(sched.submit(_tagged(0.1 * (i + 1))) for i in range(5)))
+
+        results = asyncio.run(run())
+        assert fn.sizes == [5]
+        # Each caller gets its own buffer's segments back
+        assert [r[0]["text"] for r in results] == ["0.10", "0.20", "0.30", "0.40", "0.50"]
+
+    def test_batches_capped_at_max_size(self):
+        fn = RecordingBatchFn()
+        sched = BatchScheduler(_model, max_batch_size=3, max_wait_ms=100, batch_fn=fn)
+
+        async def run():
+            return await asyncio.gather(*(sched.submit(_tagged(0.5)) for _ in range(7)))
+
+        asyncio.run(run())
+        assert fn.sizes == [3, 3, 1]
+
+    def test_lone_buffer_waits_at_most_deadline(self):
+        fn = RecordingBatchFn()
+        sched = BatchScheduler(_model, max_batch_size=8, max_wait_ms=30, batch_fn=fn)
+
+        async def run():
+            start = time.monotonic()
+            await sched.submit(_tagged(0.5))
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+        assert fn.sizes == [1]
+        assert elapsed < 0.5
+
+    def test_silent_buffer_skips_model(self):
+        fn = RecordingBatchFn()
+        sched = BatchScheduler(_model, batch_fn=fn)
+        assert asyncio.run(sched.submit(np.zeros(1600, dtype=np.float32))) == []
+        assert fn.sizes == []
+
+    def test_errors_propagate_to_every_caller(self):
+        def failing(model, buffers):
+            raise RuntimeError("boom")
+
+        sched = BatchScheduler(_model, max_wait_ms=50, batch_fn=failing)
+
+        async def run():
+            return await asyncio.gather(*(sched.submit(_tagged(0.5)) for _ in range(2)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_stats_report_occupancy(self):
+        fn = RecordingBatchFn()
+        sched = BatchScheduler(_model, max_batch_size=4, max_wait_ms=50, batch_fn=fn)
+
+        async def run():
+            await asyncio.gather(*(sched.submit(_tagged(0.5)) for _ in range(2)))
+            await asyncio.gather(*(sched.submit(_tagged(0.5)) for _ in range(4)))
+
+        asyncio.run(run())
+        stats = sched.stats()
+        assert stats["batches"] == 2
+        assert stats["buffers"] == 6
+        assert stats["last_batch"]["occupancy"] == 1.0
+        assert stats["avg_occupancy"] == 0.75
+        assert stats["size_histogram"] == {"2": 1, "4": 1}
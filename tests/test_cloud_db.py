@@ -0,0 +1,125 @@
+"""
+Tests for the pooled cloud database layer (src/cloud/db.py) and batched
+live segment writes (api.SegmentWriter).
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.cloud.db import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "cloud.db"), workers=2)
+    with db.session() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    yield db
+    db.close()
+
+
+class TestDatabase:
+    def test_connection_per_thread_reused_with_pragmas(self, db):
+        conns = {}
+
+        def grab(name):
+            conns[name] = (db.connection(), db.connection())
+
+        threads = [threading.Thread(target=grab, args=(n,)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        grab("main")
+        assert all(first is second for first, second in conns.values())
+        assert len({id(first) for first, _ in conns.values()}) == 3
+        conn = db.connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_run_is_off_the_event_loop_thread(self, db):
+        async def main():
+            loop_thread = threading.get_ident()
+            ran_on = await db.run(lambda conn: threading.get_ident())
+            return loop_thread, ran_on
+
+        loop_thread, ran_on = asyncio.run(main())
+        assert ran_on != loop_thread
+
+    def test_pool_reuses_its_connections(self, db):
+        async def main():
+            for i in range(200):
+                await db.execute("INSERT INTO items (name) VALUES (?)", (f"n{i}",))
+            return await db.fetchone("SELECT COUNT(*) FROM items")
+
+        assert asyncio.run(main())[0] == 200
+        assert db.open_connections <= 1 + db.workers  # This thread + the pool
+
+    def test_run_is_one_transaction(self, db):
+        def insert_twice(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('dup')")
+            conn.execute("INSERT INTO items (name) VALUES ('dup')")
+
+        async def main():
+            with pytest.raises(Exception):
+                await db.run(insert_twice)
+            return await db.fetchall("SELECT * FROM items")
+
+        assert asyncio.run(main()) == []  # First insert rolled back too
+
+    def test_cursor_results_survive(self, db):
+        async def main():
+            cursor = await db.execute("INSERT INTO items (name) VALUES ('x')")
+            changed = await db.executemany("INSERT INTO items (name) VALUES (?)", [("y",), ("z",)])
+            return cursor.lastrowid, changed
+
+        assert asyncio.run(main()) == (1, 2)
+
+
+def test_segment_writer_batches(monkeypatch):
+    os.environ.setdefault("WINDY_JWT_SECRET", "test-secret-key-for-testing-only-not-production")
+    os.environ.setdefault("WINDY_API_KEY", "test-api-key-for-testing-only")
+    from src.cloud import api
+    api.init_db()
+    calls = []
+    executemany = api.db.executemany
+
+    async def counting(sql, rows):
+        calls.append(len(rows))
+        return await executemany(sql, rows)
+
+    monkeypatch.setattr(api.db, "executemany", counting)
+    monkeypatch.setattr(api, "SEGMENT_BATCH", 5)
+    monkeypatch.setattr(api, "SEGMENT_FLUSH_S", 3600)
+
+    async def main():
+        with api.db.session() as conn:
+            conn.execute("INSERT OR IGNORE INTO users (id, email, name, password_hash) "
+                         "VALUES ('seg-user', 'seg@windyword.ai', 'Seg', 'x')")
+            session_id = conn.execute("INSERT INTO sessions (user_id) VALUES ('seg-user')").lastrowid
+        writer = api.SegmentWriter(session_id)
+        for i in range(12):
+            await writer.add([{"text": f"s{i}", "start_time": float(i), "end_time": i + 1.0}])
+        await writer.flush()
+        await writer.flush()  # Nothing left: no write
+        rows = await api.db.fetchall("SELECT text FROM segments WHERE session_id = ? ORDER BY id", (session_id,))
+        return [r["text"] for r in rows]
+
+    assert asyncio.run(main()) == [f"s{i}" for i in range(12)]
+    assert calls == [5, 5, 2]
+
+
+def test_db_benchmark_runs():
+    root = os.path.join(os.path.dirname(__file__), "..")
+    out = subprocess.run(
+        [sys.executable, "-m", "src.cloud.benchmark", "db", "--ops", "200", "--concurrency", "4",
+         "--json", os.devnull],
+        cwd=root, capture_output=True, text=True, timeout=120,
+    )
+    assert out.returncode == 0, out.stderr
+    assert "segment_write" in out.stdout and "pooled" in out.stdout
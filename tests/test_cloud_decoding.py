@@ -0,0 +1,68 @@
+"""
+Tests for in-process upload decoding (src/cloud/decoding.py).
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.cloud import decoding
+from src.cloud.decoding import AudioDecodeError, AudioTooLarge, decode_stream
+
+pytestmark = pytest.mark.skipif(not decoding.AV_AVAILABLE, reason="PyAV not installed")
+
+SR = 16000
+
+
+def upload(tmp_path, fmt, seconds=5.0):
+    from src.cloud.benchmark import FORMATS, synth_upload
+    path = tmp_path / f"upload{FORMATS[fmt][2]}"
+    synth_upload(path, seconds / 60, fmt)
+    return path.read_bytes()
+
+
+async def chunks(data, size=4096):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+        await asyncio.sleep(0)
+
+
+def decode(data, max_bytes=1 << 30, size=4096):
+    return asyncio.run(decode_stream(chunks(data, size), max_bytes=max_bytes))
+
+
+@pytest.mark.parametrize("fmt", ["webm", "ogg", "m4a", "mp3", "wav"])
+def test_formats_decode_to_16k_float32(tmp_path, fmt):
+    audio = decode(upload(tmp_path, fmt))
+    assert audio.dtype == np.float32
+    assert audio.size / SR == pytest.approx(5.0, abs=0.1)
+    assert 0.01 < np.abs(audio).max() <= 1.0
+
+
+def test_mp4_spools_past_memory_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(decoding, "SPOOL_MEMORY_BYTES", 1024)
+    audio = decode(upload(tmp_path, "m4a"))
+    assert audio.size / SR == pytest.approx(5.0, abs=0.1)
+
+
+def test_small_chunks_under_header_size(tmp_path):
+    audio = decode(upload(tmp_path, "webm"), size=3)
+    assert audio.size / SR == pytest.approx(5.0, abs=0.1)
+
+
+def test_empty_body_is_none():
+    assert decode(b"") is None
+
+
+def test_garbage_raises_decode_error():
+    with pytest.raises(AudioDecodeError):
+        decode(b"definitely not audio" * 10000)
+    with pytest.raises(AudioDecodeError):
+        decode(b"abc")  # Shorter than the sniffed header
+
+
+def test_too_large_stops_reading(tmp_path):
+    data = upload(tmp_path, "webm")
+    with pytest.raises(AudioTooLarge):
+        decode(data, max_bytes=len(data) // 2)
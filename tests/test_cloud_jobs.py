@@ -0,0 +1,411 @@
+"""
+Tests for the queued cloud transcription jobs (src/cloud/jobs.py) and the
+/api/v1/transcribe/jobs endpoints.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+import pytest
+
+from src.cloud.db import Database
+from src.cloud.jobs import JOBS_SCHEMA, JobQueue, QueueFull, webhook_url_error
+
+SR = 16000
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "cloud.db"))
+    with db.session() as conn:
+        conn.executescript("CREATE TABLE users (id TEXT PRIMARY KEY);" + JOBS_SCHEMA)
+        conn.executemany("INSERT INTO users (id) VALUES (?)", [("u1",), ("heavy",), ("light",)])
+    yield db
+    db.close()
+
+
+class Runner:
+    """Stands in for the model: records the order jobs start in and
+    holds each one until released."""
+
+    def __init__(self):
+        self.started = []
+        self.active = 0
+        self.peak = 0
+        self.release = None
+
+    async def __call__(self, audio):
+        self.started.append(round(audio.size / SR, 2))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        if self.release is not None:
+            await self.release.wait()
+        self.active -= 1
+        if audio.size == 3 * SR:
+            raise RuntimeError("model exploded")
+        return {"text": f"{audio.size / SR:.2f}s", "max": float(np.abs(audio).max())}
+
+
+def seconds(s):
+    return np.full(int(s * SR), 0.5, dtype=np.float32)
+
+
+async def settle(queue, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while queue._tasks and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class WebhookReceiver:
+    """Local stand-in for a customer's webhook endpoint."""
+
+    def __init__(self, statuses=(200,), location=None):
+        received = self.received = []
+        statuses = list(statuses)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received.append((dict(self.headers), body))
+                self.send_response(statuses.pop(0) if len(statuses) > 1 else statuses[0])
+                if location:
+                    self.send_header("Location", location)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def local_webhooks(monkeypatch):
+    """Let webhooks reach the WebhookReceiver on 127.0.0.1."""
+    monkeypatch.setenv("WINDY_WEBHOOK_ALLOW_HOSTS", "127.0.0.1")
+
+
+class TestJobQueue:
+    def test_result_and_audio_cleanup(self, db, tmp_path):
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path / "audio"))
+            job = await queue.submit("u1", seconds(1.5))
+            assert job["status"] in ("queued", "running")
+            await settle(queue)
+            return await queue.get(job["job_id"], "u1")
+
+        job = asyncio.run(main())
+        assert job["status"] == "done"
+        assert job["result"] == {"text": "1.50s", "max": 0.5}
+        assert os.listdir(tmp_path / "audio") == []
+
+    def test_priority_then_arrival_order(self, db, tmp_path):
+        async def main():
+            runner = Runner()
+            runner.release = asyncio.Event()
+            queue = JobQueue(db, runner, str(tmp_path), workers=1, per_user=5)
+            await queue.submit("u1", seconds(1))  # Starts straight away
+            low = await queue.submit("u1", seconds(2), priority="low")
+            await queue.submit("u1", seconds(4))
+            await queue.submit("u1", seconds(5), priority="high")
+            assert (await queue.get(low["job_id"]))["queue_position"] == 3
+            runner.release.set()
+            await settle(queue)
+            return runner
+
+        assert asyncio.run(main()).started == [1, 5, 4, 2]
+
+    def test_worker_and_per_user_limits(self, db, tmp_path):
+        async def main():
+            runner = Runner()
+            runner.release = asyncio.Event()
+            queue = JobQueue(db, runner, str(tmp_path), workers=2, per_user=1)
+            for s in (1, 2, 4):
+                await queue.submit("heavy", seconds(s))
+            await queue.submit("light", seconds(5))
+            await asyncio.sleep(0.05)
+            running = list(runner.started)
+            stats = await queue.stats()
+            assert stats["running"] == 2 and stats["queued"] == 2
+            runner.release.set()
+            await settle(queue)
+            return running, runner
+
+        running, runner = asyncio.run(main())
+        assert running == [1, 5]  # The other user isn't stuck behind "heavy"
+        assert runner.peak == 2
+        assert sorted(runner.started) == [1, 2, 4, 5]
+
+    def test_failure_is_recorded(self, db, tmp_path):
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path))
+            job = await queue.submit("u1", seconds(3))
+            await settle(queue)
+            return await queue.get(job["job_id"]), await queue.stats()
+
+        job, stats = asyncio.run(main())
+        assert job["status"] == "failed" and job["error"] == "model exploded"
+        assert stats["failed"] == 1
+
+    def test_queue_bound(self, db, tmp_path):
+        async def main():
+            runner = Runner()
+            runner.release = asyncio.Event()
+            queue = JobQueue(db, runner, str(tmp_path), workers=1, per_user=5, max_queued=1)
+            await queue.submit("u1", seconds(1))
+            await queue.submit("u1", seconds(1))
+            with pytest.raises(QueueFull):
+                await queue.submit("u1", seconds(1))
+            runner.release.set()
+            await settle(queue)
+
+        asyncio.run(main())
+
+    def test_cancel_queued_and_delete_finished(self, db, tmp_path):
+        async def main():
+            runner = Runner()
+            runner.release = asyncio.Event()
+            queue = JobQueue(db, runner, str(tmp_path), workers=1, per_user=5)
+            first = await queue.submit("u1", seconds(1))
+            second = await queue.submit("u1", seconds(2))
+            assert await queue.cancel(first["job_id"], "u1") == "running"
+            assert await queue.cancel(second["job_id"], "other-user") is None
+            assert await queue.cancel(second["job_id"], "u1") == "queued"
+            runner.release.set()
+            await settle(queue)
+            assert await queue.cancel(first["job_id"], "u1") == "done"
+            return runner, await queue.get(first["job_id"]), await queue.get(second["job_id"])
+
+        runner, first, second = asyncio.run(main())
+        assert runner.started == [1]
+        assert first is None
+        assert second["status"] == "cancelled"
+
+    def test_failed_finish_frees_worker_and_audio(self, db, tmp_path, local_webhooks):
+        receiver = WebhookReceiver()
+
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path / "audio"), workers=1, per_user=5)
+            finish = queue._finish
+            calls = []
+
+            async def flaky_finish(job_id, status, **fields):
+                calls.append(job_id)
+                if len(calls) == 1:
+                    raise sqlite3.OperationalError("database is locked")
+                await finish(job_id, status, **fields)
+
+            queue._finish = flaky_finish
+            first = await queue.submit("u1", seconds(1), webhook_url=receiver.url)
+            second = await queue.submit("u1", seconds(2))
+            await settle(queue)
+            return await queue.get(first["job_id"]), await queue.get(second["job_id"])
+
+        try:
+            first, second = asyncio.run(main())
+        finally:
+            receiver.close()
+        assert first["status"] == "running"  # Unrecorded; requeued on the next start()
+        assert second["status"] == "done"    # The worker slot was reused straight away
+        assert receiver.received == []
+        assert os.listdir(tmp_path / "audio") == []
+
+    def test_survives_restart(self, db, tmp_path):
+        runner = Runner()
+
+        async def before_restart():
+            runner.release = asyncio.Event()  # Never set: "crash" mid-job
+            queue = JobQueue(db, runner, str(tmp_path), workers=1, per_user=5)
+            jobs = [(await queue.submit("u1", seconds(s)))["job_id"] for s in (1, 2)]
+            await asyncio.sleep(0.05)
+            await queue.stop()
+            return jobs
+
+        async def after_restart():
+            runner.release = None
+            queue = JobQueue(db, runner, str(tmp_path), workers=1, per_user=5)
+            await queue.start()
+            await settle(queue)
+            return [(await queue.get(j))["status"] for j in jobs]
+
+        jobs = asyncio.run(before_restart())
+        assert asyncio.run(after_restart()) == ["done", "done"]
+        assert runner.started == [1, 1, 2]  # The interrupted job ran again
+
+    def test_webhook_delivery_signed(self, db, tmp_path, local_webhooks):
+        receiver = WebhookReceiver()
+
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path), webhook_secret="s3cret")
+            job = await queue.submit("u1", seconds(1), webhook_url=receiver.url)
+            await settle(queue)
+            return await queue.get(job["job_id"])
+
+        try:
+            job = asyncio.run(main())
+        finally:
+            receiver.close()
+        assert job["webhook_status"] == "delivered"
+        (headers, body), = receiver.received
+        payload = json.loads(body)
+        assert payload["job_id"] == job["job_id"] and payload["result"]["text"] == "1.00s"
+        expected = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert headers["X-Windy-Signature"] == expected
+
+    def test_webhook_retries_then_gives_up(self, db, tmp_path, local_webhooks):
+        flaky, dead = WebhookReceiver(statuses=(503, 200)), WebhookReceiver(statuses=(500,))
+
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path), workers=2, per_user=2)
+            queue.webhook_backoff_s = 0.01
+            ok = await queue.submit("u1", seconds(1), webhook_url=flaky.url)
+            failed = await queue.submit("u1", seconds(2), webhook_url=dead.url)
+            await settle(queue)
+            return await queue.get(ok["job_id"]), await queue.get(failed["job_id"])
+
+        try:
+            ok, failed = asyncio.run(main())
+        finally:
+            flaky.close()
+            dead.close()
+        assert ok["webhook_status"] == "delivered" and len(flaky.received) == 2
+        assert failed["webhook_status"] == "failed: HTTP 500" and len(dead.received) == 3
+
+    def test_webhook_redirects_not_followed(self, db, tmp_path, local_webhooks):
+        target = WebhookReceiver()
+        redirector = WebhookReceiver(statuses=(307,), location=target.url)
+
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path))
+            queue.webhook_backoff_s = 0.01
+            job = await queue.submit("u1", seconds(1), webhook_url=redirector.url)
+            await settle(queue)
+            return await queue.get(job["job_id"])
+
+        try:
+            job = asyncio.run(main())
+        finally:
+            target.close()
+            redirector.close()
+        assert job["webhook_status"] == "failed: HTTP 307"
+        assert len(redirector.received) == 1 and target.received == []
+
+    def test_webhook_to_internal_host_never_sent(self, db, tmp_path):
+        receiver = WebhookReceiver()
+
+        async def main():
+            queue = JobQueue(db, Runner(), str(tmp_path))
+            job = await queue.submit("u1", seconds(1), webhook_url=receiver.url)
+            await settle(queue)
+            return await queue.get(job["job_id"])
+
+        try:
+            job = asyncio.run(main())
+        finally:
+            receiver.close()
+        assert job["webhook_status"] == "failed: webhook_url host 127.0.0.1 is not a public address"
+        assert receiver.received == []
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8080/hook",
+    "http://localhost/hook",
+    "http://10.0.0.5/hook",
+    "http://192.168.1.1/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/hook",
+    "http://[::ffff:127.0.0.1]/hook",
+    "http://0.0.0.0/hook",
+    "file:///etc/passwd",
+    "http:///no-host",
+])
+def test_webhook_url_rejected(url, monkeypatch):
+    monkeypatch.delenv("WINDY_WEBHOOK_ALLOW_HOSTS", raising=False)
+    assert webhook_url_error(url) is not None
+
+
+def test_webhook_url_public_and_allowlisted(monkeypatch):
+    monkeypatch.setenv("WINDY_WEBHOOK_ALLOW_HOSTS", "localhost, hooks.internal")
+    assert webhook_url_error("https://93.184.216.34/hook") is None
+    assert webhook_url_error("http://localhost:9000/hook") is None
+    assert webhook_url_error("http://127.0.0.1/hook") is not None  # Only the listed names
+
+
+def test_jobs_endpoints(monkeypatch):
+    os.environ.setdefault("WINDY_JWT_SECRET", "test-secret-key-for-testing-only-not-production")
+    os.environ.setdefault("WINDY_API_KEY", "test-api-key-for-testing-only")
+    import io
+    import uuid
+    import wave
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    from src.cloud import api, decoding
+    if not decoding.AV_AVAILABLE:
+        pytest.skip("PyAV not installed")
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            segment = SimpleNamespace(start=0.0, end=1.0, text=" queued hello", words=None)
+            return iter([segment]), SimpleNamespace(duration=audio.size / SR, language="en")
+
+    async def get_model():
+        return Model()
+
+    async def no_cleanup(text):
+        return text
+    monkeypatch.setattr(api, "get_cloud_model", get_model)
+    monkeypatch.setattr(api, "_llm_cleanup", no_cleanup)
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes(np.zeros(2 * SR, dtype=np.int16).tobytes())
+
+    with TestClient(api.app) as client:
+        api.limiter.enabled = False
+        token = client.post("/api/v1/auth/register", json={
+            "email": f"jobs_{uuid.uuid4().hex[:8]}@windyword.ai", "password": "testpass123", "name": "Jobs"
+        }).json()["token"]
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "audio/wav"}
+
+        assert client.post("/api/v1/transcribe/jobs", content=buf.getvalue()).status_code == 401
+        assert client.post("/api/v1/transcribe/jobs?priority=urgent", content=buf.getvalue(),
+                           headers=headers).status_code == 422
+        for hook in ("file:///etc/passwd", "http://169.254.169.254/latest/meta-data/"):
+            assert client.post(f"/api/v1/transcribe/jobs?webhook_url={hook}", content=buf.getvalue(),
+                               headers=headers).status_code == 422
+
+        res = client.post("/api/v1/transcribe/jobs?priority=high", content=buf.getvalue(), headers=headers)
+        assert res.status_code == 202
+        job = res.json()
+        assert job["priority"] == "high" and job["audio_s"] == 2.0
+        url = job["status_url"]
+
+        deadline = time.monotonic() + 5
+        while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(0.02)
+            job = client.get(url, headers=headers).json()
+        assert job["status"] == "done"
+        assert job["result"]["raw_text"] == "queued hello"
+        assert job["result"]["duration"] == 2.0
+
+        listed = client.get("/api/v1/transcribe/jobs", headers=headers).json()["jobs"]
+        assert [j["job_id"] for j in listed] == [job["job_id"]] and "result" not in listed[0]
+        assert client.delete(url, headers=headers).json() == {"deleted": True, "job_id": job["job_id"]}
+        assert client.get(url, headers=headers).status_code == 404
+        assert client.get("/health").json()["jobs"]["completed"] >= 1
@@ -0,0 +1,161 @@
+"""
+Tests for the adaptive degradation controller and its wiring into
+StreamingTranscriber._track_performance.
+"""
+
+import time
+
+import pytest
+
+from src.engine.degradation import DegradationController, smaller_models
+from src.engine.transcriber import StreamingTranscriber, TranscriberConfig
+
+
+def feed(controller, rtf, settings, n):
+    """Feed n identical samples; return the adjustments made, applying them to settings."""
+    made = []
+    for _ in range(n):
+        adj = controller.observe(rtf, settings)
+        if adj is not None:
+            settings[adj.setting] = adj.new
+            if adj.setting == "model_size":
+                controller.applied(adj, True)
+            made.append(adj)
+    return made
+
+
+class TestSmallerModels:
+    def test_stock_ladder(self):
+        assert smaller_models("small") == ["base", "tiny"]
+        assert smaller_models("tiny") == []
+
+    def test_suffix_kept(self):
+        assert smaller_models("windy-core-cpu") == ["windy-lite-cpu", "windy-nano-cpu"]
+        assert smaller_models("windy-lite-ct2") == ["windy-nano-ct2"]
+
+    def test_unknown_model(self):
+        assert smaller_models("/opt/models/custom") == []
+
+
+class TestDegradationController:
+    def test_steps_beam_then_chunk_then_model(self):
+        c = DegradationController(window=3)
+        settings = {"beam_size": 5, "chunk_length_s": 3.0, "model_size": "base"}
+        made = feed(c, 1.5, settings, 3 * 6)
+        assert [(a.setting, a.old, a.new) for a in made] == [
+            ("beam_size", 5, 2),
+            ("beam_size", 2, 1),
+            ("chunk_length_s", 3.0, 6.0),
+            ("chunk_length_s", 6.0, 8.0),
+            ("model_size", "base", "tiny"),
+        ]
+        assert all(a.action == "degrade" for a in made)
+        assert c.level == 5
+
+    def test_waits_for_a_full_window(self):
+        c = DegradationController(window=5)
+        settings = {"beam_size": 5}
+        assert feed(c, 2.0, settings, 4) == []
+        assert len(feed(c, 2.0, settings, 1)) == 1
+
+    def test_mid_band_holds_steady(self):
+        c = DegradationController(window=3, restore_after=6)
+        settings = {"beam_size": 5}
+        feed(c, 1.2, settings, 3)
+        assert feed(c, 0.7, settings, 50) == []
+        assert settings["beam_size"] == 2
+
+    def test_restores_in_reverse_never_above_configured(self):
+        c = DegradationController(window=3, restore_after=6)
+        settings = {"beam_size": 5, "chunk_length_s": 3.0}
+        feed(c, 1.2, settings, 9)
+        assert settings == {"beam_size": 1, "chunk_length_s": 6.0}
+        restored = feed(c, 0.2, settings, 100)
+        assert [(a.action, a.setting, a.new) for a in restored] == [
+            ("restore", "chunk_length_s", 3.0),
+            ("restore", "beam_size", 2),
+            ("restore", "beam_size", 5),
+        ]
+        assert c.level == 0 and c.baseline() == {}
+
+    def test_restore_needs_longer_headroom_than_degrade(self):
+        c = DegradationController(window=3, restore_after=12)
+        settings = {"beam_size": 5}
+        feed(c, 1.2, settings, 3)
+        assert feed(c, 0.2, settings, 11) == []
+        assert len(feed(c, 0.2, settings, 1)) == 1
+
+    def test_only_local_models_are_chosen(self):
+        c = DegradationController(window=1, model_available=lambda m: m == "tiny")
+        adj = c.observe(3.0, {"model_size": "medium"})
+        assert adj.new == "tiny"
+
+    def test_model_swap_pauses_decisions_until_applied(self):
+        c = DegradationController(window=1)
+        adj = c.observe(3.0, {"beam_size": 1, "model_size": "small"})
+        assert adj.setting == "model_size"
+        assert c.observe(3.0, {"beam_size": 1, "model_size": "small"}) is None
+        assert c.stats()["pending"]["to"] == "base"
+        c.applied(adj, False)
+        # A model that failed to load is not tried again
+        assert c.observe(3.0, {"beam_size": 1, "model_size": "small"}).new == "tiny"
+        assert c.level == 0
+
+    def test_baseline_reports_configured_values(self):
+        c = DegradationController(window=1)
+        settings = {"beam_size": 5, "chunk_length_s": 3.0}
+        feed(c, 2.0, settings, 3)
+        assert c.baseline() == {"beam_size": 5, "chunk_length_s": 3.0}
+
+    def test_thresholds_validated(self):
+        with pytest.raises(ValueError):
+            DegradationController(high_rtf=0.5, low_rtf=0.9)
+
+
+class TestTranscriberAdaptation:
+    def test_slow_decodes_lower_beam_and_notify(self):
+        t = StreamingTranscriber(TranscriberConfig(beam_size=5))
+        seen = []
+        t.on_adjustment(lambda adj, applied: seen.append((adj.to_dict(), applied)))
+        for _ in range(5):
+            t._track_performance(3.0, 2.0)
+        assert t.config.beam_size == 2
+        assert seen[0][0]["setting"] == "beam_size" and seen[0][1] is True
+        assert t.adaptive_stats()["level"] == 1
+        assert t.configured_config().beam_size == 5
+
+    def test_streaming_mode_leaves_chunk_length_alone(self):
+        t = StreamingTranscriber(TranscriberConfig(streaming=True, stream_beam_size=2))
+        for _ in range(15):
+            t._track_performance(3.0, 2.0)
+        assert t.config.stream_beam_size == 1
+        assert t.config.chunk_length_s == 3.0
+
+    def test_model_step_swaps_in_background(self, monkeypatch):
+        monkeypatch.setattr("src.engine.transcriber._model_is_local", lambda m: True)
+        t = StreamingTranscriber(TranscriberConfig(model_size="small", beam_size=1, chunk_length_s=8.0))
+        swapped = []
+
+        def fake_swap(model_size):
+            swapped.append(model_size)
+            t.config.model_size = model_size
+            return True
+
+        t.swap_model = fake_swap
+        seen = []
+        t.on_adjustment(lambda adj, applied: seen.append(adj))
+        for _ in range(5):
+            t._track_performance(3.0, 2.0)
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert swapped == ["base"]
+        assert t.config.model_size == "base"
+        assert t.adaptive_stats()["steps"][0]["to"] == "base"
+
+    def test_disabled(self):
+        t = StreamingTranscriber(TranscriberConfig(adaptive=False))
+        for _ in range(20):
+            t._track_performance(3.0, 2.0)
+        assert t.config.beam_size == 5
+        assert t.adaptive_stats() == {"enabled": False}
@@ -271,16 +271,16 @@ class TestErrorHandling:
         assert '500' in msg
 
     def test_cloud_timeout_message(self):
-        """5-min timeout shows clear message."""
-        msg = 'Cloud processing timed out (5 min). Try a shorter recording or a different engine.'
-        assert '5 min' in msg
+        """30-min timeout shows clear message."""
+        msg = 'Cloud processing timed out (30 min). Try a shorter recording or a different engine.'
+        assert '30 min' in msg
         assert 'shorter' in msg
 
     def test_fetch_timeout_values(self):
         """Spot-check timeout values."""
-        batch_timeout_sec = 5 * 60  # 5 min for batch
+        batch_timeout_sec = 30 * 60  # 30 min for a queued batch job
         api_timeout_sec = 30  # 30s for other fetches
-        assert batch_timeout_sec == 300
+        assert batch_timeout_sec == 1800
         assert api_timeout_sec == 30
 
     def test_websocket_reconnect_logic(self):
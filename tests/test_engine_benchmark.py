@@ -0,0 +1,92 @@
+"""
+Tests for the stt benchmark harness in src/engine/benchmark.py.
+A fake model stands in for faster-whisper; the harness itself is real.
+"""
+
+import time
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.engine import benchmark
+from src.engine.model_pool import ModelPool
+from src.engine.transcriber import StreamingTranscriber
+
+
+class FakeWhisper:
+    """One word per started 0.25 s of audio; each decode takes 5 ms."""
+
+    def transcribe(self, audio, **kwargs):
+        time.sleep(0.005)
+        n = max(1, int(audio.size / 16000 / 0.25))
+        words = [SimpleNamespace(word=" hello", start=i * 0.25, end=(i + 1) * 0.25, probability=0.9)
+                 for i in range(n)]
+        segment = SimpleNamespace(text=" ".join("hello" for _ in words), start=0.0, end=n * 0.25,
+                                  avg_logprob=-0.1, words=words)
+        return iter([segment]), SimpleNamespace(language="en", language_probability=1.0)
+
+
+def _fake_factory(config):
+    transcriber = StreamingTranscriber(config)
+    transcriber._pool = ModelPool([FakeWhisper()])
+    transcriber.model = transcriber._pool.primary
+    return transcriber
+
+
+def _write_clip(path, seconds=1.5, reference=None):
+    t = np.arange(int(16000 * seconds)) / 16000
+    audio = np.where((t > 0.2) & (t < seconds - 0.2), 0.3 * np.sin(2 * np.pi * 220 * t), 0.0)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes((audio * 32767).astype(np.int16).tobytes())
+    if reference is not None:
+        path.with_name(path.stem + "_groundtruth.txt").write_text(reference)
+
+
+def test_word_error_rate():
+    assert benchmark.word_error_rate("Concord returned to its place", "concord returned to its place.") == 0.0
+    assert benchmark.word_error_rate("a b c d", "a x c") == 0.5  # one substitution + one deletion
+    assert benchmark.word_error_rate("", "") == 0.0
+
+
+def test_speech_bounds_and_wav_loading(tmp_path):
+    clip = tmp_path / "clip.wav"
+    _write_clip(clip)
+    audio = benchmark.load_wav(clip)
+    assert audio.dtype == np.float32 and audio.size == 24000
+    onset, offset = benchmark.speech_bounds(audio)
+    assert onset == pytest.approx(0.2, abs=0.03)
+    assert offset == pytest.approx(1.3, abs=0.03)
+
+
+def test_stt_sweep_reports_every_configuration(tmp_path):
+    clip = tmp_path / "clip.wav"
+    _write_clip(clip, reference="hello hello hello hello")
+
+    rows = benchmark.bench_stt([clip], ["tiny"], ["int8"], beams=[1, 5], chunk_sizes=[0.5],
+                               modes=["chunked", "streaming"], speed=8.0,
+                               transcriber_factory=_fake_factory)
+
+    assert [(r["mode"], r["beam"], r["chunk_s"]) for r in rows] == [
+        ("chunked", 1, 0.5), ("chunked", 5, 0.5), ("streaming", 1, "-"), ("streaming", 5, "-")]
+    for r in rows:
+        assert r["audio"] == "clip.wav" and r["audio_s"] == 1.5
+        assert r["rtf"] > 0
+        assert r["first_partial_ms"] is not None and r["eou_ms"] is not None
+        assert r["peak_rss_mb"] > 0
+        assert r["wer"] is not None
+
+
+def test_stt_load_failure_is_a_row(tmp_path):
+    clip = tmp_path / "clip.wav"
+    _write_clip(clip)
+
+    def failing(config):
+        raise RuntimeError("no model")
+
+    rows = benchmark.bench_stt([clip], ["base"], ["int8"], [5], [3.0], transcriber_factory=failing)
+    assert rows == [{"model": "base", "compute": "int8", "error": "no model"}]
@@ -76,6 +76,19 @@ def test_health_reports_client_count():
     assert p['clients'] == 3
 
 
+def test_health_reports_replica_queue_depth():
+    stats = [{'replica': 0, 'queue_depth': 1, 'completed': 4, 'busy_s': 2.0, 'live': True},
+             {'replica': 1, 'queue_depth': 2, 'completed': 0, 'busy_s': 0.0, 'live': False}]
+    s = _make_server_with_state(transcriber=SimpleNamespace(pool_stats=lambda: stats))
+    p = s._health_payload()
+    assert [r['queue_depth'] for r in p['replicas']] == [1, 2]
+
+
+def test_health_replicas_empty_without_pool():
+    s = _make_server_with_state(transcriber=None)
+    assert s._health_payload()['replicas'] == []
+
+
 def test_health_handles_missing_model_config():
     s = _make_server_with_state(model_config=None)
     p = s._health_payload()
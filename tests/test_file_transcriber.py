@@ -0,0 +1,313 @@
+"""
+Tests for parallel long-file transcription (src/engine/file_transcriber.py)
+and its use in WindyServer._transcribe_file_and_reply.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.engine import file_transcriber
+from src.engine.file_transcriber import chunk_length, plan_chunks, transcribe_file
+from src.engine.model_pool import ModelPool
+from src.engine.transcriber import StreamingTranscriber, TranscriberConfig
+
+SR = 16000
+
+
+def speech(seconds, pause_every=10.0, pause_s=0.5, seed=0):
+    """Noise 'speech' with a pause every pause_every seconds."""
+    rng = np.random.default_rng(seed)
+    audio = (rng.standard_normal(int(seconds * SR)) * 0.2).astype(np.float32)
+    t = np.arange(audio.size) / SR
+    audio[(t % pause_every) >= pause_every - pause_s] *= 0.001
+    return audio
+
+
+class SegmentPerSecond:
+    """One segment per second of chunk audio, its text the segment's
+    absolute start in the file (chunks are views of `audio`); sleeps per
+    call and records the peak number of concurrent calls."""
+
+    def __init__(self, audio, delay=0.0):
+        self.audio = audio
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, chunk):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        offset = (chunk.ctypes.data - self.audio.ctypes.data) / chunk.itemsize / SR
+        return [(float(i), float(i + 1), f" {offset + i:.2f}") for i in range(int(chunk.size / SR))]
+
+
+class TestPlanChunks:
+    def test_cuts_land_in_pauses(self):
+        audio = speech(300)
+        chunks = plan_chunks(audio, SR, target_s=60)
+        assert chunks[0][0] == 0 and chunks[-1][1] == audio.size
+        assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+        for _start, end in chunks[:-1]:
+            assert (end / SR) % 10 == pytest.approx(9.75, abs=0.05)  # Middle of a pause
+        assert all(45 <= (e - s) / SR <= 75 for s, e in chunks[:-1])
+
+    def test_no_pause_cuts_at_quietest_frame(self):
+        audio = speech(200, pause_every=1000)
+        audio[int(61.0 * SR):int(61.02 * SR)] *= 0.5
+        chunks = plan_chunks(audio, SR, target_s=60)
+        assert chunks[0][1] == int(61.0 * SR)
+
+    def test_chunk_length_fills_workers(self):
+        assert chunk_length(3600, workers=1, chunk_s=120) == 120
+        assert chunk_length(600, workers=8, chunk_s=120) == 75
+        assert chunk_length(120, workers=8, chunk_s=120) == 30
+
+
+class TestTranscribeFile:
+    def test_timestamps_stitched_in_order(self):
+        audio = speech(300)
+        model = SegmentPerSecond(audio)
+        result = transcribe_file(audio, model, workers=4, chunk_s=60)
+        assert result.chunks > 1
+        starts = [s["start"] for s in result.segments]
+        assert starts == sorted(starts)
+        # Each chunk's segment i is at chunk offset + i
+        assert [s["text"] for s in result.segments] == [f" {s['start']:.2f}" for s in result.segments]
+
+    def test_progress_reports_text_in_file_order(self):
+        audio = speech(300)
+        reports = []
+        result = transcribe_file(audio, SegmentPerSecond(audio), workers=4, chunk_s=60,
+                                 on_progress=reports.append)
+        assert len(reports) == result.chunks
+        assert reports[-1]["percent"] == 100.0
+        assert [r["chunks_done"] for r in reports] == list(range(1, result.chunks + 1))
+        assert " ".join(r["text"] for r in reports if r["text"]) == result.text
+
+    def test_chunks_run_in_parallel(self):
+        audio = speech(480)
+        serial = SegmentPerSecond(audio, delay=0.1)
+        t0 = time.monotonic()
+        transcribe_file(audio, serial, workers=1, chunk_s=60)
+        serial_s = time.monotonic() - t0
+
+        parallel = SegmentPerSecond(audio, delay=0.1)
+        t0 = time.monotonic()
+        transcribe_file(audio, parallel, workers=8, chunk_s=60)
+        parallel_s = time.monotonic() - t0
+        assert parallel.peak == 8
+        assert parallel_s < serial_s / 3
+
+    def test_short_file_is_one_call(self):
+        audio = speech(50)
+        calls = []
+        reports = []
+        result = transcribe_file(audio, lambda a: calls.append(a.size) or [(0.0, 1.0, " hi")],
+                                 workers=8, chunk_s=120, on_progress=reports.append)
+        assert calls == [audio.size]
+        assert result.text == "hi" and result.chunks == 1
+        assert reports == []
+
+    def test_chunk_failure_propagates(self):
+        def boom(_audio):
+            raise RuntimeError("decoder died")
+        with pytest.raises(RuntimeError):
+            transcribe_file(speech(300), boom, workers=4, chunk_s=60)
+
+
+class TestFileWorkers:
+    def test_default_is_replica_workers(self):
+        t = StreamingTranscriber(TranscriberConfig(num_workers=4))
+        t._pool = ModelPool(["m0", "m1"])
+        assert t.file_workers() == 8
+        t._pool.live_active = True
+        assert t.file_workers() == 4  # Live lane kept clear
+
+    def test_explicit(self):
+        t = StreamingTranscriber(TranscriberConfig(file_workers=3))
+        assert t.file_workers() == 3
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+
+def test_server_streams_progress_then_result(tmp_path, monkeypatch):
+    from src.engine.server import WindyServer
+    audio = speech(300)
+    monkeypatch.setattr(file_transcriber, "DECODE_AVAILABLE", True)
+    monkeypatch.setattr(file_transcriber, "decode_audio", lambda path, sampling_rate: audio)
+
+    class Model:
+        def transcribe(self, source, **kwargs):
+            n = int(source.size / SR)
+            segments = [SimpleNamespace(start=float(i), end=i + 1.0, text=" word") for i in range(n)]
+            return iter(segments), SimpleNamespace(duration=source.size / SR)
+
+    transcriber = StreamingTranscriber(TranscriberConfig(num_workers=4, file_chunk_s=60))
+    transcriber.model = Model()
+    server = WindyServer(host='127.0.0.1', port=9876)
+    server.transcriber = transcriber
+    upload = tmp_path / "upload.wav"
+    upload.write_bytes(b"\0" * 200)
+    ws = FakeWebSocket()
+
+    asyncio.run(server._transcribe_file_and_reply(ws, str(upload), "en"))
+
+    *progress, result = ws.sent
+    assert [m["type"] for m in progress] == ["transcribe_progress"] * len(progress)
+    assert len(progress) == result["chunks"] > 1
+    assert result["type"] == "transcribe_result"
+    assert result["workers"] == 4
+    assert result["audio_duration_s"] == 300
+    assert result["segments"][-1]["end"] == pytest.approx(300, abs=1)
+    assert not upload.exists()
+
+
+def wav_bytes(audio, sample_rate=SR):
+    import io
+    import wave
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+def upload(pipeline, data, seconds, parts=50):
+    """Feed data in equal parts spread over `seconds`."""
+    step = len(data) // parts + 1
+    for i in range(0, len(data), step):
+        pipeline.feed(data[i:i + step])
+        time.sleep(seconds / parts)
+
+
+@pytest.mark.skipif(not file_transcriber.AV_AVAILABLE, reason="PyAV not installed")
+class TestUploadPipeline:
+    def test_matches_whole_file_transcription(self):
+        audio = speech(300)
+        data = wav_bytes(audio)
+        decoded = np.frombuffer(data[44:], dtype=np.int16).astype(np.float32) / 32768.0
+        segments = lambda chunk: [(0.0, chunk.size / SR, f" {chunk.size}")]
+
+        reports = []
+        pipeline = file_transcriber.UploadPipeline(segments, workers=2, chunk_s=60, on_progress=reports.append)
+        upload(pipeline, data, seconds=0)
+        streamed = pipeline.finish()
+        whole = transcribe_file(decoded, segments, workers=1, chunk_s=60)
+        assert streamed.duration_s == pytest.approx(300, abs=0.01)
+        assert streamed.chunks == whole.chunks > 1
+        assert streamed.text == whole.text  # Same cuts, same chunks
+        assert reports[-1]["percent"] == 100.0 and not reports[-1]["receiving"]
+
+    def test_inference_overlaps_upload(self):
+        audio = speech(480)
+        data = wav_bytes(audio)
+        model = lambda chunk: time.sleep(0.3) or [(0.0, 1.0, " x")]  # 8 chunks x 0.3s
+
+        pipeline = file_transcriber.UploadPipeline(model, workers=1, chunk_s=60)
+        t0 = time.monotonic()
+        upload(pipeline, data, seconds=2.0)
+        pipeline.finish()
+        total = time.monotonic() - t0
+        # Sequential would be upload (2.0s) + inference (2.4s)
+        assert total < 3.6
+
+    def test_short_upload_uses_whole_file_path(self):
+        calls = []
+        pipeline = file_transcriber.UploadPipeline(lambda a: calls.append(a.size) or [], workers=4, chunk_s=60)
+        upload(pipeline, wav_bytes(speech(20)), seconds=0)
+        result = pipeline.finish()
+        assert calls == [20 * SR] and result.chunks == 1
+
+    def test_undecodable_stream_raises_on_finish(self):
+        pipeline = file_transcriber.UploadPipeline(lambda a: [], workers=1, chunk_s=60)
+        pipeline.feed(b"not audio at all" * 1000)
+        with pytest.raises(Exception):
+            pipeline.finish()
+
+    def test_feed_stops_queueing_after_decode_failure(self, monkeypatch):
+        def broken_open(pipe, mode="r"):
+            pipe.read(16)
+            raise RuntimeError("not audio")
+
+        monkeypatch.setattr(file_transcriber.av, "open", broken_open)
+        pipeline = file_transcriber.UploadPipeline(lambda a: [], workers=1, chunk_s=60)
+        pipeline.feed(b"not audio at all")
+        pipeline._thread.join(5)
+        assert str(pipeline.error) == "not audio"
+        for _ in range(100):
+            pipeline.feed(b"\0" * 65536)
+        assert pipeline._pipe.queued_bytes == 0 and pipeline._pipe._queue.empty()
+        assert pipeline.received_bytes == 16 + 100 * 65536
+        with pytest.raises(RuntimeError, match="not audio"):
+            pipeline.finish()
+
+    def test_stalled_decoder_caps_buffered_bytes(self, monkeypatch):
+        release = threading.Event()
+
+        def stalled_open(pipe, mode="r"):
+            release.wait(5)
+            raise RuntimeError("decoder gave up")
+
+        monkeypatch.setattr(file_transcriber.av, "open", stalled_open)
+        pipeline = file_transcriber.UploadPipeline(lambda a: [], workers=1, chunk_s=60,
+                                                   max_buffered_bytes=1 << 20)
+        for _ in range(64):
+            pipeline.feed(b"\0" * 65536)  # 4MB against a 1MB cap
+        assert isinstance(pipeline.error, RuntimeError) and "fell more than 1MB behind" in str(pipeline.error)
+        assert pipeline._pipe.queued_bytes == 0
+        release.set()
+        with pytest.raises(RuntimeError, match="behind"):
+            pipeline.finish()
+
+
+@pytest.mark.skipif(not file_transcriber.AV_AVAILABLE, reason="PyAV not installed")
+def test_server_transcribes_upload_while_receiving():
+    from src.engine.server import WindyServer
+    data = wav_bytes(speech(300))
+
+    class Model:
+        def transcribe(self, source, **kwargs):
+            return iter([SimpleNamespace(start=0.0, end=1.0, text=" word")]), SimpleNamespace()
+
+    class UploadingWebSocket(FakeWebSocket):
+        def __init__(self, frames):
+            super().__init__()
+            self.frames = list(frames)
+
+        async def recv(self):
+            await asyncio.sleep(0)
+            return self.frames.pop(0)
+
+    transcriber = StreamingTranscriber(TranscriberConfig(num_workers=2, file_chunk_s=60))
+    transcriber.model = Model()
+    server = WindyServer(host='127.0.0.1', port=9876)
+    server.transcriber = transcriber
+    step = 1 << 20
+    ws = UploadingWebSocket([data[i:i + step] for i in range(0, len(data), step)]
+                            + [json.dumps({"action": "transcribe_upload_end"})])
+
+    asyncio.run(server._handle_command({"action": "transcribe_upload", "format": "wav"}, ws))
+
+    *progress, result = ws.sent
+    assert result["type"] == "transcribe_result" and result["pipelined"] is True
+    assert result["chunks"] == len(progress) > 1
+    assert result["audio_duration_s"] == 300
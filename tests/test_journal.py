@@ -0,0 +1,141 @@
+"""
+Tests for the crash-recovery session journal.
+"""
+
+import struct
+import threading
+import time
+
+import pytest
+
+from src.engine.journal import SessionJournal, read_journal, reconstruct_session, recover_text
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "windy_session.journal"
+
+
+class TestSessionJournal:
+    def test_round_trip_keeps_timestamps_and_confidence(self, path):
+        j = SessionJournal(path, durability_ms=50)
+        j.open()
+        j.append("hello world", 0.0, 1.2, 0.93)
+        j.append("second", 1.2, 2.0, 0.8)
+        j.close()
+        records = read_journal(path)
+        assert [r["x"] for r in records] == ["hello world", "second"]
+        assert records[0]["s"] == 0.0 and records[0]["e"] == 1.2 and records[0]["c"] == 0.93
+        assert all("t" in r for r in records)
+
+    def test_group_commit_batches_fsyncs(self, path):
+        j = SessionJournal(path, durability_ms=100)
+        j.open()
+        for i in range(50):
+            j.append(f"w{i}", i, i + 1)
+        j.close()
+        assert j.records == 50
+        assert j.syncs < 5
+        assert len(read_journal(path)) == 50
+
+    def test_zero_window_syncs_every_record(self, path):
+        j = SessionJournal(path, durability_ms=0)
+        j.open()
+        for i in range(3):
+            j.append(f"w{i}", i, i + 1)
+        assert j.syncs == 3
+        assert len(read_journal(path)) == 3  # Already on disk before close
+        j.close()
+
+    def test_sync_makes_records_readable(self, path):
+        j = SessionJournal(path, durability_ms=500)
+        j.open()
+        j.append("pending", 0, 1)
+        j.sync()
+        assert recover_text(path) == "pending"
+        j.close()
+
+    def test_append_does_not_wait_for_fsync(self, path, monkeypatch):
+        from src.engine import journal as journal_module
+        in_fsync, release = threading.Event(), threading.Event()
+        real_fsync = journal_module.os.fsync
+
+        def slow_fsync(fd):
+            in_fsync.set()
+            release.wait(5)
+            real_fsync(fd)
+
+        j = SessionJournal(path, durability_ms=500)
+        j.open()
+        j.append("first", 0.0, 1.0)
+        monkeypatch.setattr(journal_module.os, "fsync", slow_fsync)
+        syncer = threading.Thread(target=j.sync)
+        syncer.start()
+        assert in_fsync.wait(5)
+        started = time.monotonic()
+        j.append("second", 1.0, 2.0)  # Would block on the lock if fsync held it
+        assert time.monotonic() - started < 1.0
+        release.set()
+        syncer.join()
+        j.close()
+        assert [r["x"] for r in read_journal(path)] == ["first", "second"]
+
+    def test_open_truncates_previous_session(self, path):
+        j = SessionJournal(path)
+        j.open()
+        j.append("old", 0, 1)
+        j.open()
+        j.append("new", 0, 1)
+        j.close()
+        assert recover_text(path) == "new"
+
+    def test_close_delete_removes_file(self, path):
+        j = SessionJournal(path)
+        j.open()
+        j.append("bye", 0, 1)
+        j.close(delete=True)
+        assert not path.exists()
+
+    def test_append_when_closed_is_noop(self, path):
+        j = SessionJournal(path)
+        j.append("nowhere", 0, 1)
+        assert not path.exists()
+
+
+class TestRecovery:
+    def test_torn_tail_is_ignored(self, path):
+        j = SessionJournal(path, durability_ms=0)
+        j.open()
+        j.append("complete", 0, 1)
+        j.close()
+        with open(path, "ab") as f:
+            f.write(struct.pack("<II", 100, 0) + b'{"x": "tor')  # crash mid-record
+        assert recover_text(path) == "complete"
+
+    def test_corrupt_record_stops_reader(self, path):
+        j = SessionJournal(path, durability_ms=0)
+        j.open()
+        j.append("good", 0, 1)
+        j.append("flipped", 1, 2)
+        j.close()
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+        assert recover_text(path) == "good"
+
+    def test_reconstruct_keeps_trailing_partial_only(self, path):
+        j = SessionJournal(path, durability_ms=0)
+        j.open()
+        j.append("hello", 0, 0.5, partial=True)
+        j.append("hello there", 0, 1.0, 0.9)
+        j.append("how", 1.0, 1.3, partial=True)
+        j.append("how are", 1.0, 1.6, partial=True)
+        j.close()
+        segments = reconstruct_session(read_journal(path))
+        assert [s["text"] for s in segments] == ["hello there", "how are"]
+        assert segments[-1]["partial"] is True
+        assert recover_text(path) == "hello there how are"
+
+    def test_missing_file(self, tmp_path):
+        assert read_journal(tmp_path / "nope.journal") == []
+        assert recover_text(tmp_path / "nope.journal") == ""
@@ -0,0 +1,73 @@
+"""
+Tests for the Whisper model pool behind StreamingTranscriber.lease_model.
+"""
+
+import threading
+
+from src.engine.model_pool import ModelPool, split_threads
+
+
+class TestSplitThreads:
+    def test_default_single_replica_keeps_ct2_default(self):
+        assert split_threads(0, 1) == 0
+
+    def test_budget_split_evenly(self):
+        assert split_threads(8, 2) == 4
+        assert split_threads(8, 3) == 2
+
+    def test_never_below_one(self):
+        assert split_threads(2, 4) == 1
+
+    def test_budget_covers_workers(self):
+        assert split_threads(8, 1, workers=4) == 2
+        assert split_threads(8, 2, workers=2) == 2
+
+
+class TestModelPool:
+    def test_single_replica_serves_everything(self):
+        pool = ModelPool(["m0"])
+        with pool.acquire(live=True) as live, pool.acquire() as job:
+            assert live == job == "m0"
+            assert pool.stats()[0]["queue_depth"] == 2
+
+    def test_jobs_avoid_live_replica_during_session(self):
+        pool = ModelPool(["m0", "m1", "m2"])
+        pool.live_active = True
+        with pool.acquire() as a, pool.acquire() as b, pool.acquire() as c:
+            assert {a, b} == {"m1", "m2"}
+            assert c in ("m1", "m2")
+        with pool.acquire(live=True) as live:
+            assert live == "m0"
+
+    def test_idle_live_replica_used_between_sessions(self):
+        pool = ModelPool(["m0", "m1"])
+        with pool.acquire() as a, pool.acquire() as b:
+            assert {a, b} == {"m0", "m1"}
+
+    def test_stats_track_queue_depth_and_completion(self):
+        pool = ModelPool(["m0", "m1"])
+        pool.live_active = True
+        entered = threading.Event()
+        release = threading.Event()
+
+        def job():
+            with pool.acquire():
+                entered.set()
+                release.wait(5)
+
+        t = threading.Thread(target=job)
+        t.start()
+        entered.wait(5)
+        depths = [r["queue_depth"] for r in pool.stats()]
+        release.set()
+        t.join(5)
+        assert depths == [0, 1]
+        stats = pool.stats()
+        assert stats[1]["queue_depth"] == 0
+        assert stats[1]["completed"] == 1
+        assert stats[0]["live"] is True
+
+    def test_load_calls_factory_per_replica(self):
+        pool = ModelPool.load(lambda i: f"model-{i}", 3)
+        assert len(pool) == 3
+        assert pool.primary == "model-0"
@@ -0,0 +1,150 @@
+"""
+Tests for the negotiated broadcast encodings (src/engine/protocol_codec.py)
+and their use in WindyServer._broadcast.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.engine import protocol_codec
+from src.engine.protocol_codec import BIN_V1, MSGPACK_V1, decode, encode, select_subprotocol
+
+
+def transcript(n_words=3, **overrides):
+    words = [{"word": f" w{i}", "start": i * 0.5, "end": i * 0.5 + 0.25, "prob": 0.75}
+             for i in range(n_words)]
+    message = {
+        "type": "transcript",
+        "text": "".join(w["word"] for w in words).strip(),
+        "start": 1.5,
+        "end": 4.25,
+        "confidence": -0.25,
+        "partial": False,
+        "words": words,
+        "detected_language": "en",
+        "language_probability": 0.5,
+    }
+    message.update(overrides)
+    return message
+
+
+class TestBinV1:
+    def test_transcript_round_trip(self):
+        message = transcript(n_words=40, text="héllo — 你好")
+        frame = encode(message, BIN_V1)
+        assert isinstance(frame, bytes) and frame[0] == 1
+        assert decode(frame, BIN_V1) == message  # Values chosen to be exact in f32
+        assert len(frame) < len(json.dumps(message)) / 2
+
+    def test_float_precision_is_f32(self):
+        decoded = decode(encode(transcript(start=0.1), BIN_V1), BIN_V1)
+        assert decoded["start"] == pytest.approx(0.1, rel=1e-7)
+
+    def test_empty_word_list(self):
+        message = transcript(n_words=0, text="")
+        assert decode(encode(message, BIN_V1), BIN_V1) == message
+
+    def test_state_and_pong(self):
+        for message in ({"type": "state", "state": "listening", "previous": "idle"},
+                        {"type": "pong", "heartbeat": True}):
+            frame = encode(message, BIN_V1)
+            assert frame[0] != 0
+            assert decode(frame, BIN_V1) == message
+
+    @pytest.mark.parametrize("message", [
+        {"type": "backlog", "action": "drop_oldest", "dropped_s": 1.0},  # No layout
+        {"type": "state", "state": "idle"},  # Missing a layout field
+        {**transcript(), "words_confidence": 0.9},  # Extra field
+        transcript(detected_language="x" * 300),  # Too long for str8
+        transcript(start=None),  # Wrong type
+    ])
+    def test_other_messages_fall_back_to_json(self, message):
+        frame = encode(message, BIN_V1)
+        assert frame[0] == 0
+        assert decode(frame, BIN_V1) == message
+
+
+class TestNegotiation:
+    def test_json_is_default(self):
+        message = transcript()
+        assert encode(message) == json.dumps(message)
+        assert decode(encode(message)) == message
+
+    def test_first_supported_offer_wins(self):
+        assert select_subprotocol(["chat", BIN_V1]) == BIN_V1
+        assert select_subprotocol(["chat"]) is None
+        assert select_subprotocol([]) is None
+
+    @pytest.mark.skipif(not protocol_codec.MSGPACK_AVAILABLE, reason="msgpack not installed")
+    def test_msgpack_round_trip(self):
+        message = transcript()
+        assert decode(encode(message, MSGPACK_V1), MSGPACK_V1) == message
+
+    @pytest.mark.skipif(protocol_codec.MSGPACK_AVAILABLE, reason="msgpack installed")
+    def test_msgpack_not_offered_without_msgpack(self):
+        assert select_subprotocol([MSGPACK_V1]) is None
+
+
+class FakeClient:
+    def __init__(self, subprotocol=None):
+        self.subprotocol = subprotocol
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(data)
+
+
+def test_broadcast_encodes_per_client():
+    from src.engine.server import WindyServer
+    server = WindyServer(host='127.0.0.1', port=9876)
+    plain, binary, other_binary = FakeClient(), FakeClient(BIN_V1), FakeClient(BIN_V1)
+    server.clients = {plain, binary, other_binary}
+    message = transcript()
+    asyncio.run(server._broadcast(message))
+    assert plain.sent == [json.dumps(message)]
+    assert isinstance(binary.sent[0], bytes)
+    assert binary.sent[0] is other_binary.sent[0]  # Encoded once, shared
+    assert decode(binary.sent[0], BIN_V1) == message
+
+
+def test_server_negotiates_at_handshake():
+    websockets = pytest.importorskip("websockets")
+    from src.engine.server import WindyServer
+    server = WindyServer(host='127.0.0.1', port=0)
+
+    async def main():
+        async def handler(ws):
+            server.clients.add(ws)
+            await ws.wait_closed()
+
+        async with websockets.serve(handler, '127.0.0.1', 0,
+                                    select_subprotocol=server._select_subprotocol) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            url = f"ws://127.0.0.1:{port}"
+            async with websockets.connect(url, subprotocols=[BIN_V1]) as binary, \
+                    websockets.connect(url) as plain:
+                assert binary.subprotocol == BIN_V1
+                assert plain.subprotocol is None
+                while len(server.clients) < 2:
+                    await asyncio.sleep(0.01)
+                message = {"type": "state", "state": "listening", "previous": "idle"}
+                await server._broadcast(message)
+                assert decode(await binary.recv(), BIN_V1) == message
+                assert json.loads(await plain.recv()) == message
+
+    asyncio.run(main())
+
+
+def test_wire_benchmark_round_trips():
+    from src.engine.benchmark import bench_wire
+    rows = bench_wire(minutes=0.5, repeat=1)
+    assert [r["encoding"] for r in rows][0] == "json"
+    assert all(r["round_trip"] for r in rows)
+    json_row, bin_row = rows[0], next(r for r in rows if r["encoding"] == BIN_V1)
+    assert bin_row["bytes_per_msg"] < json_row["bytes_per_msg"] / 2
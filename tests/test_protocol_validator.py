@@ -148,3 +148,14 @@ def test_validation_is_cheap_when_disabled(monkeypatch):
     # Malformed message — would normally error — returns [] when off
     assert pv.validate_client_message('totally invalid') == []
     assert pv.validate_server_message({'type': 'nonsense'}) == []
+
+
+def test_server_frames_validated_in_any_encoding():
+    from src.engine.protocol_codec import BIN_V1, encode
+    from src.engine.protocol_validator import validate_server_frame
+    good = {'type': 'pong', 'heartbeat': True}
+    assert validate_server_frame(encode(good)) == []
+    assert validate_server_frame(encode(good, BIN_V1), BIN_V1) == []
+    bad = {'type': 'transcript', 'text': 12345}
+    assert validate_server_frame(encode(bad, BIN_V1), BIN_V1)  # Via the JSON fallback frame
+    assert validate_server_frame(b'\xff', BIN_V1)
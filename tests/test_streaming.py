@@ -0,0 +1,122 @@
+"""
+Tests for the LocalAgreement streaming stabiliser and the transcriber's
+sliding-window streaming mode.
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.engine.streaming import LocalAgreement, StreamWord
+from src.engine.transcriber import StreamingTranscriber, TranscriberConfig
+
+
+def words(*specs):
+    """Build StreamWords from (start, end, text) tuples."""
+    return [StreamWord(start=s, end=e, word=f" {t}") for s, e, t in specs]
+
+
+class TestLocalAgreement:
+    def test_first_hypothesis_is_tentative(self):
+        la = LocalAgreement()
+        assert la.insert(words((0.0, 0.4, "hello"), (0.5, 0.9, "world"))) == []
+        assert [w.key for w in la.tentative] == ["hello", "world"]
+
+    def test_commits_common_prefix(self):
+        la = LocalAgreement()
+        la.insert(words((0.0, 0.4, "hello"), (0.5, 0.9, "word.")))
+        committed = la.insert(words((0.0, 0.4, "hello"), (0.5, 0.9, "world"), (1.0, 1.3, "again")))
+        assert [w.key for w in committed] == ["hello"]
+        assert [w.key for w in la.tentative] == ["world", "again"]
+        assert la.last_committed_end == pytest.approx(0.4)
+
+    def test_false_period_at_window_edge_is_not_committed(self):
+        la = LocalAgreement()
+        la.insert(words((0.0, 0.4, "my"), (0.5, 0.9, "name.")))
+        committed = la.insert(words((0.0, 0.4, "my"), (0.5, 0.9, "name"), (1.0, 1.2, "is")))
+        assert [w.key for w in committed] == ["my"]
+        committed = la.insert(words((0.5, 0.9, "name"), (1.0, 1.2, "is"), (1.3, 1.6, "Grant.")))
+        assert [w.key for w in committed] == ["name", "is"]
+
+    def test_committed_words_are_not_repeated(self):
+        la = LocalAgreement()
+        la.insert(words((0.0, 0.4, "one"), (0.5, 0.9, "two")))
+        la.insert(words((0.0, 0.4, "one"), (0.5, 0.9, "two")))
+        # Window still holds the tail of "two" (trim point fell inside it)
+        committed = la.insert(words((0.85, 0.9, "two"), (1.0, 1.4, "three")))
+        assert committed == []
+        assert [w.key for w in la.tentative] == ["three"]
+
+    def test_finalize_commits_everything(self):
+        la = LocalAgreement()
+        la.insert(words((0.0, 0.4, "a"), (0.5, 0.9, "b")))
+        final = la.finalize(words((0.0, 0.4, "a"), (0.5, 0.9, "b"), (1.0, 1.2, "c")))
+        assert [w.key for w in final] == ["a", "b", "c"]
+        assert la.tentative == []
+
+    def test_prompt_uses_committed_text(self):
+        la = LocalAgreement()
+        la.finalize(words((0.0, 0.4, "hello"), (0.5, 0.9, "there")))
+        assert la.prompt() == "hello there"
+        assert la.prompt(max_chars=5) == "there"
+
+
+class ScriptedModel:
+    """Fake WhisperModel that "hears" a fixed word script. Each 0.25s frame
+    fed by the test is filled with 1000 + frame index, so the last sample of
+    a window tells the model where the window ends in session time."""
+
+    FRAME_S = 0.25
+
+    def __init__(self, script):
+        self.script = script
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        window_end = (round(audio[-1] * 32768.0) - 1000 + 1) * self.FRAME_S
+        window_start = window_end - len(audio) / 16000.0
+        hyp = []
+        for start, end, text in self.script:
+            if start >= window_start - 0.05 and end <= window_end:
+                hyp.append(SimpleNamespace(
+                    word=f" {text}", start=start - window_start,
+                    end=end - window_start, probability=0.9))
+        seg = SimpleNamespace(words=hyp, text="".join(w.word for w in hyp))
+        return [seg], SimpleNamespace(language="en", language_probability=0.99)
+
+
+class TestStreamingMode:
+    def test_partials_then_commits_full_transcript(self):
+        script = [(0.1 + i * 0.5, 0.5 + i * 0.5, f"w{i}") for i in range(8)]
+        config = TranscriberConfig(streaming=True, stream_step_s=0.5, vad_enabled=False)
+        transcriber = StreamingTranscriber(config)
+        model = ScriptedModel(script)
+        transcriber.model = model
+
+        segments = []
+        transcriber.on_transcript(lambda seg: segments.append(seg))
+        transcriber.start_session()
+
+        # Feed 5s of non-silent audio in 0.25s frames, roughly in real time
+        for i in range(20):
+            frame = np.full(4000, 1000 + i, dtype=np.int16).tobytes()
+            transcriber.feed_audio(frame)
+            time.sleep(0.08)
+
+        transcript = transcriber.stop_session()
+
+        assert any(s.is_partial for s in segments)
+        assert transcript.split() == [f"w{i}" for i in range(8)]
+        # Committed segments carry absolute, monotonic timestamps
+        finals = [s for s in segments if not s.is_partial]
+        starts = [s.start_time for s in finals]
+        assert starts == sorted(starts)
+
+    def test_stream_mode_without_model_does_not_crash(self):
+        transcriber = StreamingTranscriber(TranscriberConfig(streaming=True))
+        transcriber.start_session()
+        transcriber.feed_audio(np.zeros(16000, dtype=np.int16).tobytes())
+        assert transcriber.stop_session() == ""
@@ -0,0 +1,71 @@
+"""
+Tests for the live-audio backpressure policies in StreamingTranscriber.
+"""
+
+import numpy as np
+import pytest
+
+from src.engine.transcriber import StreamingTranscriber, TranscriberConfig
+
+SR = 16000
+
+
+def speech(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16).tobytes()
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.int16).tobytes()
+
+
+def backlogged(policy, *frames):
+    t = StreamingTranscriber(TranscriberConfig(backlog_policy=policy, max_backlog_s=4.0, adaptive=False))
+    reports = []
+    t.on_backlog(reports.append)
+    for frame in frames:
+        t._audio_ring.write(frame)
+    return t, reports
+
+
+def test_drop_oldest_keeps_the_newest_audio():
+    t, reports = backlogged("drop_oldest", speech(6))
+    available, beam = t._relieve_backlog(t._audio_ring, 4 * SR)
+    assert available == 4 * SR and beam is None
+    assert reports[-1]["action"] == "drop_oldest"
+    assert reports[-1]["dropped_s"] == pytest.approx(2.0)
+
+
+def test_skip_silence_cuts_pauses_before_speech():
+    t, reports = backlogged("skip_silence", speech(1.5), silence(3), speech(1.5))
+    available, beam = t._relieve_backlog(t._audio_ring, 4 * SR)
+    stats = reports[-1]
+    assert stats["action"] == "skip_silence"
+    # 3s pause minus 0.2s of padding either side of the speech
+    assert stats["skipped_silence_s"] == pytest.approx(2.6, abs=0.05)
+    assert stats["dropped_s"] == 0.0
+    assert available == len(t._audio_ring)
+
+
+def test_skip_silence_falls_back_to_dropping_oldest():
+    t, reports = backlogged("skip_silence", speech(6))
+    available, _ = t._relieve_backlog(t._audio_ring, 4 * SR)
+    assert available == 4 * SR
+    assert reports[-1]["dropped_s"] == pytest.approx(2.0)
+
+
+def test_degrade_keeps_everything_and_decodes_greedy():
+    t, reports = backlogged("degrade", speech(6))
+    available, beam = t._relieve_backlog(t._audio_ring, 4 * SR)
+    assert available == 6 * SR and beam == 1
+    assert reports[-1]["dropped_s"] == 0.0
+
+
+def test_lag_reports_behind_then_caught_up():
+    t, reports = backlogged("drop_oldest")
+    t._note_lag(7 * SR, SR)  # Within one utterance_max_s: still normal
+    t._note_lag(9 * SR, SR)
+    t._note_lag(10 * SR, SR)  # Throttled
+    t._note_lag(2 * SR, SR)
+    assert [r["action"] for r in reports] == ["behind", "caught_up"]
+    assert t.backlog_stats()["peak_lag_s"] == 10.0
@@ -0,0 +1,119 @@
+"""
+Tests for src/engine/translate_local.py batching and warm-worker caching.
+No CTranslate2 model is loaded; the translator/tokenizer are fakes.
+"""
+
+import io
+import json
+import sys
+from types import SimpleNamespace
+
+from src.engine import translate_local
+
+
+class FakeSp:
+    def Encode(self, text, out_type=str):
+        return text.split()
+
+    def Decode(self, toks):
+        return " ".join(toks)
+
+
+class FakeTranslator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, batch, target_prefix, max_batch_size, **kw):
+        self.calls.append(len(batch))
+        # "Translate" = target-lang token + reversed source words (minus </s> + src tag)
+        return [SimpleNamespace(hypotheses=[prefix + list(reversed(src[:-2]))])
+                for src, prefix in zip(batch, target_prefix)]
+
+
+class FakeModel(translate_local._Model):
+    loads = 0
+
+    def __init__(self, model_dir):
+        FakeModel.loads += 1
+        self.model_dir = model_dir
+        self.translator = FakeTranslator()
+        self.sp = FakeSp()
+
+
+def test_all_items_share_one_translate_batch():
+    model = FakeModel("/m")
+    results = model.translate_items([
+        {"text": "hello world", "source": "en", "target": "es"},
+        {"text": "  ", "source": "en", "target": "es"},
+        {"text": "good morning", "source": "en", "target": "fr"},
+    ])
+    assert model.translator.calls == [2]
+    assert results == [{"translatedText": "world hello"}, {"translatedText": "  "},
+                       {"translatedText": "morning good"}]
+
+
+def test_model_cached_between_requests(monkeypatch):
+    monkeypatch.setattr(translate_local, "_Model", FakeModel)
+    FakeModel.loads = 0
+    state = {"model": None}
+    req = {"model_dir": "/m", "items": [{"text": "a b", "target": "de"}]}
+    first = translate_local._translate(state, req)
+    second = translate_local._translate(state, req)
+    assert (first["cold"], second["cold"]) == (True, False)
+    assert second["load_ms"] == 0 and "translate_ms" in second
+    assert FakeModel.loads == 1
+    translate_local._translate(state, {**req, "model_dir": "/other"})
+    assert FakeModel.loads == 2
+
+
+def test_serve_speaks_json_lines(monkeypatch, capsys):
+    monkeypatch.setattr(translate_local, "_Model", FakeModel)
+    lines = [json.dumps({"id": i, "model_dir": "/m", "items": [{"text": "x y"}]}) for i in (1, 2)]
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(lines + ["not json"]) + "\n"))
+    translate_local.serve(idle_evict_s=0)
+    out = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+    assert out[0]["type"] == "ready"
+    assert [(o["id"], o["ok"], o["cold"]) for o in out[1:3]] == [(1, True, True), (2, True, False)]
+    assert out[1]["results"] == [{"translatedText": "y x"}]
+    assert out[3]["ok"] is False
+
+
+def test_cached_items_skip_the_model(monkeypatch):
+    from src.engine.translation_cache import TranslationCache
+
+    monkeypatch.setattr(translate_local, "_Model", FakeModel)
+    FakeModel.loads = 0
+    state = {"model": None, "cache": TranslationCache()}
+    req = {"model_dir": "/m", "items": [{"text": "a b", "target": "de"}, {"text": "c d", "target": "de"}]}
+    first = translate_local._translate(state, req)
+    assert first["cache_hits"] == 0
+
+    # Fully cached request: answered without (re)loading the evicted model
+    state["model"] = None
+    second = translate_local._translate(state, req)
+    assert second["cache_hits"] == 2 and second["cold"] is False
+    assert second["results"] == first["results"]
+    assert FakeModel.loads == 1
+
+    mixed = translate_local._translate(state, {**req, "items": req["items"] + [{"text": "e f", "target": "de"}]})
+    assert mixed["cache_hits"] == 2
+    assert state["model"].translator.calls == [1]
+    assert mixed["results"][2] == {"translatedText": "f e"}
+
+
+def test_blank_items_never_load_the_model(monkeypatch):
+    from src.engine.translation_cache import TranslationCache
+
+    monkeypatch.setattr(translate_local, "_Model", FakeModel)
+    FakeModel.loads = 0
+    items = [{"text": ""}, {"text": "   "}, {}]
+    for cache in (None, TranslationCache()):
+        state = {"model": None, "cache": cache}
+        result = translate_local._translate(state, {"model_dir": "/m", "items": items})
+        assert result["results"] == [{"translatedText": ""}, {"translatedText": "   "}, {"translatedText": ""}]
+        assert result["cold"] is False and result["cache_hits"] == 0
+    assert FakeModel.loads == 0
+
+    mixed = translate_local._translate(state, {"model_dir": "/m", "items": items[:1] + [{"text": "a b"}]})
+    assert mixed["results"] == [{"translatedText": ""}, {"translatedText": "b a"}]
+    assert FakeModel.loads == 1
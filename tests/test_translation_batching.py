@@ -0,0 +1,116 @@
+"""
+Tests for the translation server's per-language-pair micro-batcher.
+"""
+
+import asyncio
+import time
+
+from src.translation.batching import TranslationBatcher
+
+
+class FakeModel:
+    """Uppercases texts; records each batch's (pair, size)."""
+
+    def __init__(self, delay_s=0.0):
+        self.calls = []
+        self.delay_s = delay_s
+
+    def __call__(self, texts, source_lang, target_lang):
+        self.calls.append(((source_lang, target_lang), len(texts)))
+        time.sleep(self.delay_s)
+        return [{"translated_text": t.upper(), "source_lang": source_lang,
+                 "target_lang": target_lang} for t in texts]
+
+
+def test_concurrent_requests_share_a_batch():
+    model = FakeModel()
+    batcher = TranslationBatcher(model, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(f"text {i}", "en", "es") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert model.calls == [(("en", "es"), 5)]
+    assert [r["translated_text"] for r in results] == [f"TEXT {i}" for i in range(5)]
+    assert all("queue_ms" in r for r in results)
+
+
+def test_groups_by_language_pair():
+    model = FakeModel()
+    batcher = TranslationBatcher(model, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("a", "en", "es"), batcher.submit("b", "en", "fr"),
+            batcher.submit("c", "en", "es"), batcher.submit("d", "de", "en"),
+        )
+
+    results = asyncio.run(run())
+    assert sorted(model.calls) == [(("de", "en"), 1), (("en", "es"), 2), (("en", "fr"), 1)]
+    assert [(r["translated_text"], r["target_lang"]) for r in results] == \
+        [("A", "es"), ("B", "fr"), ("C", "es"), ("D", "en")]
+
+
+def test_full_batch_flushes_before_deadline():
+    model = FakeModel()
+    batcher = TranslationBatcher(model, max_batch_size=4, max_wait_ms=10_000)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(batcher.submit("x", "en", "es") for _ in range(8)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 2.0
+    assert model.calls == [(("en", "es"), 4), (("en", "es"), 4)]
+
+
+def test_lone_request_waits_at_most_deadline():
+    model = FakeModel()
+    batcher = TranslationBatcher(model, max_batch_size=16, max_wait_ms=20)
+
+    async def run():
+        start = time.monotonic()
+        await batcher.submit("solo", "en", "es")
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.5
+
+
+def test_auto_source_resolved_before_grouping():
+    model = FakeModel()
+    batcher = TranslationBatcher(model, max_wait_ms=30,
+                                 detect_fn=lambda t: "fr" if t.startswith("bonjour") else "de")
+
+    async def run():
+        return await asyncio.gather(batcher.submit("bonjour", "auto", "en"),
+                                    batcher.submit("bonjour toi", "auto", "en"),
+                                    batcher.submit("hallo", "auto", "en"))
+
+    results = asyncio.run(run())
+    assert sorted(model.calls) == [(("de", "en"), 1), (("fr", "en"), 2)]
+    assert [r["source_lang"] for r in results] == ["fr", "fr", "de"]
+
+
+def test_errors_reach_every_request_and_stats_count_batches():
+    def failing(texts, src, tgt):
+        raise RuntimeError("CUDA OOM")
+
+    batcher = TranslationBatcher(failing, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(batcher.submit("a", "en", "es"), batcher.submit("b", "en", "es"),
+                                    return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+
+    model = FakeModel()
+    ok = TranslationBatcher(model, max_batch_size=4, max_wait_ms=20)
+
+    async def run_ok():
+        await asyncio.gather(*(ok.submit("x", "en", "es") for _ in range(6)))
+
+    asyncio.run(run_ok())
+    stats = ok.stats()
+    assert stats["batches"] == 2 and stats["requests"] == 6
+    assert stats["avg_batch_size"] == 3.0
+    assert stats["queued"] == 0
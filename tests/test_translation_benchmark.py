@@ -0,0 +1,99 @@
+"""
+Tests for the translation benchmark's concurrent load mode.
+"""
+
+import asyncio
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from src.translation import benchmark
+from src.translation.server import TranslationServer
+
+
+def test_parse_mix():
+    assert benchmark.parse_mix("en-es:3, en-fr") == [("en-es", 3.0), ("en-fr", 1.0)]
+    with pytest.raises(ValueError):
+        benchmark.parse_mix(" , ")
+
+
+def test_percentiles_nearest_rank():
+    p = benchmark.percentiles(list(range(1, 101)))
+    assert (p["p50"], p["p95"], p["p99"], p["max"]) == (50, 95, 99, 100)
+    assert benchmark.percentiles([])["p99"] == 0.0
+
+
+def test_arrivals_are_open_loop_poisson_and_follow_the_mix():
+    pairs = [("en-es", 3.0), ("ru-en", 1.0)]
+    lengths = [("short", 1.0), ("long", 1.0)]
+    arrivals = benchmark.schedule_arrivals(50, 20, pairs, lengths, seed=1)
+
+    assert arrivals == benchmark.schedule_arrivals(50, 20, pairs, lengths, seed=1)
+    assert 800 < len(arrivals) < 1200  # ~rate * duration
+    assert all(a["at"] < 20 for a in arrivals)
+    share = sum(a["pair"] == "en-es" for a in arrivals) / len(arrivals)
+    assert 0.65 < share < 0.85
+    for a in arrivals:
+        low, high = benchmark.LENGTH_BUCKETS[a["bucket"]]
+        assert low <= len(a["text"].split()) <= high
+
+    with pytest.raises(ValueError):
+        benchmark.schedule_arrivals(1, 1, pairs, [("huge", 1.0)])
+
+
+def test_unspaced_sources_sample_characters():
+    import random
+    text = benchmark.make_text(random.Random(0), "zh", "short")
+    assert " " not in text and 3 <= len(text) <= 8
+
+
+def test_summary_reports_server_cpu():
+    samples = [
+        {"pair": "en-es", "bucket": "short", "latency_ms": 20.0, "client_wait_ms": 1.0,
+         "queue_ms": 5.0, "inference_ms": 12, "error": None},
+        {"pair": "en-es", "bucket": "long", "latency_ms": 0.0, "client_wait_ms": 0.0,
+         "queue_ms": None, "inference_ms": None, "error": "boom"},
+    ]
+    report = benchmark.summarize_load(
+        samples, 2.0, {"rate": 1.0},
+        {"process": {"cpu_time_s": 10.0, "cpu_count": 4}},
+        {"process": {"cpu_time_s": 13.0, "cpu_count": 4}, "engine": "ct2-int8"})
+    assert (report["requests"], report["errors"], report["throughput_rps"]) == (2, 1, 0.5)
+    assert report["server_cpu"] == {"cpu_s": 3.0, "cores_busy": 1.5, "utilization": 0.375}
+    assert report["by_length"]["long"]["errors"] == 1
+    assert report["server"]["engine"] == "ct2-int8"
+
+
+class EchoTranslator:
+    """Just enough Translator for the server's translate path."""
+    _loaded = True
+    device = "cpu"
+    cache = None
+    config = type("Config", (), {"model_type": "base", "engine": "torch"})()
+
+    def get_vram_usage(self):
+        return {}
+
+    def translate(self, text, source_lang, target_lang, return_timing=False):
+        return {"translated_text": text[::-1], "source_lang": source_lang,
+                "target_lang": target_lang, "inference_ms": 1}
+
+
+def test_load_run_against_server():
+    server = TranslationServer()
+    server.translator = EchoTranslator()
+
+    async def run():
+        async with websockets.serve(server._handle_client, "127.0.0.1", 0) as ws_server:
+            port = list(ws_server.sockets)[0].getsockname()[1]
+            return await benchmark.run_load("127.0.0.1", port, clients=3, rate=200, duration=0.25,
+                                            pairs=[("en-es", 1.0), ("en-fr", 1.0)],
+                                            lengths=[("short", 1.0)], seed=2)
+
+    report = asyncio.run(run())
+    assert report["requests"] > 10 and report["errors"] == 0
+    assert set(report["by_pair"]) <= {"en-es", "en-fr"}
+    assert report["latency_ms"]["p99"] >= report["latency_ms"]["p50"] > 0
+    assert report["server_cpu"]["cpu_s"] >= 0
+    assert report["config"]["clients"] == 3
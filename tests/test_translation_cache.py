@@ -0,0 +1,131 @@
+"""
+Tests for the shared translation result cache.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from src.engine import translation_cache
+from src.engine.translation_cache import TranslationCache, normalize_text
+
+
+def test_normalization_folds_whitespace_and_unicode_forms():
+    assert normalize_text("  hello \n  world\t") == "hello world"
+    # "é" precomposed vs e + combining acute
+    assert normalize_text("café") == normalize_text("café")
+    cache = TranslationCache()
+    cache.put("good  morning", "en", "es", "m", "buenos días")
+    assert cache.get(" good morning ", "en", "es", "m") == "buenos días"
+    # Case changes the translation, so it stays in the key
+    assert cache.get("Good morning", "en", "es", "m") is None
+
+
+def test_key_includes_pair_and_model():
+    cache = TranslationCache()
+    cache.put("hello", "en", "es", "m1", "hola")
+    assert cache.get("hello", "en", "fr", "m1") is None
+    assert cache.get("hello", "en", "es", "m2") is None
+    assert cache.get("hello", "en", "es", "m1") == "hola"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TranslationCache(max_entries=2)
+    cache.put("a", "en", "es", "m", "A")
+    cache.put("b", "en", "es", "m", "B")
+    assert cache.get("a", "en", "es", "m") == "A"  # "b" is now the oldest
+    cache.put("c", "en", "es", "m", "C")
+    assert cache.get("b", "en", "es", "m") is None
+    assert cache.get("a", "en", "es", "m") == "A"
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, "time", lambda: now[0])
+    cache = TranslationCache(ttl_s=60)
+    cache.put("hello", "en", "es", "m", "hola")
+    now[0] += 59
+    assert cache.get("hello", "en", "es", "m") == "hola"
+    now[0] += 2
+    assert cache.get("hello", "en", "es", "m") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db = str(tmp_path / "cache.db")
+    first = TranslationCache(db_path=db)
+    first.put("thank you", "en", "de", "m", "danke")
+    first.close()
+
+    second = TranslationCache(db_path=db)
+    assert second.get("thank you", "en", "de", "m") == "danke"
+    assert second.get("thank you", "en", "de", "m") == "danke"  # promoted to memory
+    stats = second.stats()
+    assert stats["persistent"] is True
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 0)
+    second.close()
+
+
+def _disk_rows(db):
+    conn = sqlite3.connect(db)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_disk_tier_expires_and_deletes_stale_rows(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, "time", lambda: now[0])
+    db = str(tmp_path / "cache.db")
+    cache = TranslationCache(max_entries=1, ttl_s=60, db_path=db)
+    cache.put("hello", "en", "es", "m", "hola")
+    cache.put("bye", "en", "es", "m", "adios")  # Pushes "hello" out of memory
+    now[0] += 30
+    assert cache.get("hello", "en", "es", "m") == "hola"  # From disk
+    cache.put("bye", "en", "es", "m", "adios")  # Memory holds "bye" again
+    now[0] += 31
+    assert cache.get("hello", "en", "es", "m") is None
+    assert _disk_rows(db) == 1  # The stale row is gone; "bye" was rewritten at +30
+    cache.close()
+
+
+def test_disk_tier_pruned_to_cap_and_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, "time", lambda: now[0])
+    db = str(tmp_path / "cache.db")
+    cache = TranslationCache(max_entries=1, ttl_s=3600, db_path=db, max_disk_entries=20)
+    assert cache.prune_every == 2
+    for i in range(50):
+        now[0] += 1
+        cache.put(f"t{i}", "en", "es", "m", f"T{i}")
+    assert _disk_rows(db) <= 20 + cache.prune_every
+    assert cache.get("t49", "en", "es", "m") == "T49"
+    assert cache.get("t0", "en", "es", "m") is None  # Oldest rows went first
+
+    now[0] += 3600
+    cache.put("fresh", "en", "es", "m", "FRESH")
+    cache.put("fresh2", "en", "es", "m", "FRESH2")  # Triggers a prune: everything else expired
+    assert _disk_rows(db) == 2
+    cache.close()
+
+
+def test_stats_hit_rate():
+    cache = TranslationCache()
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.get("x", "en", "es", "m")
+    cache.put("x", "en", "es", "m", "X")
+    cache.get("x", "en", "es", "m")
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_translator_import_skips_the_transcriber_stack():
+    # The translation service only needs the stdlib cache from src.engine
+    code = ("import sys, src.translation.translator; "
+            "print(sorted(m for m in sys.modules if m.startswith('src.engine')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=str(Path(__file__).parent.parent), timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "['src.engine', 'src.engine.translation_cache']"
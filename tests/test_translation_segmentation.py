@@ -0,0 +1,92 @@
+"""
+Tests for the Translator's sentence splitter.
+"""
+
+from types import SimpleNamespace
+
+from src.translation.segmentation import join_sentences, split_sentences
+
+
+def _texts(pairs):
+    return [s for s, _ in pairs]
+
+
+def test_splits_on_sentence_punctuation():
+    pairs = split_sentences("Hello there. How are you? I'm fine!  Thanks.", "en")
+    assert _texts(pairs) == ["Hello there.", "How are you?", "I'm fine!", "Thanks."]
+    assert pairs[-1][1] is None
+
+
+def test_abbreviations_initials_and_lowercase_do_not_split():
+    text = "Dr. Smith met J. R. R. Tolkien. They spoke e.g. about trees. Nice."
+    assert _texts(split_sentences(text, "en")) == [
+        "Dr. Smith met J. R. R. Tolkien.", "They spoke e.g. about trees.", "Nice."]
+    assert _texts(split_sentences("Das ist z.B. gut. Weiter.", "de")) == ["Das ist z.B. gut.", "Weiter."]
+
+
+def test_closing_quotes_stay_with_their_sentence():
+    assert _texts(split_sentences('He said "Stop." Then left.', "en")) == ['He said "Stop."', "Then left."]
+
+
+def test_unspaced_and_script_specific_terminators():
+    assert _texts(split_sentences("今天天气很好。我们去公园吧！好吗？", "zh")) == \
+        ["今天天气很好。", "我们去公园吧！", "好吗？"]
+    assert _texts(split_sentences("यह अच्छा है। चलो चलें।", "hi")) == ["यह अच्छा है।", "चलो चलें।"]
+    assert _texts(split_sentences("كيف حالك؟ أنا بخير.", "ar")) == ["كيف حالك؟", "أنا بخير."]
+
+
+def test_unsegmented_scripts_split_on_line_breaks_only():
+    assert _texts(split_sentences("สวัสดีครับ ผมชื่อ\nบรรทัดสอง", "th")) == ["สวัสดีครับ ผมชื่อ", "บรรทัดสอง"]
+
+
+def test_overlong_sentence_is_capped_at_clause_breaks():
+    text = ", ".join(["word"] * 300)
+    pieces = _texts(split_sentences(text, "en", max_chars=200))
+    assert all(len(p) <= 200 for p in pieces)
+    assert " ".join(pieces) == text
+
+
+def test_join_keeps_line_breaks_and_uses_target_spacing():
+    pairs = split_sentences("First. Second.\n\nThird.", "en")
+    seps = [sep for _, sep in pairs]
+    assert join_sentences(["Uno.", "Dos.", "Tres."], seps, "es") == "Uno. Dos.\n\nTres."
+    assert join_sentences(["一。", "二。", "三。"], seps, "zh") == "一。二。\n\n三。"
+
+    zh = split_sentences("一。二。", "zh")
+    assert join_sentences(["One.", "Two."], [sep for _, sep in zh], "en") == "One. Two."
+
+
+def test_empty_input():
+    assert split_sentences("   ", "en") == []
+    assert join_sentences([], [], "en") == ""
+
+
+class RecordingEngine:
+    """Uppercases sentences; records each batch it is given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def translate(self, sentences, source_lang, target_lang):
+        self.batches.append(list(sentences))
+        return [(s.upper(), len(s.split()), len(s.split())) for s in sentences]
+
+
+def test_translator_batches_sentences_by_length_and_reassembles():
+    from src.translation.translator import Translator, TranslationConfig
+
+    translator = Translator(TranslationConfig(model_path="/unused", sentence_batch_size=2, cache_size=0))
+    translator.tokenizer = SimpleNamespace()
+    translator.engine = RecordingEngine()
+    translator.device = "cpu"
+    translator._loaded = True
+
+    results = translator.translate_batch(
+        ["Hello there my friend. Hi.\nNew line here now.", "Short one."], "en", "es", return_timing=True)
+
+    # Four sentences from two texts, shortest first, two per engine call
+    assert translator.engine.batches == [["Hi.", "Short one."], ["New line here now.", "Hello there my friend."]]
+    assert results[0]["translated_text"] == "HELLO THERE MY FRIEND. HI.\nNEW LINE HERE NOW."
+    assert results[0]["sentences"] == 3
+    assert results[0]["input_tokens"] == 9
+    assert results[1]["translated_text"] == "SHORT ONE."
@@ -0,0 +1,128 @@
+"""
+Tests for streaming translation (translation_partial messages).
+"""
+
+import asyncio
+import json
+import threading
+from itertools import zip_longest
+
+from src.translation.server import TranslationServer
+from src.translation.translator import Translator, TranslationConfig
+
+
+class WordStreamEngine:
+    """Streams each sentence back uppercased, one word at a time."""
+
+    def stream(self, sentence, source_lang, target_lang):
+        for i, word in enumerate(sentence.split()):
+            yield (" " if i else "") + word.upper()
+
+
+class TaggingEngine:
+    """Prefixes each sentence with the source language it was asked to read."""
+
+    def stream(self, sentence, source_lang, target_lang):
+        yield f"[{source_lang}]"
+        yield " " + sentence
+
+
+def _translator(**config):
+    translator = Translator(TranslationConfig(model_path="/unused", **config))
+    translator.tokenizer = type("Tok", (), {})()
+    translator.engine = WordStreamEngine()
+    translator._loaded = True
+    return translator
+
+
+def test_partials_grow_then_final():
+    events = list(_translator(cache_size=0).translate_stream("Hello there. Bye now.", "en", "es"))
+    partials, final = events[:-1], events[-1]
+
+    assert [p["translated_text"] for p in partials] == [
+        "HELLO", "HELLO THERE.", "HELLO THERE. BYE", "HELLO THERE. BYE NOW."]
+    assert "".join(p["delta"] for p in partials) == final["translated_text"]
+    assert final["translated_text"] == "HELLO THERE. BYE NOW."
+    assert final["streamed"] is True and "partial" not in final
+    assert 0 <= final["ttft_ms"] <= final["inference_ms"]
+
+
+def test_interleaved_languages_keep_their_source_language():
+    translator = _translator(cache_size=0)
+    translator.engine = TaggingEngine()
+    english = translator.translate_stream("Good morning. See you.", "en", "de")
+    french = translator.translate_stream("Bonjour. A bientot.", "fr", "de")
+
+    # Alternate between the two streams, sentence by sentence
+    finals = {}
+    for events in zip_longest(english, french):
+        for event in events:
+            if event is not None and "partial" not in event:
+                finals[event["source_lang"]] = event["translated_text"]
+
+    assert finals == {"en": "[en] Good morning. [en] See you.",
+                      "fr": "[fr] Bonjour. [fr] A bientot."}
+
+
+def test_cache_hit_skips_decoding():
+    translator = _translator()
+    translator.cache.put("Hello.", "en", "es", translator.cache_identity, "Hola.")
+    events = list(translator.translate_stream("Hello.", "en", "es"))
+    assert events == [{"source_lang": "en", "target_lang": "es", "translated_text": "Hola.", "model": "m2m100_418M",
+                       "inference_ms": 0, "input_length": 6, "output_length": 5, "cached": True}]
+
+
+def test_unsupported_language_is_a_final_error():
+    events = list(_translator().translate_stream("Hello.", "en", "xx"))
+    assert len(events) == 1 and "Unsupported target language" in events[0]["error"]
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def test_server_sends_partials_then_translation():
+    server = TranslationServer()
+    server.translator = _translator(cache_size=0)
+    ws = FakeWebSocket()
+
+    asyncio.run(server._stream_translation(ws, {
+        "text": "Good morning.", "source_lang": "en", "target_lang": "fr", "stream": True, "id": 3}))
+
+    assert [m["type"] for m in ws.sent] == ["translation_partial", "translation_partial", "translation"]
+    assert all(m["id"] == 3 for m in ws.sent)
+    assert ws.sent[0]["delta"] == "GOOD"
+    assert ws.sent[-1]["translated_text"] == "GOOD MORNING."
+
+
+def test_server_streams_on_the_batch_inference_thread():
+    from src.translation.batching import TranslationBatcher
+
+    server = TranslationServer()
+    server.translator = _translator(cache_size=0)
+    server._batcher = TranslationBatcher(server.translator.translate_batch)
+    threads = []
+    engine = server.translator.engine
+    stream = engine.stream
+
+    def recording(*args):
+        threads.append(threading.current_thread().name)
+        return stream(*args)
+
+    engine.stream = recording
+    ws = FakeWebSocket()
+    asyncio.run(server._stream_translation(ws, {"text": "Hi.", "source_lang": "en", "target_lang": "fr"}))
+    assert ws.sent[-1]["translated_text"] == "HI."
+    assert threads and all(name.startswith("translate-batch") for name in threads)
+
+
+def test_server_stream_validates_request():
+    server = TranslationServer()
+    server.translator = _translator()
+    ws = FakeWebSocket()
+    asyncio.run(server._stream_translation(ws, {"text": "  ", "stream": True}))
+    assert ws.sent == [{"type": "error", "error": "Missing or empty 'text' field"}]
@@ -0,0 +1,198 @@
+"""
+Tests for the streaming energy gate in front of the live audio ring.
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.engine.transcriber import StreamingTranscriber, TranscriberConfig
+from src.engine.vad import StreamingVad, find_pause, quietest_point
+
+SR = 16000
+
+
+def tone(seconds, amplitude=6000):
+    t = np.arange(int(seconds * SR)) / SR
+    return (np.sin(2 * np.pi * 200 * t) * amplitude).astype(np.int16).tobytes()
+
+
+def noise(seconds, amplitude=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SR)) * amplitude).astype(np.int16).tobytes()
+
+
+def run(gate, pcm, block_s=0.1):
+    events = []
+    step = int(block_s * SR) * 2
+    for i in range(0, len(pcm), step):
+        events.extend(gate.process(pcm[i:i + step]))
+    return events
+
+
+def summarize(events):
+    """Merge consecutive audio events: [("gap", n) | ("audio", samples) | ("end", None)]."""
+    out = []
+    for kind, value in events:
+        if kind == "audio" and out and out[-1][0] == "audio":
+            out[-1] = ("audio", out[-1][1] + len(value) // 2)
+        elif kind == "audio":
+            out.append(("audio", len(value) // 2))
+        else:
+            out.append((kind, value))
+    return out
+
+
+class TestStreamingVad:
+    def test_silence_is_dropped(self):
+        gate = StreamingVad()
+        assert run(gate, noise(3)) == []
+        assert gate.stats()["gated_s"] == pytest.approx(2.7, abs=0.05)  # Minus preroll
+
+    def test_utterance_forwarded_with_preroll_and_hangover(self):
+        gate = StreamingVad(hangover_s=0.5, preroll_s=0.3)
+        events = summarize(run(gate, noise(2) + tone(1) + noise(2)))
+        assert [k for k, _ in events] == ["gap", "audio", "end"]
+        # Speech opens 60ms into the tone and takes ~0.3s of preroll with
+        # it; the hangover adds 0.5s after the tone
+        assert events[0][1] == pytest.approx(1.74 * SR, abs=0.02 * SR)
+        assert events[1][1] == pytest.approx((0.26 + 1.0 + 0.5) * SR, abs=0.02 * SR)
+        assert not gate.in_speech
+
+    def test_state_carries_across_block_sizes(self):
+        pcm = noise(1) + tone(0.7) + noise(1) + tone(0.5) + noise(1)
+        whole = summarize(run(StreamingVad(), pcm, block_s=10))
+        tiny = summarize(run(StreamingVad(), pcm, block_s=0.013))
+        assert whole == tiny
+        assert [k for k, _ in whole].count("end") == 2
+
+    def test_short_clicks_do_not_open_the_gate(self):
+        gate = StreamingVad(min_speech_s=0.06)
+        assert run(gate, noise(0.5) + tone(0.02) + noise(0.5)) == []
+
+    def test_short_pauses_stay_in_one_utterance(self):
+        gate = StreamingVad(hangover_s=0.5)
+        events = summarize(run(gate, tone(0.5) + noise(0.3) + tone(0.5) + noise(1)))
+        assert [k for k, _ in events] == ["audio", "end"]
+
+    def test_noise_floor_learns_steady_noise(self):
+        gate = StreamingVad()
+        run(gate, noise(2, amplitude=300))  # ~-40 dBFS hum from the start
+        assert gate.stats()["noise_floor_dbfs"] == pytest.approx(-40, abs=2)
+        # Speech well above the hum still opens the gate
+        assert any(k == "audio" for k, _ in run(gate, tone(0.5)))
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio.size, kwargs))
+        return [SimpleNamespace(text=" hello", start=0.0, end=1.0, avg_logprob=-0.1)], \
+            SimpleNamespace(language="en", language_probability=0.99)
+
+
+class TestTranscriberGate:
+    def test_pauses_never_reach_the_model(self):
+        config = TranscriberConfig(chunk_length_s=3.0, adaptive=False)
+        transcriber = StreamingTranscriber(config)
+        model = CountingModel()
+        transcriber.model = model
+        transcriber.start_session()
+
+        # Speak 1s, pause 4s, speak 1s; the utterance end flushes each
+        # utterance without waiting for a full 3s chunk
+        for block in (tone(1), noise(4), tone(1), noise(1)):
+            for i in range(0, len(block), 3200):
+                transcriber.feed_audio(block[i:i + 3200])
+            time.sleep(0.3)
+
+        transcriber.stop_session()
+        assert len(model.calls) == 2
+        assert all(size < 2 * SR for size, _ in model.calls)
+        # The gate replaces faster-whisper's own VAD pass
+        assert all(kwargs["vad_filter"] is False for _, kwargs in model.calls)
+        stats = transcriber.vad_gate_stats()
+        assert stats["gated_s"] > 3.0
+
+    def test_gate_can_be_disabled(self):
+        transcriber = StreamingTranscriber(TranscriberConfig(vad_gate=False))
+        transcriber.start_session()
+        transcriber.feed_audio(noise(1))  # Less than a chunk: stays buffered
+        assert len(transcriber._audio_ring) == SR
+        assert transcriber.vad_gate_stats() == {"enabled": False}
+        transcriber.stop_session()
+
+
+def as_float(pcm):
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class TestUtteranceCuts:
+    def test_first_pause_after_min(self):
+        audio = as_float(tone(1) + noise(0.3) + tone(2) + noise(0.3) + tone(1))
+        # The pause at 1s is too early for min_s=2; cut in the middle of the next one
+        cut = find_pause(audio, SR, min_s=2.0, pause_s=0.2)
+        assert cut == pytest.approx(3.45 * SR, abs=0.02 * SR)
+
+    def test_pauses_shorter_than_pause_s_ignored(self):
+        audio = as_float(tone(2) + noise(0.1) + tone(2))
+        assert find_pause(audio, SR, min_s=1.0, pause_s=0.2) is None
+
+    def test_trailing_pause_counts(self):
+        audio = as_float(tone(2) + noise(0.4))
+        assert find_pause(audio, SR, min_s=1.0, pause_s=0.2) == pytest.approx(2.2 * SR, abs=0.02 * SR)
+
+    def test_quietest_point_in_second_half(self):
+        loud = tone(3)
+        dip = tone(0.1, amplitude=500)
+        audio = as_float(tone(1, amplitude=800) + loud + dip + loud)
+        # The quiet first second is before start_s and ignored
+        assert 4.0 * SR <= quietest_point(audio, SR, start_s=3.5) <= 4.1 * SR
+
+
+class TestUtteranceSegmentation:
+    def run_session(self, config, blocks):
+        transcriber = StreamingTranscriber(config)
+        model = CountingModel()
+        transcriber.model = model
+        transcriber.start_session()
+        for block in blocks:
+            for i in range(0, len(block), 3200):
+                transcriber.feed_audio(block[i:i + 3200])
+                time.sleep(0.02)  # 10x real time
+        time.sleep(0.3)
+        transcriber.stop_session()
+        return [size / SR for size, _ in model.calls]
+
+    def test_calls_end_at_short_pauses(self):
+        # Two 3.5s phrases separated by a 0.3s breath (shorter than the
+        # gate's hangover, so only the segmenter sees it)
+        config = TranscriberConfig(chunk_length_s=3.0, adaptive=False)
+        sizes = self.run_session(config, [tone(3.5), noise(0.3), tone(3.5)])
+        assert len(sizes) == 2
+        assert sizes[0] == pytest.approx(3.65, abs=0.1)
+
+    def test_fixed_segmentation_cuts_every_chunk(self):
+        config = TranscriberConfig(chunk_length_s=3.0, segmentation="fixed", adaptive=False)
+        sizes = self.run_session(config, [tone(3.5), noise(0.3), tone(3.5)])
+        assert 3.0 <= sizes[0] < 3.6  # Whatever was buffered at the poll after 3s
+
+    def test_false_final_period_only_stripped_mid_speech(self):
+        transcriber = StreamingTranscriber(TranscriberConfig())
+
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                return [SimpleNamespace(text=" Hello there.", start=0.0, end=1.0, avg_logprob=-0.1)], \
+                    SimpleNamespace(language="en", language_probability=0.99)
+
+        transcriber.model = Model()
+        texts = []
+        transcriber.on_transcript(lambda seg: texts.append(seg.text))
+        audio = as_float(tone(1))
+        transcriber._process_chunk(audio)
+        transcriber._process_chunk(audio, mid_speech=True)
+        assert texts == ["Hello there.", "Hello there"]
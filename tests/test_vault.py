@@ -5,7 +5,9 @@ Tests for Windy Word Prompt Vault
 import pytest
 import tempfile
 import os
-from src.engine.vault import PromptVault
+import threading
+import time
+from src.engine.vault import PromptVault, _SegmentWriter
 
 
 @pytest.fixture
@@ -178,3 +180,158 @@ class TestExport:
     def test_export_nonexistent(self, vault):
         text = vault.export_session(9999)
         assert text == ''
+
+
+class TestWriteBehind:
+    """Test the queued (write-behind) segment path used by the live session."""
+    
+    def test_queued_segments_visible_after_end_session(self, vault):
+        s1 = vault.create_session()
+        for i in range(10):
+            vault.queue_segment(s1, f"word{i}", i, i + 1, 0.9)
+        vault.end_session(s1)
+        
+        session = vault.get_session(s1)
+        assert session['word_count'] == 10
+        assert [seg['text'] for seg in session['segments']] == [f"word{i}" for i in range(10)]
+    
+    def test_rows_grouped_into_batches(self, tmp_path):
+        v = PromptVault(db_path=os.path.join(str(tmp_path), 'batched.db'),
+                        flush_interval_ms=200, flush_max_rows=8)
+        s1 = v.create_session()
+        for i in range(16):
+            v.queue_segment(s1, f"w{i}", i, i + 1)
+        assert v.flush(timeout=5)
+        assert v._writer.batches == 2
+        assert len(v.get_session_segments(s1)) == 16
+        v.close()
+    
+    def test_commit_order_preserved(self, vault):
+        s1 = vault.create_session()
+        for i in range(50):
+            vault.queue_segment(s1, f"s{i}", 0, 1)
+        vault.flush()
+        rows = vault._conn.execute(
+            "SELECT text FROM segments WHERE session_id = ? ORDER BY id", (s1,)
+        ).fetchall()
+        assert [r[0] for r in rows] == [f"s{i}" for i in range(50)]
+    
+    def test_close_drains_queue(self, tmp_path):
+        db_path = os.path.join(str(tmp_path), 'drain.db')
+        v = PromptVault(db_path=db_path, flush_interval_ms=1000)
+        s1 = v.create_session()
+        v.queue_segment(s1, "last words", 0, 1)
+        v.close()
+        
+        v2 = PromptVault(db_path=db_path)
+        assert [seg['text'] for seg in v2.get_session_segments(s1)] == ["last words"]
+        v2.close()
+    
+    def test_bad_row_does_not_drop_batch(self, vault):
+        s1 = vault.create_session()
+        vault.queue_segment(s1, "kept", 0, 1)
+        vault.queue_segment(99999, "orphan", 0, 1)  # FK violation
+        vault.queue_segment(s1, "also kept", 1, 2)
+        vault.flush()
+        assert [seg['text'] for seg in vault.get_session_segments(s1)] == ["kept", "also kept"]
+        assert vault._writer.failed_rows == 1
+    
+    def test_stalled_writer_does_not_hang_reads(self, tmp_path, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(_SegmentWriter, "_commit", lambda self, conn, batch: release.wait(10))
+        v = PromptVault(db_path=os.path.join(str(tmp_path), 'stalled.db'), flush_timeout_s=0.2)
+        s1 = v.create_session()
+        v.save_segment(s1, "written", 0, 1)
+        v.queue_segment(s1, "stuck", 1, 2)
+        started = time.monotonic()
+        assert [seg['text'] for seg in v.get_session_segments(s1)] == ["written"]
+        v.end_session(s1)
+        assert time.monotonic() - started < 2
+        release.set()
+        v.close()
+    
+    def test_dead_writer_fails_flush_at_once(self, tmp_path, monkeypatch):
+        def crash(self):
+            raise RuntimeError("writer died")
+        monkeypatch.setattr(_SegmentWriter, "_drain", crash)
+        monkeypatch.setattr(threading, "excepthook", lambda args: None)
+        v = PromptVault(db_path=os.path.join(str(tmp_path), 'dead.db'))
+        s1 = v.create_session()
+        v.queue_segment(s1, "lost", 0, 1)
+        started = time.monotonic()
+        assert v.flush(timeout=30) is False
+        assert v.search("lost") == []
+        assert time.monotonic() - started < 2
+        v.close()
+
+    
+    def test_concurrent_callers_share_the_connection_safely(self, tmp_path):
+        vault = PromptVault(db_path=os.path.join(str(tmp_path), 'shared.db'), flush_interval_ms=0)
+        errors = []
+        s0 = vault.create_session()
+        vault.save_segment(s0, "hello world", 0, 1)
+
+        def writer():
+            try:
+                for i in range(150):
+                    sid = vault.create_session()
+                    vault.queue_segment(sid, f"w{i}", 0, 1)
+                    vault.end_session(sid)
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(150):
+                    vault.get_sessions(limit=10)
+                    vault.search("hello")
+                    vault.export_session(s0, "md")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=fn) for fn in (writer, reader) * 3]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(vault.get_sessions(limit=1000)) == 451
+        vault.close()
+
+def test_server_vault_commands_run_off_the_event_loop():
+    import asyncio
+    import json
+    from src.engine.server import WindyServer
+
+    class RecordingVault:
+        def __init__(self):
+            self.threads = []
+
+        def search(self, query):
+            self.threads.append(threading.get_ident())
+            return [{"text": query}]
+
+        def delete_session(self, session_id):
+            self.threads.append(threading.get_ident())
+            return True
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.sent = []
+
+        async def send(self, message):
+            self.sent.append(json.loads(message))
+
+    server = WindyServer(host='127.0.0.1', port=9876)
+    server.vault = RecordingVault()
+    ws = FakeWebSocket()
+
+    async def main():
+        await server._handle_command({"action": "vault_search", "query": "hello"}, ws)
+        await server._handle_command({"action": "vault_delete", "session_id": 3}, ws)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert ws.sent == [{"type": "vault_search", "results": [{"text": "hello"}]},
+                       {"type": "vault_delete", "success": True}]
+    assert len(server.vault.threads) == 2 and loop_thread not in server.vault.threads
@@ -95,3 +95,25 @@ class TestWhitespace:
     def test_no_space_before_punctuation(self, processor):
         result = processor.process("hello , world")
         assert "hello, world" in result.lower() or "Hello, world" in result
+
+
+class TestPrecompiledRules:
+    """The single-pass rules must match the old per-rule re.sub loop exactly."""
+    
+    def test_identical_to_per_rule_processing(self):
+        from src.engine.benchmark import _LegacyVibe, vibe_segments
+        settings = {'vibe_enabled': True}
+        legacy, fast = _LegacyVibe(settings), VibeProcessor(settings)
+        edge_cases = [
+            "Um, you know, I mean like basically it's kinda sorta done",
+            "UMM like like like", "unlike the umbrella, likely", "I MEAN IT",
+            "you know you know", "lemme know cuz i dunno. sure", "like",
+        ]
+        for text in vibe_segments(0.1) + edge_cases:
+            assert fast.process(text) == legacy.process(text), text
+    
+    def test_rebuild_picks_up_new_rules(self, processor):
+        processor.FILLERS = {'erm'}
+        processor.CORRECTIONS = {r'\bya\b': 'you'}
+        processor.rebuild()
+        assert processor.process("see erm ya") == "See you."